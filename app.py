@@ -4,6 +4,7 @@
 
 from flask import Flask, render_template, request, jsonify, send_file, session, redirect
 import time
+import importlib
 import sqlite3
 import os
 import json
@@ -31,22 +32,58 @@ from utils.crisis_detector import CrisisDetector
 # from utils.accessibility_engine import AccessibilityEngine  # Temporarily disabled due to mediapipe dependency
 from utils.offline_manager import OfflineManager
 from utils.multi_language_processor import MultiLanguageProcessor
+from utils.emotion_repository import EmotionRepository
+from utils.blob_codec import BlobCodec
+from utils.session_store import create_session_interface, regenerate_session_id
+from utils.render_cache import RenderCache, SCOPE_DASHBOARD, SCOPE_JOURNAL, build_version
+from utils.media_decoding import decode_image, UploadPersister
+from utils.video_emotion import VideoEmotionAnalyzer
+from utils.image_hash_cache import ImageHashCache
+from utils.tiered_analysis import TieringPolicy
+from utils.text_emotion_model import get_text_emotion_model
+from utils.distillation import TrainingTextStore
+from utils.streaming_voice import register_voice_stream_handlers
+from utils.crisis_pipeline import CrisisPipeline, register_crisis_update_handlers
+from utils.crisis_outbox import CrisisOutbox
+from utils.counsellor_feed import CounsellorFeed, FLAGGED_REPORT_LEVELS, register_counsellor_feed_handlers
+from utils.lazy_import import LazyComponent, lazy_status, module_available, warmup
+from utils.preload import run_after_fork_hooks
+
+try:
+    from flask_socketio import SocketIO
+    SOCKETIO_AVAILABLE = True
+except ImportError:
+    SOCKETIO_AVAILABLE = False
 
 # Initialize Flask app
 
-# Real API Integrations
-try:
-    from integrations.spotify_therapy import spotify_therapy
-    from integrations.google_cloud import google_services
-    from integrations.database_manager import db_manager
-    REAL_APIS_AVAILABLE = True
-except ImportError as e:
-    logging.warning(f"Real API integrations not available: {e}")
-    REAL_APIS_AVAILABLE = False
+# Real API Integrations - the SDK clients are created on first use
+REAL_API_MODULES = ('spotipy', 'google.cloud.speech', 'google.cloud.texttospeech',
+                    'google.cloud.translate_v2', 'google.cloud.vision')
+_missing_apis = [name for name in REAL_API_MODULES if not module_available(name)]
+REAL_APIS_AVAILABLE = not _missing_apis
+if REAL_APIS_AVAILABLE:
+    spotify_therapy = LazyComponent(
+        'spotify_therapy', lambda: importlib.import_module('integrations.spotify_therapy').spotify_therapy)
+    # gRPC / MongoDB clients are created at import of their modules and must not cross a fork
+    google_services = LazyComponent(
+        'google_services', lambda: importlib.import_module('integrations.google_cloud').google_services,
+        fork_safe=False)
+    db_manager = LazyComponent(
+        'db_manager', lambda: importlib.import_module('integrations.database_manager').db_manager,
+        fork_safe=False)
+else:
+    logging.warning(f"Real API integrations not available: missing {', '.join(_missing_apis)}")
 
 
 app = Flask(__name__)
 app.secret_key = os.environ.get('SECRET_KEY', 'manas_secret_key_2025')
+# WebSocket transport for streamed voice analysis (threading works under plain gunicorn/dev server)
+# and pushed crisis updates; set SOCKETIO_MESSAGE_QUEUE (e.g. redis://) when running several workers
+socketio = SocketIO(
+    app, async_mode=os.environ.get('SOCKETIO_ASYNC_MODE', 'threading'),
+    message_queue=os.environ.get('SOCKETIO_MESSAGE_QUEUE')
+) if SOCKETIO_AVAILABLE else None
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -54,19 +91,70 @@ logger = logging.getLogger(__name__)
 
 # Configuration
 UPLOAD_FOLDER = 'uploads'
-ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif', 'wav', 'mp3', 'mp4'}
+DATABASE_PATH = 'manas_wellness.db'
+ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif', 'wav', 'mp3', 'mp4', 'webm', 'mov'}
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 
+# Server-side sessions: the cookie only carries a signed session id
+app.session_interface = create_session_interface(DATABASE_PATH)
+
 # Ensure upload directory exists
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
-# Initialize core components
-emotion_detector = EmotionDetector()
-therapy_generator = TherapyGenerator()
-crisis_detector = CrisisDetector()
+# Initialize core components - built on first use (or by warmup_app), so boot
+# and workers that never analyze media skip MediaPipe graphs and worker pools
+crisis_detector = LazyComponent('crisis_detector', lambda: CrisisDetector(DATABASE_PATH))
+# Crisis terms in text always send the analysis to Gemini, whatever the local confidence
+tiering_policy = LazyComponent('tiering_policy', lambda: TieringPolicy(lexicon=crisis_detector.lexicon))
+# MediaPipe graphs, worker processes and thread pools are per process
+emotion_detector = LazyComponent('emotion_detector', lambda: EmotionDetector(tiering=tiering_policy.get()),
+                                 fork_safe=False)
+video_emotion_analyzer = VideoEmotionAnalyzer(emotion_detector)
+therapy_generator = LazyComponent('therapy_generator', TherapyGenerator)
 # accessibility_engine = AccessibilityEngine()  # Temporarily disabled
-offline_manager = OfflineManager()
-multi_language_processor = MultiLanguageProcessor()
+offline_manager = LazyComponent('offline_manager', OfflineManager)
+multi_language_processor = LazyComponent('multi_language_processor', MultiLanguageProcessor)
+blob_codec = BlobCodec(DATABASE_PATH)
+emotion_repository = EmotionRepository(DATABASE_PATH, codec=blob_codec)
+render_cache = RenderCache(DATABASE_PATH, build=build_version(os.path.join(app.root_path, app.template_folder)))
+upload_persister = UploadPersister(UPLOAD_FOLDER)
+image_cache = ImageHashCache()
+# Raw text for distilling the local text model: off unless DISTILLATION_COLLECT_TEXT is set
+training_texts = TrainingTextStore(DATABASE_PATH)
+
+def analyze_image_cached(user_id, image_bytes):
+    """Facial analysis of an upload, reusing the user's recent result for a near-duplicate image"""
+    image = decode_image(image_bytes)
+    fingerprint = image_cache.fingerprint(image)
+    emotion_result = image_cache.lookup(user_id, fingerprint)
+    if emotion_result is None:
+        emotion_result = emotion_detector.analyze_facial_emotion(image)
+        image_cache.store(user_id, fingerprint, emotion_result)
+    return emotion_result
+
+def save_streamed_voice_result(user_id, emotion_result):
+    """Persist the final result of a streamed voice session like an uploaded recording"""
+    session_id = str(uuid.uuid4())
+    emotion_repository.save_emotional_state(
+        user_id, session_id, emotion_result, 'audio', emotion_result.get('confidence', 0.0)
+    )
+    render_cache.invalidate(user_id, SCOPE_DASHBOARD)
+    return {
+        'risk_assessment': crisis_pipeline.assess(emotion_result, user_id),
+        'session_id': session_id
+    }
+
+# Crisis screens answer immediately; Gemini confirmations are pushed over Socket.IO when available
+# Alerts and their SMS / webhook / email notifications are written together and delivered in the background
+# Counsellor dashboards receive each alert once per institution, with replay on reconnect
+counsellor_feed = CounsellorFeed(DATABASE_PATH)
+crisis_outbox = CrisisOutbox(DATABASE_PATH, feed=counsellor_feed)
+crisis_pipeline = CrisisPipeline(crisis_detector, crisis_outbox)
+
+if socketio is not None:
+    register_voice_stream_handlers(socketio, emotion_detector, save_streamed_voice_result)
+    crisis_pipeline.publish = register_crisis_update_handlers(socketio)
+    register_counsellor_feed_handlers(socketio, counsellor_feed)
 
 def allowed_file(filename):
     """Check if file extension is allowed"""
@@ -74,7 +162,7 @@ def allowed_file(filename):
 
 def get_db_connection():
     """Get SQLite database connection"""
-    conn = sqlite3.connect('manas_wellness.db')
+    conn = sqlite3.connect(DATABASE_PATH)
     conn.row_factory = sqlite3.Row
     return conn
 
@@ -199,6 +287,21 @@ def init_db():
         )
     ''')
     
+    # Voice conversations table
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS voice_conversations (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id TEXT NOT NULL,
+            user_message TEXT NOT NULL,
+            ai_response TEXT NOT NULL,
+            sentiment TEXT,
+            confidence REAL,
+            emotion TEXT,
+            keywords TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    
     # Journal entries table
     conn.execute('''
         CREATE TABLE IF NOT EXISTS journal_entries (
@@ -240,10 +343,45 @@ def init_db():
     
     conn.commit()
     conn.close()
+    
+    # Indexes for hot/cold history queries and compression dictionaries
+    emotion_repository.ensure_schema()
+    blob_codec.ensure_schema()
+    render_cache.ensure_schema()
+    counsellor_feed.ensure_schema()
 
 # Initialize database on startup
 init_db()
 
+WARMUP_ON_BOOT = os.environ.get('WARMUP_ON_BOOT', 'false').lower() in ('1', 'true', 'yes')
+
+def warmup_app(fork_safe_only=False):
+    """Import the heavy ML dependencies and build deferred components now
+
+    Trades boot time for a fast first request. In a preloading gunicorn
+    master only fork-safe modules and components are loaded (see
+    gunicorn.conf.py); the rest are built per worker by init_worker().
+    """
+    timings = warmup(fork_safe_only=fork_safe_only)
+    # Text model artifact (built at deploy time) is loaded before the first journal entry
+    start = time.perf_counter()
+    if get_text_emotion_model() is not None:
+        timings['text_emotion_model'] = round(time.perf_counter() - start, 4)
+    logger.info(f"Warmup finished in {sum(timings.values()):.2f}s: {timings}")
+    return timings
+
+def init_worker():
+    """Per-worker setup after fork: drop inherited process-local state, then optionally build it"""
+    run_after_fork_hooks()
+    # Also picks up notifications left pending by a previous worker
+    crisis_outbox.ensure_running()
+    if WARMUP_ON_BOOT:
+        warmup_app()
+
+if WARMUP_ON_BOOT:
+    # Safe in a process that will fork; per-process parts follow in init_worker or on first use
+    warmup_app(fork_safe_only=True)
+
 # ==================== ROUTES ====================
 
 @app.route('/')
@@ -258,28 +396,27 @@ def dashboard():
     if not user_id:
         return render_template('auth.html')
     
-    # Get user's recent emotional states and therapy sessions
-    conn = get_db_connection()
-    
-    recent_emotions = conn.execute('''
-        SELECT * FROM emotional_states 
-        WHERE user_id = ? 
-        ORDER BY timestamp DESC 
-        LIMIT 10
-    ''', (user_id,)).fetchall()
-    
-    recent_sessions = conn.execute('''
-        SELECT * FROM therapy_sessions 
-        WHERE user_id = ? 
-        ORDER BY timestamp DESC 
-        LIMIT 5
-    ''', (user_id,)).fetchall()
-    
-    conn.close()
+    def render_dashboard():
+        # Get user's recent emotional states (hot + archived) and therapy sessions
+        recent_emotions = emotion_repository.get_recent_emotions(user_id, limit=10)
+        
+        conn = get_db_connection()
+        
+        recent_sessions = [blob_codec.decode_row(row, ['content']) for row in conn.execute('''
+            SELECT * FROM therapy_sessions 
+            WHERE user_id = ? 
+            ORDER BY timestamp DESC 
+            LIMIT 5
+        ''', (user_id,)).fetchall()]
+        
+        conn.close()
+        
+        return render_template('dashboard.html', 
+                             recent_emotions=recent_emotions,
+                             recent_sessions=recent_sessions)
     
-    return render_template('dashboard.html', 
-                         recent_emotions=recent_emotions,
-                         recent_sessions=recent_sessions)
+    # Only re-queried and re-rendered after an emotion or therapy write
+    return render_cache.cached_response(user_id, SCOPE_DASHBOARD, render_dashboard)
 
 @app.route('/api/auth/register', methods=['POST'])
 def register_user():
@@ -289,6 +426,8 @@ def register_user():
     
     conn = get_db_connection()
     try:
+        # institution_id is never taken from the client: it decides which counsellors
+        # see this student's crisis alerts (assigned with `python -m utils.counsellor_feed assign-student`)
         conn.execute('''
             INSERT INTO users (user_id, name, age, language, accessibility_needs)
             VALUES (?, ?, ?, ?, ?)
@@ -296,6 +435,7 @@ def register_user():
               data.get('language', 'english'), data.get('accessibility_needs', '')))
         conn.commit()
         
+        regenerate_session_id(session)
         session['user_id'] = user_id
         session['user_name'] = data.get('name')
         
@@ -323,14 +463,16 @@ def analyze_emotion():
                 timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
                 file_extension = image_file.filename.rsplit('.', 1)[1].lower()
                 filename = f"emotion_capture_{user_id}_{timestamp}.{file_extension}"
-                filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-                image_file.save(filepath)
                 
-                emotion_result = emotion_detector.analyze_facial_emotion(filepath)
+                # Decode straight from the request body - no disk round-trip
+                image_bytes = image_file.read()
+                emotion_result = analyze_image_cached(user_id, image_bytes)
                 modality = 'visual'
                 
-                # Store filepath in emotion result for reference
-                emotion_result['image_path'] = filename
+                # Optionally keep the original (written in the background)
+                stored_name = upload_persister.persist(image_bytes, filename)
+                if stored_name:
+                    emotion_result['image_path'] = stored_name
         
         elif 'audio' in request.files:
             # Voice emotion detection
@@ -340,14 +482,34 @@ def analyze_emotion():
                 timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
                 file_extension = audio_file.filename.rsplit('.', 1)[1].lower()
                 filename = f"emotion_audio_{user_id}_{timestamp}.{file_extension}"
-                filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-                audio_file.save(filepath)
                 
-                emotion_result = emotion_detector.analyze_voice_emotion(filepath)
+                # Decode straight from the request body - no disk round-trip
+                audio_bytes = audio_file.read()
+                y, sr, frontend_report = emotion_detector.audio_frontend.process(audio_bytes, extension=file_extension)
+                emotion_result = emotion_detector.analyze_voice_emotion(y, sr)
+                emotion_result['audio_frontend'] = frontend_report
                 modality = 'audio'
                 
-                # Store filepath in emotion result for reference
-                emotion_result['audio_path'] = filename
+                # Optionally keep the original (written in the background)
+                stored_name = upload_persister.persist(audio_bytes, filename)
+                if stored_name:
+                    emotion_result['audio_path'] = stored_name
+        
+        elif 'video' in request.files:
+            # Video emotion timeline
+            video_file = request.files['video']
+            if video_file and allowed_file(video_file.filename):
+                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                file_extension = video_file.filename.rsplit('.', 1)[1].lower()
+                filename = f"emotion_video_{user_id}_{timestamp}.{file_extension}"
+                
+                video_bytes = video_file.read()
+                emotion_result = video_emotion_analyzer.analyze_video(video_bytes, file_extension)
+                modality = 'video'
+                
+                stored_name = upload_persister.persist(video_bytes, filename)
+                if stored_name:
+                    emotion_result['video_path'] = stored_name
         
         elif request.is_json and 'text' in request.json:
             # Text emotion analysis
@@ -364,17 +526,19 @@ def analyze_emotion():
         else:
             return jsonify({'success': False, 'error': 'No valid input provided'})
         
-        # Store emotion data
-        conn = get_db_connection()
-        conn.execute('''
-            INSERT INTO emotional_states (user_id, session_id, emotion_data, modality, confidence)
-            VALUES (?, ?, ?, ?, ?)
-        ''', (user_id, session_id, json.dumps(emotion_result), modality, emotion_result.get('confidence', 0.0)))
-        conn.commit()
-        conn.close()
-        
-        # Check for crisis indicators
-        risk_assessment = crisis_detector.assess_risk(emotion_result, user_id)
+        # Store emotion data (the analysis only, never the student's text)
+        emotion_repository.save_emotional_state(
+            user_id, session_id, emotion_result, modality, emotion_result.get('confidence', 0.0)
+        )
+        if modality == 'text':
+            # Gemini-labelled text trains the local model only when DISTILLATION_COLLECT_TEXT is on
+            training_texts.record(user_id, text, emotion_result)
+        render_cache.invalidate(user_id, SCOPE_DASHBOARD)
+        
+        # Check for crisis indicators (local screen now, Gemini confirmation pushed later)
+        risk_assessment = crisis_pipeline.assess(
+            dict(emotion_result, text_content=text) if modality == 'text' else emotion_result, user_id
+        )
         
         return jsonify({
             'success': True,
@@ -387,6 +551,76 @@ def analyze_emotion():
         logger.error(f"Emotion analysis error: {e}")
         return jsonify({'success': False, 'error': str(e)})
 
+@app.route('/api/emotion/analyze-multimodal', methods=['POST'])
+def analyze_emotion_multimodal():
+    """Analyze any combination of image, audio and text in one request
+
+    The modalities run concurrently, so latency is roughly that of the
+    slowest one; their results are fused and stored as one emotional state.
+    """
+    user_id = session.get('user_id', 'demo_user')
+    session_id = request.form.get('session_id') or str(uuid.uuid4())
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+
+    try:
+        analyses = {}
+        uploads = []
+
+        image_file = request.files.get('image')
+        if image_file and allowed_file(image_file.filename):
+            image_bytes = image_file.read()
+            analyses['visual'] = lambda: analyze_image_cached(user_id, image_bytes)
+            uploads.append((image_bytes, f"emotion_capture_{user_id}_{timestamp}.{image_file.filename.rsplit('.', 1)[1].lower()}"))
+
+        audio_file = request.files.get('audio')
+        if audio_file and allowed_file(audio_file.filename):
+            audio_bytes = audio_file.read()
+            audio_extension = audio_file.filename.rsplit('.', 1)[1].lower()
+            def analyze_audio():
+                y, sr, frontend_report = emotion_detector.audio_frontend.process(audio_bytes, extension=audio_extension)
+                return dict(emotion_detector.analyze_voice_emotion(y, sr), audio_frontend=frontend_report)
+            analyses['audio'] = analyze_audio
+            uploads.append((audio_bytes, f"emotion_audio_{user_id}_{timestamp}.{audio_extension}"))
+
+        text = (request.form.get('text') or '').strip()
+        if text:
+            analyses['text'] = lambda: emotion_detector.analyze_text_emotion(text)
+
+        if not analyses:
+            return jsonify({'success': False, 'error': 'No valid input provided'})
+
+        emotion_result = emotion_detector.analyze_multimodal(analyses)
+
+        for data, filename in uploads:
+            upload_persister.persist(data, filename)
+
+        # Store one combined emotional state
+        emotion_repository.save_emotional_state(
+            user_id, session_id, emotion_result, 'multimodal', emotion_result.get('confidence', 0.0)
+        )
+        if text:
+            # As in analyze_emotion: opt-in, separate table, own retention
+            for r in emotion_result.get('individual_results', []):
+                if r.get('modality') == 'text':
+                    training_texts.record(user_id, text, r)
+        render_cache.invalidate(user_id, SCOPE_DASHBOARD)
+
+        # Check for crisis indicators, including the raw text
+        risk_assessment = crisis_pipeline.assess(
+            dict(emotion_result, text_content=text) if text else emotion_result, user_id
+        )
+
+        return jsonify({
+            'success': True,
+            'emotion_result': emotion_result,
+            'risk_assessment': risk_assessment,
+            'session_id': session_id
+        })
+
+    except Exception as e:
+        logger.error(f"Multimodal emotion analysis error: {e}")
+        return jsonify({'success': False, 'error': str(e)})
+
 @app.route('/api/therapy/generate', methods=['POST'])
 def generate_therapy():
     """Generate personalized therapy content"""
@@ -414,9 +648,10 @@ def generate_therapy():
         conn.execute('''
             INSERT INTO therapy_sessions (user_id, session_id, therapy_type, content)
             VALUES (?, ?, ?, ?)
-        ''', (user_id, session_id, therapy_content['type'], json.dumps(therapy_content)))
+        ''', (user_id, session_id, therapy_content['type'], blob_codec.encode(json.dumps(therapy_content))))
         conn.commit()
         conn.close()
+        render_cache.invalidate(user_id, SCOPE_DASHBOARD)
         
         return jsonify({
             'success': True,
@@ -548,35 +783,35 @@ def crisis_check():
     user_data = data.get('user_data')
     
     try:
-        risk_level = crisis_detector.analyze_risk_level(user_data)
+        # Resources for the local screen right away; the confirmed level follows as a crisis_update event
+        result = crisis_pipeline.check(user_data, user_id)
         
-        if risk_level >= 0.8:  # High risk
-            intervention = crisis_detector.emergency_protocol(user_id)
-            
-            # Log crisis alert
-            conn = get_db_connection()
-            conn.execute('''
-                INSERT INTO crisis_alerts (user_id, risk_level, alert_type, intervention_taken)
-                VALUES (?, ?, ?, ?)
-            ''', (user_id, risk_level, 'emergency', json.dumps(intervention)))
-            conn.commit()
-            conn.close()
-            
-        elif risk_level >= 0.5:  # Moderate risk
-            intervention = crisis_detector.support_resources(user_id)
-        else:
-            intervention = crisis_detector.preventative_guidance(user_id)
-        
-        return jsonify({
-            'success': True,
-            'risk_level': risk_level,
-            'intervention': intervention
-        })
+        return jsonify(dict(result, success=True))
         
     except Exception as e:
         logger.error(f"Crisis check error: {e}")
         return jsonify({'success': False, 'error': str(e)})
 
+@app.route('/api/crisis/alerts/<int:alert_id>/deliveries')
+def crisis_alert_deliveries(alert_id):
+    """Delivery state of the notifications queued for one of the user's crisis alerts"""
+    user_id = session.get('user_id')
+    if not user_id:
+        return jsonify({'success': False, 'error': 'User not authenticated'})
+    
+    try:
+        conn = get_db_connection()
+        alert = conn.execute('SELECT user_id FROM crisis_alerts WHERE id = ?', (alert_id,)).fetchone()
+        conn.close()
+        if alert is None or alert['user_id'] != user_id:
+            return jsonify({'success': False, 'error': 'Alert not found'}), 404
+        
+        return jsonify({'success': True, 'alert_id': alert_id, 'deliveries': crisis_outbox.delivery_status(alert_id)})
+        
+    except Exception as e:
+        logger.error(f"Crisis delivery status error: {e}")
+        return jsonify({'success': False, 'error': str(e)})
+
 @app.route('/api/accessibility/navigate', methods=['POST'])
 def accessibility_navigate():
     """Eye tracking and accessibility navigation"""
@@ -630,6 +865,14 @@ def submit_feedback():
         logger.error(f"Feedback submission error: {e}")
         return jsonify({'success': False, 'error': str(e)})
 
+@app.route('/api/metrics/analysis-tiers')
+def analysis_tier_metrics():
+    """Share of emotion analyses answered locally vs escalated to Gemini"""
+    metrics = tiering_policy.stats.snapshot()
+    metrics['image_cache'] = image_cache.stats()
+    metrics['lazy_loading'] = lazy_status()
+    return jsonify({'success': True, 'metrics': metrics})
+
 @app.route('/api/offline/sync', methods=['POST'])
 def offline_sync():
     """Sync offline data when connection is available"""
@@ -724,6 +967,7 @@ def journal_page():
             user_id = session.get('user_id')
             if not user_id:
                 user_id = str(uuid.uuid4())
+                regenerate_session_id(session)
                 session['user_id'] = user_id
             
             # Simple mood emoji mapping
@@ -769,22 +1013,15 @@ def journal_page():
             sentiment_score = 0.5
             
             try:
-                positive_words = ['happy', 'good', 'great', 'wonderful', 'amazing', 'love', 'joy', 'excited', 'grateful', 'blessed', 'peaceful', 'content']
-                negative_words = ['sad', 'bad', 'terrible', 'awful', 'hate', 'angry', 'frustrated', 'stressed', 'anxious', 'worried', 'depressed', 'lonely']
-                
-                text_lower = text_content.lower()
-                positive_count = sum(1 for word in positive_words if word in text_lower)
-                negative_count = sum(1 for word in negative_words if word in text_lower)
-                
-                if positive_count > negative_count:
-                    sentiment_score = 0.7 + min(positive_count * 0.05, 0.3)
-                    emotion_detected = "Positive"
-                elif negative_count > positive_count:
-                    sentiment_score = max(0.3 - negative_count * 0.05, 0.0)
-                    emotion_detected = "Negative"
-                else:
-                    sentiment_score = 0.5
-                    emotion_detected = "Neutral"
+                text_model = get_text_emotion_model()
+                if text_model:
+                    # Model sentiment is -1..1; journal entries store 0..1
+                    polarity = text_model.analyze(text_content)['sentiment_score']
+                    sentiment_score = round((polarity + 1) / 2, 3)
+                    if polarity > 0.2:
+                        emotion_detected = "Positive"
+                    elif polarity < -0.2:
+                        emotion_detected = "Negative"
                     
             except Exception as e:
                 logger.error(f"Sentiment analysis error: {e}")
@@ -837,6 +1074,7 @@ def journal_page():
             
             conn.commit()
             conn.close()
+            render_cache.invalidate(user_id, SCOPE_JOURNAL)
             
             # Parse AI insights for frontend
             insights = {
@@ -858,70 +1096,78 @@ def journal_page():
             return jsonify({'success': False, 'message': 'Error processing journal entry. Please try again.'})
     
     # GET request - show enhanced journal page with previous entries
+    user_id = session.get('user_id')
+    if not user_id:
+        return render_empty_journal_page()
+    
+    # Streaks depend on the calendar as well as on saved entries; a failed
+    # render falls back to the empty page, which is never cached
+    return render_cache.cached_response(
+        user_id, SCOPE_JOURNAL, lambda: render_journal_page(user_id),
+        extra=datetime.now().strftime('%Y-%m-%d'),
+        fallback=render_empty_journal_page
+    )
+
+def render_journal_page(user_id):
+    """Render journal.html with the user's recent entries and streak data (raises on failure)"""
+    conn = get_db_connection()
     try:
-        user_id = session.get('user_id')
+        # Ensure table exists
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS journal_entries (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_id TEXT NOT NULL,
+                content TEXT NOT NULL,
+                mood TEXT,
+                mood_emoji TEXT,
+                energy_level TEXT,
+                sleep_quality TEXT,
+                ai_insights TEXT,
+                content_encrypted BOOLEAN DEFAULT FALSE,
+                tags TEXT,
+                sentiment_score REAL,
+                emotion_detected TEXT,
+                voice_file_path TEXT,
+                voice_transcript TEXT,
+                images TEXT,
+                streak_count INTEGER DEFAULT 0,
+                word_count INTEGER DEFAULT 0,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        
+        # Get recent journal entries
+        entries = conn.execute('''
+            SELECT * FROM journal_entries 
+            WHERE user_id = ? 
+            ORDER BY created_at DESC 
+            LIMIT 20
+        ''', (user_id,)).fetchall()
+        
+        # Convert to list of dicts
         journal_entries = []
-        streak_data = {'current_streak': 0, 'longest_streak': 0, 'total_entries': 0}
+        for entry in entries:
+            entry_dict = dict(entry)
+            try:
+                entry_dict['created_at'] = datetime.fromisoformat(entry['created_at'])
+            except:
+                entry_dict['created_at'] = datetime.now()
+            journal_entries.append(entry_dict)
         
-        if user_id:
-            conn = get_db_connection()
-            
-            # Ensure table exists
-            conn.execute('''
-                CREATE TABLE IF NOT EXISTS journal_entries (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    user_id TEXT NOT NULL,
-                    content TEXT NOT NULL,
-                    mood TEXT,
-                    mood_emoji TEXT,
-                    energy_level TEXT,
-                    sleep_quality TEXT,
-                    ai_insights TEXT,
-                    content_encrypted BOOLEAN DEFAULT FALSE,
-                    tags TEXT,
-                    sentiment_score REAL,
-                    emotion_detected TEXT,
-                    voice_file_path TEXT,
-                    voice_transcript TEXT,
-                    images TEXT,
-                    streak_count INTEGER DEFAULT 0,
-                    word_count INTEGER DEFAULT 0,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            # Get recent journal entries
-            entries = conn.execute('''
-                SELECT * FROM journal_entries 
-                WHERE user_id = ? 
-                ORDER BY created_at DESC 
-                LIMIT 20
-            ''', (user_id,)).fetchall()
-            
-            # Convert to list of dicts
-            journal_entries = []
-            for entry in entries:
-                entry_dict = dict(entry)
-                try:
-                    entry_dict['created_at'] = datetime.fromisoformat(entry['created_at'])
-                except:
-                    entry_dict['created_at'] = datetime.now()
-                journal_entries.append(entry_dict)
-            
-            # Get streak data
-            streak_data = get_user_streak_data(user_id, conn)
-            
-            conn.close()
+        # Get streak data
+        streak_data = get_user_streak_data(user_id, conn)
+    finally:
+        conn.close()
     
-        return render_template('journal.html', 
-                             journal_entries=journal_entries,
-                             streak_data=streak_data)
-        
-    except Exception as e:
-        logger.error(f"Journal page error: {e}")
-        return render_template('journal.html', 
-                             journal_entries=[],
-                             streak_data={'current_streak': 0, 'longest_streak': 0, 'total_entries': 0})
+    return render_template('journal.html', 
+                         journal_entries=journal_entries,
+                         streak_data=streak_data)
+
+def render_empty_journal_page():
+    """Journal page without entries (signed-out visitors, or when loading entries fails)"""
+    return render_template('journal.html', 
+                         journal_entries=[],
+                         streak_data={'current_streak': 0, 'longest_streak': 0, 'total_entries': 0})
 
 def get_current_streak(user_id, conn):
     """Calculate current journaling streak for user"""
@@ -1052,6 +1298,7 @@ def analyze_voice_chat():
         user_id = session.get('user_id')
         if not user_id:
             user_id = str(uuid.uuid4())
+            regenerate_session_id(session)
             session['user_id'] = user_id
         
         # Enhanced analysis using Google GenAI with better error handling
@@ -1187,69 +1434,46 @@ def perform_fallback_analysis(message):
     """Enhanced fallback analysis when AI is unavailable"""
     message_lower = message.lower()
     
-    # Expanded emotional vocabulary
-    positive_words = [
-        'happy', 'good', 'great', 'wonderful', 'amazing', 'love', 'joy', 'excited', 
-        'grateful', 'blessed', 'peaceful', 'content', 'confident', 'motivated', 'proud',
-        'optimistic', 'hopeful', 'cheerful', 'delighted', 'thrilled', 'satisfied', 'calm',
-        'relaxed', 'comfortable', 'successful', 'accomplished', 'energetic', 'positive'
-    ]
-    
-    negative_words = [
-        'sad', 'bad', 'terrible', 'awful', 'hate', 'angry', 'frustrated', 'stressed', 
-        'anxious', 'worried', 'depressed', 'lonely', 'confused', 'overwhelmed', 'tired',
-        'upset', 'disappointed', 'scared', 'nervous', 'concerned', 'troubled', 'hurt',
-        'irritated', 'exhausted', 'hopeless', 'discouraged', 'insecure', 'uncertain'
-    ]
-    
-    # Academic/study related words
+    # Topic cues used to pick a contextual response (emotion comes from the local model)
     study_words = ['exam', 'test', 'study', 'homework', 'assignment', 'grade', 'class', 'school', 'college', 'university', 'learning']
     stress_words = ['pressure', 'deadline', 'busy', 'overloaded', 'difficult', 'hard', 'struggling', 'challenge']
     
-    positive_count = sum(1 for word in positive_words if word in message_lower)
-    negative_count = sum(1 for word in negative_words if word in message_lower)
     study_count = sum(1 for word in study_words if word in message_lower)
     stress_count = sum(1 for word in stress_words if word in message_lower)
     
+    display_emotions = {
+        'happy': "Happy", 'excited': "Excited", 'calm': "Calm", 'sad': "Sad",
+        'anxious': "Anxious", 'stressed': "Stressed", 'angry': "Frustrated",
+        'confused': "Confused", 'hopeless': "Overwhelmed"
+    }
+    
+    text_model = get_text_emotion_model()
+    if text_model:
+        prediction = text_model.analyze(message)
+        label = prediction['primary_emotion']
+        polarity = prediction['sentiment_score']
+        confidence = prediction['confidence']
+        keywords = [term.capitalize() for term in text_model.top_terms(message, label)]
+    else:
+        label, polarity, confidence, keywords = 'neutral', 0.0, 0.3, []
+    
     # Determine sentiment and emotion
-    if positive_count > negative_count:
+    if polarity > 0.2:
         sentiment = "positive"
-        confidence = min(0.7 + positive_count * 0.05, 0.95)
-        if 'excited' in message_lower or 'thrilled' in message_lower:
-            emotion = "Excited"
-        elif 'calm' in message_lower or 'peaceful' in message_lower:
-            emotion = "Calm"
-        elif 'confident' in message_lower or 'proud' in message_lower:
-            emotion = "Confident"
-        else:
-            emotion = "Happy"
-    elif negative_count > positive_count or stress_count > 0:
+    elif polarity < -0.2 or stress_count > 0:
         sentiment = "negative"
-        confidence = min(0.7 + negative_count * 0.05, 0.95)
-        if 'anxious' in message_lower or 'nervous' in message_lower:
-            emotion = "Anxious"
-        elif 'stressed' in message_lower or stress_count > 0:
-            emotion = "Stressed"
-        elif 'sad' in message_lower or 'depressed' in message_lower:
-            emotion = "Sad"
-        elif 'overwhelmed' in message_lower:
-            emotion = "Overwhelmed"
-        else:
-            emotion = "Concerned"
     else:
         sentiment = "neutral"
-        confidence = 0.75
-        if study_count > 0:
-            emotion = "Focused"
-        else:
-            emotion = "Thoughtful"
+    
+    if label in display_emotions:
+        emotion = display_emotions[label]
+    elif sentiment == "negative":
+        emotion = "Stressed" if stress_count > 0 else "Concerned"
+    else:
+        emotion = "Focused" if study_count > 0 else "Thoughtful"
     
     # Extract relevant keywords
-    keywords = []
-    all_emotional_words = positive_words + negative_words + study_words + stress_words
-    for word in all_emotional_words:
-        if word in message_lower:
-            keywords.append(word.capitalize())
+    keywords += [word.capitalize() for word in study_words + stress_words if word in message_lower]
     
     # Generate contextual response
     response = generate_contextual_response(message_lower, sentiment, emotion, study_count > 0, stress_count > 0)
@@ -1343,41 +1567,7 @@ def sentiment_to_score(sentiment):
 def save_voice_conversation(user_id, user_message, ai_response, analysis_data):
     """Save voice conversation to database"""
     try:
-        conn = get_db_connection()
-        
-        # Create voice_conversations table if not exists
-        conn.execute('''
-            CREATE TABLE IF NOT EXISTS voice_conversations (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id TEXT NOT NULL,
-                user_message TEXT NOT NULL,
-                ai_response TEXT NOT NULL,
-                sentiment TEXT,
-                confidence REAL,
-                emotion TEXT,
-                keywords TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        # Insert conversation
-        conn.execute('''
-            INSERT INTO voice_conversations (
-                user_id, user_message, ai_response, sentiment, confidence, emotion, keywords
-            ) VALUES (?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            user_id,
-            user_message,
-            ai_response,
-            analysis_data.get('sentiment', 'neutral'),
-            analysis_data.get('confidence', 0.7),
-            analysis_data.get('emotion', 'Neutral'),
-            json.dumps(analysis_data.get('keywords', []))
-        ))
-        
-        conn.commit()
-        conn.close()
-        
+        emotion_repository.save_voice_conversation(user_id, user_message, ai_response, analysis_data)
     except Exception as e:
         logger.error(f"Error saving voice conversation: {e}")
 
@@ -1599,17 +1789,28 @@ def report_bullying():
         
         # Save anonymous report (no personal identification)
         conn = get_db_connection()
-        conn.execute('''
+        cursor = conn.execute('''
             INSERT INTO bullying_reports (anonymous_id, report_data, ai_response, crisis_level, timestamp)
             VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
         ''', (
             report_data['anonymous_id'],
-            json.dumps(report_data),
-            json.dumps(support_plan),
+            blob_codec.encode(json.dumps(report_data)),
+            blob_codec.encode(json.dumps(support_plan)),
             crisis_analysis.get('risk_level', 'low')
         ))
+        # Flagged reports reach counsellors (still anonymous: no user id, no report text)
+        feed_event = None
+        if crisis_analysis.get('risk_level', 'low') in FLAGGED_REPORT_LEVELS:
+            feed_event = counsellor_feed.append(conn, 'bullying_report', cursor.lastrowid, session.get('user_id'), {
+                'anonymous_id': report_data['anonymous_id'],
+                'crisis_level': crisis_analysis['risk_level'],
+                'incident_type': report_data['incident_type'],
+                'severity': report_data['severity'],
+                'needs_immediate_support': report_data['needs_immediate_support']
+            })
         conn.commit()
         conn.close()
+        counsellor_feed.broadcast(feed_event)
         
         return jsonify({
             'status': 'success',
@@ -1717,8 +1918,8 @@ def voice_navigation():
         
         navigation_response = gemini_text(navigation_prompt)
         
-        # Check for distress in voice command
-        if any(word in voice_command.lower() for word in ['help', 'emergency', 'crisis', 'hurt', 'suicide', 'scared']):
+        # Check for distress in voice command (whole words, English/Hindi/Hinglish, negations ignored)
+        if crisis_detector.lexicon.contains(voice_command):
             crisis_analysis = crisis_detector.analyze_text(voice_command)
             
             return jsonify({
@@ -3146,6 +3347,7 @@ def googlefit_callback():
                         existing_user_id = file.replace('googlefit_', '').replace('.json', '')
                         if google_fit.get_credentials(existing_user_id):
                             user_id = existing_user_id
+                            regenerate_session_id(session)
                             session['user_id'] = user_id  # Update session
                             logger.info(f"Using existing credentials for user {user_id}")
                             break
@@ -3308,6 +3510,7 @@ def get_googlefit_snapshot():
                         existing_user_id = file.replace('googlefit_', '').replace('.json', '')
                         if google_fit.get_credentials(existing_user_id):
                             user_id = existing_user_id
+                            regenerate_session_id(session)
                             session['user_id'] = user_id  # Update session
                             logger.info(f"Using existing credentials for user {user_id}")
                             break
@@ -3370,6 +3573,7 @@ def get_googlefit_status():
                         existing_user_id = file.replace('googlefit_', '').replace('.json', '')
                         if google_fit.get_credentials(existing_user_id):
                             user_id = existing_user_id
+                            regenerate_session_id(session)
                             session['user_id'] = user_id  # Update session
                             logger.info(f"Using existing credentials for user {user_id}")
                             break
@@ -3407,7 +3611,11 @@ def get_googlefit_status():
 
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 5000))
-    app.run(debug=False, host='0.0.0.0', port=port)
+    crisis_outbox.ensure_running()
+    if socketio is not None:
+        socketio.run(app, debug=False, host='0.0.0.0', port=port, allow_unsafe_werkzeug=True)
+    else:
+        app.run(debug=False, host='0.0.0.0', port=port)
 @app.route('/api/googlefit/debug')
 def debug_google_fit():
     """Debug endpoint to check Google Fit integration status"""
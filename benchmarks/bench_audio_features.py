@@ -0,0 +1,87 @@
+# 🧠 Manas: Audio Feature Benchmark
+# Per-second-of-audio cost of the legacy per-call extractor vs the shared-STFT pipeline
+#
+# Usage: python -m benchmarks.bench_audio_features [--seconds 10] [--repeat 5] [--file clip.wav]
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import librosa
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.audio_features import extract_audio_features  # noqa: E402
+
+
+def legacy_extract_audio_features(y: np.ndarray, sr: int) -> dict:
+    """The previous extractor: every feature runs its own STFT, plus beat tracking"""
+    features = {}
+    pitches, magnitudes = librosa.piptrack(y=y, sr=sr)
+    pitch_values = pitches[magnitudes > np.percentile(magnitudes, 85)]
+    features['pitch_mean'] = np.mean(pitch_values) if len(pitch_values) > 0 else 0
+    features['pitch_variation'] = np.std(pitch_values) if len(pitch_values) > 0 else 0
+    features['energy'] = np.mean(librosa.feature.rms(y=y)[0])
+    features['spectral_centroid'] = np.mean(librosa.feature.spectral_centroid(y=y, sr=sr)[0])
+    features['spectral_rolloff'] = np.mean(librosa.feature.spectral_rolloff(y=y, sr=sr)[0])
+    tempo, _ = librosa.beat.beat_track(y=y, sr=sr)
+    features['tempo'] = tempo
+    features['zcr'] = np.mean(librosa.feature.zero_crossing_rate(y)[0])
+    mfccs = librosa.feature.mfcc(y=y, sr=sr, n_mfcc=13)
+    for i in range(13):
+        features[f'mfcc_{i}'] = np.mean(mfccs[i])
+    return features
+
+
+def synthetic_voice(seconds: float, sr: int) -> np.ndarray:
+    """Pitch-modulated harmonic signal with noise, roughly speech-like in spectrum"""
+    t = np.arange(int(seconds * sr)) / sr
+    f0 = 160 + 30 * np.sin(2 * np.pi * 0.5 * t)
+    phase = 2 * np.pi * np.cumsum(f0) / sr
+    y = sum(np.sin(k * phase) / k for k in range(1, 6))
+    y *= 0.5 + 0.5 * np.abs(np.sin(2 * np.pi * 3 * t))
+    y += 0.02 * np.random.default_rng(0).standard_normal(len(t))
+    return (y / np.max(np.abs(y))).astype(np.float32)
+
+
+def time_per_audio_second(fn, y: np.ndarray, sr: int, repeat: int) -> float:
+    fn(y, sr)  # warm caches (mel filterbanks, numba JIT)
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(y, sr)
+        best = min(best, time.perf_counter() - start)
+    return best / (len(y) / sr) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark voice emotion feature extraction')
+    parser.add_argument('--seconds', type=float, default=10.0, help='Length of synthetic audio')
+    parser.add_argument('--repeat', type=int, default=5, help='Timed runs per variant (best is reported)')
+    parser.add_argument('--file', help='Benchmark a real audio file instead of synthetic audio')
+    args = parser.parse_args()
+
+    sr = 22050
+    if args.file:
+        y, sr = librosa.load(args.file, sr=sr)
+    else:
+        y = synthetic_voice(args.seconds, sr)
+
+    variants = [
+        ('legacy (per-call STFT + beat_track)', legacy_extract_audio_features),
+        ('shared STFT', lambda y, sr: extract_audio_features(y, sr, include_tempo=False)),
+        ('shared STFT + tempo', lambda y, sr: extract_audio_features(y, sr, include_tempo=True)),
+    ]
+
+    print(f"Audio: {len(y) / sr:.1f}s @ {sr} Hz, best of {args.repeat}")
+    baseline = None
+    for name, fn in variants:
+        ms = time_per_audio_second(fn, y, sr, args.repeat)
+        baseline = baseline or ms
+        print(f"  {name:<38} {ms:8.2f} ms per audio second  ({baseline / ms:4.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+# 🧠 Manas: Crisis Lexicon Benchmark
+# Per-message cost of the legacy per-keyword substring scan vs the compiled lexicon, plus known false hits
+#
+# Usage: python -m benchmarks.bench_crisis_lexicon [--messages 2000] [--words 60] [--repeat 5]
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.crisis_lexicon import SCORED_CATEGORIES, get_crisis_lexicon  # noqa: E402
+
+LEGACY_WEIGHTS = {'high_risk': 0.3, 'moderate_risk': 0.1, 'warning_signs': 0.2}
+
+FILLER = ('today', 'class', 'exam', 'friends', 'home', 'feel', 'really', 'was', 'and', 'the', 'my',
+          'mom', 'talked', 'about', 'school', 'kal', 'bahut', 'accha', 'tha', 'दोस्त', 'घर')
+
+# Sentences the substring scan flags although nothing in them is a crisis term
+FALSE_HITS = (
+    'I jumped for joy when the results came out',
+    'We hung out at the shopping mall after the finals',
+    'Our team finalised the project, shotgun the front seat',
+    'That was a hangover from last semester',
+)
+
+
+def legacy_score(text: str, keywords) -> float:
+    """The previous scan: one substring search per keyword, no word boundaries"""
+    text_lower = text.lower()
+    score = 0.0
+    for category, weight in LEGACY_WEIGHTS.items():
+        for keyword in keywords[category]:
+            if keyword in text_lower:
+                score += weight
+    return score
+
+
+def synthetic_messages(count: int, words: int, terms) -> list:
+    rng = random.Random(7)
+    messages = []
+    for _ in range(count):
+        tokens = [rng.choice(FILLER) for _ in range(words)]
+        if rng.random() < 0.2:
+            tokens.insert(rng.randrange(words), rng.choice(terms))
+        messages.append(' '.join(tokens))
+    return messages
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark crisis keyword scanning')
+    parser.add_argument('--messages', type=int, default=2000, help='Messages per run')
+    parser.add_argument('--words', type=int, default=60, help='Words per message')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per implementation (best is reported)')
+    args = parser.parse_args()
+
+    lexicon = get_crisis_lexicon()
+    keywords = {category: [t.lower() for t in lexicon.terms[category]] for category in SCORED_CATEGORIES}
+    messages = synthetic_messages(args.messages, args.words, [t for c in SCORED_CATEGORIES for t in keywords[c]])
+
+    def best_of(fn) -> float:
+        times = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            for message in messages:
+                fn(message)
+            times.append(time.perf_counter() - start)
+        return min(times) / len(messages) * 1e6
+
+    legacy = best_of(lambda m: legacy_score(m, keywords))
+    compiled = best_of(lambda m: lexicon.score(lexicon.scan(m)))
+    print(f"{args.messages} messages x {args.words} words, {sum(len(v) for v in keywords.values())} scored terms")
+    print(f"  legacy substring scan  {legacy:8.1f} µs/message")
+    print(f"  compiled lexicon       {compiled:8.1f} µs/message   ({legacy / compiled:.1f}x)")
+
+    print("False hits (legacy score -> lexicon score):")
+    for sentence in FALSE_HITS:
+        print(f"  {legacy_score(sentence, keywords):.1f} -> {lexicon.score(lexicon.scan(sentence)):.1f}   {sentence}")
+
+
+if __name__ == '__main__':
+    main()
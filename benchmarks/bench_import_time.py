@@ -0,0 +1,82 @@
+# 🧠 Manas: Import-Time Benchmark
+# Boot cost of `import app` from `python -X importtime`, with the heaviest modules and warmup cost
+#
+# Usage: python -m benchmarks.bench_import_time [--target app] [--top 20] [--warmup] [--repeat 3]
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# "import time:  self [us] | cumulative | imported package"
+IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S.*)$')
+
+# Modules that should no longer be imported at boot
+HEAVY_MODULES = ('cv2', 'mediapipe', 'librosa', 'soundfile', 'sklearn', 'google.generativeai',
+                 'spotipy', 'google.cloud.vision', 'tensorflow')
+
+
+def run_importtime(target: str, warmup: bool = False) -> Tuple[str, float]:
+    """Import ``target`` in a fresh interpreter; returns (-X importtime stderr, wall seconds)"""
+    code = f"import time; t = time.perf_counter(); import {target}; "
+    if warmup:
+        code += f"getattr({target}, 'warmup_app', lambda: None)(); "
+    code += "print(time.perf_counter() - t)"
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=ROOT,
+                          capture_output=True, text=True, env=dict(os.environ, WARMUP_ON_BOOT='false'))
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else 'import failed')
+    return proc.stderr, float(proc.stdout.strip().splitlines()[-1])
+
+
+def parse_importtime(report: str) -> Dict[str, Tuple[int, int]]:
+    """module -> (self us, cumulative us); top-level packages aggregate their submodules"""
+    modules: Dict[str, Tuple[int, int]] = {}
+    for line in report.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, _, name = match.groups()
+            modules[name.strip()] = (int(self_us), int(cumulative_us))
+    return modules
+
+
+def by_package(modules: Dict[str, Tuple[int, int]]) -> List[Tuple[str, int]]:
+    """Self time summed per top-level package, largest first"""
+    totals: Dict[str, int] = defaultdict(int)
+    for name, (self_us, _) in modules.items():
+        totals[name.split('.')[0]] += self_us
+    return sorted(totals.items(), key=lambda item: item[1], reverse=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Profile import time of the app')
+    parser.add_argument('--target', default='app', help='Module to import (default: app)')
+    parser.add_argument('--top', type=int, default=20, help='Packages to list')
+    parser.add_argument('--repeat', type=int, default=3, help='Fresh interpreters per measurement (best is reported)')
+    parser.add_argument('--warmup', action='store_true', help='Also time import + warmup_app()')
+    args = parser.parse_args()
+
+    runs = [run_importtime(args.target) for _ in range(args.repeat)]
+    report, wall = min(runs, key=lambda run: run[1])
+    modules = parse_importtime(report)
+
+    print(f"import {args.target}: {wall:.2f}s wall (best of {args.repeat}), {len(modules)} modules")
+    print(f"\n  {'package':<32} {'self ms':>9}")
+    for package, self_us in by_package(modules)[:args.top]:
+        print(f"  {package:<32} {self_us / 1000:9.1f}")
+
+    loaded = [name for name in HEAVY_MODULES if name in modules]
+    print(f"\nHeavy modules imported at boot: {', '.join(loaded) if loaded else 'none'}")
+
+    if args.warmup:
+        warm = min(run_importtime(args.target, warmup=True)[1] for _ in range(args.repeat))
+        print(f"import {args.target} + warmup_app(): {warm:.2f}s wall")
+
+
+if __name__ == '__main__':
+    main()
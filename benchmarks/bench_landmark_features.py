@@ -0,0 +1,96 @@
+# 🧠 Manas: Landmark Feature Benchmark
+# Per-face cost of the legacy per-helper landmark analysis vs the vectorized batch path
+#
+# Usage: python -m benchmarks.bench_landmark_features [--faces 64] [--repeat 5]
+
+import argparse
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.landmark_features import (  # noqa: E402
+    NUM_LANDMARKS, analyze_landmarks_batch, landmarks_to_array
+)
+
+
+def _ear(landmarks, idx):
+    p = landmarks[idx]
+    h = np.linalg.norm(p[0] - p[3])
+    return (np.linalg.norm(p[1] - p[5]) + np.linalg.norm(p[2] - p[4])) / (2.0 * h) if h > 0 else 0.25
+
+
+def _brow(landmarks, idx):
+    return np.mean(landmarks[33:40, 1]) - np.mean(landmarks[idx][:, 1])
+
+
+def legacy_analysis(landmarks: np.ndarray) -> dict:
+    """The previous per-face path: one helper call (and gather) per feature"""
+    mouth = [61, 84, 17, 314, 405, 320, 307, 375, 321, 308, 324, 318]
+    left_ear = _ear(landmarks, [33, 7, 163, 144, 145, 153])
+    right_ear = _ear(landmarks, [362, 382, 381, 380, 374, 373])
+    m = landmarks[mouth]
+    h = np.linalg.norm(m[0] - m[6])
+    mouth_ar = (np.linalg.norm(m[2] - m[6]) + np.linalg.norm(m[3] - m[7]) + np.linalg.norm(m[4] - m[8])) / (3.0 * h)
+    curvature = (m[0][1] + m[6][1]) / 2 - (m[3][1] + m[9][1]) / 2
+    brow = (_brow(landmarks, [70, 63, 105, 66]) + _brow(landmarks, [296, 334, 293, 300])) / 2
+    ear = (left_ear + right_ear) / 2
+    scores = {
+        'happy': max(0, min(100, curvature * 60 + (1 - ear) * 40)),
+        'sad': max(0, min(100, (1 - curvature) * 50 + (1 - ear) * 30 + (1 - brow) * 20)),
+        'surprised': max(0, min(100, ear * 40 + mouth_ar * 35 + brow * 25)),
+        'angry': max(0, min(100, (1 - ear) * 35 + (1 - curvature) * 30 + brow * 35)),
+        'neutral': max(0, min(100, 100 - abs(curvature - 0.5) * 80 - abs(ear - 0.4) * 60)),
+        'anxious': max(0, min(100, (1 - ear) * 40 + brow * 45 + mouth_ar * 15)),
+    }
+    return {'primary_emotion': max(scores, key=scores.get), 'emotions_breakdown': scores}
+
+
+def fake_mesh_result(rng) -> SimpleNamespace:
+    """Object shaped like ``results.multi_face_landmarks[0]``"""
+    points = rng.random((NUM_LANDMARKS, 3))
+    return SimpleNamespace(landmark=[SimpleNamespace(x=x, y=y, z=z) for x, y, z in points])
+
+
+def best_of(fn, repeat: int) -> float:
+    fn()
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark facial landmark feature extraction')
+    parser.add_argument('--faces', type=int, default=64, help='Faces per batch (e.g. video frames)')
+    parser.add_argument('--repeat', type=int, default=5, help='Timed runs per variant (best is reported)')
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    meshes = [fake_mesh_result(rng) for _ in range(args.faces)]
+    arrays = [landmarks_to_array(mesh) for mesh in meshes]
+
+    variants = [
+        ('list comprehension + per-helper', lambda: [legacy_analysis(np.array([[lm.x, lm.y, lm.z] for lm in m.landmark]))
+                                                    for m in meshes]),
+        ('fromiter + per-face vectorized', lambda: [analyze_landmarks_batch([landmarks_to_array(m)]) for m in meshes]),
+        ('fromiter + one batch', lambda: analyze_landmarks_batch([landmarks_to_array(m) for m in meshes])),
+        ('features only, one batch', lambda: analyze_landmarks_batch(arrays)),
+    ]
+
+    print(f"{args.faces} faces x {NUM_LANDMARKS} landmarks, best of {args.repeat}")
+    baseline = None
+    for name, fn in variants:
+        us = best_of(fn, args.repeat) / args.faces * 1e6
+        baseline = baseline or us
+        print(f"  {name:<34} {us:9.1f} us per face  ({baseline / us:4.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
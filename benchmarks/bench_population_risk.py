@@ -0,0 +1,72 @@
+# 🧠 Manas: Population Risk Benchmark
+# Scoring time of the nightly re-scoring job over synthetic per-user rollups
+#
+# Usage: python -m benchmarks.bench_population_risk [--users 100000] [--repeat 3] [--db manas_wellness.db]
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.population_risk import PopulationRiskJob, score_population  # noqa: E402
+
+
+def synthetic_rollups(users: int, now: float, seed: int = 7) -> pd.DataFrame:
+    """Rollups shaped like load_rollups output, with gaps where users have no data for a source"""
+    rng = np.random.default_rng(seed)
+
+    def sparse(values: np.ndarray, present: float) -> np.ndarray:
+        return np.where(rng.random(users) < present, values, np.nan)
+
+    baseline_entries = rng.poisson(6, users).astype(float)
+    frame = pd.DataFrame({
+        'journal_sentiment_recent': sparse(rng.beta(5, 4, users), 0.5),
+        'journal_sentiment_baseline': sparse(rng.beta(5, 4, users), 0.6),
+        'journal_entries_recent': rng.poisson(2, users).astype(float),
+        'journal_entries_baseline': baseline_entries,
+        'journal_negative_recent': sparse(rng.beta(2, 6, users), 0.5),
+        'days_since_journal': sparse(rng.exponential(5, users), 0.7),
+        'voice_negative_recent': sparse(rng.beta(2, 5, users), 0.3),
+        'voice_negative_baseline': sparse(rng.beta(2, 5, users), 0.3),
+        'checkins_recent': rng.poisson(3, users).astype(float),
+        'checkins_baseline': rng.poisson(12, users).astype(float),
+        'ewma': sparse(rng.beta(2, 6, users), 0.8),
+        'peak': sparse(rng.beta(3, 4, users), 0.8),
+        'window_start': now - rng.uniform(0, 14 * 86400, users),
+        'window_count': rng.poisson(1, users).astype(float),
+        'previous_window_count': rng.poisson(1, users).astype(float),
+        'last_crisis_at': sparse(now - rng.uniform(0, 60 * 86400, users), 0.05),
+        'updated_at': now - rng.uniform(0, 30 * 86400, users)
+    }, index=pd.Index([f"user_{i}" for i in range(users)], name='user_id'))
+    return frame
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the population risk scoring pass')
+    parser.add_argument('--users', type=int, default=100000, help='Synthetic users to score')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs (best is reported)')
+    parser.add_argument('--db', help='Also run the full job (dry run) against this database')
+    args = parser.parse_args()
+
+    now = time.time()
+    frame = synthetic_rollups(args.users, now)
+    times = []
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        scored = score_population(frame, now)
+        times.append(time.perf_counter() - start)
+    print(f"{args.users} users: scored in {min(times):.3f}s, {int(scored['flagged'].sum())} flagged")
+
+    if args.db:
+        summary = PopulationRiskJob(args.db).run(dry_run=True)
+        print(f"Full job on {args.db}: {summary['users']} users, load {summary['load_seconds']}s, "
+              f"score {summary['score_seconds']}s, {summary['flagged']} flagged")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+# 🧠 Manas: Worker Memory Benchmark
+# Private (unshared) memory per worker with a preloading master vs workers that import the app themselves
+#
+# Usage: python -m benchmarks.bench_worker_memory [--workers 3] [--warmup]   (Linux only)
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from typing import Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def memory_kb() -> Dict[str, int]:
+    """Rss / Pss / private memory of this process from /proc/self/smaps_rollup, in kB"""
+    fields = {}
+    with open('/proc/self/smaps_rollup') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 2 and parts[0].endswith(':') and parts[1].isdigit():
+                fields[parts[0][:-1]] = int(parts[1])
+    return {
+        'rss': fields.get('Rss', 0),
+        'pss': fields.get('Pss', 0),
+        'private': fields.get('Private_Clean', 0) + fields.get('Private_Dirty', 0)
+    }
+
+
+def preloaded_workers(count: int, warm: bool) -> List[Dict[str, int]]:
+    """Import the app once, freeze, then fork ``count`` workers like gunicorn --preload"""
+    import gc
+    gc.disable()
+    import app
+    from utils.preload import prepare_for_fork
+
+    app.warmup_app(fork_safe_only=True)
+    prepare_for_fork()
+
+    readers, pids = [], []
+    for _ in range(count):
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_fd)
+            gc.enable()
+            app.init_worker()
+            if warm:
+                app.warmup_app()
+            with os.fdopen(write_fd, 'w') as out:
+                out.write(json.dumps(memory_kb()))
+            os._exit(0)
+        os.close(write_fd)
+        readers.append(read_fd)
+        pids.append(pid)
+
+    results = []
+    for read_fd, pid in zip(readers, pids):
+        with os.fdopen(read_fd) as f:
+            results.append(json.loads(f.read()))
+        os.waitpid(pid, 0)
+    return results
+
+
+def independent_workers(count: int, warm: bool) -> List[Dict[str, int]]:
+    """Workers that each import the app in a fresh interpreter (no preload)"""
+    code = (
+        "import json, app\n"
+        + ("app.warmup_app()\n" if warm else "")
+        + "from benchmarks.bench_worker_memory import memory_kb\n"
+        + "print(json.dumps(memory_kb()))"
+    )
+    procs = [subprocess.Popen([sys.executable, '-c', code], cwd=ROOT, stdout=subprocess.PIPE, text=True)
+             for _ in range(count)]
+    return [json.loads(proc.communicate()[0].strip().splitlines()[-1]) for proc in procs]
+
+
+def summarize(name: str, results: List[Dict[str, int]]):
+    avg = {key: sum(r[key] for r in results) / len(results) / 1024 for key in ('rss', 'pss', 'private')}
+    print(f"  {name:<22} rss {avg['rss']:8.1f} MB   pss {avg['pss']:8.1f} MB   private {avg['private']:8.1f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare per-worker memory with and without preloading')
+    parser.add_argument('--workers', type=int, default=3, help='Workers to start per mode')
+    parser.add_argument('--warmup', action='store_true', help='Build all components in each worker')
+    args = parser.parse_args()
+
+    if not os.path.exists('/proc/self/smaps_rollup'):
+        sys.exit('smaps_rollup not available (Linux only)')
+
+    os.environ.setdefault('WARMUP_ON_BOOT', 'false')
+    print(f"{args.workers} workers per mode, per-worker averages (private = memory not shared with any process)")
+    summarize('independent imports', independent_workers(args.workers, args.warmup))
+    summarize('preload + fork', preloaded_workers(args.workers, args.warmup))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+# 🧠 Manas: Gunicorn Configuration
+# Preloading master shares imported code and frozen tables copy-on-write; per-worker state is built after fork
+#
+# Usage: gunicorn -c gunicorn.conf.py app:app
+
+import gc
+import importlib.util
+import os
+
+
+def _flag(name: str, default: str) -> bool:
+    return os.environ.get(name, default).lower() in ('1', 'true', 'yes')
+
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
+
+# Socket.IO (voice stream, crisis updates, counsellor feed) with more than one worker
+# needs two things gunicorn cannot provide on its own:
+#   - SOCKETIO_MESSAGE_QUEUE (e.g. redis://...), so an emit from one worker reaches
+#     clients connected to another;
+#   - sticky sessions, because a long-polling client must reach the worker holding its
+#     Socket.IO session: run behind a load balancer with session affinity (one gunicorn
+#     per worker), or have clients connect with transports=['websocket'] only.
+# Hence one worker by default when Socket.IO is installed, and no start with several
+# workers and no message queue.
+SOCKETIO_ENABLED = importlib.util.find_spec('flask_socketio') is not None
+workers = int(os.environ.get('WEB_CONCURRENCY', 1 if SOCKETIO_ENABLED else 2))
+if SOCKETIO_ENABLED and workers > 1 and not os.environ.get('SOCKETIO_MESSAGE_QUEUE'):
+    raise RuntimeError(
+        f"WEB_CONCURRENCY={workers} with Socket.IO requires SOCKETIO_MESSAGE_QUEUE (and sticky sessions "
+        "or websocket-only clients); set WEB_CONCURRENCY=1 or configure a message queue"
+    )
+# Threaded workers: needed for the Socket.IO voice stream (threading async mode); with a single
+# worker, concurrency comes from its threads
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', 8 if workers == 1 else 4))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 120))
+
+# Import app.py once in the master; workers inherit it through fork
+preload_app = _flag('GUNICORN_PRELOAD', 'true')
+
+if preload_app:
+    # No collections while the master loads: they would only fragment the
+    # heap that workers are about to share (re-enabled in post_fork)
+    gc.disable()
+
+
+def when_ready(server):
+    """Master, after app.py is imported and before the first fork"""
+    if not preload_app:
+        return
+    from app import warmup_app, WARMUP_ON_BOOT
+    from utils.preload import prepare_for_fork
+
+    if not WARMUP_ON_BOOT:
+        # app.py already did this at import when WARMUP_ON_BOOT is set
+        warmup_app(fork_safe_only=True)
+    prepare_for_fork()
+
+
+def pre_fork(server, worker):
+    """Master, before each fork (including replacements for dead workers)"""
+    if preload_app:
+        gc.freeze()
+
+
+def post_fork(server, worker):
+    """New worker: re-enable GC and create process-local resources"""
+    if not preload_app:
+        return
+    gc.enable()
+    from app import init_worker
+    init_worker()
+    server.log.info(f"Worker {worker.pid} initialized ({gc.get_freeze_count()} objects shared from master)")
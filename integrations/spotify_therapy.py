@@ -10,9 +10,137 @@ from flask import session
 import logging
 from dotenv import load_dotenv
 
+from utils.preload import freeze
+
 # Load environment variables
 load_dotenv()
 
+# Lookup tables are module-level and frozen: built once (in the gunicorn
+# master with preload) instead of as dict literals on every call
+
+# Mood -> Spotify audio features and search terms
+MOOD_MAPPING = freeze({
+    'anxious': {'valence': 0.3, 'energy': 0.2, 'search_terms': ['anxiety relief', 'calming music', 'meditation']},
+    'depressed': {'valence': 0.4, 'energy': 0.3, 'search_terms': ['healing music', 'uplifting gentle', 'emotional support']},
+    'stressed': {'valence': 0.5, 'energy': 0.4, 'search_terms': ['stress relief', 'relaxation', 'peaceful']},
+    'angry': {'valence': 0.2, 'energy': 0.8, 'search_terms': ['anger management', 'cooling down', 'peaceful']},
+    'happy': {'valence': 0.8, 'energy': 0.7, 'search_terms': ['happy music', 'uplifting', 'positive vibes']},
+    'calm': {'valence': 0.6, 'energy': 0.3, 'search_terms': ['calm music', 'peaceful', 'meditation']},
+    'energetic': {'valence': 0.8, 'energy': 0.9, 'search_terms': ['energetic', 'upbeat', 'motivational']},
+    'sad': {'valence': 0.2, 'energy': 0.2, 'search_terms': ['sad music', 'melancholy', 'emotional']},
+    'focused': {'valence': 0.5, 'energy': 0.4, 'search_terms': ['focus music', 'concentration', 'study']},
+    'motivated': {'valence': 0.8, 'energy': 0.8, 'search_terms': ['motivational', 'workout', 'energizing']}
+})
+
+# Therapeutic benefit of a track per mood
+THERAPY_BENEFITS = freeze({
+    'anxious': 'Promotes relaxation and reduces anxiety',
+    'depressed': 'Uplifts mood and provides emotional support',
+    'stressed': 'Helps with stress relief and mindfulness',
+    'angry': 'Channels emotions constructively',
+    'calm': 'Maintains peaceful state of mind',
+    'sad': 'Provides comfort and emotional processing'
+})
+
+# Therapy focus description per mood
+THERAPY_FOCUS = freeze({
+    'anxious': 'Anxiety reduction through calming melodies',
+    'depressed': 'Mood elevation through uplifting rhythms',
+    'stressed': 'Stress relief through mindful listening',
+    'angry': 'Emotional regulation through music therapy',
+    'calm': 'Mindfulness enhancement through ambient sounds',
+    'sad': 'Emotional processing through therapeutic music'
+})
+
+# Crisis-specific music parameters
+CRISIS_PARAMS = freeze({
+    'high': {
+        'valence': 0.1, 'energy': 0.1, 'tempo': '60-70',
+        'genres': ['ambient', 'new-age', 'classical'],
+        'keywords': ['healing', 'calm', 'peace', 'meditation']
+    },
+    'medium': {
+        'valence': 0.3, 'energy': 0.2, 'tempo': '70-80',
+        'genres': ['instrumental', 'acoustic', 'folk'],
+        'keywords': ['comfort', 'gentle', 'soothing']
+    },
+    'low': {
+        'valence': 0.5, 'energy': 0.3, 'tempo': '80-90',
+        'genres': ['indie', 'alternative', 'pop'],
+        'keywords': ['hope', 'support', 'understanding']
+    }
+})
+
+# Sleep sequence phases, in playback order
+SLEEP_PHASES = freeze({
+    'relaxation': {  # 0-30 minutes
+        'valence': 0.3, 'energy': 0.2, 'tempo': '60-80',
+        'genres': ['ambient', 'classical', 'new-age']
+    },
+    'transition': {  # 30-60 minutes
+        'valence': 0.2, 'energy': 0.1, 'tempo': '50-70',
+        'genres': ['ambient', 'drone', 'minimalist']
+    },
+    'deep_sleep': {  # 60-90 minutes
+        'valence': 0.1, 'energy': 0.05, 'tempo': '40-60',
+        'genres': ['ambient', 'sound-healing', 'nature-sounds']
+    }
+})
+
+# Study music parameters per study type
+STUDY_MAPPING = freeze({
+    'concentration': {
+        'valence': 0.5, 'energy': 0.4, 'tempo': '70-90',
+        'genres': ['lo-fi', 'instrumental', 'classical'],
+        'keywords': ['focus', 'concentration', 'study', 'productivity']
+    },
+    'creative': {
+        'valence': 0.6, 'energy': 0.5, 'tempo': '80-100',
+        'genres': ['ambient', 'electronic', 'indie-folk'],
+        'keywords': ['creative', 'inspiration', 'flow', 'innovation']
+    },
+    'memory': {
+        'valence': 0.4, 'energy': 0.3, 'tempo': '60-80',
+        'genres': ['classical', 'baroque', 'minimalist'],
+        'keywords': ['memory', 'learning', 'retention', 'classical']
+    },
+    'exam_prep': {
+        'valence': 0.4, 'energy': 0.3, 'tempo': '50-70',
+        'genres': ['ambient', 'classical', 'meditation'],
+        'keywords': ['calm', 'confidence', 'clarity', 'focus']
+    }
+})
+
+# Cultural healing music parameters
+CULTURAL_MAPPING = freeze({
+    'indian': {
+        'instruments': ['sitar', 'tabla', 'flute', 'tanpura'],
+        'genres': ['classical', 'raga', 'devotional', 'meditation'],
+        'keywords': ['raga', 'healing', 'meditation', 'spiritual']
+    },
+    'chinese': {
+        'instruments': ['guzheng', 'erhu', 'dizi', 'pipa'],
+        'genres': ['traditional', 'meditation', 'healing'],
+        'keywords': ['traditional chinese', 'healing', 'meditation', 'zen']
+    },
+    'japanese': {
+        'instruments': ['koto', 'shamisen', 'shakuhachi'],
+        'genres': ['traditional', 'zen', 'meditation'],
+        'keywords': ['zen', 'meditation', 'traditional japanese', 'healing']
+    },
+    'western': {
+        'instruments': ['piano', 'violin', 'cello', 'harp'],
+        'genres': ['classical', 'new-age', 'acoustic'],
+        'keywords': ['classical', 'healing', 'therapeutic', 'peaceful']
+    },
+    'african': {
+        'instruments': ['djembe', 'kora', 'mbira', 'kalimba'],
+        'genres': ['traditional', 'world', 'healing'],
+        'keywords': ['african traditional', 'healing', 'rhythmic', 'spiritual']
+    }
+})
+
+
 class SpotifyMusicTherapy:
     def __init__(self):
         self.client_id = os.getenv('SPOTIFY_CLIENT_ID')
@@ -42,21 +170,7 @@ class SpotifyMusicTherapy:
             return self._get_fallback_playlist(mood)
         
         try:
-            # Map moods to Spotify audio features and search terms
-            mood_mapping = {
-                'anxious': {'valence': 0.3, 'energy': 0.2, 'search_terms': ['anxiety relief', 'calming music', 'meditation']},
-                'depressed': {'valence': 0.4, 'energy': 0.3, 'search_terms': ['healing music', 'uplifting gentle', 'emotional support']},
-                'stressed': {'valence': 0.5, 'energy': 0.4, 'search_terms': ['stress relief', 'relaxation', 'peaceful']},
-                'angry': {'valence': 0.2, 'energy': 0.8, 'search_terms': ['anger management', 'cooling down', 'peaceful']},
-                'happy': {'valence': 0.8, 'energy': 0.7, 'search_terms': ['happy music', 'uplifting', 'positive vibes']},
-                'calm': {'valence': 0.6, 'energy': 0.3, 'search_terms': ['calm music', 'peaceful', 'meditation']},
-                'energetic': {'valence': 0.8, 'energy': 0.9, 'search_terms': ['energetic', 'upbeat', 'motivational']},
-                'sad': {'valence': 0.2, 'energy': 0.2, 'search_terms': ['sad music', 'melancholy', 'emotional']},
-                'focused': {'valence': 0.5, 'energy': 0.4, 'search_terms': ['focus music', 'concentration', 'study']},
-                'motivated': {'valence': 0.8, 'energy': 0.8, 'search_terms': ['motivational', 'workout', 'energizing']}
-            }
-            
-            mood_params = mood_mapping.get(mood.lower(), mood_mapping['calm'])
+            mood_params = MOOD_MAPPING.get(mood.lower(), MOOD_MAPPING['calm'])
             
             # Use search instead of recommendations to avoid API issues
             playlist = []
@@ -245,27 +359,11 @@ class SpotifyMusicTherapy:
     
     def _get_therapy_benefit(self, mood, track):
         """Determine therapeutic benefit of track for specific mood"""
-        benefits = {
-            'anxious': 'Promotes relaxation and reduces anxiety',
-            'depressed': 'Uplifts mood and provides emotional support',
-            'stressed': 'Helps with stress relief and mindfulness',
-            'angry': 'Channels emotions constructively',
-            'calm': 'Maintains peaceful state of mind',
-            'sad': 'Provides comfort and emotional processing'
-        }
-        return benefits.get(mood.lower(), 'Supports overall mental wellness')
+        return THERAPY_BENEFITS.get(mood.lower(), 'Supports overall mental wellness')
     
     def _get_therapy_focus(self, mood):
         """Get therapy focus description"""
-        focus = {
-            'anxious': 'Anxiety reduction through calming melodies',
-            'depressed': 'Mood elevation through uplifting rhythms',
-            'stressed': 'Stress relief through mindful listening',
-            'angry': 'Emotional regulation through music therapy',
-            'calm': 'Mindfulness enhancement through ambient sounds',
-            'sad': 'Emotional processing through therapeutic music'
-        }
-        return focus.get(mood.lower(), 'General wellness support')
+        return THERAPY_FOCUS.get(mood.lower(), 'General wellness support')
     
     def _calculate_therapeutic_score(self, track):
         """Calculate how therapeutically beneficial a track might be"""
@@ -324,26 +422,7 @@ class SpotifyMusicTherapy:
             return self._get_crisis_fallback_playlist(crisis_level)
         
         try:
-            # Crisis-specific music parameters
-            crisis_params = {
-                'high': {
-                    'valence': 0.1, 'energy': 0.1, 'tempo': '60-70',
-                    'genres': ['ambient', 'new-age', 'classical'],
-                    'keywords': ['healing', 'calm', 'peace', 'meditation']
-                },
-                'medium': {
-                    'valence': 0.3, 'energy': 0.2, 'tempo': '70-80',
-                    'genres': ['instrumental', 'acoustic', 'folk'],
-                    'keywords': ['comfort', 'gentle', 'soothing']
-                },
-                'low': {
-                    'valence': 0.5, 'energy': 0.3, 'tempo': '80-90',
-                    'genres': ['indie', 'alternative', 'pop'],
-                    'keywords': ['hope', 'support', 'understanding']
-                }
-            }
-            
-            params = crisis_params.get(crisis_level, crisis_params['high'])
+            params = CRISIS_PARAMS.get(crisis_level, CRISIS_PARAMS['high'])
             tracks = []
             
             # Search for crisis intervention music
@@ -418,25 +497,10 @@ class SpotifyMusicTherapy:
             return self._get_sleep_fallback_sequence(sleep_goal)
         
         try:
-            sleep_phases = {
-                'relaxation': {  # 0-30 minutes
-                    'valence': 0.3, 'energy': 0.2, 'tempo': '60-80',
-                    'genres': ['ambient', 'classical', 'new-age']
-                },
-                'transition': {  # 30-60 minutes
-                    'valence': 0.2, 'energy': 0.1, 'tempo': '50-70',
-                    'genres': ['ambient', 'drone', 'minimalist']
-                },
-                'deep_sleep': {  # 60-90 minutes
-                    'valence': 0.1, 'energy': 0.05, 'tempo': '40-60',
-                    'genres': ['ambient', 'sound-healing', 'nature-sounds']
-                }
-            }
-            
             sequence_tracks = []
             phase_duration = sequence_length // 3  # Divide into 3 phases
             
-            for phase_name, phase_params in sleep_phases.items():
+            for phase_name, phase_params in SLEEP_PHASES.items():
                 phase_tracks = []
                 
                 # Search for phase-specific music
@@ -490,7 +554,7 @@ class SpotifyMusicTherapy:
                 'sleep_goal': sleep_goal,
                 'sequence_length_minutes': sequence_length,
                 'tracks': sequence_tracks,
-                'phases': list(sleep_phases.keys()),
+                'phases': list(SLEEP_PHASES.keys()),
                 'therapy_focus': 'Progressive sleep induction and deep rest',
                 'usage_instructions': 'Start 30 minutes before sleep. Use low volume.',
                 'source': 'spotify_sleep_therapy'
@@ -506,30 +570,7 @@ class SpotifyMusicTherapy:
             return self._get_study_fallback_playlist(study_type)
         
         try:
-            study_mapping = {
-                'concentration': {
-                    'valence': 0.5, 'energy': 0.4, 'tempo': '70-90',
-                    'genres': ['lo-fi', 'instrumental', 'classical'],
-                    'keywords': ['focus', 'concentration', 'study', 'productivity']
-                },
-                'creative': {
-                    'valence': 0.6, 'energy': 0.5, 'tempo': '80-100',
-                    'genres': ['ambient', 'electronic', 'indie-folk'],
-                    'keywords': ['creative', 'inspiration', 'flow', 'innovation']
-                },
-                'memory': {
-                    'valence': 0.4, 'energy': 0.3, 'tempo': '60-80',
-                    'genres': ['classical', 'baroque', 'minimalist'],
-                    'keywords': ['memory', 'learning', 'retention', 'classical']
-                },
-                'exam_prep': {
-                    'valence': 0.4, 'energy': 0.3, 'tempo': '50-70',
-                    'genres': ['ambient', 'classical', 'meditation'],
-                    'keywords': ['calm', 'confidence', 'clarity', 'focus']
-                }
-            }
-            
-            params = study_mapping.get(study_type, study_mapping['concentration'])
+            params = STUDY_MAPPING.get(study_type, STUDY_MAPPING['concentration'])
             tracks = []
             
             # Search for study music
@@ -598,35 +639,7 @@ class SpotifyMusicTherapy:
             return self._get_cultural_fallback_playlist(culture, healing_type)
         
         try:
-            cultural_mapping = {
-                'indian': {
-                    'instruments': ['sitar', 'tabla', 'flute', 'tanpura'],
-                    'genres': ['classical', 'raga', 'devotional', 'meditation'],
-                    'keywords': ['raga', 'healing', 'meditation', 'spiritual']
-                },
-                'chinese': {
-                    'instruments': ['guzheng', 'erhu', 'dizi', 'pipa'],
-                    'genres': ['traditional', 'meditation', 'healing'],
-                    'keywords': ['traditional chinese', 'healing', 'meditation', 'zen']
-                },
-                'japanese': {
-                    'instruments': ['koto', 'shamisen', 'shakuhachi'],
-                    'genres': ['traditional', 'zen', 'meditation'],
-                    'keywords': ['zen', 'meditation', 'traditional japanese', 'healing']
-                },
-                'western': {
-                    'instruments': ['piano', 'violin', 'cello', 'harp'],
-                    'genres': ['classical', 'new-age', 'acoustic'],
-                    'keywords': ['classical', 'healing', 'therapeutic', 'peaceful']
-                },
-                'african': {
-                    'instruments': ['djembe', 'kora', 'mbira', 'kalimba'],
-                    'genres': ['traditional', 'world', 'healing'],
-                    'keywords': ['african traditional', 'healing', 'rhythmic', 'spiritual']
-                }
-            }
-            
-            params = cultural_mapping.get(culture.lower(), cultural_mapping['western'])
+            params = CULTURAL_MAPPING.get(culture.lower(), CULTURAL_MAPPING['western'])
             tracks = []
             
             # Search for cultural healing music
@@ -0,0 +1,44 @@
+# 🧠 Manas: Analysis Worker Tests
+
+import os
+import subprocess
+import sys
+import textwrap
+
+import pytest
+
+pytest.importorskip('librosa')
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SHM_DIR = '/dev/shm'
+
+# Spawned workers re-import __main__, so the job runs from ``-c`` in a fresh interpreter;
+# the resource tracker reports problems on its own stderr, which only a child process captures
+AUDIO_JOB = textwrap.dedent('''
+    import numpy as np
+    from utils.analysis_workers import AnalysisWorkerPool
+
+    pool = AnalysisWorkerPool(1)
+    y = np.sin(np.linspace(0, 2 * np.pi * 220, 22050)).astype(np.float32)
+    for _ in range(2):
+        features = pool.audio_features(y, 22050)
+        assert features['energy'] > 0, features
+    pool.shutdown()
+    print('ok')
+''')
+
+
+def _shared_blocks():
+    return {name for name in os.listdir(SHM_DIR) if name.startswith('psm_')}
+
+
+@pytest.mark.skipif(not os.path.isdir(SHM_DIR), reason='needs POSIX shared memory')
+def test_offloaded_job_leaves_no_tracker_noise_or_blocks():
+    before = _shared_blocks()
+    result = subprocess.run([sys.executable, '-c', AUDIO_JOB], cwd=ROOT, capture_output=True, text=True,
+                            timeout=120, env=dict(os.environ, PYTHONPATH=ROOT))
+
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == 'ok'
+    assert 'Traceback' not in result.stderr and 'leaked' not in result.stderr, result.stderr
+    assert _shared_blocks() - before == set()
@@ -0,0 +1,84 @@
+# 🧠 Manas: Blob Codec Tests
+
+import json
+import sqlite3
+
+import pytest
+
+from utils.blob_codec import MAGIC, ZSTD_AVAILABLE, BlobCodec
+
+
+def _result(i: int) -> str:
+    return json.dumps({
+        'primary_emotion': ['happy', 'sad', 'anxious'][i % 3],
+        'emotion_intensity': i % 10,
+        'confidence': round(0.5 + (i % 5) / 10, 2),
+        'analysis_method': 'enhanced_mediapipe_gemini_fusion',
+        'recommendations': f'Take a short walk and talk to a friend about day {i}',
+    })
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / 'codec.db')
+    conn = sqlite3.connect(path)
+    conn.execute('CREATE TABLE emotional_states (id INTEGER PRIMARY KEY, emotion_data TEXT)')
+    conn.executemany('INSERT INTO emotional_states (emotion_data) VALUES (?)', [(_result(i),) for i in range(60)])
+    conn.commit()
+    conn.close()
+    return path
+
+
+@pytest.fixture
+def codec(db_path):
+    codec = BlobCodec(db_path)
+    codec.ensure_schema()
+    return codec
+
+
+def test_round_trip_without_dictionary(codec):
+    value = _result(1)
+    encoded = codec.encode(value)
+    assert isinstance(encoded, bytes) and encoded.startswith(MAGIC)
+    assert len(encoded) < len(value)
+    assert codec.decode(encoded) == value
+
+
+def test_small_and_missing_values_are_left_alone(codec):
+    assert codec.encode('{"a": 1}') == '{"a": 1}'
+    assert codec.encode(None) is None
+    assert codec.decode(None) is None
+
+
+def test_legacy_rows_decode_unchanged(codec):
+    value = _result(2)
+    # Text columns written before compression, and the same JSON read back as a BLOB
+    assert codec.decode(value) == value
+    assert codec.decode(value.encode('utf-8')) == value
+    assert codec.decode(memoryview(value.encode('utf-8'))) == value
+
+
+@pytest.mark.parametrize('use_zstd', [False, pytest.param(True, marks=pytest.mark.skipif(
+    not ZSTD_AVAILABLE, reason='zstandard not installed'))])
+def test_round_trip_with_trained_dictionary(codec, db_path, use_zstd):
+    before = codec.encode(_result(7))
+    dict_id = codec.train(use_zstd=use_zstd)
+    assert dict_id is not None
+
+    value = _result(7)
+    encoded = codec.encode(value)
+    assert codec.decode(encoded) == value
+    assert len(encoded) < len(before)
+    # Rows encoded before training still decode, as does a fresh process reading the stored dictionary
+    assert codec.decode(before) == value
+    assert BlobCodec(db_path).decode(encoded) == value
+
+
+def test_recompress_all_keeps_every_row(codec, db_path):
+    codec.train(use_zstd=False)
+    summary = codec.recompress_all(batch_size=16)
+    assert summary['emotional_states']['rows'] == 60
+    conn = sqlite3.connect(db_path)
+    stored = [row[0] for row in conn.execute('SELECT emotion_data FROM emotional_states ORDER BY id')]
+    conn.close()
+    assert [codec.decode(v) for v in stored] == [_result(i) for i in range(60)]
@@ -0,0 +1,50 @@
+# 🧠 Manas: Crisis Lexicon Tests
+
+import pytest
+
+from utils.crisis_lexicon import CATEGORY_WEIGHTS, get_crisis_lexicon
+
+
+@pytest.fixture(scope='module')
+def lexicon():
+    return get_crisis_lexicon()
+
+
+def _negated(lexicon, text, term):
+    return next(m.negated for m in lexicon.scan(text) if m.term == term)
+
+
+@pytest.mark.parametrize('text', [
+    'I dont know, I want to die',
+    'I do not care, I want to die',
+    'I want to die nahi',
+    'no I want to die',
+    'I never said I want to die',
+    'I am not ok and I want to die',
+    'not hopeless but I want to die',
+])
+def test_negation_does_not_cross_clauses_or_unrelated_words(lexicon, text):
+    assert not _negated(lexicon, text, 'want to die')
+    assert lexicon.analyze(text)['score'] >= CATEGORY_WEIGHTS['high_risk']
+
+
+@pytest.mark.parametrize('text, term', [
+    ("I don't want to die", 'want to die'),
+    ("I'm not going to kill myself", 'kill myself'),
+    ('not suicidal', 'suicidal'),
+    ("I don't feel hopeless", 'hopeless'),
+    ('main bekaar nahi hoon', 'bekaar'),
+    ('main akela bilkul nahi hoon', 'akela'),
+])
+def test_negation_of_the_governed_term(lexicon, text, term):
+    assert _negated(lexicon, text, term)
+
+
+def test_negated_high_risk_keeps_partial_weight(lexicon):
+    assert lexicon.analyze("I don't want to die")['score'] == pytest.approx(0.15)
+
+
+def test_terms_are_word_bounded(lexicon):
+    assert not lexicon.contains('I love the hangout spot near campus')
+    assert lexicon.contains('I want to hang myself')
+    assert lexicon.contains("I can’t go on")
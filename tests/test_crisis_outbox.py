@@ -0,0 +1,128 @@
+# 🧠 Manas: Crisis Outbox Tests
+
+import sqlite3
+
+import pytest
+
+from utils import crisis_outbox
+from utils.crisis_outbox import (
+    BACKOFF_BASE_SECONDS, BACKOFF_MAX_SECONDS, MAX_ATTEMPTS, STATUS_FAILED, STATUS_PENDING, STATUS_SENT,
+    STATUS_SUPPRESSED, CrisisOutbox, LogChannel, backoff_seconds
+)
+
+
+def _outbox(tmp_path, channel):
+    db_path = str(tmp_path / 'outbox.db')
+    conn = sqlite3.connect(db_path)
+    conn.execute('''
+        CREATE TABLE crisis_alerts (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id TEXT NOT NULL,
+            risk_level REAL,
+            alert_type TEXT,
+            intervention_taken TEXT,
+            resolved BOOLEAN DEFAULT FALSE,
+            timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    conn.commit()
+    conn.close()
+    outbox = CrisisOutbox(db_path, channels=[channel])
+    # Dispatch synchronously from the test instead of the background thread
+    outbox.ensure_running = lambda: None
+    return outbox
+
+
+@pytest.fixture
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(crisis_outbox, 'backoff_seconds', lambda attempts: 0.0)
+
+
+def test_alert_and_notification_are_written_together(tmp_path):
+    channel = LogChannel()
+    outbox = _outbox(tmp_path, channel)
+
+    alert_id = outbox.record_alert('u1', 0.9, 'emergency', {'immediate_actions': []})
+    assert alert_id is not None
+    assert [row['status'] for row in outbox.delivery_status(alert_id)] == [STATUS_PENDING]
+    assert channel.sent == []
+
+    assert outbox.dispatch_due() == 1
+    (status,) = outbox.delivery_status(alert_id)
+    assert (status['status'], status['attempts']) == (STATUS_SENT, 1)
+    assert channel.sent[0]['alert_id'] == alert_id
+    assert outbox.dispatch_due() == 0
+
+
+def test_failed_send_is_retried_until_delivered(tmp_path, no_backoff):
+    channel = LogChannel(fail_times=2)
+    outbox = _outbox(tmp_path, channel)
+    alert_id = outbox.record_alert('u1', 0.9, 'emergency', {})
+
+    outbox.dispatch_due()
+    (status,) = outbox.delivery_status(alert_id)
+    assert (status['status'], status['attempts']) == (STATUS_PENDING, 1)
+    assert 'Simulated delivery failure' in status['last_error']
+
+    outbox.dispatch_due()
+    outbox.dispatch_due()
+    (status,) = outbox.delivery_status(alert_id)
+    assert (status['status'], status['attempts'], status['last_error']) == (STATUS_SENT, 3, None)
+    assert len(channel.sent) == 1
+
+
+def test_retry_waits_for_backoff(tmp_path):
+    outbox = _outbox(tmp_path, LogChannel(fail_times=1))
+    alert_id = outbox.record_alert('u1', 0.9, 'emergency', {})
+
+    outbox.dispatch_due()
+    # The retry is scheduled in the future, so nothing is due yet
+    assert outbox.dispatch_due() == 0
+    (status,) = outbox.delivery_status(alert_id)
+    assert status['next_attempt_at'] > status['created_at']
+
+
+def test_send_fails_permanently_after_max_attempts(tmp_path, no_backoff):
+    channel = LogChannel(fail_times=MAX_ATTEMPTS + 1)
+    outbox = _outbox(tmp_path, channel)
+    alert_id = outbox.record_alert('u1', 0.9, 'emergency', {})
+
+    for _ in range(MAX_ATTEMPTS + 2):
+        outbox.dispatch_due()
+    (status,) = outbox.delivery_status(alert_id)
+    assert (status['status'], status['attempts']) == (STATUS_FAILED, MAX_ATTEMPTS)
+    assert channel.sent == []
+
+
+def test_repeated_alert_is_suppressed_within_window(tmp_path):
+    channel = LogChannel()
+    outbox = _outbox(tmp_path, channel)
+
+    first = outbox.record_alert('u1', 0.9, 'emergency', {})
+    second = outbox.record_alert('u1', 0.95, 'emergency', {})
+    other_type = outbox.record_alert('u1', 0.6, 'support', {})
+    other_user = outbox.record_alert('u2', 0.9, 'emergency', {})
+
+    # Every alert is still recorded; only the duplicate notification is held back
+    assert len({first, second, other_type, other_user}) == 4
+    assert outbox.delivery_status(second)[0]['status'] == STATUS_SUPPRESSED
+    assert outbox.stats() == {STATUS_PENDING: 3, STATUS_SUPPRESSED: 1}
+
+    outbox.dispatch_due()
+    assert sorted(sent['alert_id'] for sent in channel.sent) == sorted([first, other_type, other_user])
+
+
+def test_failing_message_still_dedupes(tmp_path, no_backoff):
+    outbox = _outbox(tmp_path, LogChannel(fail_times=1))
+    outbox.record_alert('u1', 0.9, 'emergency', {})
+    outbox.dispatch_due()
+
+    # A pending retry already covers this user and alert type
+    duplicate = outbox.record_alert('u1', 0.9, 'emergency', {})
+    assert outbox.delivery_status(duplicate)[0]['status'] == STATUS_SUPPRESSED
+
+
+def test_backoff_grows_and_is_capped():
+    assert BACKOFF_BASE_SECONDS * 0.8 <= backoff_seconds(1) <= BACKOFF_BASE_SECONDS * 1.2
+    assert BACKOFF_BASE_SECONDS * 4 * 0.8 <= backoff_seconds(3) <= BACKOFF_BASE_SECONDS * 4 * 1.2
+    assert backoff_seconds(50) <= BACKOFF_MAX_SECONDS * 1.2
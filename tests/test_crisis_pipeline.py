@@ -0,0 +1,177 @@
+# 🧠 Manas: Crisis Pipeline Tests
+
+import pytest
+
+from utils.crisis_pipeline import EMERGENCY_RISK, CrisisPipeline
+
+CATEGORIES = ((0.8, 'critical'), (0.6, 'high'), (0.4, 'moderate'), (0.0, 'low'))
+
+
+def _category(risk_level):
+    return next(name for floor, name in CATEGORIES if risk_level >= floor)
+
+
+class FakeDetector:
+    """CrisisDetector stand-in: the screen returns ``screen_risk``, the model ``confirmed_risk``"""
+
+    def __init__(self, screen_risk, confirmed_risk=None, fail=False):
+        self.screen_risk = screen_risk
+        self.confirmed_risk = screen_risk if confirmed_risk is None else confirmed_risk
+        self.fail = fail
+        self.calls = []
+        self.logged = []
+
+    def _assessment(self, risk_level):
+        return {
+            'risk_level': risk_level,
+            'risk_category': _category(risk_level),
+            'emergency_intervention': risk_level >= EMERGENCY_RISK,
+            'immediate_actions': ['call helpline'] if risk_level >= EMERGENCY_RISK else []
+        }
+
+    def assess_risk(self, emotion_result, user_id, use_ai=True, record=True):
+        self.calls.append(('assess_risk', use_ai, record))
+        return self._assessment(self.screen_risk)
+
+    def confirm_assessment(self, screen, text, user_id):
+        self.calls.append(('confirm_assessment', text))
+        if self.fail:
+            raise RuntimeError('model unavailable')
+        return self._assessment(self.confirmed_risk)
+
+    def _log_risk_assessment(self, user_id, assessment):
+        self.logged.append(assessment)
+
+    def screen_risk_level(self, user_data, user_id):
+        return self.screen_risk
+
+    def confirm_risk_level(self, screen_risk, user_data):
+        if self.fail:
+            raise RuntimeError('model unavailable')
+        return self.confirmed_risk
+
+    def intervention_for(self, risk_level, user_id, ai_content=True):
+        return {'level': _category(risk_level), 'ai_content': ai_content}
+
+
+class FakeOutbox:
+    def __init__(self):
+        self.alerts = []
+
+    def record_alert(self, user_id, risk_level, alert_type, details):
+        self.alerts.append((user_id, risk_level, alert_type, details))
+        return len(self.alerts)
+
+
+def _pipeline(detector):
+    outbox, published = FakeOutbox(), []
+    pipeline = CrisisPipeline(detector, outbox, publish=lambda user_id, update: published.append((user_id, update)),
+                              max_workers=1)
+    return pipeline, outbox, published
+
+
+def _drain(pipeline):
+    # Wait for the background confirmations
+    pipeline._executor.shutdown(wait=True)
+
+
+def test_screen_without_text_needs_no_confirmation():
+    detector = FakeDetector(0.3)
+    pipeline, outbox, published = _pipeline(detector)
+
+    assessment = pipeline.assess({'primary_emotion': 'sad'}, 'u1')
+    _drain(pipeline)
+
+    assert assessment['phase'] == 'screen'
+    assert assessment['confirmation'] == 'not_required'
+    # The screen is final, so it is recorded in history right away
+    assert detector.calls == [('assess_risk', False, True)]
+    assert outbox.alerts == [] and published == []
+
+
+def test_screen_emergency_is_alerted_before_confirmation():
+    detector = FakeDetector(0.9)
+    pipeline, outbox, published = _pipeline(detector)
+
+    assessment = pipeline.assess({'text_content': 'I want to die'}, 'u1')
+    # Phase 1 wrote the alert synchronously
+    assert [alert[2] for alert in outbox.alerts] == ['emergency']
+    assert outbox.alerts[0][3]['assessment_id'] == assessment['assessment_id']
+    assert detector.calls[0] == ('assess_risk', False, False)
+    _drain(pipeline)
+
+    # Confirmed at the same category: nothing more to record, the client still gets the result
+    assert len(outbox.alerts) == 1
+    user_id, update = published[0]
+    assert user_id == 'u1'
+    assert update['assessment_id'] == assessment['assessment_id']
+    assert update['phase'] == 'confirmed' and update['confirmation'] == 'complete'
+
+
+def test_confirmation_upgrade_records_emergency():
+    detector = FakeDetector(0.45, confirmed_risk=0.85)
+    pipeline, outbox, published = _pipeline(detector)
+
+    assessment = pipeline.assess({'text_content': 'nothing matters'}, 'u1')
+    assert assessment['confirmation'] == 'pending'
+    _drain(pipeline)
+
+    (_, risk_level, alert_type, details), = outbox.alerts
+    assert (risk_level, alert_type) == (0.85, 'emergency')
+    assert details['screen_category'] == 'moderate' and details['confirmed_category'] == 'critical'
+    assert published[0][1]['screen_category'] == 'moderate'
+    assert published[0][1]['risk_category'] == 'critical'
+
+
+def test_confirmation_downgrade_of_low_risk_is_not_alerted():
+    detector = FakeDetector(0.45, confirmed_risk=0.1)
+    pipeline, outbox, published = _pipeline(detector)
+
+    pipeline.assess({'text_content': 'long day'}, 'u1')
+    _drain(pipeline)
+
+    assert outbox.alerts == []
+    assert published[0][1]['risk_category'] == 'low'
+
+
+def test_failed_confirmation_keeps_screen_result():
+    detector = FakeDetector(0.45, fail=True)
+    pipeline, outbox, published = _pipeline(detector)
+
+    assessment = pipeline.assess({'text_content': 'long day'}, 'u1')
+    _drain(pipeline)
+
+    # The screen is logged in place of the confirmed assessment
+    assert detector.logged and detector.logged[0]['risk_category'] == 'moderate'
+    assert published == [('u1', {'assessment_id': assessment['assessment_id'], 'confirmation': 'failed'})]
+
+
+@pytest.mark.parametrize('screen_risk, confirmed_risk, alert_types', [
+    (0.9, 0.9, ['emergency']),
+    (0.6, 0.9, ['emergency']),
+    (0.9, 0.3, ['emergency', 'downgraded']),
+    (0.2, 0.6, ['support']),
+    (0.2, 0.3, []),
+])
+def test_check_alerts(screen_risk, confirmed_risk, alert_types):
+    detector = FakeDetector(screen_risk, confirmed_risk=confirmed_risk)
+    pipeline, outbox, published = _pipeline(detector)
+
+    result = pipeline.check({'recent_emotions': []}, 'u1')
+    assert result['intervention']['ai_content'] is False
+    _drain(pipeline)
+
+    assert [alert[2] for alert in outbox.alerts] == alert_types
+    update = published[0][1]
+    assert update['assessment_id'] == result['assessment_id']
+    assert (update['screen_risk_level'], update['risk_level']) == (screen_risk, confirmed_risk)
+    assert update['intervention']['ai_content'] is True
+
+
+def test_publish_errors_do_not_escape():
+    def publish(user_id, update):
+        raise ConnectionError('no socket')
+
+    pipeline = CrisisPipeline(FakeDetector(0.3), FakeOutbox(), publish=publish, max_workers=1)
+    pipeline.assess({'text_content': 'fine'}, 'u1')
+    _drain(pipeline)
@@ -0,0 +1,38 @@
+# 🧠 Manas: Distillation Training Text Tests
+
+import time
+
+from utils.distillation import TrainingTextStore
+
+GEMINI_RESULT = {'primary_emotion': 'Stressed', 'analysis_tier': 'gemini', 'model_used': 'gemini-2.0-flash'}
+
+
+def _examples(store):
+    return [example for batch in store.iter_examples() for example in batch]
+
+
+def test_text_is_not_kept_unless_enabled(tmp_path):
+    store = TrainingTextStore(str(tmp_path / 'd.db'), enabled=False)
+    assert not store.record('s1', 'exam ka bahut pressure hai', GEMINI_RESULT)
+    assert _examples(store) == []
+
+
+def test_only_gemini_labels_are_kept(tmp_path):
+    store = TrainingTextStore(str(tmp_path / 'd.db'), enabled=True)
+    assert store.record('s1', 'exam ka bahut pressure hai', GEMINI_RESULT)
+    assert not store.record('s1', 'local guess', dict(GEMINI_RESULT, analysis_tier='local'))
+    assert not store.record('s1', 'fallback', dict(GEMINI_RESULT, model_used='keyword_fallback'))
+    assert [(e['input'], e['label']) for e in _examples(store)] == [('exam ka bahut pressure hai', 'stressed')]
+
+
+def test_expired_and_deleted_texts_are_removed(tmp_path):
+    store = TrainingTextStore(str(tmp_path / 'd.db'), enabled=True, retention_days=30)
+    store.record('s1', 'old entry', GEMINI_RESULT)
+    store.record('s2', 'other student', GEMINI_RESULT)
+    conn = store._connect()
+    conn.execute("UPDATE distillation_texts SET created_at = ? WHERE text = 'old entry'", (time.time() - 31 * 86400,))
+    conn.commit()
+    conn.close()
+    assert [e['input'] for e in _examples(store)] == ['other student']
+    assert store.delete_user('s2') == 1
+    assert _examples(store) == []
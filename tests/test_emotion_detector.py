@@ -0,0 +1,41 @@
+# 🧠 Manas: Emotion Detector Tests
+
+import time
+
+import pytest
+
+from utils.emotion_detector import EmotionDetector
+
+
+@pytest.fixture(scope='module')
+def detector():
+    return EmotionDetector()
+
+
+def _analysis(emotion, seconds):
+    def run():
+        time.sleep(seconds)
+        return {'primary_emotion': emotion, 'confidence': 0.8, 'emotion_intensity': 5}
+    return run
+
+
+def test_multimodal_latency_is_per_modality(detector):
+    # The slow modality is collected first; the fast one must not inherit its wait
+    result = detector.analyze_multimodal({
+        'visual': _analysis('sad', 0.4),
+        'text': _analysis('sad', 0.05),
+    })
+
+    latency = result['modality_latency_seconds']
+    assert latency['visual'] >= 0.35
+    assert latency['text'] < 0.3
+
+
+def test_multimodal_latency_of_failed_modality(detector):
+    def broken():
+        raise RuntimeError('decoder failed')
+
+    result = detector.analyze_multimodal({'audio': broken, 'text': _analysis('happy', 0.0)})
+
+    assert result['modality_latency_seconds']['audio'] < 0.2
+    assert result['primary_emotion'] == 'happy'
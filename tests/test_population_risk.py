@@ -0,0 +1,59 @@
+# 🧠 Manas: Population Risk Tests
+
+import sqlite3
+
+import pytest
+
+pytest.importorskip('pandas')
+
+from utils.population_risk import PopulationRiskJob, load_rollups, score_population  # noqa: E402
+from utils.risk_history import RISK_EVENT_WINDOW_SECONDS, RiskHistory  # noqa: E402
+
+T0 = 1_700_000_000.0
+HOUR = 3600.0
+DAY = 24 * HOUR
+
+# (user, [(offset seconds, risk level, category), ...]) covering decay, events and window roll-over
+HISTORIES = [
+    ('calm', [(0, 0.1, 'low'), (DAY, 0.2, 'low')]),
+    ('moderate', [(0, 0.4, 'moderate'), (2 * HOUR, 0.5, 'moderate'), (3 * DAY, 0.45, 'moderate')]),
+    ('crisis', [(0, 0.3, 'low'), (5 * DAY, 0.9, 'critical'), (5 * DAY + HOUR, 0.7, 'high')]),
+    ('rolled', [(0, 0.6, 'high'), (HOUR, 0.5, 'moderate'), (RISK_EVENT_WINDOW_SECONDS + DAY, 0.4, 'moderate')]),
+    ('expired', [(0, 0.8, 'critical')]),
+]
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / 'population.db')
+    history = RiskHistory(path)
+    for user_id, events in HISTORIES:
+        for offset, risk_level, category in events:
+            history.record(user_id, risk_level, category, now=T0 + offset)
+    return path
+
+
+@pytest.mark.parametrize('elapsed', [10 * DAY, 16 * DAY, 30 * DAY])
+def test_matches_per_user_historical_risk(db_path, elapsed):
+    now = T0 + elapsed
+    conn = sqlite3.connect(db_path)
+    try:
+        scored = score_population(load_rollups(conn, now), now)
+    finally:
+        conn.close()
+
+    history = RiskHistory(db_path)
+    assert set(scored.index) == {user_id for user_id, _ in HISTORIES}
+    for user_id in scored.index:
+        expected = RiskHistory.historical_risk(history.get_state(user_id, now=now))
+        # get_state rounds its fields; the vectorized path does not
+        assert scored.loc[user_id, 'historical_risk'] == pytest.approx(expected, abs=2e-3), user_id
+
+
+def test_run_flags_recent_crisis(db_path):
+    summary = PopulationRiskJob(db_path).run(now=T0 + 6 * DAY, dry_run=True)
+
+    assert summary['users'] == len(HISTORIES)
+    flagged = {user['user_id'] for user in summary['top']}
+    assert 'crisis' in flagged
+    assert 'calm' not in flagged
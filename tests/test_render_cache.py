@@ -0,0 +1,54 @@
+# 🧠 Manas: Render Cache Tests
+
+import pytest
+
+flask = pytest.importorskip('flask')
+
+from utils.render_cache import RenderCache, SCOPE_JOURNAL  # noqa: E402
+
+
+def _app(cache, pages):
+    app = flask.Flask(__name__)
+
+    def render():
+        page = pages.pop(0)
+        if isinstance(page, Exception):
+            raise page
+        return page
+
+    @app.route('/journal')
+    def journal():
+        return cache.cached_response('student', SCOPE_JOURNAL, render, fallback=lambda: 'empty')
+
+    return app
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = RenderCache(str(tmp_path / 'render.db'), build='build-1')
+    cache.ensure_schema()
+    return cache
+
+
+def test_failed_render_serves_fallback_without_caching(cache):
+    client = _app(cache, [RuntimeError('database locked'), 'entries']).test_client()
+
+    failed = client.get('/journal')
+    assert failed.get_data(as_text=True) == 'empty'
+    assert failed.headers['Cache-Control'] == 'no-store'
+    assert failed.headers.get('ETag') is None
+
+    ok = client.get('/journal')
+    assert ok.get_data(as_text=True) == 'entries'
+    assert client.get('/journal', headers={'If-None-Match': ok.headers['ETag']}).status_code == 304
+
+
+def test_etag_changes_with_the_build(cache, tmp_path):
+    etag = cache.etag('student', SCOPE_JOURNAL, 3)
+    redeployed = RenderCache(cache.db_path, build='build-2')
+    assert redeployed.etag('student', SCOPE_JOURNAL, 3) != etag
+
+    client = _app(redeployed, ['new markup']).test_client()
+    response = client.get('/journal', headers={'If-None-Match': f'"{etag}"'})
+    assert response.status_code == 200
+    assert response.get_data(as_text=True) == 'new markup'
@@ -0,0 +1,91 @@
+# 🧠 Manas: Risk History Tests
+
+import pytest
+
+from utils.risk_history import (
+    HISTORY_WEIGHTS, RISK_EVENT_SATURATION, RISK_EVENT_WINDOW_SECONDS, RISK_EWMA_ALPHA,
+    RISK_HALF_LIFE_SECONDS, RiskHistory
+)
+
+T0 = 1_700_000_000.0
+HOUR = 3600.0
+
+
+@pytest.fixture
+def history(tmp_path):
+    return RiskHistory(str(tmp_path / 'risk.db'))
+
+
+def test_unknown_user_has_empty_state(history):
+    state = history.get_state('nobody', now=T0)
+    assert state == {'ewma': 0.0, 'peak': 0.0, 'recent_events': 0.0, 'seconds_since_crisis': None, 'assessments': 0}
+    assert RiskHistory.historical_risk(state) == 0.0
+
+
+def test_ewma_starts_at_first_value_then_blends(history):
+    history.record('s1', 0.6, 'moderate', now=T0)
+    assert history.get_state('s1', now=T0)['ewma'] == pytest.approx(0.6)
+
+    history.record('s1', 0.2, 'low', now=T0)
+    expected = (1 - RISK_EWMA_ALPHA) * 0.6 + RISK_EWMA_ALPHA * 0.2
+    state = history.get_state('s1', now=T0)
+    assert state['ewma'] == pytest.approx(expected, abs=1e-4)
+    assert state['peak'] == pytest.approx(0.6)
+    assert state['assessments'] == 2
+
+
+def test_risk_level_is_clamped(history):
+    history.record('s1', 3.0, 'critical', now=T0)
+    assert history.get_state('s1', now=T0)['peak'] == 1.0
+
+
+def test_ewma_and_peak_halve_every_half_life(history):
+    history.record('s1', 0.8, 'high', now=T0)
+    state = history.get_state('s1', now=T0 + RISK_HALF_LIFE_SECONDS)
+    assert state['ewma'] == pytest.approx(0.4, abs=1e-4)
+    assert state['peak'] == pytest.approx(0.4, abs=1e-4)
+
+    # A new assessment blends with the decayed average, not the stored one
+    history.record('s1', 0.0, 'low', now=T0 + 2 * RISK_HALF_LIFE_SECONDS)
+    state = history.get_state('s1', now=T0 + 2 * RISK_HALF_LIFE_SECONDS)
+    assert state['ewma'] == pytest.approx((1 - RISK_EWMA_ALPHA) * 0.2, abs=1e-4)
+    assert state['peak'] == pytest.approx(0.2, abs=1e-4)
+
+
+def test_only_elevated_assessments_count_as_events(history):
+    for category in ('low', 'moderate', 'high', 'critical', 'minimal'):
+        history.record('s1', 0.5, category, now=T0)
+    assert history.get_state('s1', now=T0)['recent_events'] == 3
+
+
+def test_window_rolls_over_and_previous_bucket_fades(history):
+    history.record('s1', 0.5, 'moderate', now=T0)
+    history.record('s1', 0.5, 'moderate', now=T0 + HOUR)
+
+    # One window later the events move to the previous bucket, weighted by the remaining overlap
+    quarter = T0 + RISK_EVENT_WINDOW_SECONDS * 1.25
+    assert history.get_state('s1', now=quarter)['recent_events'] == pytest.approx(2 * 0.75, abs=0.01)
+
+    # An event in the new bucket counts fully; the window now starts one period after T0
+    history.record('s1', 0.5, 'moderate', now=quarter)
+    assert history.get_state('s1', now=quarter)['recent_events'] == pytest.approx(1 + 2 * 0.75, abs=0.01)
+
+    # After two full windows without events nothing remains
+    assert history.get_state('s1', now=T0 + RISK_EVENT_WINDOW_SECONDS * 3.5)['recent_events'] == 0
+
+
+def test_last_crisis_is_kept_until_the_next_one(history):
+    history.record('s1', 0.9, 'high', now=T0)
+    history.record('s1', 0.1, 'low', now=T0 + HOUR)
+    assert history.get_state('s1', now=T0 + 2 * HOUR)['seconds_since_crisis'] == 2 * HOUR
+
+
+def test_historical_risk_weights():
+    state = {'ewma': 0.5, 'peak': 1.0, 'recent_events': RISK_EVENT_SATURATION * 2, 'seconds_since_crisis': 0}
+    expected = (HISTORY_WEIGHTS['ewma'] * 0.5 + HISTORY_WEIGHTS['peak'] + HISTORY_WEIGHTS['events']
+                + HISTORY_WEIGHTS['recent_crisis'])
+    assert RiskHistory.historical_risk(state) == pytest.approx(expected)
+
+    faded = dict(state, seconds_since_crisis=RISK_HALF_LIFE_SECONDS)
+    assert RiskHistory.historical_risk(state) - RiskHistory.historical_risk(faded) == pytest.approx(
+        HISTORY_WEIGHTS['recent_crisis'] / 2, abs=1e-4)
@@ -0,0 +1,91 @@
+# 🧠 Manas: Server-Side Session Store Tests
+
+import pytest
+
+flask = pytest.importorskip('flask')
+
+from utils.session_store import (  # noqa: E402
+    ServerSideSessionInterface, SQLiteSessionBackend, regenerate_session_id
+)
+
+
+@pytest.fixture
+def app(tmp_path):
+    app = flask.Flask(__name__)
+    app.secret_key = 'test-secret'
+    app.session_interface = ServerSideSessionInterface(SQLiteSessionBackend(str(tmp_path / 'sessions.db')))
+
+    @app.route('/set/<key>/<value>')
+    def set_value(key, value):
+        flask.session[key] = value
+        return 'ok'
+
+    @app.route('/append/<value>')
+    def append_value(value):
+        flask.session.setdefault('items', []).append(value)
+        flask.session.modified = True
+        return 'ok'
+
+    @app.route('/get/<key>')
+    def get_value(key):
+        return flask.jsonify(flask.session.get(key))
+
+    @app.route('/login')
+    def login():
+        regenerate_session_id(flask.session)
+        flask.session['user_id'] = 'student'
+        return 'ok'
+
+    return app
+
+
+def _cookie(client, app):
+    return client.get_cookie(app.config['SESSION_COOKIE_NAME']).value
+
+
+def test_concurrent_writes_from_one_cookie_get_distinct_versions(app):
+    client = app.test_client()
+    client.get('/set/mood/calm')
+    shared = _cookie(client, app)
+
+    # Two requests start from the same cookie and both write
+    client.get('/set/mood/anxious')
+    first = _cookie(client, app)
+    client.set_cookie(app.config['SESSION_COOKIE_NAME'], shared)
+    client.get('/set/mood/happy')
+    second = _cookie(client, app)
+    assert first != second
+
+    # The cookie of the last write reads that write, from cache and from a cold worker alike
+    assert client.get('/get/mood').json == 'happy'
+    app.session_interface.cache._entries.clear()
+    assert client.get('/get/mood').json == 'happy'
+
+    # The overwritten write's cookie is served what the backend holds, not a stale cached copy
+    client.set_cookie(app.config['SESSION_COOKIE_NAME'], first)
+    assert client.get('/get/mood').json == 'happy'
+
+
+def test_cached_parts_are_not_shared_with_the_live_session(app):
+    client = app.test_client()
+    client.get('/append/a')
+    client.get('/append/b')
+    assert client.get('/get/items').json == ['a', 'b']
+    for data in app.session_interface.cache._entries.values():
+        assert data.get('items') in (None, ['a'], ['a', 'b'])
+
+
+def test_login_regenerates_the_sid(app):
+    client = app.test_client()
+    client.get('/set/theme/dark')
+    before = _cookie(client, app)
+    client.get('/login')
+    after = _cookie(client, app)
+    assert before.split('.')[0] != after.split('.')[0]
+    assert client.get('/get/theme').json == 'dark'
+
+    # The pre-login sid no longer carries any session
+    client.set_cookie(app.config['SESSION_COOKIE_NAME'], before)
+    app.session_interface.cache._entries.clear()
+    assert client.get('/get/user_id').json is None
+    assert client.get('/get/theme').json is None
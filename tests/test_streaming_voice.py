@@ -0,0 +1,52 @@
+# 🧠 Manas: Streaming Voice Tests
+
+import numpy as np
+import pytest
+
+pytest.importorskip('librosa')
+
+from utils.audio_features import extract_audio_features  # noqa: E402
+from utils.streaming_voice import RunningVoiceFeatures  # noqa: E402
+
+SR = 22050
+
+
+@pytest.fixture(scope='module')
+def voice():
+    """8 s of a harmonic tone whose loudness pulses twice a second (120 BPM)"""
+    t = np.arange(8 * SR) / SR
+    envelope = 0.25 + 0.2 * (np.mod(t, 0.5) < 0.15)
+    tone = np.sin(2 * np.pi * 220 * t) + 0.5 * np.sin(2 * np.pi * 440 * t) + 0.25 * np.sin(2 * np.pi * 1320 * t)
+    return (envelope * tone).astype(np.float32)
+
+
+def _streamed(y, chunk=3001, include_tempo=True):
+    running = RunningVoiceFeatures(SR, include_tempo=include_tempo)
+    for start in range(0, len(y), chunk):
+        running.add(y[start:start + chunk])
+    return running.features()
+
+
+def test_streamed_features_match_offline(voice):
+    offline = extract_audio_features(voice, SR, include_tempo=True)
+    streamed = _streamed(voice)
+
+    assert set(streamed) == set(offline)
+    # Energy feeds the fixed voice thresholds, so it must be on the same (time-domain) scale
+    assert streamed['energy'] == pytest.approx(offline['energy'], rel=0.02)
+    assert streamed['tempo'] == pytest.approx(offline['tempo'], rel=0.05)
+    for name in ('pitch_mean', 'spectral_centroid', 'spectral_rolloff', 'zcr'):
+        assert streamed[name] == pytest.approx(offline[name], rel=0.05), name
+    # Mel dB scaling is per chunk
+    for name in ('mfcc_0', 'mfcc_1'):
+        assert streamed[name] == pytest.approx(offline[name], rel=0.1), name
+
+
+def test_chunk_size_does_not_change_features(voice):
+    small, large = _streamed(voice, chunk=1024), _streamed(voice, chunk=SR)
+    assert small['energy'] == pytest.approx(large['energy'], rel=1e-3)
+    assert small['tempo'] == pytest.approx(large['tempo'], rel=0.05)
+
+
+def test_tempo_can_be_disabled(voice):
+    assert 'tempo' not in _streamed(voice, include_tempo=False)
@@ -0,0 +1,94 @@
+# 🧠 Manas: Local Text Emotion Model Tests
+
+import pytest
+
+pytest.importorskip('sklearn')
+
+from utils.text_emotion_model import TextEmotionModel  # noqa: E402
+from utils.text_emotion_seed import SEED_EXAMPLES  # noqa: E402
+
+NEGATIVE = {'sad', 'hopeless', 'anxious', 'stressed', 'angry'}
+
+# Not in the seed corpus; English, Hinglish and Hindi for every label
+HELD_OUT = [
+    ("I'm really happy, my sister got engaged today", 'happy'),
+    ("Feeling good after a fun day out with friends", 'happy'),
+    ("Aaj bahut achha lag raha hai, sab log khush hain", 'happy'),
+    ("आज बहुत खुशी का दिन है", 'happy'),
+    ("I can't wait to start college next month, so excited!", 'excited'),
+    ("Kal match dekhne ja rahe hain, bahut excited hoon", 'excited'),
+    ("Our trip to Manali is tomorrow, I'm thrilled", 'excited'),
+    ("कल मेला है, बहुत उत्साहित हूँ", 'excited'),
+    ("After my evening walk I feel peaceful and relaxed", 'calm'),
+    ("Mann bahut shaant hai, sukoon mil raha hai", 'calm'),
+    ("Sitting quietly in the garden, feeling calm", 'calm'),
+    ("मेडिटेशन के बाद बहुत शांति है", 'calm'),
+    ("I feel so lonely and sad without my friends here", 'sad'),
+    ("Bahut udaas hoon, rona aa raha hai", 'sad'),
+    ("I miss my grandfather so much, it hurts", 'sad'),
+    ("आज बहुत उदास और अकेला महसूस कर रहा हूँ", 'sad'),
+    ("I'm so nervous about the interview, my heart is racing", 'anxious'),
+    ("Result ko leke bahut ghabrahat aur dar hai", 'anxious'),
+    ("I keep worrying that something will go wrong", 'anxious'),
+    ("परीक्षा को लेकर बहुत घबराहट और चिंता है", 'anxious'),
+    ("Too many assignments and exams, I'm totally stressed", 'stressed'),
+    ("Padhai ka pressure aur deadlines, bahut tension hai", 'stressed'),
+    ("The pressure from coaching and school is too much", 'stressed'),
+    ("काम का बहुत दबाव है, बहुत तनाव है", 'stressed'),
+    ("I'm so angry, my brother broke my phone", 'angry'),
+    ("Sab par bahut gussa aa raha hai aaj", 'angry'),
+    ("I'm furious that they blamed me again", 'angry'),
+    ("मुझे अपने दोस्त पर बहुत गुस्सा है", 'angry'),
+    ("I don't know which course to choose, I'm confused", 'confused'),
+    ("Kya karun samajh nahi aa raha, bahut confusion hai", 'confused'),
+    ("I'm unsure about my future and can't decide", 'confused'),
+    ("क्या करूँ, कुछ समझ नहीं आ रहा", 'confused'),
+    ("There's no point anymore, nothing will ever change", 'hopeless'),
+    ("Koi umeed nahi hai, sab bekaar hai", 'hopeless'),
+    ("I feel worthless, I'll never be good enough", 'hopeless'),
+    ("कोई उम्मीद नहीं बची, कुछ नहीं बदलेगा", 'hopeless'),
+    ("I went to the market and then studied for an hour", 'neutral'),
+    ("Aaj college gaya, lecture attend kiya", 'neutral'),
+    ("I have a lab session on Thursday", 'neutral'),
+    ("आज कॉलेज में दो क्लास थीं", 'neutral'),
+]
+
+
+@pytest.fixture(scope='module')
+def seed_model():
+    return TextEmotionModel.from_seed()
+
+
+def test_held_out_accuracy(seed_model):
+    predictions = [(seed_model.analyze(text)['primary_emotion'], label) for text, label in HELD_OUT]
+    accuracy = sum(p == label for p, label in predictions) / len(predictions)
+    polarity = sum((p in NEGATIVE) == (label in NEGATIVE) for p, label in predictions) / len(predictions)
+    assert accuracy >= 0.8
+    assert polarity >= 0.9
+
+
+def test_seed_corpus_cross_validation():
+    # Each fold holds out every fifth example of every label; chance is 0.1
+    folds = 5
+    accuracies = []
+    for fold in range(folds):
+        texts, labels, held_out = [], [], []
+        for label, examples in SEED_EXAMPLES.items():
+            for i, text in enumerate(examples):
+                if i % folds == fold:
+                    held_out.append((text, label))
+                else:
+                    texts.append(text)
+                    labels.append(label)
+        model = TextEmotionModel.train(texts, labels)
+        accuracies.append(sum(model.analyze(t)['primary_emotion'] == label for t, label in held_out) / len(held_out))
+    assert sum(accuracies) / folds >= 0.45
+
+
+def test_saved_artifact_round_trip(seed_model, tmp_path):
+    path = str(tmp_path / 'text_emotion.joblib')
+    seed_model.save(path)
+    loaded = TextEmotionModel.load(path)
+    text = 'Padhai ka bahut pressure hai'
+    assert loaded.analyze(text)['primary_emotion'] == seed_model.analyze(text)['primary_emotion']
+    assert loaded.version == seed_model.version
@@ -8,6 +8,8 @@ import logging
 from typing import Dict, List, Optional, Any, Tuple
 import json
 
+from .landmark_features import landmarks_to_array, gaze_points
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
@@ -129,7 +131,7 @@ class AccessibilityEngine:
             
             # Extract eye landmarks
             face_landmarks = results.multi_face_landmarks[0]
-            landmarks_array = np.array([[lm.x, lm.y, lm.z] for lm in face_landmarks.landmark])
+            landmarks_array = landmarks_to_array(face_landmarks)
             
             # Calculate gaze direction
             gaze_point = self._calculate_gaze_point(landmarks_array, frame.shape)
@@ -200,7 +202,7 @@ class AccessibilityEngine:
             # Analyze hand landmarks
             gestures_detected = []
             for hand_landmarks in results.multi_hand_landmarks:
-                landmarks_array = np.array([[lm.x, lm.y, lm.z] for lm in hand_landmarks.landmark])
+                landmarks_array = landmarks_to_array(hand_landmarks)
                 gesture = self._recognize_gesture(landmarks_array)
                 if gesture:
                     gestures_detected.append(gesture)
@@ -405,18 +407,10 @@ class AccessibilityEngine:
     def _calculate_gaze_point(self, landmarks: np.ndarray, frame_shape: Tuple[int, int, int]) -> Tuple[float, float]:
         """Calculate gaze point from eye landmarks"""
         try:
-            # Get iris landmarks (simplified approach)
-            left_iris_center = np.mean(landmarks[self.eye_landmarks['left_iris']], axis=0)
-            right_iris_center = np.mean(landmarks[self.eye_landmarks['right_iris']], axis=0)
-            
-            # Average iris positions
-            iris_center = (left_iris_center + right_iris_center) / 2
-            
-            # Convert to screen coordinates (normalized 0-1)
-            gaze_x = iris_center[0]
-            gaze_y = iris_center[1]
+            # Mean of both iris centres, already in normalized (0-1) screen coordinates
+            gaze_x, gaze_y = gaze_points(landmarks)[0]
             
-            return (gaze_x, gaze_y)
+            return (float(gaze_x), float(gaze_y))
             
         except Exception as e:
             logger.error(f"Gaze point calculation error: {e}")
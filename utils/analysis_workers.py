@@ -0,0 +1,199 @@
+# 🧠 Manas: Analysis Worker Processes
+# Process pool for CPU-heavy landmarking and audio features, fed through shared memory
+
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from .preload import register_after_fork
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT = float(os.environ.get('ANALYSIS_TIMEOUT_SECONDS', 20))
+
+
+class AnalysisTimeout(Exception):
+    """Raised when an analysis job misses its deadline"""
+
+
+# ==================== SHARED MEMORY ====================
+
+ArrayRef = Tuple[str, Tuple[int, ...], str]
+
+
+class _SharedArray:
+    """Copy of a numpy array in a named shared-memory block owned by the caller"""
+
+    def __init__(self, array: np.ndarray):
+        array = np.ascontiguousarray(array)
+        self.shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        np.ndarray(array.shape, dtype=array.dtype, buffer=self.shm.buf)[...] = array
+        self.ref: ArrayRef = (self.shm.name, array.shape, array.dtype.str)
+
+    def release(self):
+        try:
+            self.shm.close()
+            self.shm.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def _attach(ref: ArrayRef) -> Tuple[shared_memory.SharedMemory, np.ndarray]:
+    """Map a caller's shared array into this process without copying"""
+    name, shape, dtype = ref
+    # The parent registered the block and unlinks it; spawned workers share its
+    # resource tracker, so attaching here must leave that registration alone
+    shm = shared_memory.SharedMemory(name=name)
+    return shm, np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+
+
+# ==================== WORKER PROCESS ====================
+
+_worker_pools = None
+
+
+def _init_worker():
+    """Preload models once per worker process"""
+    global _worker_pools
+    try:
+        from .mediapipe_pool import FacePools, MEDIAPIPE_AVAILABLE
+        if MEDIAPIPE_AVAILABLE:
+            # Worker processes are single threaded, so one graph of each kind is enough
+            _worker_pools = FacePools(size=1)
+    except Exception as e:
+        logging.getLogger(__name__).error(f"Worker MediaPipe preload failed: {e}")
+    try:
+        from .audio_features import extract_audio_features  # noqa: F401 - warms librosa
+    except Exception as e:
+        logging.getLogger(__name__).error(f"Worker audio preload failed: {e}")
+
+
+def _check_deadline(deadline: float):
+    # Jobs already handed to a worker cannot be cancelled, so they drop themselves
+    if time.time() > deadline:
+        raise AnalysisTimeout("Deadline passed before the job started")
+
+
+def _face_job(ref: ArrayRef, deadline: float) -> Tuple[bool, Optional[np.ndarray]]:
+    _check_deadline(deadline)
+    if _worker_pools is None:
+        raise RuntimeError("MediaPipe is not available in the worker process")
+    shm, image = _attach(ref)
+    try:
+        return _worker_pools.detect(image)
+    finally:
+        del image
+        shm.close()
+
+
+def _audio_features_job(ref: ArrayRef, sr: int, deadline: float) -> Dict[str, float]:
+    _check_deadline(deadline)
+    from .audio_features import extract_audio_features
+    shm, y = _attach(ref)
+    try:
+        return extract_audio_features(y, sr)
+    finally:
+        del y
+        shm.close()
+
+
+# ==================== POOL ====================
+
+class AnalysisWorkerPool:
+    """Runs facial landmarking and audio feature extraction in worker processes.
+
+    Keeps the request threads free of long GIL-holding sections: the request
+    thread copies the decoded array into shared memory once, submits a job
+    with a deadline and waits on the future. Jobs that miss their deadline
+    are cancelled if still queued, or skip themselves when a worker picks
+    them up late.
+    """
+
+    def __init__(self, max_workers: int, default_timeout: float = DEFAULT_TIMEOUT):
+        self.max_workers = max_workers
+        self.default_timeout = default_timeout
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        # Created on first use so that importing the app never forks workers
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=_init_worker
+                )
+                logger.info(f"Analysis worker pool started with {self.max_workers} processes")
+            return self._executor
+
+    def _reset_executor(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    def _run(self, fn, array: np.ndarray, *args, timeout: Optional[float] = None) -> Any:
+        timeout = self.default_timeout if timeout is None else timeout
+        deadline = time.time() + timeout
+        shared = _SharedArray(array)
+        try:
+            future = self._get_executor().submit(fn, shared.ref, *args, deadline)
+            try:
+                return future.result(timeout=timeout)
+            except FutureTimeout:
+                future.cancel()
+                raise AnalysisTimeout(f"Analysis job exceeded {timeout}s")
+        except BrokenProcessPool:
+            logger.error("Analysis worker pool broke - restarting on next job")
+            self._reset_executor()
+            raise
+        finally:
+            shared.release()
+
+    def detect_face(self, rgb_image: np.ndarray, timeout: Optional[float] = None) -> Tuple[bool, Optional[np.ndarray]]:
+        """Face mesh landmarks for an RGB image (see FacePools.detect)"""
+        return self._run(_face_job, rgb_image, timeout=timeout)
+
+    def audio_features(self, y: np.ndarray, sr: int, timeout: Optional[float] = None) -> Dict[str, float]:
+        """Audio emotion features for a mono signal"""
+        return self._run(_audio_features_job, y, sr, timeout=timeout)
+
+    def shutdown(self):
+        self._reset_executor()
+
+
+_shared_workers: Optional[AnalysisWorkerPool] = None
+_shared_lock = threading.Lock()
+
+
+def get_analysis_workers() -> Optional[AnalysisWorkerPool]:
+    """Process-wide worker pool, or None when ANALYSIS_WORKERS=0 disables it"""
+    global _shared_workers
+    with _shared_lock:
+        if _shared_workers is None:
+            try:
+                workers = int(os.environ.get('ANALYSIS_WORKERS', max(1, min(2, (os.cpu_count() or 2) - 1))))
+            except ValueError:
+                workers = 1
+            if workers <= 0:
+                return None
+            _shared_workers = AnalysisWorkerPool(workers)
+        return _shared_workers
+
+
+@register_after_fork
+def _reset_analysis_workers():
+    # A forked worker cannot use its parent's process pool (its manager thread is gone)
+    global _shared_workers, _shared_lock
+    _shared_workers = None
+    _shared_lock = threading.Lock()
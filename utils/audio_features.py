@@ -0,0 +1,87 @@
+# 🧠 Manas: Audio Feature Extraction
+# Voice emotion features derived from a single shared STFT
+
+import logging
+import os
+from typing import Dict, Optional
+
+import numpy as np
+
+from .lazy_import import lazy_import, module_available
+
+# Imported on first use
+LIBROSA_AVAILABLE = module_available('librosa')
+librosa = lazy_import('librosa') if LIBROSA_AVAILABLE else None
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+N_FFT = 2048
+HOP_LENGTH = 512
+N_MFCC = 13
+
+# Tempo separates 'excited' from 'angry' in the voice heuristics. On the shared
+# onset envelope beat tracking adds about a fifth to extraction time (it used to
+# re-run its own STFT); AUDIO_TEMPO_ENABLED=false skips it, and with it that split
+TEMPO_ENABLED = os.environ.get('AUDIO_TEMPO_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+
+
+def extract_audio_features(y: np.ndarray, sr: int, include_tempo: Optional[bool] = None) -> Dict[str, float]:
+    """Extract audio features for emotion analysis
+
+    The magnitude spectrogram is computed once and pitch, spectral shape,
+    MFCCs and tempo are all derived from it (and the mel spectrogram built
+    from it), instead of each librosa call re-running its own STFT. Energy
+    stays a time-domain RMS: RMS of the Hann-windowed STFT is smaller, and
+    the voice classification thresholds are calibrated on the signal RMS.
+
+    Args:
+        y: Mono audio signal
+        sr: Sample rate
+        include_tempo: Estimate tempo with beat tracking (defaults to AUDIO_TEMPO_ENABLED)
+
+    Returns:
+        Dictionary of scalar features
+    """
+    if include_tempo is None:
+        include_tempo = TEMPO_ENABLED
+
+    try:
+        features = {}
+
+        # One STFT for everything spectral
+        S = np.abs(librosa.stft(y, n_fft=N_FFT, hop_length=HOP_LENGTH))
+
+        # Pitch/Fundamental frequency
+        pitches, magnitudes = librosa.piptrack(S=S, sr=sr, n_fft=N_FFT, hop_length=HOP_LENGTH)
+        pitch_values = pitches[magnitudes > np.percentile(magnitudes, 85)]
+        features['pitch_mean'] = float(np.mean(pitch_values)) if len(pitch_values) > 0 else 0.0
+        features['pitch_variation'] = float(np.std(pitch_values)) if len(pitch_values) > 0 else 0.0
+
+        # Energy/Amplitude - time domain (framing only, no FFT)
+        features['energy'] = float(np.mean(librosa.feature.rms(y=y, frame_length=N_FFT, hop_length=HOP_LENGTH)[0]))
+
+        # Spectral features
+        features['spectral_centroid'] = float(np.mean(librosa.feature.spectral_centroid(S=S, sr=sr, n_fft=N_FFT, hop_length=HOP_LENGTH)[0]))
+        features['spectral_rolloff'] = float(np.mean(librosa.feature.spectral_rolloff(S=S, sr=sr, n_fft=N_FFT, hop_length=HOP_LENGTH)[0]))
+
+        # Zero crossing rate (speech clarity indicator) - time domain, already cheap
+        features['zcr'] = float(np.mean(librosa.feature.zero_crossing_rate(y, frame_length=N_FFT, hop_length=HOP_LENGTH)[0]))
+
+        # MFCCs (Mel-frequency cepstral coefficients) from the same spectrogram
+        mel_db = librosa.power_to_db(librosa.feature.melspectrogram(S=S ** 2, sr=sr))
+        mfccs = librosa.feature.mfcc(S=mel_db, n_mfcc=N_MFCC)
+        for i in range(N_MFCC):
+            features[f'mfcc_{i}'] = float(np.mean(mfccs[i]))
+
+        # Tempo - reuses the mel spectrogram for the onset envelope
+        if include_tempo:
+            onset_env = librosa.onset.onset_strength(S=mel_db, sr=sr, hop_length=HOP_LENGTH)
+            tempo, _ = librosa.beat.beat_track(onset_envelope=onset_env, sr=sr, hop_length=HOP_LENGTH)
+            features['tempo'] = float(np.atleast_1d(tempo)[0])
+
+        return features
+
+    except Exception as e:
+        logger.error(f"Audio feature extraction error: {e}")
+        return {}
@@ -0,0 +1,209 @@
+# 🧠 Manas: Voice Audio Front-End
+# Bounded decode, voice-activity trimming and a capped analysis window for voice emotion input
+
+import io
+import logging
+import os
+import tempfile
+from typing import Any, Dict, List, Tuple, Union
+
+import numpy as np
+
+from .lazy_import import lazy_import, module_available
+from .media_decoding import TARGET_SAMPLE_RATE
+
+# Heavy dependencies are imported on first use
+SOUNDFILE_AVAILABLE = module_available('soundfile')
+sf = lazy_import('soundfile') if SOUNDFILE_AVAILABLE else None
+LIBROSA_AVAILABLE = module_available('librosa')
+librosa = lazy_import('librosa') if LIBROSA_AVAILABLE else None
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Never decode more than this much of an upload
+MAX_DECODE_SECONDS = float(os.environ.get('VOICE_MAX_DECODE_SECONDS', 600))
+# Voiced audio actually handed to feature extraction / Gemini
+ANALYSIS_WINDOW_SECONDS = float(os.environ.get('VOICE_ANALYSIS_WINDOW_SECONDS', 20))
+
+Segment = Tuple[int, int]
+
+
+class AudioFrontEnd:
+    """Turns an uploaded recording into a short, voiced, feature-rate signal.
+
+    1. Decode in blocks straight from memory, downmixing each block and
+       stopping at ``max_decode_seconds``.
+    2. Find voiced regions with a frame-energy VAD at the native rate.
+    3. Keep at most ``window_seconds`` of voiced audio: everything when it
+       fits, otherwise ``chunk_seconds`` pieces spread evenly over the voiced
+       timeline so the window represents the whole recording.
+    4. Resample only that window to ``target_sr``.
+
+    Analysis cost therefore depends on ``window_seconds``, not on upload length.
+    """
+
+    def __init__(self, target_sr: int = TARGET_SAMPLE_RATE, window_seconds: float = ANALYSIS_WINDOW_SECONDS,
+                 chunk_seconds: float = 4.0, max_decode_seconds: float = MAX_DECODE_SECONDS,
+                 frame_ms: float = 30.0, threshold_db: float = 35.0, min_voiced_ms: float = 200.0,
+                 merge_gap_ms: float = 300.0, padding_ms: float = 100.0):
+        """
+        Args:
+            target_sr: Sample rate the voice features are computed at
+            window_seconds: Most voiced audio analyzed per recording
+            chunk_seconds: Piece length when sampling a long recording
+            max_decode_seconds: Decoding stops after this much audio
+            frame_ms: VAD frame length
+            threshold_db: Frames this far below the loudest frame count as silence
+            min_voiced_ms: Shorter voiced runs are treated as clicks/noise
+            merge_gap_ms: Pauses shorter than this stay inside one segment
+            padding_ms: Audio kept either side of each segment
+        """
+        self.target_sr = target_sr
+        self.window_seconds = window_seconds
+        self.chunk_seconds = chunk_seconds
+        self.max_decode_seconds = max_decode_seconds
+        self.frame_ms = frame_ms
+        self.threshold_db = threshold_db
+        self.min_voiced_ms = min_voiced_ms
+        self.merge_gap_ms = merge_gap_ms
+        self.padding_ms = padding_ms
+
+    # ==================== DECODING ====================
+
+    def _decode_blocks(self, data: bytes) -> Tuple[np.ndarray, int]:
+        with sf.SoundFile(io.BytesIO(data)) as f:
+            native_sr = f.samplerate
+            limit = int(self.max_decode_seconds * native_sr)
+            blocks = [block.mean(axis=1) for block in f.blocks(blocksize=native_sr * 5, dtype='float32',
+                                                                always_2d=True, frames=min(limit, f.frames))]
+        y = np.concatenate(blocks) if blocks else np.zeros(0, dtype=np.float32)
+        return y, native_sr
+
+    def decode(self, audio: Union[bytes, str], extension: str = '') -> Tuple[np.ndarray, int]:
+        """Mono float32 signal at its native rate, at most ``max_decode_seconds`` long"""
+        if isinstance(audio, str):
+            extension = extension or os.path.splitext(audio)[1].lstrip('.')
+            with open(audio, 'rb') as f:
+                audio = f.read()
+
+        if SOUNDFILE_AVAILABLE:
+            try:
+                return self._decode_blocks(audio)
+            except Exception as e:
+                logger.debug(f"soundfile could not decode audio, falling back to librosa: {e}")
+
+        # Containers libsndfile cannot read (webm/mp4) go through librosa/audioread
+        suffix = f".{extension}" if extension else ''
+        with tempfile.NamedTemporaryFile(suffix=suffix) as tmp:
+            tmp.write(audio)
+            tmp.flush()
+            y, native_sr = librosa.load(tmp.name, sr=None, mono=True, duration=self.max_decode_seconds)
+        return y.astype(np.float32, copy=False), native_sr
+
+    # ==================== VOICE ACTIVITY ====================
+
+    def voiced_segments(self, y: np.ndarray, sr: int) -> List[Segment]:
+        """(start, end) sample ranges containing speech"""
+        frame = max(1, int(sr * self.frame_ms / 1000))
+        n_frames = len(y) // frame
+        if n_frames == 0:
+            return [(0, len(y))] if len(y) else []
+
+        frames = y[:n_frames * frame].reshape(n_frames, frame)
+        energy_db = 10 * np.log10(np.mean(frames.astype(np.float64) ** 2, axis=1) + 1e-10)
+        voiced = energy_db > energy_db.max() - self.threshold_db
+
+        # Run boundaries of the voiced mask
+        edges = np.flatnonzero(np.diff(np.concatenate([[0], voiced.astype(np.int8), [0]])))
+        runs = edges.reshape(-1, 2)
+
+        merge_gap = self.merge_gap_ms / self.frame_ms
+        merged: List[List[int]] = []
+        for start, end in runs:
+            if merged and start - merged[-1][1] <= merge_gap:
+                merged[-1][1] = end
+            else:
+                merged.append([start, end])
+
+        min_frames = self.min_voiced_ms / self.frame_ms
+        pad = int(sr * self.padding_ms / 1000)
+        return [(max(0, start * frame - pad), min(len(y), end * frame + pad))
+                for start, end in merged if end - start >= min_frames]
+
+    # ==================== WINDOWING ====================
+
+    def _gather(self, y: np.ndarray, segments: List[Segment], voiced_start: int, length: int) -> List[np.ndarray]:
+        """``length`` samples starting ``voiced_start`` samples into the voiced timeline"""
+        pieces = []
+        offset = 0
+        for start, end in segments:
+            size = end - start
+            if voiced_start < offset + size and length > 0:
+                begin = start + max(0, voiced_start - offset)
+                take = min(end - begin, length)
+                pieces.append(y[begin:begin + take])
+                length -= take
+                voiced_start = begin + take - start + offset
+            offset += size
+        return pieces
+
+    def select_window(self, y: np.ndarray, sr: int, segments: List[Segment]) -> np.ndarray:
+        """Concatenate voiced audio, sampling evenly when it exceeds the window"""
+        voiced_total = sum(end - start for start, end in segments)
+        window = int(self.window_seconds * sr)
+        if voiced_total <= window:
+            pieces = [y[start:end] for start, end in segments]
+        else:
+            chunk = min(window, int(self.chunk_seconds * sr))
+            count = max(1, window // chunk)
+            starts = np.linspace(0, voiced_total - chunk, count).astype(int)
+            pieces = [p for s in starts for p in self._gather(y, segments, int(s), chunk)]
+
+        # Short fades so joins do not add clicks to the spectral features
+        fade = max(1, int(sr * 0.005))
+        ramp = np.linspace(0.0, 1.0, fade, dtype=np.float32)
+        faded = []
+        for piece in pieces:
+            piece = piece.astype(np.float32, copy=True)
+            if len(piece) > 2 * fade:
+                piece[:fade] *= ramp
+                piece[-fade:] *= ramp[::-1]
+            faded.append(piece)
+        return np.concatenate(faded) if faded else np.zeros(0, dtype=np.float32)
+
+    # ==================== PIPELINE ====================
+
+    def process(self, audio: Union[bytes, str], extension: str = '') -> Tuple[np.ndarray, int, Dict[str, Any]]:
+        """
+        Decode, trim and window a recording
+
+        Args:
+            audio: Encoded audio bytes or a file path
+            extension: Original file extension, used only for the fallback decoder
+
+        Returns:
+            (signal at target_sr, target_sr, front-end report)
+        """
+        y, native_sr = self.decode(audio, extension)
+        segments = self.voiced_segments(y, native_sr)
+        voiced_seconds = sum(end - start for start, end in segments) / native_sr if native_sr else 0.0
+
+        if segments:
+            window = self.select_window(y, native_sr, segments)
+        else:
+            # Nothing above the noise floor - analyze the start rather than nothing
+            window = y[:int(self.window_seconds * native_sr)]
+
+        if native_sr != self.target_sr and len(window):
+            window = librosa.resample(window, orig_sr=native_sr, target_sr=self.target_sr)
+
+        report = {
+            'decoded_seconds': round(len(y) / native_sr, 2) if native_sr else 0.0,
+            'voiced_seconds': round(voiced_seconds, 2),
+            'analyzed_seconds': round(len(window) / self.target_sr, 2),
+            'voiced_segments': len(segments),
+            'sampled': voiced_seconds > self.window_seconds,
+            'native_sample_rate': native_sr
+        }
+        return window.astype(np.float32, copy=False), self.target_sr, report
@@ -0,0 +1,349 @@
+# 🧠 Manas: Dictionary-Compressed JSON Storage
+# Shared-dictionary compression for the large Gemini analysis blobs stored in SQLite
+
+import argparse
+import json
+import logging
+import re
+import sqlite3
+import struct
+import threading
+import zlib
+from collections import Counter
+from typing import Dict, List, Optional, Any, Iterable, Tuple
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+    zstandard = None
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Encoded values start with a NUL byte so they can never be mistaken for JSON text
+MAGIC = b'\x00MZ'
+HEADER = struct.Struct('>3sBI')  # magic, codec id, dictionary id
+
+CODEC_ZLIB = ord('z')
+CODEC_ZSTD = ord('s')
+
+# zlib can only reference the last 32 KB of a preset dictionary
+ZLIB_DICTIONARY_SIZE = 32 * 1024
+ZSTD_DICTIONARY_SIZE = 64 * 1024
+
+# Blob columns holding Gemini analysis JSON, per table
+COMPRESSED_COLUMNS = {
+    'emotional_states': ['emotion_data'],
+    'therapy_sessions': ['content'],
+    'bullying_reports': ['report_data', 'ai_response']
+}
+
+
+class BlobCodec:
+    """Encode/decode JSON text columns with a trained shared dictionary.
+
+    Dictionaries are stored in the ``compression_dictionaries`` table and
+    referenced by id in every encoded value, so retraining never breaks rows
+    written with an older dictionary. Values written before the codec existed
+    are plain text and pass through ``decode`` untouched.
+    """
+
+    def __init__(self, db_path: str = 'manas_wellness.db', min_size: int = 128, level: int = 9):
+        """
+        Initialize codec
+
+        Args:
+            db_path: SQLite database holding the dictionaries
+            min_size: Values shorter than this (in bytes) are stored uncompressed
+            level: Compression level
+        """
+        self.db_path = db_path
+        self.min_size = min_size
+        self.level = level
+        self._dictionaries: Dict[int, Tuple[int, bytes]] = {}
+        self._active_id = 0
+        self._lock = threading.Lock()
+        self._loaded = False
+
+    # ==================== DICTIONARY STORAGE ====================
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def ensure_schema(self):
+        """Create the dictionary table"""
+        try:
+            conn = self._connect()
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS compression_dictionaries (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    codec TEXT NOT NULL,
+                    dictionary BLOB NOT NULL,
+                    sample_count INTEGER,
+                    active BOOLEAN DEFAULT FALSE,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            conn.commit()
+            conn.close()
+        except Exception as e:
+            logger.error(f"Compression dictionary schema error: {e}")
+
+    def _load_dictionaries(self):
+        """Load all stored dictionaries once per process"""
+        with self._lock:
+            if self._loaded:
+                return
+            try:
+                conn = self._connect()
+                rows = conn.execute('SELECT id, codec, dictionary, active FROM compression_dictionaries').fetchall()
+                conn.close()
+                for row in rows:
+                    codec_id = CODEC_ZSTD if row['codec'] == 'zstd' else CODEC_ZLIB
+                    self._dictionaries[row['id']] = (codec_id, bytes(row['dictionary']))
+                    if row['active']:
+                        self._active_id = row['id']
+            except sqlite3.Error as e:
+                logger.warning(f"Compression dictionaries unavailable: {e}")
+            self._loaded = True
+
+    def _dictionary(self, dict_id: int) -> Optional[Tuple[int, bytes]]:
+        self._load_dictionaries()
+        if dict_id not in self._dictionaries:
+            # Another worker may have trained a newer dictionary since we loaded
+            with self._lock:
+                self._loaded = False
+            self._load_dictionaries()
+        return self._dictionaries.get(dict_id)
+
+    # ==================== ENCODE / DECODE ====================
+
+    def encode(self, value: Optional[str]) -> Any:
+        """Compress a JSON string for storage; returns bytes or the original string"""
+        if value is None:
+            return None
+        raw = value.encode('utf-8')
+        if len(raw) < self.min_size:
+            return value
+        try:
+            self._load_dictionaries()
+            dict_id = self._active_id
+            codec_id, dictionary = self._dictionaries.get(dict_id, (CODEC_ZLIB, b''))
+            if codec_id == CODEC_ZSTD and ZSTD_AVAILABLE:
+                compressor = zstandard.ZstdCompressor(
+                    level=self.level, dict_data=zstandard.ZstdCompressionDict(dictionary)
+                )
+                payload = compressor.compress(raw)
+            else:
+                if codec_id == CODEC_ZSTD:
+                    # zstd dictionary active but library missing on this worker
+                    dict_id, dictionary, codec_id = 0, b'', CODEC_ZLIB
+                compressor = zlib.compressobj(self.level, zdict=dictionary) if dictionary else zlib.compressobj(self.level)
+                payload = compressor.compress(raw) + compressor.flush()
+            return HEADER.pack(MAGIC, codec_id, dict_id) + payload
+        except Exception as e:
+            logger.error(f"Blob encode error: {e}")
+            return value
+
+    def decode(self, value: Any) -> Optional[str]:
+        """Return the JSON string for a stored value, compressed or not"""
+        if value is None or isinstance(value, str):
+            return value
+        value = bytes(value)
+        if not value.startswith(MAGIC):
+            return value.decode('utf-8')
+        _, codec_id, dict_id = HEADER.unpack_from(value)
+        payload = value[HEADER.size:]
+        dictionary = b''
+        if dict_id:
+            stored = self._dictionary(dict_id)
+            if stored is None:
+                raise ValueError(f"Unknown compression dictionary {dict_id}")
+            dictionary = stored[1]
+        if codec_id == CODEC_ZSTD:
+            if not ZSTD_AVAILABLE:
+                raise RuntimeError("zstandard is required to read zstd-compressed rows")
+            decompressor = zstandard.ZstdDecompressor(dict_data=zstandard.ZstdCompressionDict(dictionary))
+            return decompressor.decompress(payload).decode('utf-8')
+        decompressor = zlib.decompressobj(zdict=dictionary) if dictionary else zlib.decompressobj()
+        return (decompressor.decompress(payload) + decompressor.flush()).decode('utf-8')
+
+    def decode_row(self, row: Any, columns: Iterable[str]) -> Dict[str, Any]:
+        """Convert a row to a dict with the given columns decoded"""
+        result = dict(row)
+        for column in columns:
+            if column in result:
+                try:
+                    result[column] = self.decode(result[column])
+                except Exception as e:
+                    logger.error(f"Blob decode error for {column}: {e}")
+                    result[column] = None
+        return result
+
+    # ==================== TRAINING ====================
+
+    def _sample_values(self, conn: sqlite3.Connection, sample_size: int) -> List[bytes]:
+        """Pull a random sample of decoded blob values across all compressed columns"""
+        samples = []
+        per_column = max(1, sample_size // sum(len(cols) for cols in COMPRESSED_COLUMNS.values()))
+        for table, columns in COMPRESSED_COLUMNS.items():
+            for column in columns:
+                try:
+                    rows = conn.execute(
+                        f"SELECT {column} FROM {table} WHERE {column} IS NOT NULL ORDER BY RANDOM() LIMIT ?",
+                        (per_column,)
+                    ).fetchall()
+                except sqlite3.Error:
+                    continue
+                for row in rows:
+                    try:
+                        text = self.decode(row[0])
+                    except Exception:
+                        continue
+                    if text:
+                        samples.append(text.encode('utf-8'))
+        return samples
+
+    @staticmethod
+    def _build_zlib_dictionary(samples: List[bytes], size: int = ZLIB_DICTIONARY_SIZE) -> bytes:
+        """Build a zlib preset dictionary from the most valuable repeated fragments.
+
+        zlib has no trainer, so JSON keys, string values and short phrases are
+        scored by ``occurrences * length`` and packed with the most valuable
+        fragments last, where deflate finds them at the shortest distance.
+        """
+        fragment_pattern = re.compile(rb'"[^"\\]{2,200}"\s*:\s*|"[^"\\]{4,400}"|[A-Za-z][A-Za-z ,.\'-]{12,200}')
+        counts = Counter()
+        for sample in samples:
+            counts.update(set(fragment_pattern.findall(sample)))
+        scored = sorted(
+            ((count * len(fragment), fragment) for fragment, count in counts.items() if count > 1),
+            reverse=True
+        )
+        chosen, total = [], 0
+        for _, fragment in scored:
+            if total + len(fragment) > size:
+                continue
+            chosen.append(fragment)
+            total += len(fragment)
+        return b''.join(reversed(chosen))
+
+    def train(self, sample_size: int = 2000, use_zstd: Optional[bool] = None) -> Optional[int]:
+        """
+        Train a new shared dictionary from stored blobs and make it active
+
+        Args:
+            sample_size: Number of existing values to sample
+            use_zstd: Force codec choice; defaults to zstd when installed
+
+        Returns:
+            New dictionary id, or None if there was not enough data
+        """
+        use_zstd = ZSTD_AVAILABLE if use_zstd is None else (use_zstd and ZSTD_AVAILABLE)
+        self.ensure_schema()
+        conn = self._connect()
+        try:
+            samples = self._sample_values(conn, sample_size)
+            if len(samples) < 10:
+                logger.warning(f"Only {len(samples)} samples available - skipping dictionary training")
+                return None
+
+            if use_zstd:
+                dictionary = zstandard.train_dictionary(ZSTD_DICTIONARY_SIZE, samples).as_bytes()
+                codec_name = 'zstd'
+            else:
+                dictionary = self._build_zlib_dictionary(samples)
+                codec_name = 'zlib'
+
+            conn.execute('UPDATE compression_dictionaries SET active = FALSE')
+            cursor = conn.execute('''
+                INSERT INTO compression_dictionaries (codec, dictionary, sample_count, active)
+                VALUES (?, ?, ?, TRUE)
+            ''', (codec_name, dictionary, len(samples)))
+            conn.commit()
+            dict_id = cursor.lastrowid
+        finally:
+            conn.close()
+
+        with self._lock:
+            self._loaded = False
+        self._load_dictionaries()
+        logger.info(f"Trained {codec_name} dictionary {dict_id} ({len(dictionary)} bytes from {len(samples)} samples)")
+        return dict_id
+
+    # ==================== MIGRATION ====================
+
+    def recompress_all(self, batch_size: int = 500) -> Dict[str, Any]:
+        """
+        One-off migration: re-encode every blob column with the active dictionary
+
+        Returns:
+            Row counts and byte totals before/after per table
+        """
+        summary = {}
+        conn = self._connect()
+        try:
+            for table, columns in COMPRESSED_COLUMNS.items():
+                stats = {'rows': 0, 'bytes_before': 0, 'bytes_after': 0}
+                last_id = 0
+                while True:
+                    try:
+                        rows = conn.execute(
+                            f"SELECT id, {', '.join(columns)} FROM {table} WHERE id > ? ORDER BY id LIMIT ?",
+                            (last_id, batch_size)
+                        ).fetchall()
+                    except sqlite3.Error as e:
+                        logger.warning(f"Skipping {table}: {e}")
+                        break
+                    if not rows:
+                        break
+                    updates = []
+                    for row in rows:
+                        new_values = []
+                        for column in columns:
+                            stored = row[column]
+                            stats['bytes_before'] += len(stored) if stored is not None else 0
+                            encoded = self.encode(self.decode(stored))
+                            stats['bytes_after'] += len(encoded) if encoded is not None else 0
+                            new_values.append(encoded)
+                        updates.append(new_values + [row['id']])
+                    conn.executemany(
+                        f"UPDATE {table} SET {', '.join(f'{c} = ?' for c in columns)} WHERE id = ?",
+                        updates
+                    )
+                    conn.commit()
+                    stats['rows'] += len(rows)
+                    last_id = rows[-1]['id']
+                summary[table] = stats
+                logger.info(f"Recompressed {table}: {stats}")
+        finally:
+            conn.close()
+        return summary
+
+
+def main():
+    """Command-line entry point: train a dictionary and/or recompress existing rows"""
+    parser = argparse.ArgumentParser(description='Dictionary compression for analysis blobs')
+    parser.add_argument('command', choices=['train', 'migrate'], help='train: new dictionary; migrate: train then recompress all rows')
+    parser.add_argument('--db', default='manas_wellness.db', help='Database path')
+    parser.add_argument('--samples', type=int, default=2000, help='Values sampled for training')
+    parser.add_argument('--zlib', action='store_true', help='Use zlib even if zstandard is installed')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    codec = BlobCodec(args.db)
+    dict_id = codec.train(args.samples, use_zstd=not args.zlib)
+    print(f"Active dictionary: {dict_id}")
+    if args.command == 'migrate':
+        print(json.dumps(codec.recompress_all(), indent=2))
+        conn = sqlite3.connect(args.db)
+        conn.execute('VACUUM')
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()
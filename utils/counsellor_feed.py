@@ -0,0 +1,290 @@
+# 🧠 Manas: Counsellor Crisis Feed
+# Append-only event log of crisis alerts and high-risk reports, pushed to counsellors per institution
+#
+# Usage: python -m utils.counsellor_feed [--db manas_wellness.db] add-counsellor <user_id> <institution_id>
+#        python -m utils.counsellor_feed [--db manas_wellness.db] assign-student <user_id> <institution_id>
+
+import argparse
+import json
+import logging
+import os
+import sqlite3
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+DEFAULT_INSTITUTION_ID = os.environ.get('DEFAULT_INSTITUTION_ID', 'default')
+# Events sent per backlog message on (re)subscribe
+REPLAY_BATCH_SIZE = 200
+# Older events are not replayed; the dashboard loads history through the REST API instead
+REPLAY_MAX_EVENTS = 1000
+
+# Bullying reports at these crisis levels reach the dashboard
+FLAGGED_REPORT_LEVELS = frozenset({'high'})
+
+COUNSELLOR_NAMESPACE = '/counsellor'
+
+
+def institution_room(institution_id: str) -> str:
+    """Socket.IO room of the counsellors of one institution"""
+    return f"institution:{institution_id}"
+
+
+class CounsellorFeed:
+    """Crisis events for counsellor dashboards.
+
+    Every crisis alert (and alert update) and every bullying report flagged
+    high is appended to ``crisis_events`` inside the transaction that
+    writes it, then broadcast once to the room of the student's institution.
+    Event ids are monotonic, so a reconnecting dashboard passes the last id
+    it saw and receives only what it missed; no client ever polls the
+    database.
+    """
+
+    def __init__(self, db_path: str = 'manas_wellness.db', default_institution: str = DEFAULT_INSTITUTION_ID):
+        """
+        Args:
+            db_path: SQLite database
+            default_institution: Institution for users without one (and anonymous reports)
+        """
+        self.db_path = db_path
+        self.default_institution = default_institution
+        self.publish: Optional[Callable[[Dict[str, Any]], None]] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=5)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def ensure_schema(self):
+        """Create the event log and counsellor tables, and the users.institution_id column"""
+        conn = self._connect()
+        try:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS crisis_events (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    institution_id TEXT NOT NULL,
+                    kind TEXT NOT NULL,
+                    ref_id INTEGER,
+                    payload TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                )
+            ''')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_crisis_events_institution ON crisis_events (institution_id, id)')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS counsellors (
+                    user_id TEXT PRIMARY KEY,
+                    institution_id TEXT NOT NULL
+                )
+            ''')
+            columns = {row['name'] for row in conn.execute('PRAGMA table_info(users)')}
+            if columns and 'institution_id' not in columns:
+                conn.execute('ALTER TABLE users ADD COLUMN institution_id TEXT')
+            conn.commit()
+        finally:
+            conn.close()
+
+    # ==================== EVENTS ====================
+
+    def institution_of(self, conn: sqlite3.Connection, user_id: Optional[str]) -> str:
+        if user_id:
+            row = conn.execute('SELECT institution_id FROM users WHERE user_id = ?', (user_id,)).fetchone()
+            if row is not None and row[0]:
+                return row[0]
+        return self.default_institution
+
+    def append(self, conn: sqlite3.Connection, kind: str, ref_id: Optional[int], user_id: Optional[str],
+               payload: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Add an event using the caller's connection (so it commits or rolls back with the record it describes)
+
+        Args:
+            conn: Open connection inside the writer's transaction
+            kind: 'crisis_alert', 'alert_updated' or 'bullying_report'
+            ref_id: Id of the crisis_alerts / bullying_reports row
+            user_id: Student the event concerns (None for anonymous reports)
+            payload: Dashboard fields (no free text from the student)
+
+        Returns:
+            The event, to pass to ``broadcast`` after commit
+        """
+        institution_id = self.institution_of(conn, user_id)
+        created_at = time.time()
+        cursor = conn.execute('''
+            INSERT INTO crisis_events (institution_id, kind, ref_id, payload, created_at)
+            VALUES (?, ?, ?, ?, ?)
+        ''', (institution_id, kind, ref_id, json.dumps(payload, default=str), created_at))
+        return {'id': cursor.lastrowid, 'institution_id': institution_id, 'kind': kind, 'ref_id': ref_id,
+                'payload': payload, 'created_at': created_at}
+
+    def broadcast(self, event: Optional[Dict[str, Any]]):
+        """Push a committed event to its institution's room (one emit, however many counsellors)"""
+        if event is None or self.publish is None:
+            return
+        try:
+            self.publish(event)
+        except Exception as e:
+            logger.error(f"Counsellor feed broadcast error: {e}")
+
+    def replay(self, institution_id: str, after_id: int = 0, limit: int = REPLAY_MAX_EVENTS) -> List[Dict[str, Any]]:
+        """Events of an institution after ``after_id`` (the newest ``limit`` of them), oldest first"""
+        conn = self._connect()
+        try:
+            rows = conn.execute('''
+                SELECT * FROM crisis_events
+                WHERE institution_id = ? AND id > ?
+                ORDER BY id DESC
+                LIMIT ?
+            ''', (institution_id, after_id, limit)).fetchall()
+        finally:
+            conn.close()
+        return [dict(row, payload=json.loads(row['payload'])) for row in reversed(rows)]
+
+    # ==================== COUNSELLORS ====================
+
+    def counsellor_institution(self, user_id: Optional[str]) -> Optional[str]:
+        """Institution a counsellor may watch, or None if ``user_id`` is not a counsellor"""
+        if not user_id:
+            return None
+        conn = self._connect()
+        try:
+            row = conn.execute('SELECT institution_id FROM counsellors WHERE user_id = ?', (user_id,)).fetchone()
+        finally:
+            conn.close()
+        return row[0] if row else None
+
+    def add_counsellor(self, user_id: str, institution_id: str):
+        conn = self._connect()
+        try:
+            conn.execute('INSERT OR REPLACE INTO counsellors (user_id, institution_id) VALUES (?, ?)',
+                         (user_id, institution_id))
+            conn.commit()
+        finally:
+            conn.close()
+
+    def assign_institution(self, user_id: str, institution_id: str) -> bool:
+        """
+        Set the institution whose counsellors receive a student's alerts (admin step, never client input)
+
+        Returns:
+            False if there is no such user
+        """
+        conn = self._connect()
+        try:
+            updated = conn.execute('UPDATE users SET institution_id = ? WHERE user_id = ?',
+                                   (institution_id, user_id)).rowcount
+            conn.commit()
+        finally:
+            conn.close()
+        return updated > 0
+
+    def acknowledge_alert(self, alert_id: int, counsellor_id: str, institution_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Mark a crisis alert resolved by a counsellor of the student's institution
+
+        Returns:
+            The broadcast 'alert_updated' event, or None if the alert is not visible to the counsellor
+        """
+        conn = self._connect()
+        try:
+            alert = conn.execute('SELECT user_id, alert_type FROM crisis_alerts WHERE id = ?', (alert_id,)).fetchone()
+            if alert is None or self.institution_of(conn, alert['user_id']) != institution_id:
+                return None
+            conn.execute('UPDATE crisis_alerts SET resolved = TRUE WHERE id = ?', (alert_id,))
+            event = self.append(conn, 'alert_updated', alert_id, alert['user_id'], {
+                'alert_id': alert_id, 'alert_type': alert['alert_type'],
+                'resolved': True, 'acknowledged_by': counsellor_id
+            })
+            conn.commit()
+        finally:
+            conn.close()
+        self.broadcast(event)
+        return event
+
+
+def register_counsellor_feed_handlers(socketio, feed: CounsellorFeed, namespace: str = COUNSELLOR_NAMESPACE):
+    """
+    Socket.IO protocol for the counsellor dashboard
+
+    Client -> server: ``subscribe`` {cursor}, ``acknowledge`` {alert_id}
+    Server -> client: ``backlog`` {events, cursor, truncated}, ``crisis_event`` {...}, ``error`` {...}
+
+    The client keeps the id of the last event it processed and sends it as
+    ``cursor`` when it (re)subscribes. It joins the room before the backlog
+    is read, so an event may arrive both live and in the backlog; clients
+    skip ids at or below their cursor.
+
+    Args:
+        socketio: flask_socketio.SocketIO instance
+        feed: CounsellorFeed
+        namespace: Socket.IO namespace
+    """
+    from flask import session
+    from flask_socketio import emit, join_room
+
+    def publish(event: Dict[str, Any]):
+        socketio.emit('crisis_event', event, to=institution_room(event['institution_id']), namespace=namespace)
+
+    feed.publish = publish
+
+    @socketio.on('connect', namespace=namespace)
+    def handle_connect(auth=None):
+        # Only counsellors may connect
+        if feed.counsellor_institution(session.get('user_id')) is None:
+            return False
+
+    @socketio.on('subscribe', namespace=namespace)
+    def handle_subscribe(data=None):
+        institution_id = feed.counsellor_institution(session.get('user_id'))
+        if institution_id is None:
+            emit('error', {'error': 'Not a counsellor'})
+            return
+        join_room(institution_room(institution_id))
+        cursor = int((data or {}).get('cursor') or 0)
+        events = feed.replay(institution_id, cursor)
+        truncated = len(events) == REPLAY_MAX_EVENTS
+        for start in range(0, len(events), REPLAY_BATCH_SIZE):
+            batch = events[start:start + REPLAY_BATCH_SIZE]
+            emit('backlog', {'events': batch, 'cursor': batch[-1]['id'], 'truncated': truncated})
+        if not events:
+            emit('backlog', {'events': [], 'cursor': cursor, 'truncated': False})
+
+    @socketio.on('acknowledge', namespace=namespace)
+    def handle_acknowledge(data=None):
+        user_id = session.get('user_id')
+        institution_id = feed.counsellor_institution(user_id)
+        alert_id = (data or {}).get('alert_id')
+        if institution_id is None or alert_id is None:
+            emit('error', {'error': 'Not allowed'})
+            return
+        if feed.acknowledge_alert(int(alert_id), user_id, institution_id) is None:
+            emit('error', {'error': 'Alert not found'})
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Manage counsellor access to the crisis dashboard')
+    parser.add_argument('--db', default='manas_wellness.db', help='SQLite database path')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    add = subparsers.add_parser('add-counsellor', help='Allow a user to watch an institution')
+    add.add_argument('user_id')
+    add.add_argument('institution_id')
+    assign = subparsers.add_parser('assign-student', help="Route a student's alerts to an institution")
+    assign.add_argument('user_id')
+    assign.add_argument('institution_id')
+    args = parser.parse_args()
+
+    feed = CounsellorFeed(args.db)
+    feed.ensure_schema()
+    if args.command == 'add-counsellor':
+        feed.add_counsellor(args.user_id, args.institution_id)
+        print(f"{args.user_id} can now watch institution {args.institution_id}")
+    elif feed.assign_institution(args.user_id, args.institution_id):
+        print(f"Alerts for {args.user_id} now go to institution {args.institution_id}")
+    else:
+        print(f"No user {args.user_id}")
+
+
+if __name__ == '__main__':
+    main()
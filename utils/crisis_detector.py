@@ -8,100 +8,109 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any, Tuple
 import numpy as np
 
+from .crisis_lexicon import SCORED_CATEGORIES, get_crisis_lexicon
 from .gemini_api import generate_crisis_intervention, gemini_text
+from .preload import freeze
+from .risk_history import RiskHistory
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# ==================== SHARED TABLES ====================
+
+# Crisis indicators and their weights
+CRISIS_INDICATORS = freeze({
+    'emotional': {
+        'suicidal_ideation': 1.0,
+        'self_harm': 0.9,
+        'hopelessness': 0.8,
+        'severe_depression': 0.7,
+        'panic_attacks': 0.6,
+        'extreme_anxiety': 0.6,
+        'anger_outbursts': 0.5,
+        'emotional_numbness': 0.5
+    },
+    'behavioral': {
+        'social_withdrawal': 0.6,
+        'sleep_disruption': 0.4,
+        'appetite_changes': 0.4,
+        'academic_decline': 0.5,
+        'substance_use': 0.7,
+        'risky_behavior': 0.6,
+        'giving_away_possessions': 0.8,
+        'sudden_mood_improvement': 0.7  # Can indicate decision to harm
+    },
+    'cognitive': {
+        'concentration_problems': 0.4,
+        'memory_issues': 0.3,
+        'negative_self_talk': 0.6,
+        'catastrophic_thinking': 0.5,
+        'decision_making_difficulty': 0.4,
+        'confusion': 0.4
+    },
+    'physical': {
+        'fatigue': 0.3,
+        'headaches': 0.2,
+        'stomach_problems': 0.2,
+        'muscle_tension': 0.3,
+        'rapid_heartbeat': 0.4,
+        'breathing_difficulty': 0.5
+    }
+})
+
+# Weights of the factors combined by assess_risk (also used by the population re-scoring job)
+RISK_FACTOR_WEIGHTS = freeze({'base': 0.5, 'text': 0.3, 'historical': 0.2})
+
+# Emergency contacts for India (returned in API responses, so kept as plain dicts)
+EMERGENCY_CONTACTS = {
+    'national': [
+        {'name': 'AASRA', 'number': '91-22-27546669', 'hours': '24/7'},
+        {'name': 'Sneha', 'number': '044-24640050', 'hours': '24/7'},
+        {'name': 'Vandrevala Foundation', 'number': '1860-2662-345', 'hours': '24/7'},
+        {'name': 'iCall', 'number': '022-25521111', 'hours': '10 AM - 8 PM'},
+        {'name': 'Connecting Trust', 'number': '040-67138888', 'hours': '24/7'}
+    ],
+    'emergency': [
+        {'name': 'Emergency Services', 'number': '112', 'type': 'immediate_danger'},
+        {'name': 'Police', 'number': '100', 'type': 'immediate_danger'},
+        {'name': 'Medical Emergency', 'number': '108', 'type': 'medical'}
+    ]
+}
+
+
 class CrisisDetector:
     """Advanced crisis detection and intervention system"""
     
-    def __init__(self):
-        """Initialize crisis detection system"""
-        # Crisis indicators and their weights
-        self.crisis_indicators = {
-            'emotional': {
-                'suicidal_ideation': 1.0,
-                'self_harm': 0.9,
-                'hopelessness': 0.8,
-                'severe_depression': 0.7,
-                'panic_attacks': 0.6,
-                'extreme_anxiety': 0.6,
-                'anger_outbursts': 0.5,
-                'emotional_numbness': 0.5
-            },
-            'behavioral': {
-                'social_withdrawal': 0.6,
-                'sleep_disruption': 0.4,
-                'appetite_changes': 0.4,
-                'academic_decline': 0.5,
-                'substance_use': 0.7,
-                'risky_behavior': 0.6,
-                'giving_away_possessions': 0.8,
-                'sudden_mood_improvement': 0.7  # Can indicate decision to harm
-            },
-            'cognitive': {
-                'concentration_problems': 0.4,
-                'memory_issues': 0.3,
-                'negative_self_talk': 0.6,
-                'catastrophic_thinking': 0.5,
-                'decision_making_difficulty': 0.4,
-                'confusion': 0.4
-            },
-            'physical': {
-                'fatigue': 0.3,
-                'headaches': 0.2,
-                'stomach_problems': 0.2,
-                'muscle_tension': 0.3,
-                'rapid_heartbeat': 0.4,
-                'breathing_difficulty': 0.5
-            }
-        }
-        
-        # Crisis keywords for text analysis
-        self.crisis_keywords = {
-            'high_risk': [
-                'suicide', 'kill myself', 'end it all', 'not worth living',
-                'better off dead', 'want to die', 'hurt myself', 'cut myself',
-                'overdose', 'jump', 'hang', 'gun', 'pills'
-            ],
-            'moderate_risk': [
-                'hopeless', 'worthless', 'useless', 'burden', 'trapped',
-                'no way out', 'give up', 'can\'t go on', 'too much',
-                'overwhelming', 'exhausted', 'empty', 'numb'
-            ],
-            'warning_signs': [
-                'goodbye', 'sorry for everything', 'forgive me',
-                'take care of', 'won\'t need', 'final', 'last time',
-                'always remember', 'love you all'
-            ]
-        }
+    def __init__(self, db_path: str = 'manas_wellness.db'):
+        """
+        Initialize crisis detection system
         
-        # Emergency contacts for India
-        self.emergency_contacts = {
-            'national': [
-                {'name': 'AASRA', 'number': '91-22-27546669', 'hours': '24/7'},
-                {'name': 'Sneha', 'number': '044-24640050', 'hours': '24/7'},
-                {'name': 'Vandrevala Foundation', 'number': '1860-2662-345', 'hours': '24/7'},
-                {'name': 'iCall', 'number': '022-25521111', 'hours': '10 AM - 8 PM'},
-                {'name': 'Connecting Trust', 'number': '040-67138888', 'hours': '24/7'}
-            ],
-            'emergency': [
-                {'name': 'Emergency Services', 'number': '112', 'type': 'immediate_danger'},
-                {'name': 'Police', 'number': '100', 'type': 'immediate_danger'},
-                {'name': 'Medical Emergency', 'number': '108', 'type': 'medical'}
-            ]
-        }
+        Args:
+            db_path: SQLite database holding per-user risk state
+        """
+        # Shared, read-only module tables (see SHARED TABLES above)
+        self.crisis_indicators = CRISIS_INDICATORS
+        self.emergency_contacts = EMERGENCY_CONTACTS
+        # Crisis terms (English, Hindi, Hinglish) compiled into one word-bounded scan
+        self.lexicon = get_crisis_lexicon()
+        self.crisis_keywords = {category: self.lexicon.terms[category] for category in SCORED_CATEGORIES}
+        # Running per-user risk state, one row per user
+        self.risk_history = RiskHistory(db_path)
         
         logger.info("CrisisDetector initialized successfully")
     
-    def assess_risk(self, emotion_result: Dict[str, Any], user_id: str) -> Dict[str, Any]:
+    def assess_risk(self, emotion_result: Dict[str, Any], user_id: str, use_ai: bool = True,
+                    record: bool = True) -> Dict[str, Any]:
         """
         Assess crisis risk based on emotion analysis and user history
         
         Args:
             emotion_result: Current emotion analysis result
             user_id: User identifier
+            use_ai: Include Gemini's reading of the text; False gives the
+                local screen (lexicon + history) without any network call
+            record: Fold the result into the user's risk history (skip when
+                a confirmed assessment will be recorded instead)
         
         Returns:
             Risk assessment with level and recommendations
@@ -113,28 +122,20 @@ class CrisisDetector:
             # Analyze text content if available
             text_risk = 0.0
             if 'text_content' in emotion_result:
-                text_risk = self._analyze_text_for_crisis(emotion_result['text_content'])
+                text_risk = self._analyze_text_for_crisis(emotion_result['text_content'], use_ai=use_ai)
             
             # Get historical risk patterns
-            historical_risk = self._get_historical_risk_pattern(user_id)
-            
-            # Combine risk factors
-            combined_risk = self._combine_risk_factors(base_risk, text_risk, historical_risk)
-            
-            # Generate risk assessment
-            risk_assessment = {
-                'risk_level': combined_risk,
-                'risk_category': self._categorize_risk(combined_risk),
-                'contributing_factors': self._identify_risk_factors(emotion_result),
-                'immediate_actions': self._get_immediate_actions(combined_risk),
-                'monitoring_required': combined_risk >= 0.3,
-                'professional_referral': combined_risk >= 0.6,
-                'emergency_intervention': combined_risk >= 0.8,
-                'timestamp': datetime.now().isoformat()
-            }
+            history = self._get_historical_risk_pattern(user_id)
+            historical_risk = self.risk_history.historical_risk(history)
+            
+            risk_assessment = self._build_assessment(
+                {'base': base_risk, 'text': text_risk, 'historical': historical_risk},
+                self._identify_risk_factors(emotion_result), history
+            )
             
             # Log risk assessment
-            self._log_risk_assessment(user_id, risk_assessment)
+            if record:
+                self._log_risk_assessment(user_id, risk_assessment)
             
             return risk_assessment
             
@@ -148,6 +149,81 @@ class CrisisDetector:
                 'emergency_intervention': False
             }
     
+    def confirm_assessment(self, assessment: Dict[str, Any], text: str, user_id: str) -> Dict[str, Any]:
+        """
+        Re-score a local screen (assess_risk with use_ai=False) with Gemini's reading of the text
+        
+        Args:
+            assessment: The screen's result
+            text: The text that was screened
+            user_id: User identifier
+        
+        Returns:
+            The confirmed assessment (recorded in the user's risk history)
+        """
+        factors = dict(assessment['factors'])
+        factors['text'] = self._analyze_text_for_crisis(text, use_ai=True)
+        confirmed = self._build_assessment(factors, assessment.get('contributing_factors', []),
+                                           assessment.get('history', {}))
+        self._log_risk_assessment(user_id, confirmed)
+        return confirmed
+    
+    def _build_assessment(self, factors: Dict[str, float], contributing_factors: List[str],
+                          history: Dict[str, Any]) -> Dict[str, Any]:
+        """Assessment dict from the base, text and historical risk factors"""
+        # Combine risk factors
+        combined_risk = self._combine_risk_factors(factors['base'], factors['text'], factors['historical'])
+        
+        return {
+            'risk_level': combined_risk,
+            'risk_category': self._categorize_risk(combined_risk),
+            'contributing_factors': contributing_factors,
+            'immediate_actions': self._get_immediate_actions(combined_risk),
+            'monitoring_required': combined_risk >= 0.3,
+            'professional_referral': combined_risk >= 0.6,
+            'emergency_intervention': combined_risk >= 0.8,
+            'factors': factors,
+            'history': history,
+            'timestamp': datetime.now().isoformat()
+        }
+    
+    def analyze_text(self, text: str) -> Dict[str, Any]:
+        """
+        Fast keyword screen of free text (journal entries, reports, voice commands)
+        
+        Args:
+            text: Text to screen
+        
+        Returns:
+            risk_level ('high', 'moderate' or 'low'), keyword score, matched
+            terms with positions, and resources when risk is present
+        """
+        try:
+            analysis = self.lexicon.analyze(text)
+            categories = analysis['categories']
+            if categories['high_risk']:
+                risk_level = 'high'
+            elif categories['moderate_risk'] or categories['warning_signs']:
+                risk_level = 'moderate'
+            else:
+                risk_level = 'low'
+            
+            result = {
+                'risk_level': risk_level,
+                'risk_score': analysis['score'],
+                'matched_terms': sorted({m['term'] for m in analysis['matches'] if not m['negated']}),
+                'matches': analysis['matches'],
+                'timestamp': datetime.now().isoformat()
+            }
+            if risk_level != 'low':
+                result['immediate_actions'] = self._get_immediate_actions(0.8 if risk_level == 'high' else 0.5)
+                result['emergency_contacts'] = self.emergency_contacts
+            return result
+            
+        except Exception as e:
+            logger.error(f"Text screening error: {e}")
+            return {'risk_level': 'low', 'risk_score': 0.0, 'matched_terms': [], 'matches': []}
+    
     def analyze_risk_level(self, user_data: Dict[str, Any]) -> float:
         """
         Analyze overall risk level from comprehensive user data
@@ -159,25 +235,7 @@ class CrisisDetector:
             Risk level score (0-1)
         """
         try:
-            total_risk = 0.0
-            factor_count = 0
-            
-            # Analyze each category of indicators
-            for category, indicators in self.crisis_indicators.items():
-                if category in user_data:
-                    category_data = user_data[category]
-                    for indicator, weight in indicators.items():
-                        if indicator in category_data:
-                            # Normalize indicator value (assume 0-10 scale)
-                            indicator_value = category_data[indicator] / 10.0
-                            total_risk += indicator_value * weight
-                            factor_count += 1
-            
-            # Calculate average weighted risk
-            if factor_count > 0:
-                average_risk = total_risk / factor_count
-            else:
-                average_risk = 0.0
+            average_risk = self._indicator_risk(user_data)
             
             # Apply additional analysis using AI
             ai_risk = self._ai_risk_analysis(user_data)
@@ -191,19 +249,83 @@ class CrisisDetector:
             logger.error(f"Risk level analysis error: {e}")
             return 0.5  # Default to moderate risk for safety
     
-    def emergency_protocol(self, user_id: str) -> Dict[str, Any]:
+    def screen_risk_level(self, user_data: Dict[str, Any], user_id: Optional[str] = None) -> float:
+        """
+        Local risk screen of user data: weighted indicators plus the user's history, no AI call
+        
+        Args:
+            user_data: Comprehensive user data including emotions, behaviors, etc.
+            user_id: User identifier, to include the historical factor
+        
+        Returns:
+            Risk level score (0-1)
+        """
+        try:
+            risk = self._indicator_risk(user_data)
+            if user_id:
+                historical_risk = self.risk_history.historical_risk(self._get_historical_risk_pattern(user_id))
+                risk = risk * 0.8 + historical_risk * 0.2
+            return min(risk, 1.0)
+            
+        except Exception as e:
+            logger.error(f"Risk screen error: {e}")
+            return 0.5  # Default to moderate risk for safety
+    
+    def confirm_risk_level(self, screen_risk: float, user_data: Dict[str, Any]) -> float:
+        """Combine a local screen with Gemini's analysis of the same user data (0-1)"""
+        return min((screen_risk * 0.7) + (self._ai_risk_analysis(user_data) * 0.3), 1.0)
+    
+    def intervention_for(self, risk_level: float, user_id: str, ai_content: bool = True) -> Dict[str, Any]:
+        """
+        Intervention plan matching a risk level
+        
+        Args:
+            risk_level: Risk level score (0-1)
+            user_id: User identifier
+            ai_content: Include Gemini-generated intervention content
+        
+        Returns:
+            Emergency protocol (>= 0.8), support resources (>= 0.5) or preventative guidance
+        """
+        if risk_level >= 0.8:
+            return self.emergency_protocol(user_id, ai_content=ai_content)
+        if risk_level >= 0.5:
+            return self.support_resources(user_id, ai_content=ai_content)
+        return self.preventative_guidance(user_id, ai_content=ai_content)
+    
+    def _indicator_risk(self, user_data: Dict[str, Any]) -> float:
+        """Average weighted risk of the crisis indicators present in user data"""
+        total_risk = 0.0
+        factor_count = 0
+        
+        # Analyze each category of indicators
+        for category, indicators in self.crisis_indicators.items():
+            if category in user_data:
+                category_data = user_data[category]
+                for indicator, weight in indicators.items():
+                    if indicator in category_data:
+                        # Normalize indicator value (assume 0-10 scale)
+                        indicator_value = category_data[indicator] / 10.0
+                        total_risk += indicator_value * weight
+                        factor_count += 1
+        
+        # Calculate average weighted risk
+        return total_risk / factor_count if factor_count > 0 else 0.0
+    
+    def emergency_protocol(self, user_id: str, ai_content: bool = True) -> Dict[str, Any]:
         """
         Execute emergency protocol for high-risk situations
         
         Args:
             user_id: User identifier
+            ai_content: Include Gemini-generated intervention content
         
         Returns:
             Emergency intervention plan
         """
         try:
             # Generate immediate intervention content
-            intervention_content = generate_crisis_intervention(0.9, {'emergency': True})
+            intervention_content = generate_crisis_intervention(0.9, {'emergency': True}) if ai_content else None
             
             # Create emergency action plan
             emergency_plan = {
@@ -242,19 +364,20 @@ class CrisisDetector:
                 'error': str(e)
             }
     
-    def support_resources(self, user_id: str) -> Dict[str, Any]:
+    def support_resources(self, user_id: str, ai_content: bool = True) -> Dict[str, Any]:
         """
         Provide support resources for moderate-risk situations
         
         Args:
             user_id: User identifier
+            ai_content: Include Gemini-generated intervention content
         
         Returns:
             Support resources and intervention plan
         """
         try:
             # Generate support intervention content
-            intervention_content = generate_crisis_intervention(0.6, {'support_needed': True})
+            intervention_content = generate_crisis_intervention(0.6, {'support_needed': True}) if ai_content else None
             
             support_plan = {
                 'support_resources': [
@@ -302,19 +425,20 @@ class CrisisDetector:
                 'error': str(e)
             }
     
-    def preventative_guidance(self, user_id: str) -> Dict[str, Any]:
+    def preventative_guidance(self, user_id: str, ai_content: bool = True) -> Dict[str, Any]:
         """
         Provide preventative mental health guidance
         
         Args:
             user_id: User identifier
+            ai_content: Include Gemini-generated intervention content
         
         Returns:
             Preventative guidance and wellness plan
         """
         try:
             # Generate preventative content
-            intervention_content = generate_crisis_intervention(0.2, {'preventative': True})
+            intervention_content = generate_crisis_intervention(0.2, {'preventative': True}) if ai_content else None
             
             prevention_plan = {
                 'wellness_activities': [
@@ -370,26 +494,13 @@ class CrisisDetector:
                 'error': str(e)
             }
     
-    def _analyze_text_for_crisis(self, text: str) -> float:
-        """Analyze text content for crisis indicators"""
+    def _analyze_text_for_crisis(self, text: str, use_ai: bool = True) -> float:
+        """Analyze text content for crisis indicators (keywords only when use_ai is False)"""
         try:
-            text_lower = text.lower()
-            risk_score = 0.0
-            
-            # Check for high-risk keywords
-            for keyword in self.crisis_keywords['high_risk']:
-                if keyword in text_lower:
-                    risk_score += 0.3
-            
-            # Check for moderate-risk keywords
-            for keyword in self.crisis_keywords['moderate_risk']:
-                if keyword in text_lower:
-                    risk_score += 0.1
-            
-            # Check for warning signs
-            for keyword in self.crisis_keywords['warning_signs']:
-                if keyword in text_lower:
-                    risk_score += 0.2
+            # One pass over the text for every crisis term
+            risk_score = self.lexicon.score(self.lexicon.scan(text))
+            if not use_ai:
+                return risk_score
             
             # Use AI for contextual analysis
             ai_analysis = self._ai_text_analysis(text)
@@ -466,22 +577,20 @@ class CrisisDetector:
             logger.error(f"AI risk analysis error: {e}")
             return 0.0
     
-    def _get_historical_risk_pattern(self, user_id: str) -> float:
-        """Get historical risk pattern for user"""
+    def _get_historical_risk_pattern(self, user_id: str) -> Dict[str, Any]:
+        """Get historical risk pattern for user (one primary-key lookup of user_risk_state)"""
         try:
-            # In production, this would query the database for historical data
-            # For now, return default
-            return 0.0
+            return self.risk_history.get_state(user_id)
             
         except Exception as e:
             logger.error(f"Historical risk pattern error: {e}")
-            return 0.0
+            return {}
     
     def _combine_risk_factors(self, base_risk: float, text_risk: float, historical_risk: float) -> float:
         """Combine different risk factors into overall risk score"""
         try:
             # Weighted combination
-            weights = {'base': 0.5, 'text': 0.3, 'historical': 0.2}
+            weights = RISK_FACTOR_WEIGHTS
             
             combined = (base_risk * weights['base'] + 
                        text_risk * weights['text'] + 
@@ -553,7 +662,7 @@ class CrisisDetector:
     def _log_risk_assessment(self, user_id: str, assessment: Dict[str, Any]):
         """Log risk assessment to database"""
         try:
-            # In production, this would log to database
+            self.risk_history.record(user_id, assessment['risk_level'], assessment['risk_category'])
             logger.info(f"Risk assessment for user {user_id}: {assessment['risk_category']}")
         except Exception as e:
             logger.error(f"Risk assessment logging error: {e}")
@@ -575,10 +684,8 @@ class CrisisDetector:
     def _notify_support_system(self, user_id: str, alert_type: str):
         """Notify support system of crisis situation"""
         try:
-            # In production, this would trigger notifications to:
-            # - Emergency contacts
-            # - Mental health professionals
-            # - Support network
+            # SMS / webhook / email delivery is queued with the crisis_alerts row
+            # (utils.crisis_outbox, via CrisisPipeline); this only leaves a trace in the log
             logger.critical(f"Support system notification: {alert_type} for user {user_id}")
         except Exception as e:
             logger.error(f"Support system notification error: {e}")
\ No newline at end of file
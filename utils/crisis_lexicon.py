@@ -0,0 +1,253 @@
+# 🧠 Manas: Crisis Lexicon
+# One compiled, word-bounded scan for crisis, warning, distress and negation terms (English, Hindi, Hinglish)
+
+import logging
+import re
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+from .preload import freeze
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Devanagari vowel signs are not \w, so they are listed explicitly (as in TOKEN_PATTERN
+# of utils.text_emotion_model); a term only matches as whole words
+WORD_CHARS = r'\wऀ-ॿ'
+WORD_PATTERN = re.compile(f'[{WORD_CHARS}]+')
+
+# Categories in priority order: a term listed twice belongs to the first one
+ENGLISH_TERMS = {
+    'high_risk': [
+        'suicide', 'suicidal', 'kill myself', 'end it all', 'end my life', 'take my own life',
+        'not worth living', 'no point living', 'no reason to live', 'better off dead', 'want to die',
+        'hurt myself', 'cut myself', 'self harm', 'overdose', 'jump', 'hang', 'gun', 'pills',
+    ],
+    'moderate_risk': [
+        'hopeless', 'worthless', 'useless', 'burden', 'trapped', 'no way out', 'give up',
+        "can't go on", "can't take it", 'too much', 'overwhelming', 'exhausted', 'empty', 'numb',
+        'depressed', 'alone', 'no one cares',
+    ],
+    'warning_signs': [
+        'goodbye', 'sorry for everything', 'forgive me', 'take care of', "won't need", 'final',
+        'last time', 'always remember', 'love you all',
+    ],
+    # Calls for help; not scored, but enough to surface support (e.g. voice commands)
+    'distress': ['help', 'emergency', 'crisis', 'hurt', 'scared', 'unsafe'],
+    # Negation before a term ("not hopeless")
+    'negation': ['not', 'never', 'no', "don't", "do not", "didn't", "won't", "wouldn't", "isn't", "am not"],
+}
+
+# Hinglish and Hindi; only these terms can be negated by a following 'nahi' ("bekaar nahi hoon")
+HINDI_TERMS = {
+    'high_risk': [
+        'khudkushi', 'aatmahatya', 'atmahatya', 'marna chahta', 'marna chahti', 'mar jana chahta',
+        'mar jana chahti', 'mar jaana chahta', 'mar jaana chahti', 'jeena nahi chahta', 'jeena nahi chahti',
+        'zindagi khatam', 'khud ko maar', 'khud ko nuksan',
+        'आत्महत्या', 'खुदकुशी', 'मरना चाहता', 'मरना चाहती', 'मर जाना चाहता', 'मर जाना चाहती',
+        'जीना नहीं चाहता', 'जीना नहीं चाहती', 'ज़िंदगी खत्म', 'जिंदगी खत्म', 'खुद को मार', 'खुद को नुकसान',
+    ],
+    'moderate_risk': [
+        'bekaar', 'bekar', 'koi fayda nahi', 'umeed nahi', 'thak gaya', 'thak gayi', 'akela', 'akeli',
+        'haar gaya', 'haar gayi', 'bojh',
+        'बेकार', 'निराश', 'कोई फायदा नहीं', 'उम्मीद नहीं', 'थक गया', 'थक गई', 'अकेला', 'अकेली', 'बोझ',
+    ],
+    'warning_signs': [
+        'alvida', 'maaf kar dena', 'akhri baar',
+        'अलविदा', 'माफ़ कर देना', 'माफ कर देना', 'आखिरी बार',
+    ],
+    'distress': ['bachao', 'madad', 'darr lag raha', 'बचाओ', 'मदद', 'डर लग रहा'],
+    'negation': ['na', 'mat', 'मत', 'ना'],
+    # In Hindi word order the negation follows the term
+    'negation_after': ['nahi', 'nahin', 'नहीं'],
+}
+
+CRISIS_TERMS = freeze({
+    category: ENGLISH_TERMS.get(category, []) + HINDI_TERMS.get(category, [])
+    for category in ('high_risk', 'moderate_risk', 'warning_signs', 'distress', 'negation', 'negation_after')
+})
+HINDI_ORDER_TERMS = frozenset(term for terms in HINDI_TERMS.values() for term in terms)
+
+SCORED_CATEGORIES = ('high_risk', 'moderate_risk', 'warning_signs')
+CRISIS_CATEGORIES = SCORED_CATEGORIES + ('distress',)
+NEGATION_CATEGORIES = ('negation', 'negation_after')
+
+# Per distinct term, as in the previous per-keyword scan
+CATEGORY_WEIGHTS = freeze({'high_risk': 0.3, 'moderate_risk': 0.1, 'warning_signs': 0.2, 'distress': 0.0})
+# A negated high-risk term still counts for something; negated lower-risk terms do not
+NEGATED_WEIGHTS = freeze({'high_risk': 0.5})
+# Words allowed between a negation and the term it negates
+NEGATION_WINDOW_BEFORE = 3
+NEGATION_WINDOW_AFTER = 2
+# A negation only governs a term across these words ("not going to kill myself",
+# "don't feel hopeless"); any other word, a conjunction or a clause break ends its scope,
+# so "I dont know, I want to die" and "no I want to die" stay un-negated
+NEGATION_BRIDGE_WORDS = frozenset({
+    'really', 'even', 'ever', 'at', 'all', 'feel', 'feeling', 'felt', 'going', 'gonna', 'to',
+    'want', 'wanna', 'wanted', 'be', 'being', 'am', 'trying', 'try', 'planning', 'plan',
+    'bilkul', 'toh', 'बिल्कुल', 'तो',
+})
+CLAUSE_BREAK = re.compile(r'[.,;:!?।—\n]')
+
+# Typographic apostrophes and dashes match their ASCII forms
+APOSTROPHES = "'’‘`"
+SEPARATORS = r'[\s\-‐–]+'
+_NORMALIZE = str.maketrans({ch: "'" for ch in APOSTROPHES[1:]})
+
+
+class LexiconMatch(NamedTuple):
+    term: str
+    category: str
+    start: int
+    end: int
+    negated: bool = False
+
+
+def _normalize_term(term: str) -> str:
+    return re.sub(SEPARATORS, ' ', term.translate(_NORMALIZE).lower()).replace("'", '').strip()
+
+
+def _char_pattern(ch: str) -> str:
+    if ch == ' ':
+        return SEPARATORS
+    if ch == "'":
+        return f'[{APOSTROPHES}]?'
+    return re.escape(ch)
+
+
+def _trie_pattern(terms: Iterable[str]) -> str:
+    """Alternation of ``terms`` factored into a prefix trie
+
+    At any position the regex engine follows a single path through the
+    trie instead of trying every term in turn, and optional suffixes are
+    greedy, so the longest term starting there wins ("no way out" over
+    "no").
+    """
+    trie: Dict[str, Any] = {}
+    for term in terms:
+        node = trie
+        for ch in term:
+            node = node.setdefault(ch, {})
+        node[''] = True
+
+    def emit(node: Dict[str, Any]) -> str:
+        branches = [_char_pattern(ch) + emit(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ''
+        body = '|'.join(branches)
+        if '' in node:
+            return f'(?:{body})?'
+        return body if len(branches) == 1 else f'(?:{body})'
+
+    return emit(trie)
+
+
+class CrisisLexicon:
+    """Every crisis-related term compiled into one word-bounded pattern.
+
+    ``scan`` walks the text once and returns each match with its category
+    and position; negations found in the same pass mark the terms they
+    directly govern (same clause, only bridge words in between). Matching is case-insensitive, treats runs of spaces/hyphens
+    alike and makes apostrophes optional ("cant" matches "can't").
+    """
+
+    def __init__(self, terms: Mapping[str, Sequence[str]] = CRISIS_TERMS,
+                 weights: Mapping[str, float] = CATEGORY_WEIGHTS,
+                 hindi_order_terms: Iterable[str] = HINDI_ORDER_TERMS):
+        """
+        Args:
+            terms: Category -> terms, in priority order
+            weights: Score added per distinct, non-negated term of a category
+            hindi_order_terms: Terms a following 'negation_after' word can negate
+        """
+        self.weights = weights
+        self._hindi_order = frozenset(_normalize_term(term) for term in hindi_order_terms)
+        self._categories: Dict[str, str] = {}
+        patterns = set()
+        for category, category_terms in terms.items():
+            for term in category_terms:
+                self._categories.setdefault(_normalize_term(term), category)
+                patterns.add(re.sub(SEPARATORS, ' ', term.translate(_NORMALIZE).lower().strip()))
+        self.terms = freeze({
+            category: [t for t in category_terms if self._categories[_normalize_term(t)] == category]
+            for category, category_terms in terms.items()
+        })
+        self._pattern = re.compile(
+            f'(?<![{WORD_CHARS}])(?:{_trie_pattern(sorted(patterns))})(?![{WORD_CHARS}])', re.IGNORECASE
+        )
+        logger.info(f"Crisis lexicon compiled with {len(self._categories)} terms")
+
+    def scan(self, text: Optional[str]) -> List[LexiconMatch]:
+        """Crisis, warning and distress matches in ``text``, each flagged if negated"""
+        if not text:
+            return []
+        raw = []
+        for match in self._pattern.finditer(text):
+            term = _normalize_term(match.group())
+            raw.append((term, self._categories.get(term, 'negation'), match.start(), match.end()))
+        if not raw:
+            return []
+
+        matches = []
+        for i, (term, category, start, end) in enumerate(raw):
+            if category in NEGATION_CATEGORIES:
+                continue
+            negated = self._negated_by(text, raw[i - 1] if i else None, start, 'negation', NEGATION_WINDOW_BEFORE)
+            if not negated and term in self._hindi_order:
+                negated = self._negated_by(text, raw[i + 1] if i + 1 < len(raw) else None, end,
+                                           'negation_after', NEGATION_WINDOW_AFTER)
+            matches.append(LexiconMatch(term, category, start, end, negated))
+        return matches
+
+    @staticmethod
+    def _negated_by(text: str, neighbour: Optional[Tuple[str, str, int, int]], edge: int,
+                    category: str, window: int) -> bool:
+        """Whether ``neighbour`` is a negation that directly governs the term ending/starting at ``edge``"""
+        if neighbour is None or neighbour[1] != category:
+            return False
+        gap = text[neighbour[3]:edge] if neighbour[2] < edge else text[edge:neighbour[2]]
+        if CLAUSE_BREAK.search(gap):
+            return False
+        words = WORD_PATTERN.findall(gap.lower())
+        return len(words) < window and all(word in NEGATION_BRIDGE_WORDS for word in words)
+
+    def contains(self, text: Optional[str], categories: Sequence[str] = CRISIS_CATEGORIES,
+                 include_negated: bool = False) -> bool:
+        """Whether any term of ``categories`` occurs in ``text``"""
+        return any(m.category in categories and (include_negated or not m.negated) for m in self.scan(text))
+
+    def score(self, matches: Iterable[LexiconMatch]) -> float:
+        """Keyword risk in [0, 1]: category weight per distinct term, reduced when negated"""
+        best: Dict[str, float] = {}
+        for m in matches:
+            weight = self.weights.get(m.category, 0.0)
+            if m.negated:
+                weight *= NEGATED_WEIGHTS.get(m.category, 0.0)
+            best[m.term] = max(best.get(m.term, 0.0), weight)
+        return min(sum(best.values()), 1.0)
+
+    def analyze(self, text: Optional[str]) -> Dict[str, Any]:
+        """
+        Scan ``text`` once and summarize
+
+        Returns:
+            score, per-category counts of non-negated terms, the most severe
+            category present, and every match with its position
+        """
+        matches = self.scan(text)
+        counts = {category: 0 for category in CRISIS_CATEGORIES}
+        for m in matches:
+            if not m.negated:
+                counts[m.category] += 1
+        return {
+            'score': round(self.score(matches), 4),
+            'categories': counts,
+            'highest_category': next((c for c in CRISIS_CATEGORIES if counts[c]), None),
+            'matches': [m._asdict() for m in matches]
+        }
+
+
+@lru_cache(maxsize=1)
+def get_crisis_lexicon() -> CrisisLexicon:
+    """Process-wide lexicon (compiled once; built in the master under gunicorn preload)"""
+    return CrisisLexicon()
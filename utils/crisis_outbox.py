@@ -0,0 +1,440 @@
+# 🧠 Manas: Crisis Alert Outbox
+# Crisis alerts and their notifications committed together; a background dispatcher delivers with retries
+
+import json
+import logging
+import os
+import random
+import smtplib
+import sqlite3
+import threading
+import time
+from email.message import EmailMessage
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from .lazy_import import lazy_import, module_available
+from .preload import register_after_fork
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+TWILIO_AVAILABLE = module_available('twilio')
+REQUESTS_AVAILABLE = module_available('requests')
+twilio_rest = lazy_import('twilio.rest', fork_safe=False)
+requests = lazy_import('requests')
+
+MAX_ATTEMPTS = int(os.environ.get('CRISIS_OUTBOX_MAX_ATTEMPTS', 6))
+BACKOFF_BASE_SECONDS = float(os.environ.get('CRISIS_OUTBOX_BACKOFF_SECONDS', 5))
+BACKOFF_MAX_SECONDS = float(os.environ.get('CRISIS_OUTBOX_BACKOFF_MAX_SECONDS', 900))
+# A second notification of the same kind for the same user within this window is suppressed
+DEDUPE_WINDOW_SECONDS = float(os.environ.get('CRISIS_DEDUPE_MINUTES', 30)) * 60
+POLL_INTERVAL_SECONDS = float(os.environ.get('CRISIS_OUTBOX_POLL_SECONDS', 5))
+# A claimed message not finished within this time is retried (its worker died)
+CLAIM_LEASE_SECONDS = 120
+BATCH_SIZE = 20
+
+STATUS_PENDING = 'pending'
+STATUS_SENDING = 'sending'
+STATUS_SENT = 'sent'
+STATUS_FAILED = 'failed'
+STATUS_SUPPRESSED = 'suppressed'
+
+
+def backoff_seconds(attempts: int) -> float:
+    """Delay before retry number ``attempts`` (exponential, capped, with jitter)"""
+    delay = min(BACKOFF_BASE_SECONDS * (2 ** max(attempts - 1, 0)), BACKOFF_MAX_SECONDS)
+    return delay * random.uniform(0.8, 1.2)
+
+
+def format_alert_message(alert: Dict[str, Any]) -> str:
+    """Short notification text; the student's own words are never included"""
+    return (f"Manas crisis alert #{alert['alert_id']}: {alert['alert_type']} "
+            f"(risk {float(alert['risk_level']):.2f}) for user {alert['user_id']}. "
+            f"Please follow up through the counsellor dashboard.")
+
+
+# ==================== CHANNELS ====================
+
+class NotificationChannel:
+    """Delivery channel; ``send`` raises on failure so the message is retried"""
+
+    name = 'channel'
+    # Alert types this channel is notified of (None: all)
+    alert_types: Optional[frozenset] = None
+
+    def wants(self, alert_type: str) -> bool:
+        return self.alert_types is None or alert_type in self.alert_types
+
+    def recipients(self) -> Sequence[str]:
+        return ('default',)
+
+    def send(self, recipient: str, alert: Dict[str, Any]):
+        raise NotImplementedError
+
+
+class TwilioSMSChannel(NotificationChannel):
+    """SMS to on-call numbers through Twilio (emergencies only by default)"""
+
+    name = 'sms'
+
+    def __init__(self, account_sid: str, auth_token: str, from_number: str, to_numbers: Iterable[str],
+                 alert_types: Iterable[str] = ('emergency',)):
+        self.account_sid = account_sid
+        self.auth_token = auth_token
+        self.from_number = from_number
+        self.to_numbers = tuple(to_numbers)
+        self.alert_types = frozenset(alert_types)
+        self._client = None
+
+    def recipients(self) -> Sequence[str]:
+        return self.to_numbers
+
+    def send(self, recipient: str, alert: Dict[str, Any]):
+        if self._client is None:
+            self._client = twilio_rest.Client(self.account_sid, self.auth_token)
+        self._client.messages.create(to=recipient, from_=self.from_number, body=format_alert_message(alert))
+
+
+class WebhookChannel(NotificationChannel):
+    """JSON POST of the alert to a support-system endpoint"""
+
+    name = 'webhook'
+
+    def __init__(self, url: str, timeout: float = 10.0, token: Optional[str] = None):
+        self.url = url
+        self.timeout = timeout
+        self.token = token
+
+    def recipients(self) -> Sequence[str]:
+        return (self.url,)
+
+    def send(self, recipient: str, alert: Dict[str, Any]):
+        headers = {'Authorization': f"Bearer {self.token}"} if self.token else {}
+        response = requests.post(recipient, json=alert, headers=headers, timeout=self.timeout)
+        response.raise_for_status()
+
+
+class EmailChannel(NotificationChannel):
+    """Email to counsellors over SMTP"""
+
+    name = 'email'
+
+    def __init__(self, host: str, port: int, sender: str, to_addresses: Iterable[str],
+                 username: Optional[str] = None, password: Optional[str] = None, use_tls: bool = True):
+        self.host = host
+        self.port = port
+        self.sender = sender
+        self.to_addresses = tuple(to_addresses)
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+
+    def recipients(self) -> Sequence[str]:
+        return self.to_addresses
+
+    def send(self, recipient: str, alert: Dict[str, Any]):
+        message = EmailMessage()
+        message['Subject'] = f"Manas crisis alert: {alert['alert_type']}"
+        message['From'] = self.sender
+        message['To'] = recipient
+        message.set_content(format_alert_message(alert))
+        with smtplib.SMTP(self.host, self.port, timeout=15) as smtp:
+            if self.use_tls:
+                smtp.starttls()
+            if self.username:
+                smtp.login(self.username, self.password or '')
+            smtp.send_message(message)
+
+
+class LogChannel(NotificationChannel):
+    """Local stub: logs each notification and keeps it in ``sent`` (development and tests)"""
+
+    name = 'log'
+
+    def __init__(self, fail_times: int = 0):
+        """
+        Args:
+            fail_times: Fail this many sends first, to exercise retries
+        """
+        self.sent: List[Dict[str, Any]] = []
+        self._fail_times = fail_times
+
+    def send(self, recipient: str, alert: Dict[str, Any]):
+        if self._fail_times > 0:
+            self._fail_times -= 1
+            raise RuntimeError('Simulated delivery failure')
+        self.sent.append(dict(alert, recipient=recipient))
+        logger.critical(f"Support system notification: {format_alert_message(alert)}")
+
+
+def _csv(name: str) -> List[str]:
+    return [item.strip() for item in os.environ.get(name, '').split(',') if item.strip()]
+
+
+def channels_from_env() -> List[NotificationChannel]:
+    """Channels configured through environment variables (the log stub when none are)"""
+    channels: List[NotificationChannel] = []
+    sms_to = _csv('CRISIS_SMS_TO')
+    if sms_to and os.environ.get('TWILIO_ACCOUNT_SID'):
+        if TWILIO_AVAILABLE:
+            channels.append(TwilioSMSChannel(
+                os.environ['TWILIO_ACCOUNT_SID'], os.environ.get('TWILIO_AUTH_TOKEN', ''),
+                os.environ.get('TWILIO_FROM_NUMBER', ''), sms_to
+            ))
+        else:
+            logger.warning("CRISIS_SMS_TO is set but twilio is not installed; SMS alerts disabled")
+    if os.environ.get('CRISIS_WEBHOOK_URL'):
+        if REQUESTS_AVAILABLE:
+            channels.append(WebhookChannel(os.environ['CRISIS_WEBHOOK_URL'],
+                                           token=os.environ.get('CRISIS_WEBHOOK_TOKEN')))
+        else:
+            logger.warning("CRISIS_WEBHOOK_URL is set but requests is not installed; webhook alerts disabled")
+    email_to = _csv('CRISIS_EMAIL_TO')
+    if email_to and os.environ.get('SMTP_HOST'):
+        channels.append(EmailChannel(
+            os.environ['SMTP_HOST'], int(os.environ.get('SMTP_PORT', 587)),
+            os.environ.get('SMTP_FROM', 'alerts@manas.local'), email_to,
+            username=os.environ.get('SMTP_USERNAME'), password=os.environ.get('SMTP_PASSWORD')
+        ))
+    return channels or [LogChannel()]
+
+
+# ==================== OUTBOX ====================
+
+class CrisisOutbox:
+    """Transactional outbox for crisis alerts.
+
+    ``record_alert`` inserts the crisis_alerts row and one crisis_outbox row
+    per channel and recipient in a single transaction, so an alert can never
+    exist without its notifications (or the reverse), and nothing is sent
+    inline. A daemon thread per process claims due messages, delivers them
+    and records the outcome; failures are retried with exponential backoff
+    until MAX_ATTEMPTS, and a message claimed by a worker that died is
+    picked up again once its lease expires.
+    """
+
+    def __init__(self, db_path: str = 'manas_wellness.db',
+                 channels: Optional[Sequence[NotificationChannel]] = None, feed=None):
+        """
+        Args:
+            db_path: SQLite database holding crisis_alerts
+            channels: Delivery channels (default: channels_from_env())
+            feed: CounsellorFeed receiving each alert as a dashboard event
+        """
+        self.db_path = db_path
+        self.feed = feed
+        self.channels = {channel.name: channel for channel in (channels if channels is not None else channels_from_env())}
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._init_table()
+        register_after_fork(self._reset)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=5)
+
+    def _init_table(self):
+        try:
+            conn = self._connect()
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS crisis_outbox (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    alert_id INTEGER,
+                    user_id TEXT NOT NULL,
+                    alert_type TEXT NOT NULL,
+                    channel TEXT NOT NULL,
+                    recipient TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    dedupe_key TEXT NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    next_attempt_at REAL NOT NULL,
+                    lease_until REAL,
+                    last_error TEXT,
+                    created_at REAL NOT NULL,
+                    sent_at REAL
+                )
+            ''')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_crisis_outbox_due ON crisis_outbox (status, next_attempt_at)')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_crisis_outbox_dedupe ON crisis_outbox (dedupe_key, created_at)')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_crisis_outbox_alert ON crisis_outbox (alert_id)')
+            conn.commit()
+            conn.close()
+        except Exception as e:
+            logger.error(f"Crisis outbox table initialization error: {e}")
+
+    def record_alert(self, user_id: str, risk_level: float, alert_type: str, details: Dict[str, Any]) -> Optional[int]:
+        """
+        Insert a crisis alert and queue its notifications atomically
+
+        Args:
+            user_id: User the alert concerns
+            risk_level: Risk score (0-1)
+            alert_type: e.g. 'emergency', 'support', 'reassessed', 'downgraded'
+            details: Intervention / assessment details stored with the alert
+
+        Returns:
+            The crisis_alerts id, or None if nothing could be written
+        """
+        now = time.time()
+        try:
+            conn = self._connect()
+            try:
+                conn.execute('BEGIN IMMEDIATE')
+                cursor = conn.execute('''
+                    INSERT INTO crisis_alerts (user_id, risk_level, alert_type, intervention_taken)
+                    VALUES (?, ?, ?, ?)
+                ''', (user_id, risk_level, alert_type, json.dumps(details, default=str)))
+                alert_id = cursor.lastrowid
+                alert = {'alert_id': alert_id, 'user_id': user_id, 'alert_type': alert_type,
+                         'risk_level': risk_level, 'created_at': now}
+                self._enqueue(conn, alert, now)
+                event = None
+                if self.feed is not None:
+                    event = self.feed.append(conn, 'crisis_alert', alert_id, user_id, {
+                        'alert_id': alert_id, 'alert_type': alert_type, 'risk_level': risk_level, 'user_id': user_id
+                    })
+                conn.commit()
+            finally:
+                conn.close()
+        except Exception as e:
+            logger.error(f"Crisis alert write error: {e}")
+            return None
+        self.ensure_running()
+        self._wake.set()
+        if self.feed is not None:
+            self.feed.broadcast(event)
+        return alert_id
+
+    def _enqueue(self, conn: sqlite3.Connection, alert: Dict[str, Any], now: float):
+        payload = json.dumps(alert, default=str)
+        for channel in self.channels.values():
+            if not channel.wants(alert['alert_type']):
+                continue
+            for recipient in channel.recipients():
+                dedupe_key = f"{alert['user_id']}:{alert['alert_type']}:{channel.name}:{recipient}"
+                duplicate = conn.execute('''
+                    SELECT 1 FROM crisis_outbox
+                    WHERE dedupe_key = ? AND created_at > ? AND status != ?
+                    LIMIT 1
+                ''', (dedupe_key, now - DEDUPE_WINDOW_SECONDS, STATUS_SUPPRESSED)).fetchone()
+                conn.execute('''
+                    INSERT INTO crisis_outbox
+                        (alert_id, user_id, alert_type, channel, recipient, payload, dedupe_key,
+                         status, next_attempt_at, created_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', (alert['alert_id'], alert['user_id'], alert['alert_type'], channel.name, recipient,
+                      payload, dedupe_key, STATUS_SUPPRESSED if duplicate else STATUS_PENDING, now, now))
+
+    # ==================== DISPATCH ====================
+
+    def ensure_running(self):
+        """Start this process's dispatcher thread if it is not running"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='crisis-outbox', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def _reset(self):
+        # The parent's thread does not exist in a forked child
+        self._thread = None
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                delivered = self.dispatch_due()
+            except Exception as e:
+                logger.error(f"Crisis outbox dispatch error: {e}")
+                delivered = 0
+            if delivered < BATCH_SIZE:
+                self._wake.wait(POLL_INTERVAL_SECONDS)
+                self._wake.clear()
+
+    def _claim(self, now: float) -> List[sqlite3.Row]:
+        conn = self._connect()
+        conn.row_factory = sqlite3.Row
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            rows = conn.execute('''
+                SELECT * FROM crisis_outbox
+                WHERE (status = ? AND next_attempt_at <= ?) OR (status = ? AND lease_until < ?)
+                ORDER BY next_attempt_at
+                LIMIT ?
+            ''', (STATUS_PENDING, now, STATUS_SENDING, now, BATCH_SIZE)).fetchall()
+            conn.executemany('UPDATE crisis_outbox SET status = ?, lease_until = ? WHERE id = ?',
+                             [(STATUS_SENDING, now + CLAIM_LEASE_SECONDS, row['id']) for row in rows])
+            conn.commit()
+            return rows
+        finally:
+            conn.close()
+
+    def dispatch_due(self) -> int:
+        """
+        Deliver every message that is due now (also usable synchronously, e.g. from a cron job)
+
+        Returns:
+            Number of messages attempted
+        """
+        rows = self._claim(time.time())
+        for row in rows:
+            self._deliver(row)
+        return len(rows)
+
+    def _deliver(self, row: sqlite3.Row):
+        attempts = row['attempts'] + 1
+        channel = self.channels.get(row['channel'])
+        try:
+            if channel is None:
+                raise RuntimeError(f"Channel {row['channel']} is not configured in this process")
+            channel.send(row['recipient'], json.loads(row['payload']))
+            self._update(row['id'], status=STATUS_SENT, attempts=attempts, sent_at=time.time(),
+                         last_error=None, lease_until=None)
+        except Exception as e:
+            if attempts >= MAX_ATTEMPTS:
+                logger.error(f"Crisis notification {row['id']} via {row['channel']} failed permanently: {e}")
+                self._update(row['id'], status=STATUS_FAILED, attempts=attempts, last_error=str(e), lease_until=None)
+            else:
+                delay = backoff_seconds(attempts)
+                logger.warning(f"Crisis notification {row['id']} via {row['channel']} failed "
+                               f"(attempt {attempts}), retrying in {delay:.0f}s: {e}")
+                self._update(row['id'], status=STATUS_PENDING, attempts=attempts, last_error=str(e),
+                             next_attempt_at=time.time() + delay, lease_until=None)
+
+    def _update(self, message_id: int, **fields):
+        conn = self._connect()
+        try:
+            assignments = ', '.join(f"{name} = ?" for name in fields)
+            conn.execute(f'UPDATE crisis_outbox SET {assignments} WHERE id = ?', (*fields.values(), message_id))
+            conn.commit()
+        finally:
+            conn.close()
+
+    # ==================== STATUS ====================
+
+    def delivery_status(self, alert_id: int) -> List[Dict[str, Any]]:
+        """Per channel/recipient delivery state of one alert"""
+        conn = self._connect()
+        conn.row_factory = sqlite3.Row
+        try:
+            rows = conn.execute('''
+                SELECT channel, recipient, status, attempts, next_attempt_at, last_error, created_at, sent_at
+                FROM crisis_outbox WHERE alert_id = ? ORDER BY id
+            ''', (alert_id,)).fetchall()
+        finally:
+            conn.close()
+        return [dict(row) for row in rows]
+
+    def stats(self) -> Dict[str, int]:
+        """Message counts by status"""
+        conn = self._connect()
+        try:
+            return dict(conn.execute('SELECT status, COUNT(*) FROM crisis_outbox GROUP BY status').fetchall())
+        finally:
+            conn.close()
@@ -0,0 +1,233 @@
+# 🧠 Manas: Two-Phase Crisis Pipeline
+# Local screen answers in milliseconds; Gemini confirms in the background and the update is pushed to the client
+
+import logging
+import os
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from .preload import register_after_fork
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+CONFIRMATION_WORKERS = int(os.environ.get('CRISIS_CONFIRMATION_WORKERS', 2))
+
+# Risk levels of /api/crisis/check (see CrisisDetector.intervention_for)
+EMERGENCY_RISK = 0.8
+SUPPORT_RISK = 0.5
+
+CRISIS_NAMESPACE = '/crisis'
+
+
+def crisis_room(user_id: str) -> str:
+    """Socket.IO room receiving a user's crisis updates"""
+    return f"crisis:{user_id}"
+
+
+class CrisisPipeline:
+    """Crisis assessment in two phases.
+
+    Phase 1 (``assess`` / ``check``) uses only local signals: the crisis
+    lexicon, weighted indicators and the user's risk history. It returns
+    the assessment and matching resources without any network call, and an
+    emergency screen is written to crisis_alerts (with its notifications,
+    see CrisisOutbox) right away.
+
+    Phase 2 runs on a background thread: Gemini re-scores the same input,
+    the assessment is upgraded or downgraded, the outcome is written to
+    crisis_alerts when it warrants follow-up, and ``publish`` pushes it to
+    the client (Socket.IO room ``crisis:<user_id>``), tagged with the
+    ``assessment_id`` returned by phase 1.
+    """
+
+    def __init__(self, detector, outbox,
+                 publish: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+                 max_workers: int = CONFIRMATION_WORKERS):
+        """
+        Args:
+            detector: CrisisDetector (or a LazyComponent of one)
+            outbox: CrisisOutbox recording alerts and queueing their notifications
+            publish: Called with (user_id, update) when a confirmation finishes
+            max_workers: Concurrent Gemini confirmations per process
+        """
+        self.detector = detector
+        self.outbox = outbox
+        self.publish = publish
+        self.max_workers = max_workers
+        self._executor = self._new_executor()
+        register_after_fork(self._restart)
+
+    def _new_executor(self) -> ThreadPoolExecutor:
+        return ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='crisis-confirm')
+
+    def _restart(self):
+        # Threads do not survive fork; each worker confirms through its own pool
+        self._executor = self._new_executor()
+
+    # ==================== PHASE 1 ====================
+
+    def assess(self, emotion_result: Dict[str, Any], user_id: str) -> Dict[str, Any]:
+        """
+        Screen an emotion analysis now; confirm text content with Gemini in the background
+
+        Args:
+            emotion_result: Emotion analysis result (with ``text_content`` when text was given)
+            user_id: User identifier
+
+        Returns:
+            Phase 1 risk assessment, with ``assessment_id`` and ``confirmation``
+            ('pending' or 'not_required')
+        """
+        text = emotion_result.get('text_content')
+        assessment = self.detector.assess_risk(emotion_result, user_id, use_ai=False, record=not text)
+        assessment_id = uuid.uuid4().hex
+        assessment.update({
+            'assessment_id': assessment_id,
+            'phase': 'screen',
+            'confirmation': 'pending' if text else 'not_required'
+        })
+        if assessment.get('emergency_intervention'):
+            self._write_alert(user_id, assessment['risk_level'], 'emergency', {
+                'assessment_id': assessment_id,
+                'screen_category': assessment['risk_category'],
+                'immediate_actions': assessment['immediate_actions']
+            })
+        if text:
+            self._submit(self._confirm_assessment, assessment_id, user_id, assessment, text)
+        return assessment
+
+    def check(self, user_data: Dict[str, Any], user_id: str) -> Dict[str, Any]:
+        """
+        Screen comprehensive user data (``/api/crisis/check``) now; confirm with Gemini in the background
+
+        Args:
+            user_data: Comprehensive user data including emotions, behaviors, etc.
+            user_id: User identifier
+
+        Returns:
+            risk_level, intervention (without generated content), assessment_id
+            and confirmation status
+        """
+        risk_level = self.detector.screen_risk_level(user_data, user_id)
+        intervention = self.detector.intervention_for(risk_level, user_id, ai_content=False)
+        if risk_level >= EMERGENCY_RISK:
+            # Never wait for the model before recording an emergency
+            self._write_alert(user_id, risk_level, 'emergency', intervention)
+
+        assessment_id = uuid.uuid4().hex
+        self._submit(self._confirm_check, assessment_id, user_id, user_data, risk_level)
+        return {
+            'risk_level': risk_level,
+            'intervention': intervention,
+            'assessment_id': assessment_id,
+            'phase': 'screen',
+            'confirmation': 'pending'
+        }
+
+    # ==================== PHASE 2 ====================
+
+    def _submit(self, fn: Callable, *args):
+        try:
+            self._executor.submit(fn, *args)
+        except RuntimeError as e:
+            # Interpreter shutting down: the screen result stands
+            logger.warning(f"Crisis confirmation not scheduled: {e}")
+
+    def _confirm_assessment(self, assessment_id: str, user_id: str, screen: Dict[str, Any], text: str):
+        try:
+            confirmed = self.detector.confirm_assessment(screen, text, user_id)
+        except Exception as e:
+            logger.error(f"Crisis confirmation error for {assessment_id}: {e}")
+            self.detector._log_risk_assessment(user_id, screen)
+            self._publish(user_id, {'assessment_id': assessment_id, 'confirmation': 'failed'})
+            return
+
+        changed = confirmed['risk_category'] != screen['risk_category']
+        if changed and max(confirmed['risk_level'], screen['risk_level']) >= SUPPORT_RISK:
+            # Emergencies found by the screen were alerted in phase 1; record what the model changed
+            alert_type = 'emergency' if confirmed['risk_level'] >= EMERGENCY_RISK else 'reassessed'
+            self._write_alert(user_id, confirmed['risk_level'], alert_type, {
+                'assessment_id': assessment_id,
+                'screen_category': screen['risk_category'],
+                'confirmed_category': confirmed['risk_category'],
+                'immediate_actions': confirmed['immediate_actions']
+            })
+        self._publish(user_id, dict(
+            confirmed,
+            assessment_id=assessment_id,
+            phase='confirmed',
+            confirmation='complete',
+            screen_category=screen['risk_category']
+        ))
+
+    def _confirm_check(self, assessment_id: str, user_id: str, user_data: Dict[str, Any], screen_risk: float):
+        try:
+            risk_level = self.detector.confirm_risk_level(screen_risk, user_data)
+            intervention = self.detector.intervention_for(risk_level, user_id)
+        except Exception as e:
+            logger.error(f"Crisis check confirmation error for {assessment_id}: {e}")
+            self._publish(user_id, {'assessment_id': assessment_id, 'confirmation': 'failed'})
+            return
+
+        if risk_level >= EMERGENCY_RISK and screen_risk < EMERGENCY_RISK:
+            self._write_alert(user_id, risk_level, 'emergency', intervention)
+        elif risk_level < EMERGENCY_RISK <= screen_risk:
+            # The screen raised an emergency the model does not confirm; keep it visible for review
+            self._write_alert(user_id, risk_level, 'downgraded', {'assessment_id': assessment_id,
+                                                                 'screen_risk': screen_risk})
+        elif SUPPORT_RISK <= risk_level < EMERGENCY_RISK:
+            self._write_alert(user_id, risk_level, 'support', intervention)
+
+        self._publish(user_id, {
+            'assessment_id': assessment_id,
+            'phase': 'confirmed',
+            'confirmation': 'complete',
+            'screen_risk_level': screen_risk,
+            'risk_level': risk_level,
+            'intervention': intervention
+        })
+
+    def _publish(self, user_id: str, update: Dict[str, Any]):
+        if self.publish is None:
+            return
+        try:
+            self.publish(user_id, update)
+        except Exception as e:
+            logger.error(f"Crisis update delivery error: {e}")
+
+    def _write_alert(self, user_id: str, risk_level: float, alert_type: str, details: Dict[str, Any]):
+        # Alert row and notifications commit together; delivery happens off the request path
+        self.outbox.record_alert(user_id, risk_level, alert_type, details)
+
+
+def register_crisis_update_handlers(socketio, namespace: str = CRISIS_NAMESPACE) -> Callable[[str, Dict[str, Any]], None]:
+    """
+    Socket.IO channel for phase 2 results
+
+    Clients connect to ``namespace`` and receive ``crisis_update`` events for
+    the logged-in user. With several workers, SocketIO needs a
+    ``message_queue`` so a worker can reach clients connected to another.
+
+    Args:
+        socketio: flask_socketio.SocketIO instance
+        namespace: Socket.IO namespace
+
+    Returns:
+        Publish callback for CrisisPipeline
+    """
+    from flask import session
+    from flask_socketio import join_room
+
+    @socketio.on('connect', namespace=namespace)
+    def handle_connect(auth=None):
+        user_id = session.get('user_id')
+        if not user_id:
+            return False
+        join_room(crisis_room(user_id))
+
+    def publish(user_id: str, update: Dict[str, Any]):
+        socketio.emit('crisis_update', update, to=crisis_room(user_id), namespace=namespace)
+
+    return publish
@@ -0,0 +1,483 @@
+# 🧠 Manas: Model Distillation
+# Trains the local text, landmark and audio models from accumulated Gemini labels
+
+import argparse
+import hashlib
+import itertools
+import json
+import logging
+import os
+import sqlite3
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .emotion_repository import EmotionRepository
+from .lazy_import import lazy_import, module_available
+from .model_registry import HotSwappableModel, ModelRegistry
+from .text_emotion_model import TextEmotionModel, get_text_emotion_model, SKLEARN_AVAILABLE as TEXT_MODEL_AVAILABLE
+from .text_emotion_seed import SEED_EXAMPLES
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# scikit-learn is imported when a model is first loaded or trained
+SKLEARN_AVAILABLE = module_available('sklearn') and module_available('joblib')
+joblib = lazy_import('joblib') if SKLEARN_AVAILABLE else None
+
+KINDS = ('text', 'landmark', 'audio')
+
+# Fixed feature orders; a model artifact records the list it was trained on
+LANDMARK_FEATURES = [
+    'facial_features.eye_openness',
+    'facial_features.mouth_openness',
+    'facial_features.mouth_curvature',
+    'facial_features.eyebrow_elevation',
+    'facial_features.left_right_asymmetry',
+    'geometric_analysis.left_eye_ratio',
+    'geometric_analysis.right_eye_ratio',
+    'geometric_analysis.eyebrow_symmetry',
+]
+AUDIO_FEATURES = [
+    'pitch_mean', 'pitch_variation', 'energy', 'spectral_centroid', 'spectral_rolloff', 'zcr',
+] + [f'mfcc_{i}' for i in range(13)]
+
+# Rows whose id hashes into this bucket are never trained on, so every
+# candidate and the currently promoted model are scored on the same examples
+HOLDOUT_PERCENT = int(os.environ.get('DISTILLATION_HOLDOUT_PERCENT', 20))
+MIN_EXAMPLES = int(os.environ.get('DISTILLATION_MIN_EXAMPLES', 200))
+MIN_EXAMPLES_PER_LABEL = 5
+
+# Students' raw text is only kept for training when explicitly enabled, in its own
+# table (never in emotional_states) and only for this many days
+TEXT_COLLECTION_ENABLED = os.environ.get('DISTILLATION_COLLECT_TEXT', 'false').lower() in ('1', 'true', 'yes')
+TEXT_RETENTION_DAYS = int(os.environ.get('DISTILLATION_TEXT_RETENTION_DAYS', 30))
+
+
+def _lookup(data: Dict[str, Any], dotted: str) -> Optional[float]:
+    value: Any = data
+    for part in dotted.split('.'):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def feature_vector(data: Dict[str, Any], names: Sequence[str]) -> Optional[np.ndarray]:
+    """Features in ``names`` order, or None when any is missing"""
+    values = [_lookup(data, name) for name in names]
+    if any(v is None or not np.isfinite(v) for v in values):
+        return None
+    return np.array(values, dtype=np.float64)
+
+
+class FeatureModel:
+    """A classifier over a fixed list of numeric features (landmark geometry or audio)"""
+
+    def __init__(self, kind: str, feature_names: Sequence[str], pipeline: 'Pipeline',
+                 metadata: Optional[Dict[str, Any]] = None):
+        self.kind = kind
+        self.feature_names = list(feature_names)
+        self.pipeline = pipeline
+        self.labels: List[str] = list(pipeline.named_steps['clf'].classes_)
+        self.metadata = metadata or {}
+
+    @classmethod
+    def train(cls, kind: str, feature_names: Sequence[str], X: np.ndarray, y: Sequence[str]) -> 'FeatureModel':
+        from sklearn.linear_model import LogisticRegression
+        from sklearn.pipeline import Pipeline
+        from sklearn.preprocessing import StandardScaler
+
+        pipeline = Pipeline([
+            ('scale', StandardScaler()),
+            ('clf', LogisticRegression(max_iter=2000, class_weight='balanced')),
+        ])
+        pipeline.fit(X, list(y))
+        return cls(kind, feature_names, pipeline, {
+            'version': datetime.now().strftime('%Y%m%d%H%M%S'),
+            'trained_at': datetime.now().isoformat(),
+            'training_examples': len(y),
+        })
+
+    def save(self, path: str):
+        joblib.dump({'kind': self.kind, 'feature_names': self.feature_names,
+                     'pipeline': self.pipeline, 'metadata': self.metadata}, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'FeatureModel':
+        artifact = joblib.load(path)
+        return cls(artifact['kind'], artifact['feature_names'], artifact['pipeline'], artifact.get('metadata'))
+
+    def predict(self, data: Dict[str, Any]) -> Optional[Tuple[str, float, Dict[str, float]]]:
+        """
+        Classify an analysis result or feature dict
+
+        Returns:
+            (label, confidence, probabilities), or None when features are missing
+        """
+        vector = feature_vector(data, self.feature_names)
+        if vector is None:
+            return None
+        probabilities = self.pipeline.predict_proba(vector.reshape(1, -1))[0]
+        scores = {label: float(p) for label, p in zip(self.labels, probabilities)}
+        label = max(scores, key=scores.get)
+        return label, scores[label], scores
+
+
+# ==================== EXPORT ====================
+
+def _is_gemini_labelled(data: Dict[str, Any]) -> bool:
+    return data.get('analysis_tier') == 'gemini' and 'fallback' not in str(data.get('model_used', ''))
+
+
+class TrainingTextStore:
+    """Gemini-labelled texts kept for distilling the local text model.
+
+    Raw student text is sensitive, so it is opt-in (DISTILLATION_COLLECT_TEXT),
+    stored apart from the emotion history in ``distillation_texts``, and
+    deleted after ``retention_days`` (each write and each export purges).
+    """
+
+    def __init__(self, db_path: str = 'manas_wellness.db', enabled: bool = TEXT_COLLECTION_ENABLED,
+                 retention_days: int = TEXT_RETENTION_DAYS):
+        """
+        Args:
+            db_path: SQLite database
+            enabled: Whether ``record`` keeps anything
+            retention_days: Age after which texts are deleted
+        """
+        self.db_path = db_path
+        self.enabled = enabled
+        self.retention_days = retention_days
+        self._schema_ready = False
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=5)
+        if not self._schema_ready:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS distillation_texts (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    user_id TEXT,
+                    text TEXT NOT NULL,
+                    label TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                )
+            ''')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_distillation_texts_created ON distillation_texts (created_at)')
+            self._schema_ready = True
+        return conn
+
+    def _purge(self, conn: sqlite3.Connection) -> int:
+        cutoff = time.time() - self.retention_days * 86400
+        return conn.execute('DELETE FROM distillation_texts WHERE created_at < ?', (cutoff,)).rowcount
+
+    def record(self, user_id: Optional[str], text: Optional[str], result: Dict[str, Any]) -> bool:
+        """
+        Keep ``text`` as a training example if collection is on and Gemini labelled it
+
+        Returns:
+            Whether the text was stored
+        """
+        label = result.get('primary_emotion')
+        if not (self.enabled and text and label and label != 'error'
+                and _is_gemini_labelled(result) and not result.get('cached')):
+            return False
+        try:
+            conn = self._connect()
+            try:
+                conn.execute('INSERT INTO distillation_texts (user_id, text, label, created_at) VALUES (?, ?, ?, ?)',
+                             (user_id, text, str(label).lower(), time.time()))
+                self._purge(conn)
+                conn.commit()
+            finally:
+                conn.close()
+            return True
+        except Exception as e:
+            logger.error(f"Training text store error: {e}")
+            return False
+
+    def delete_user(self, user_id: str) -> int:
+        """Remove every text of a user (account deletion / withdrawn consent)"""
+        conn = self._connect()
+        try:
+            deleted = conn.execute('DELETE FROM distillation_texts WHERE user_id = ?', (user_id,)).rowcount
+            conn.commit()
+        finally:
+            conn.close()
+        return deleted
+
+    def iter_examples(self, batch_size: int = 1000) -> Iterator[List[Dict[str, Any]]]:
+        """Unexpired examples as {'id', 'kind', 'input', 'label'} batches"""
+        conn = self._connect()
+        try:
+            self._purge(conn)
+            conn.commit()
+            last_id = 0
+            while True:
+                rows = conn.execute(
+                    'SELECT id, text, label FROM distillation_texts WHERE id > ? ORDER BY id LIMIT ?',
+                    (last_id, batch_size)
+                ).fetchall()
+                if not rows:
+                    return
+                last_id = rows[-1][0]
+                yield [{'id': row_id, 'kind': 'text', 'input': text, 'label': label} for row_id, text, label in rows]
+        finally:
+            conn.close()
+
+
+def extract_example(modality: str, data: Dict[str, Any]) -> Optional[Tuple[str, Any, str]]:
+    """
+    Turn a stored emotion result into a (kind, input, teacher_label) example
+
+    Only results that Gemini actually labelled qualify; local-tier results
+    would just teach the models their own predictions. Text examples come
+    from TrainingTextStore, not from the emotion history.
+    """
+    if data.get('cached'):
+        # A reused analysis would count the same example twice
+        return None
+    if modality in ('image', 'visual'):
+        label = (data.get('gemini_analysis') or {}).get('facial_emotion_detected')
+        vector = feature_vector(data, LANDMARK_FEATURES)
+        if label and vector is not None:
+            return 'landmark', vector, label
+    elif modality in ('audio', 'voice'):
+        label = data.get('gemini_emotion')
+        vector = feature_vector(data.get('audio_features') or {}, AUDIO_FEATURES)
+        if label and vector is not None:
+            return 'audio', vector, label
+    return None
+
+
+def export_batches(repository: EmotionRepository, batch_size: int = 1000) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Labelled examples from the whole emotion history, one batch per DB page
+
+    Yields:
+        Lists of {'id', 'kind', 'input', 'label'} dicts
+    """
+    for rows in repository.iter_emotional_state_batches(batch_size=batch_size):
+        examples = []
+        for row in rows:
+            try:
+                data = json.loads(row['emotion_data']) if row.get('emotion_data') else {}
+            except (TypeError, json.JSONDecodeError):
+                continue
+            modality = row.get('modality') or data.get('modality', '')
+            # Multimodal rows carry each modality's own result
+            parts = data.get('individual_results', []) if modality == 'multimodal' else [data]
+            for part in parts:
+                example = extract_example(part.get('modality', modality), part)
+                if example and example[2] and example[2] != 'error':
+                    kind, model_input, label = example
+                    examples.append({'id': row['id'], 'kind': kind, 'input': model_input, 'label': str(label).lower()})
+        if examples:
+            yield examples
+
+
+def is_holdout(row_id: int) -> bool:
+    """Stable train/holdout assignment by row id"""
+    return int(hashlib.md5(str(row_id).encode()).hexdigest(), 16) % 100 < HOLDOUT_PERCENT
+
+
+def collect_examples(repository: EmotionRepository, kinds: Sequence[str] = KINDS,
+                     batch_size: int = 1000,
+                     text_store: Optional[TrainingTextStore] = None) -> Dict[str, Dict[str, Tuple[list, list]]]:
+    """Examples per kind split into {'train': (inputs, labels), 'holdout': (inputs, labels)}"""
+    collected = {kind: {'train': ([], []), 'holdout': ([], [])} for kind in kinds}
+    batches = export_batches(repository, batch_size)
+    if 'text' in kinds and text_store is not None:
+        batches = itertools.chain(batches, text_store.iter_examples(batch_size))
+    for batch in batches:
+        for example in batch:
+            if example['kind'] not in collected:
+                continue
+            split = collected[example['kind']]['holdout' if is_holdout(example['id']) else 'train']
+            split[0].append(example['input'])
+            split[1].append(example['label'])
+    return collected
+
+
+# ==================== TRAIN / EVALUATE ====================
+
+def evaluate(predict, inputs: list, labels: list) -> Dict[str, Any]:
+    """Agreement with the Gemini labels of the holdout set"""
+    from sklearn.metrics import accuracy_score, f1_score
+
+    predictions = [predict(x) for x in inputs]
+    return {
+        'holdout_examples': len(labels),
+        'accuracy': round(float(accuracy_score(labels, predictions)), 4),
+        'macro_f1': round(float(f1_score(labels, predictions, average='macro', zero_division=0)), 4),
+    }
+
+
+def _usable(inputs: list, labels: list) -> Tuple[list, list]:
+    """Drop labels too rare to learn"""
+    counts = Counter(labels)
+    keep = [i for i, label in enumerate(labels) if counts[label] >= MIN_EXAMPLES_PER_LABEL]
+    return [inputs[i] for i in keep], [labels[i] for i in keep]
+
+
+def train_kind(kind: str, train: Tuple[list, list]):
+    """Fit a candidate model of ``kind``"""
+    inputs, labels = _usable(*train)
+    if kind == 'text':
+        # Seed examples keep every label represented while Gemini data is sparse
+        for label, examples in SEED_EXAMPLES.items():
+            inputs.extend(examples)
+            labels.extend([label] * len(examples))
+        return TextEmotionModel.train(inputs, labels, {'source': 'distillation'})
+    names = LANDMARK_FEATURES if kind == 'landmark' else AUDIO_FEATURES
+    return FeatureModel.train(kind, names, np.vstack(inputs), labels)
+
+
+def _predictor(kind: str, model):
+    if kind == 'text':
+        return lambda text: model.analyze(text)['primary_emotion']
+    return lambda vector: model.labels[int(np.argmax(model.pipeline.predict_proba(vector.reshape(1, -1))[0]))]
+
+
+def _load(kind: str, path: str):
+    return TextEmotionModel.load(path) if kind == 'text' else FeatureModel.load(path)
+
+
+class Distiller:
+    """Runs export → train → evaluate → publish (→ promote) for each model kind"""
+
+    def __init__(self, repository: EmotionRepository, registry: Optional[ModelRegistry] = None,
+                 min_examples: int = MIN_EXAMPLES, min_improvement: float = 0.0,
+                 text_store: Optional[TrainingTextStore] = None):
+        """
+        Args:
+            repository: Source of the stored emotion results
+            registry: Destination of model versions
+            text_store: Source of text examples (without one the text model is not retrained)
+            min_examples: Training examples required before a kind is trained
+            min_improvement: Holdout accuracy gain over the current model needed to promote
+        """
+        self.repository = repository
+        self.registry = registry or ModelRegistry()
+        self.min_examples = min_examples
+        self.min_improvement = min_improvement
+        self.text_store = text_store
+
+    def _current_score(self, kind: str, holdout: Tuple[list, list]) -> Optional[Dict[str, Any]]:
+        """Score the active model on today's holdout set (it may have changed since it was promoted)"""
+        if kind == 'text':
+            model = get_text_emotion_model()
+        else:
+            version = self.registry.current_version(kind)
+            model = _load(kind, self.registry.artifact_path(kind, version)) if version else None
+        if model is None:
+            return None
+        return evaluate(_predictor(kind, model), *holdout)
+
+    def run(self, kinds: Sequence[str] = KINDS, promote: bool = True, batch_size: int = 1000) -> Dict[str, Any]:
+        """
+        Distill every requested kind
+
+        Returns:
+            Per-kind report: skipped reason, or the new version with its metrics and promotion
+        """
+        report: Dict[str, Any] = {}
+        collected = collect_examples(self.repository, kinds, batch_size, self.text_store)
+
+        for kind in kinds:
+            train, holdout = collected[kind]['train'], collected[kind]['holdout']
+            if len(train[1]) < self.min_examples or not holdout[1]:
+                report[kind] = {'skipped': f"{len(train[1])} training / {len(holdout[1])} holdout examples"}
+                continue
+
+            try:
+                candidate = train_kind(kind, train)
+                metrics = evaluate(_predictor(kind, candidate), *holdout)
+                metrics.update({
+                    'training_examples': len(train[1]),
+                    'label_counts': dict(Counter(train[1])),
+                })
+                current = self._current_score(kind, holdout)
+                metrics['current_model'] = current
+
+                version = self.registry.publish(kind, candidate.save, metrics, candidate.metadata['version'])
+                better = current is None or metrics['accuracy'] >= current['accuracy'] + self.min_improvement
+                if promote and better:
+                    self.registry.promote(kind, version)
+                report[kind] = {'version': version, 'promoted': bool(promote and better), 'metrics': metrics}
+            except Exception as e:
+                logger.error(f"Distillation of {kind} model failed: {e}")
+                report[kind] = {'error': str(e)}
+
+        return report
+
+
+# ==================== SERVING ====================
+
+_feature_slots: Dict[str, HotSwappableModel] = {}
+
+
+def get_feature_model(kind: str) -> Optional[FeatureModel]:
+    """The promoted landmark/audio model for this worker, or None until one exists
+
+    Reloads automatically when a new version is promoted.
+    """
+    if not SKLEARN_AVAILABLE:
+        return None
+    slot = _feature_slots.get(kind)
+    if slot is None:
+        slot = _feature_slots.setdefault(kind, HotSwappableModel(kind, FeatureModel.load))
+    return slot.get()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Distil local emotion models from Gemini-labelled history')
+    parser.add_argument('--db', default='manas_wellness.db', help='Hot SQLite database path')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    train_parser = subparsers.add_parser('train', help='Export, train, evaluate and publish models')
+    train_parser.add_argument('--kinds', nargs='+', choices=KINDS, default=list(KINDS))
+    train_parser.add_argument('--batch-size', type=int, default=1000, help='Rows per export batch')
+    train_parser.add_argument('--min-examples', type=int, default=MIN_EXAMPLES)
+    train_parser.add_argument('--min-improvement', type=float, default=0.0)
+    train_parser.add_argument('--no-promote', action='store_true', help='Publish without switching CURRENT')
+
+    list_parser = subparsers.add_parser('list', help='Show published versions and their holdout scores')
+    list_parser.add_argument('--kinds', nargs='+', choices=KINDS, default=list(KINDS))
+
+    promote_parser = subparsers.add_parser('promote', help='Activate (or roll back to) a published version')
+    promote_parser.add_argument('kind', choices=KINDS)
+    promote_parser.add_argument('version')
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    registry = ModelRegistry()
+
+    if args.command == 'train':
+        if not (SKLEARN_AVAILABLE and TEXT_MODEL_AVAILABLE):
+            parser.error('scikit-learn is required for distillation')
+        distiller = Distiller(EmotionRepository(args.db), registry, args.min_examples, args.min_improvement,
+                              text_store=TrainingTextStore(args.db))
+        report = distiller.run(args.kinds, promote=not args.no_promote, batch_size=args.batch_size)
+        print(json.dumps(report, indent=2, default=str))
+    elif args.command == 'list':
+        for kind in args.kinds:
+            current = registry.current_version(kind)
+            for version in registry.versions(kind):
+                metrics = registry.read_metrics(kind, version)
+                marker = '*' if version == current else ' '
+                print(f"{marker} {kind:9s} {version}  accuracy={metrics.get('accuracy')}  "
+                      f"macro_f1={metrics.get('macro_f1')}  n={metrics.get('training_examples')}")
+    else:
+        registry.promote(args.kind, args.version)
+        print(f"{args.kind} model {args.version} is now active")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,63 +1,120 @@
 # 🧠 Manas: Multi-Modal Emotion Detection
 # Advanced emotion analysis using computer vision, voice, and text processing
 
-import cv2
 import numpy as np
-try:
-    import mediapipe as mp
-    MEDIAPIPE_AVAILABLE = True
-except ImportError:
-    MEDIAPIPE_AVAILABLE = False
-    mp = None
+
+from .lazy_import import lazy_import, module_available
+
+# Heavy dependencies are imported on first use, not when this module loads
+cv2 = lazy_import('cv2')
+
+MEDIAPIPE_AVAILABLE = module_available('mediapipe')
+mp = lazy_import('mediapipe') if MEDIAPIPE_AVAILABLE else None
+if not MEDIAPIPE_AVAILABLE:
     print("Warning: mediapipe not available. Face emotion detection will be disabled.")
 
-try:
-    import librosa
-    LIBROSA_AVAILABLE = True
-except ImportError:
-    LIBROSA_AVAILABLE = False
-    librosa = None
+LIBROSA_AVAILABLE = module_available('librosa')
+librosa = lazy_import('librosa') if LIBROSA_AVAILABLE else None
+if not LIBROSA_AVAILABLE:
     print("Warning: librosa not available. Audio emotion detection will be disabled.")
 
 import json
 import logging
-from typing import Dict, List, Optional, Any
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Callable, Dict, List, Optional, Any, Union
 from PIL import Image
 import tempfile
 import os
+import time
 from datetime import datetime
 
-from .gemini_api import gemini_analyze_emotion
+from .gemini_api import gemini_analyze_emotion, _fallback_emotion_analysis
+from .mediapipe_pool import get_face_pools
+from .analysis_workers import get_analysis_workers, AnalysisTimeout
+from .audio_features import extract_audio_features
+from .audio_frontend import AudioFrontEnd
+from .landmark_features import analyze_landmarks
+from .tiered_analysis import TieringPolicy
+from .distillation import get_feature_model
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Response format of every Gemini facial analysis (images and video keyframes); parsed by
+# EmotionDetector._enhanced_facial_analysis_fusion
+FACIAL_ANALYSIS_JSON_FORMAT = """
+Provide a comprehensive psychological assessment in this EXACT JSON format:
+
+{
+    "facial_emotion_detected": "primary emotion (happy, sad, anxious, angry, neutral, surprised, confused, stressed, calm, excited)",
+    "emotion_intensity": integer from 1-10,
+    "confidence": decimal from 0.0-1.0,
+    "facial_features_analysis": {
+        "eye_expression": "detailed description of eye area emotions and tension",
+        "mouth_expression": "detailed analysis of mouth curvature and positioning", 
+        "eyebrow_position": "eyebrow elevation, furrow patterns, stress indicators",
+        "overall_facial_tension": "assessment of facial muscle tension and asymmetry",
+        "micro_expressions": "subtle emotional indicators visible in the image"
+    },
+    "emotions_breakdown": {
+        "happy": percentage 0-100,
+        "sad": percentage 0-100,
+        "angry": percentage 0-100,
+        "surprised": percentage 0-100,
+        "neutral": percentage 0-100,
+        "anxious": percentage 0-100,
+        "confused": percentage 0-100
+    },
+    "mental_wellness_indicators": ["specific indicators from facial analysis"],
+    "cultural_considerations": "considerations for Indian youth emotional expression patterns",
+    "recommendations": "specific therapeutic recommendations based on facial emotional state",
+    "image_quality_assessment": "assessment of image clarity, lighting, angle for analysis accuracy",
+    "analysis_notes": "additional observations relevant to mental wellness assessment"
+}
+"""
+
 class EmotionDetector:
     """Multi-modal emotion detection system"""
     
-    def __init__(self):
-        """Initialize emotion detection components"""
-        # MediaPipe setup for facial emotion detection
+    def __init__(self, pool_size: Optional[int] = None, tiering: Optional[TieringPolicy] = None):
+        """Initialize emotion detection components
+        
+        Args:
+            pool_size: Number of pooled MediaPipe graphs (defaults to the worker thread count)
+            tiering: Policy deciding when local results are returned without Gemini
+        """
+        # MediaPipe setup for facial emotion detection - one graph per concurrent request
         if MEDIAPIPE_AVAILABLE:
             try:
                 self.mp_face_mesh = mp.solutions.face_mesh
                 self.mp_drawing = mp.solutions.drawing_utils
-                self.face_mesh = self.mp_face_mesh.FaceMesh(
-                    static_image_mode=True,
-                    max_num_faces=1,
-                    refine_landmarks=True,
-                    min_detection_confidence=0.5
-                )
-                logger.info("MediaPipe Face Mesh initialized successfully")
+                self.face_pools = get_face_pools(pool_size)
+                logger.info("MediaPipe Face Mesh pool initialized successfully")
             except Exception as e:
                 logger.error(f"MediaPipe initialization failed: {e}")
                 self.mp_face_mesh = None
                 self.mp_drawing = None
-                self.face_mesh = None
+                self.face_pools = None
         else:
             self.mp_face_mesh = None
             self.mp_drawing = None
-            self.face_mesh = None
+            self.face_pools = None
+        
+        # Voice input is trimmed to a bounded window of voiced audio before analysis
+        self.audio_frontend = AudioFrontEnd()
+        
+        # Out-of-process workers for landmarking and audio features (None when disabled)
+        self.workers = get_analysis_workers()
+        
+        # Local-first analysis: Gemini only for ambiguous or risky inputs
+        self.tiering = tiering or TieringPolicy()
+        
+        # Threads for running the modalities of one multimodal request side by side;
+        # CPU-heavy parts already run in the analysis workers, the rest waits on Gemini
+        self.modality_executor = ThreadPoolExecutor(
+            max_workers=int(os.environ.get('MULTIMODAL_THREADS', 8)),
+            thread_name_prefix='modality'
+        )
         
         # Emotion mapping for facial landmarks
         self.emotion_landmarks = {
@@ -70,7 +127,7 @@ class EmotionDetector:
         
         logger.info("EmotionDetector initialized successfully")
     
-    def _gemini_only_facial_analysis(self, image_path: str) -> Dict[str, Any]:
+    def _gemini_only_facial_analysis(self, image_path: Union[str, np.ndarray]) -> Dict[str, Any]:
         """
         Fallback facial analysis using only Gemini AI when MediaPipe fails
         """
@@ -166,59 +223,66 @@ class EmotionDetector:
                 'error': str(e)
             }
     
-    def analyze_facial_emotion(self, image_path: str) -> Dict[str, Any]:
+    def analyze_facial_emotion(self, image: Union[str, np.ndarray]) -> Dict[str, Any]:
         """
         Analyze facial emotion from image using enhanced MediaPipe and Gemini AI
         
         Args:
-            image_path: Path to image file
+            image: Path to image file, or an already-decoded BGR array
+                (see utils.media_decoding.decode_image)
         
         Returns:
             Dictionary containing comprehensive emotion analysis results
         """
         try:
-            # Check if MediaPipe is available and properly initialized
-            if not self.face_mesh:
-                logger.warning("MediaPipe not available, using Gemini-only analysis")
-                return self._gemini_only_facial_analysis(image_path)
-            
             # Load and validate image
-            image = cv2.imread(image_path)
+            if isinstance(image, str):
+                image = cv2.imread(image)
             if image is None:
                 raise ValueError("Could not load image")
             
-            # Convert BGR to RGB for MediaPipe
+            # Convert BGR to RGB once - shared by MediaPipe and Gemini
             rgb_image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
             
+            # Check if MediaPipe is available and properly initialized
+            if not self.face_pools:
+                logger.warning("MediaPipe not available, using Gemini-only analysis")
+                return self._gemini_only_facial_analysis(rgb_image)
+            
             # Get image dimensions for better analysis
             height, width = rgb_image.shape[:2]
             
             # Process with MediaPipe Face Mesh for detailed landmarks
-            results = self.face_mesh.process(rgb_image)
-            
-            if not results.multi_face_landmarks:
-                # Fallback: try with simpler face detection
-                try:
-                    mp_face_detection = mp.solutions.face_detection
-                    face_detection = mp_face_detection.FaceDetection(min_detection_confidence=0.3)
-                    detection_results = face_detection.process(rgb_image)
-                    
-                    if not detection_results.detections:
-                        logger.warning("No face detected, using Gemini-only analysis")
-                        return self._gemini_only_facial_analysis(image_path)
-                except Exception as fallback_error:
-                    logger.error(f"Face detection fallback failed: {fallback_error}")
-                    return self._gemini_only_facial_analysis(image_path)
+            try:
+                face_found, landmarks_array = self._detect_face(rgb_image)
+            except AnalysisTimeout as timeout_error:
+                logger.warning(f"Face landmarking timed out, using Gemini-only analysis: {timeout_error}")
+                return self._gemini_only_facial_analysis(rgb_image)
+            except Exception as fallback_error:
+                logger.error(f"Face detection failed: {fallback_error}")
+                return self._gemini_only_facial_analysis(rgb_image)
+            
+            if not face_found:
+                logger.warning("No face detected, using Gemini-only analysis")
+                return self._gemini_only_facial_analysis(rgb_image)
             
             # Extract facial landmarks if available
             landmark_analysis = {}
-            if results.multi_face_landmarks:
-                face_landmarks = results.multi_face_landmarks[0]
-                landmarks_array = np.array([[lm.x, lm.y, lm.z] for lm in face_landmarks.landmark])
-                
+            if landmarks_array is not None:
                 # Enhanced geometric analysis
                 landmark_analysis = self._enhanced_landmark_analysis(landmarks_array)
+                self._apply_distilled_model('landmark', landmark_analysis, landmark_analysis)
                 logger.info(f"Landmark analysis: {landmark_analysis}")
+                
+                if not self.tiering.escalation_reason('visual', landmark_analysis):
+                    landmark_analysis.update({
+                        'facial_landmarks_detected': True,
+                        'analysis_method': 'mediapipe_local',
+                        'analysis_tier': 'local',
+                        'image_resolution': f"{width}x{height}",
+                        'processing_timestamp': datetime.now().isoformat()
+                    })
+                    return landmark_analysis
             else:
                 landmark_analysis = {
                     'primary_emotion': 'neutral',
@@ -236,37 +300,10 @@ class EmotionDetector:
             
             Image technical details:
             - Resolution: {width}x{height}
-            - Face detected: {results.multi_face_landmarks is not None}
+            - Face detected: {landmarks_array is not None}
             - Analysis context: Mental wellness assessment for Indian youth
             
-            Provide a comprehensive psychological assessment in this EXACT JSON format:
-            
-            {{
-                "facial_emotion_detected": "primary emotion (happy, sad, anxious, angry, neutral, surprised, confused, stressed, calm, excited)",
-                "emotion_intensity": integer from 1-10,
-                "confidence": decimal from 0.0-1.0,
-                "facial_features_analysis": {{
-                    "eye_expression": "detailed description of eye area emotions and tension",
-                    "mouth_expression": "detailed analysis of mouth curvature and positioning", 
-                    "eyebrow_position": "eyebrow elevation, furrow patterns, stress indicators",
-                    "overall_facial_tension": "assessment of facial muscle tension and asymmetry",
-                    "micro_expressions": "subtle emotional indicators visible in the image"
-                }},
-                "emotions_breakdown": {{
-                    "happy": percentage 0-100,
-                    "sad": percentage 0-100,
-                    "angry": percentage 0-100,
-                    "surprised": percentage 0-100,
-                    "neutral": percentage 0-100,
-                    "anxious": percentage 0-100,
-                    "confused": percentage 0-100
-                }},
-                "mental_wellness_indicators": ["specific indicators from facial analysis"],
-                "cultural_considerations": "considerations for Indian youth emotional expression patterns",
-                "recommendations": "specific therapeutic recommendations based on facial emotional state",
-                "image_quality_assessment": "assessment of image clarity, lighting, angle for analysis accuracy",
-                "analysis_notes": "additional observations relevant to mental wellness assessment"
-            }}
+            {FACIAL_ANALYSIS_JSON_FORMAT}
             
             CRITICAL ANALYSIS FACTORS:
             1. Eye region: Look for stress lines, tear duct tension, eyelid positioning
@@ -288,7 +325,7 @@ class EmotionDetector:
             # Get enhanced Gemini analysis
             from .gemini_api import gemini_multimodal
             try:
-                gemini_response = gemini_multimodal(image_path, gemini_prompt)
+                gemini_response = gemini_multimodal(rgb_image, gemini_prompt)
                 logger.info(f"Gemini facial analysis response: {gemini_response[:300]}...")
                 
                 # Enhanced combination of MediaPipe and Gemini results
@@ -296,8 +333,9 @@ class EmotionDetector:
                 
                 # Add metadata
                 combined_result.update({
-                    'facial_landmarks_detected': results.multi_face_landmarks is not None,
+                    'facial_landmarks_detected': landmarks_array is not None,
                     'analysis_method': 'enhanced_mediapipe_gemini_fusion',
+                    'analysis_tier': 'gemini',
                     'image_resolution': f"{width}x{height}",
                     'processing_timestamp': datetime.now().isoformat()
                 })
@@ -308,7 +346,7 @@ class EmotionDetector:
                 logger.warning(f"Gemini facial analysis failed: {gemini_error}")
                 # Return enhanced MediaPipe analysis as fallback
                 landmark_analysis.update({
-                    'facial_landmarks_detected': results.multi_face_landmarks is not None,
+                    'facial_landmarks_detected': landmarks_array is not None,
                     'analysis_method': 'enhanced_mediapipe_only',
                     'gemini_error': str(gemini_error),
                     'fallback_used': True
@@ -327,25 +365,69 @@ class EmotionDetector:
                 'suggestions': 'Please try again with a clearer image in good lighting'
             }
     
-    def analyze_voice_emotion(self, audio_path: str) -> Dict[str, Any]:
+    def _detect_face(self, rgb_image: np.ndarray):
+        """Run face landmarking in a worker process, or in-thread when workers are disabled"""
+        if self.workers:
+            try:
+                return self.workers.detect_face(rgb_image)
+            except AnalysisTimeout:
+                raise
+            except Exception as e:
+                logger.warning(f"Analysis worker failed, landmarking in-process: {e}")
+        return self.face_pools.detect(rgb_image)
+    
+    def analyze_voice_emotion(self, audio: Union[str, np.ndarray], sr: int = 22050) -> Dict[str, Any]:
         """
         Analyze voice emotion from audio file
         
         Args:
-            audio_path: Path to audio file
+            audio: Path to audio file, or an already-decoded mono signal
+                (see utils.audio_frontend.AudioFrontEnd.process)
+            sr: Sample rate of a decoded signal
         
         Returns:
             Dictionary containing voice emotion analysis
         """
         try:
             # Load audio file
-            y, sr = librosa.load(audio_path, sr=22050)
+            if isinstance(audio, str):
+                y, sr, _ = self.audio_frontend.process(audio)
+            else:
+                y = audio
             
             # Extract audio features
             features = self._extract_audio_features(y, sr)
+            return self.analyze_voice_features(features)
             
+        except Exception as e:
+            logger.error(f"Voice emotion analysis error: {e}")
+            return {
+                'primary_emotion': 'error',
+                'emotion_intensity': 0,
+                'confidence': 0.0,
+                'audio_features_extracted': False,
+                'analysis_method': 'error',
+                'error': str(e)
+            }
+    
+    def analyze_voice_features(self, features: Dict[str, float]) -> Dict[str, Any]:
+        """
+        Voice emotion from already-extracted audio features (uploads and streams)
+        
+        Args:
+            features: Scalar features as produced by utils.audio_features.extract_audio_features
+        
+        Returns:
+            Dictionary containing voice emotion analysis
+        """
+        try:
             # Basic emotion classification from audio features
             emotion_scores = self._classify_emotion_from_audio(features)
+            self._apply_distilled_model('audio', emotion_scores, features)
+            
+            if not self.tiering.escalation_reason('audio', emotion_scores):
+                emotion_scores['analysis_tier'] = 'local'
+                return emotion_scores
             
             # Use Gemini for enhanced analysis if we can transcribe
             try:
@@ -400,6 +482,11 @@ class EmotionDetector:
             Dictionary containing text emotion analysis
         """
         try:
+            # Cheap local analysis first; escalate only ambiguous or risky text
+            local_result = self.analyze_text_emotion_local(text)
+            if not self.tiering.escalation_reason('text', local_result, text):
+                return local_result
+            
             # Use Gemini AI for comprehensive text emotion analysis
             emotion_result = gemini_analyze_emotion(text, {
                 'modality': 'text',
@@ -411,6 +498,7 @@ class EmotionDetector:
                 'text_length': len(text),
                 'word_count': len(text.split()),
                 'analysis_method': 'gemini_ai',
+                'analysis_tier': 'gemini',
                 'modality': 'text'
             })
             
@@ -427,6 +515,87 @@ class EmotionDetector:
                 'error': str(e)
             }
     
+    def analyze_text_emotion_local(self, text: str) -> Dict[str, Any]:
+        """
+        Local (no network) text emotion analysis used as the first tier
+        
+        Args:
+            text: Text to analyze
+        
+        Returns:
+            Dictionary containing text emotion analysis
+        """
+        result = _fallback_emotion_analysis(text, {'modality': 'text'})
+        result.pop('fallback_reason', None)
+        result.update({
+            'text_length': len(text),
+            'word_count': len(text.split()),
+            'model_used': 'local_text_model',
+            'analysis_method': 'local_text_model',
+            'analysis_tier': 'local',
+            'modality': 'text'
+        })
+        return result
+    
+    def analyze_multimodal(self, analyses: Dict[str, Callable[[], Dict[str, Any]]],
+                           timeout: float = 60.0) -> Dict[str, Any]:
+        """
+        Run several single-modality analyses concurrently and fuse them
+        
+        Args:
+            analyses: Modality ('visual', 'audio', 'text') -> zero-argument callable
+                returning that modality's analysis result
+            timeout: Seconds to wait for the slowest modality
+        
+        Returns:
+            Fused emotion analysis result with per-modality timings (each
+            modality's own run time; None if it never started)
+        """
+        started = datetime.now()
+        run_started = {}
+        run_seconds = {}
+        
+        def timed(modality: str, run: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+            # Timed on the worker, so waiting on other modalities is not counted
+            run_started[modality] = time.perf_counter()
+            try:
+                return run()
+            finally:
+                run_seconds[modality] = round(time.perf_counter() - run_started[modality], 3)
+        
+        futures = {modality: self.modality_executor.submit(timed, modality, run) for modality, run in analyses.items()}
+        
+        results = []
+        timings = {}
+        for modality, future in futures.items():
+            remaining = max(0.0, timeout - (datetime.now() - started).total_seconds())
+            try:
+                result = future.result(timeout=remaining)
+            except FutureTimeoutError:
+                future.cancel()
+                logger.warning(f"{modality} analysis timed out in multimodal request")
+                result = {'primary_emotion': 'error', 'confidence': 0.0, 'error': 'timeout'}
+            except Exception as e:
+                logger.error(f"{modality} analysis failed in multimodal request: {e}")
+                result = {'primary_emotion': 'error', 'confidence': 0.0, 'error': str(e)}
+            result['modality'] = modality
+            if modality in run_seconds:
+                timings[modality] = run_seconds[modality]
+            elif modality in run_started:
+                # Still running when the deadline passed
+                timings[modality] = round(time.perf_counter() - run_started[modality], 3)
+            else:
+                timings[modality] = None
+            results.append(result)
+        
+        fused = self.fuse_multimodal_emotions(results)
+        fused.update({
+            'modality': 'multimodal',
+            'modality_latency_seconds': timings,
+            'processing_timestamp': datetime.now().isoformat()
+        })
+        return fused
+    
     def fuse_multimodal_emotions(self, emotion_results: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
         Fuse multiple emotion analysis results for higher accuracy
@@ -452,6 +621,8 @@ class EmotionDetector:
             emotions = []
             confidences = []
             risk_levels = []
+            intensities = []
+            weights = []
             
             for result in emotion_results:
                 if result.get('primary_emotion') != 'error':
@@ -459,8 +630,10 @@ class EmotionDetector:
                     weight = modality_weights.get(modality, 0.33)
                     
                     emotions.append(result.get('primary_emotion', 'neutral'))
+                    weights.append(weight)
                     confidences.append(result.get('confidence', 0.0) * weight)
-                    risk_levels.append(result.get('risk_level', 0.0) * weight)
+                    risk_levels.append(float(result.get('risk_level', 0.0) or 0.0))
+                    intensities.append(float(result.get('emotion_intensity', 5) or 0) * weight)
             
             if not emotions:
                 return {'primary_emotion': 'neutral', 'confidence': 0.0}
@@ -475,12 +648,15 @@ class EmotionDetector:
             # Get primary emotion
             primary_emotion = max(emotion_counts, key=emotion_counts.get)
             
-            # Calculate fused metrics
-            fused_confidence = sum(confidences) / len(confidences) if confidences else 0.0
-            fused_risk_level = sum(risk_levels) / len(risk_levels) if risk_levels else 0.0
+            # Calculate fused metrics (weighted average, so one modality keeps its own confidence)
+            total_weight = sum(weights)
+            fused_confidence = sum(confidences) / total_weight if total_weight else 0.0
+            # Risk is not averaged away - one alarming modality is enough
+            fused_risk_level = max(risk_levels) if risk_levels else 0.0
             
             return {
                 'primary_emotion': primary_emotion,
+                'emotion_intensity': int(round(sum(intensities) / total_weight)) if total_weight else 0,
                 'confidence': min(fused_confidence, 1.0),
                 'risk_level': min(fused_risk_level, 1.0),
                 'modalities_used': [r.get('modality', 'unknown') for r in emotion_results],
@@ -496,201 +672,32 @@ class EmotionDetector:
                 'error': str(e)
             }
     
-    def _classify_emotion_from_landmarks(self, landmarks: np.ndarray) -> Dict[str, Any]:
-        """Classify emotion from facial landmarks using advanced geometric analysis"""
-        try:
-            # More sophisticated facial emotion analysis
-            # Key landmark indices for facial features
-            LEFT_EYE = [33, 7, 163, 144, 145, 153, 154, 155, 133, 173, 157, 158, 159, 160, 161, 246]
-            RIGHT_EYE = [362, 382, 381, 380, 374, 373, 390, 249, 263, 466, 388, 387, 386, 385, 384, 398]
-            MOUTH = [61, 84, 17, 314, 405, 320, 307, 375, 321, 308, 324, 318]
-            EYEBROWS = [70, 63, 105, 66, 107, 55, 65, 52, 53, 46]
-            
-            # Calculate facial feature measurements
-            # Eye aspect ratio (EAR) - measures eye openness
-            left_ear = self._calculate_eye_aspect_ratio(landmarks, LEFT_EYE)
-            right_ear = self._calculate_eye_aspect_ratio(landmarks, RIGHT_EYE)
-            avg_ear = (left_ear + right_ear) / 2.0
-            
-            # Mouth aspect ratio (MAR) - measures mouth openness
-            mar = self._calculate_mouth_aspect_ratio(landmarks, MOUTH)
-            
-            # Eyebrow elevation - measures surprise/stress
-            eyebrow_elevation = self._calculate_eyebrow_elevation(landmarks, EYEBROWS)
-            
-            # Mouth curvature - measures smile/frown
-            mouth_curvature = self._calculate_mouth_curvature(landmarks, MOUTH)
-            
-            # Classify emotion based on feature combinations
-            emotion_scores = {
-                'happy': 0,
-                'sad': 0,
-                'angry': 0,
-                'surprised': 0,
-                'neutral': 0,
-                'anxious': 0
-            }
-            
-            # Happy: wide smile, normal eye openness
-            if mouth_curvature > 0.02 and mar > 0.01:
-                emotion_scores['happy'] = min(80, max(50, mouth_curvature * 2000 + mar * 1000))
-            
-            # Sad: downturned mouth, droopy eyes
-            elif mouth_curvature < -0.01 and avg_ear < 0.25:
-                emotion_scores['sad'] = min(75, max(45, abs(mouth_curvature) * 1500 + (0.3 - avg_ear) * 200))
-            
-            # Surprised: raised eyebrows, wide eyes, open mouth
-            elif eyebrow_elevation > 0.02 and avg_ear > 0.3 and mar > 0.02:
-                emotion_scores['surprised'] = min(85, max(55, eyebrow_elevation * 2000 + avg_ear * 200 + mar * 800))
-            
-            # Angry: lowered eyebrows, tense mouth
-            elif eyebrow_elevation < -0.01 and mouth_curvature < -0.005:
-                emotion_scores['angry'] = min(70, max(45, abs(eyebrow_elevation) * 1500 + abs(mouth_curvature) * 1000))
-            
-            # Anxious: slight tension in multiple features
-            elif abs(mouth_curvature) < 0.005 and avg_ear < 0.28 and eyebrow_elevation > 0.005:
-                emotion_scores['anxious'] = min(65, max(40, (0.3 - avg_ear) * 150 + eyebrow_elevation * 1000))
-            
-            else:
-                emotion_scores['neutral'] = 60
-            
-            # Find primary emotion
-            primary_emotion = max(emotion_scores, key=emotion_scores.get)
-            intensity = max(3, min(10, int(emotion_scores[primary_emotion] / 10)))
-            confidence = min(0.9, max(0.4, emotion_scores[primary_emotion] / 100))
-            
-            return {
-                'primary_emotion': primary_emotion,
-                'emotion_intensity': intensity,
-                'confidence': confidence,
-                'facial_landmarks_detected': True,
-                'analysis_method': 'mediapipe_advanced_geometric',
-                'feature_measurements': {
-                    'eye_aspect_ratio': avg_ear,
-                    'mouth_aspect_ratio': mar,
-                    'eyebrow_elevation': eyebrow_elevation,
-                    'mouth_curvature': mouth_curvature
-                },
-                'emotion_scores': emotion_scores
-            }
-            
-        except Exception as e:
-            logger.error(f"Advanced landmark classification error: {e}")
-            return {
-                'primary_emotion': 'neutral',
-                'emotion_intensity': 3,
-                'confidence': 0.3,
-                'error': str(e)
-            }
-    
-    def _calculate_eye_aspect_ratio(self, landmarks: np.ndarray, eye_indices: List[int]) -> float:
-        """Calculate eye aspect ratio for eye openness detection"""
-        try:
-            # Get eye landmark points
-            eye_points = landmarks[eye_indices]
-            
-            # Vertical eye distances
-            v1 = np.linalg.norm(eye_points[1] - eye_points[5])
-            v2 = np.linalg.norm(eye_points[2] - eye_points[4])
-            
-            # Horizontal eye distance
-            h = np.linalg.norm(eye_points[0] - eye_points[3])
-            
-            # Eye aspect ratio
-            ear = (v1 + v2) / (2.0 * h) if h > 0 else 0.25
-            return ear
-        except:
-            return 0.25  # Default value
-    
-    def _calculate_mouth_aspect_ratio(self, landmarks: np.ndarray, mouth_indices: List[int]) -> float:
-        """Calculate mouth aspect ratio for mouth openness detection"""
-        try:
-            mouth_points = landmarks[mouth_indices]
-            
-            # Vertical mouth distances
-            v1 = np.linalg.norm(mouth_points[2] - mouth_points[6])
-            v2 = np.linalg.norm(mouth_points[3] - mouth_points[7])
-            v3 = np.linalg.norm(mouth_points[4] - mouth_points[8])
-            
-            # Horizontal mouth distance
-            h = np.linalg.norm(mouth_points[0] - mouth_points[6])
-            
-            # Mouth aspect ratio
-            mar = (v1 + v2 + v3) / (3.0 * h) if h > 0 else 0.0
-            return mar
-        except:
-            return 0.0
-    
-    def _calculate_eyebrow_elevation(self, landmarks: np.ndarray, eyebrow_indices: List[int]) -> float:
-        """Calculate eyebrow elevation for surprise/stress detection"""
-        try:
-            eyebrow_points = landmarks[eyebrow_indices]
-            
-            # Calculate average eyebrow height relative to eye position
-            eyebrow_y = np.mean(eyebrow_points[:, 1])
-            eye_y = np.mean(landmarks[33:40, 1])  # Average eye height
-            
-            elevation = eye_y - eyebrow_y  # Higher values = raised eyebrows
-            return elevation
-        except:
-            return 0.0
-    
-    def _calculate_mouth_curvature(self, landmarks: np.ndarray, mouth_indices: List[int]) -> float:
-        """Calculate mouth curvature for smile/frown detection"""
-        try:
-            mouth_points = landmarks[mouth_indices]
-            
-            # Get mouth corners and center
-            left_corner = mouth_points[0]
-            right_corner = mouth_points[6]
-            center_top = mouth_points[3]
-            center_bottom = mouth_points[9] if len(mouth_points) > 9 else mouth_points[7]
-            
-            # Calculate mouth center
-            mouth_center_y = (center_top[1] + center_bottom[1]) / 2
-            corners_y = (left_corner[1] + right_corner[1]) / 2
-            
-            # Positive curvature = smile, negative = frown
-            curvature = corners_y - mouth_center_y
-            return curvature
-        except:
-            return 0.0
-    
     def _extract_audio_features(self, y: np.ndarray, sr: int) -> Dict[str, float]:
-        """Extract audio features for emotion analysis"""
+        """Extract audio features for emotion analysis, in a worker process when enabled"""
+        if self.workers:
+            try:
+                return self.workers.audio_features(y, sr)
+            except AnalysisTimeout:
+                raise
+            except Exception as e:
+                logger.warning(f"Analysis worker failed, extracting audio features in-process: {e}")
+        return extract_audio_features(y, sr)
+    
+    def _apply_distilled_model(self, kind: str, result: Dict[str, Any], features: Dict[str, Any]):
+        """Replace a heuristic label with the distilled model's prediction when one is promoted"""
         try:
-            features = {}
-            
-            # Pitch/Fundamental frequency
-            pitches, magnitudes = librosa.piptrack(y=y, sr=sr)
-            pitch_values = pitches[magnitudes > np.percentile(magnitudes, 85)]
-            features['pitch_mean'] = np.mean(pitch_values) if len(pitch_values) > 0 else 0
-            features['pitch_variation'] = np.std(pitch_values) if len(pitch_values) > 0 else 0
-            
-            # Energy/Amplitude
-            features['energy'] = np.mean(librosa.feature.rms(y=y)[0])
-            
-            # Spectral features
-            features['spectral_centroid'] = np.mean(librosa.feature.spectral_centroid(y=y, sr=sr)[0])
-            features['spectral_rolloff'] = np.mean(librosa.feature.spectral_rolloff(y=y, sr=sr)[0])
-            
-            # Tempo
-            tempo, _ = librosa.beat.beat_track(y=y, sr=sr)
-            features['tempo'] = tempo
-            
-            # Zero crossing rate (speech clarity indicator)
-            features['zcr'] = np.mean(librosa.feature.zero_crossing_rate(y)[0])
-            
-            # MFCCs (Mel-frequency cepstral coefficients)
-            mfccs = librosa.feature.mfcc(y=y, sr=sr, n_mfcc=13)
-            for i in range(13):
-                features[f'mfcc_{i}'] = np.mean(mfccs[i])
-            
-            return features
-            
+            model = get_feature_model(kind)
+            prediction = model.predict(features) if model else None
+            if prediction:
+                label, confidence, probabilities = prediction
+                result.update({
+                    'primary_emotion': label,
+                    'confidence': round(confidence, 3),
+                    'emotion_probabilities': {k: round(v, 4) for k, v in probabilities.items()},
+                    'local_model_version': model.metadata.get('version', 'unversioned')
+                })
         except Exception as e:
-            logger.error(f"Audio feature extraction error: {e}")
-            return {}
+            logger.warning(f"Distilled {kind} model failed, keeping heuristic result: {e}")
     
     def _classify_emotion_from_audio(self, features: Dict[str, float]) -> Dict[str, Any]:
         """Classify emotion from audio features"""
@@ -701,6 +708,7 @@ class EmotionDetector:
             pitch_mean = features.get('pitch_mean', 0)
             pitch_variation = features.get('pitch_variation', 0)
             energy = features.get('energy', 0)
+            # Absent when AUDIO_TEMPO_ENABLED=false; high-energy speech is then never 'excited'
             tempo = features.get('tempo', 120)
             
             # Simple heuristics
@@ -740,81 +748,7 @@ class EmotionDetector:
     
     def _enhanced_landmark_analysis(self, landmarks: np.ndarray) -> Dict[str, Any]:
         """Enhanced geometric analysis of facial landmarks for better emotion detection"""
-        try:
-            # Key facial landmarks indices for MediaPipe Face Mesh
-            # Eye landmarks
-            left_eye_indices = [33, 7, 163, 144, 145, 153, 154, 155, 133, 173, 157, 158, 159, 160, 161, 246]
-            right_eye_indices = [362, 382, 381, 380, 374, 373, 390, 249, 263, 466, 388, 387, 386, 385, 384, 398]
-            
-            # Mouth landmarks
-            mouth_outer_indices = [61, 84, 17, 314, 405, 320, 307, 375, 321, 308, 324, 318]
-            mouth_inner_indices = [13, 82, 81, 80, 78, 95, 88, 178, 87, 14, 317, 402, 318, 324]
-            
-            # Eyebrow landmarks
-            left_eyebrow_indices = [70, 63, 105, 66, 107, 55, 65, 52, 53, 46]
-            right_eyebrow_indices = [296, 334, 293, 300, 276, 283, 282, 295, 285, 336]
-            
-            # Calculate enhanced ratios
-            left_ear = self._calculate_eye_aspect_ratio(landmarks, left_eye_indices[:6])
-            right_ear = self._calculate_eye_aspect_ratio(landmarks, right_eye_indices[:6])
-            avg_ear = (left_ear + right_ear) / 2
-            
-            mouth_ar = self._calculate_mouth_aspect_ratio(landmarks, mouth_outer_indices[:6])
-            mouth_curvature = self._calculate_mouth_curvature(landmarks, mouth_outer_indices)
-            
-            left_eyebrow_height = self._calculate_eyebrow_elevation(landmarks, left_eyebrow_indices[:4])
-            right_eyebrow_height = self._calculate_eyebrow_elevation(landmarks, right_eyebrow_indices[:4])
-            avg_eyebrow_height = (left_eyebrow_height + right_eyebrow_height) / 2
-            
-            # Enhanced emotion classification
-            emotion_scores = {
-                'happy': max(0, min(100, (mouth_curvature * 60 + (1 - avg_ear) * 40))),
-                'sad': max(0, min(100, ((1 - mouth_curvature) * 50 + (1 - avg_ear) * 30 + (1 - avg_eyebrow_height) * 20))),
-                'surprised': max(0, min(100, (avg_ear * 40 + mouth_ar * 35 + avg_eyebrow_height * 25))),
-                'angry': max(0, min(100, ((1 - avg_ear) * 35 + (1 - mouth_curvature) * 30 + avg_eyebrow_height * 35))),
-                'neutral': max(0, min(100, (100 - abs(mouth_curvature - 0.5) * 80 - abs(avg_ear - 0.4) * 60))),
-                'anxious': max(0, min(100, ((1 - avg_ear) * 40 + avg_eyebrow_height * 45 + mouth_ar * 15)))
-            }
-            
-            # Determine primary emotion
-            primary_emotion = max(emotion_scores, key=emotion_scores.get)
-            max_score = emotion_scores[primary_emotion]
-            
-            # Calculate confidence based on distinctiveness
-            sorted_scores = sorted(emotion_scores.values(), reverse=True)
-            confidence = (sorted_scores[0] - sorted_scores[1]) / 100 if len(sorted_scores) > 1 else 0.5
-            confidence = max(0.3, min(0.9, confidence))
-            
-            return {
-                'primary_emotion': primary_emotion,
-                'emotion_intensity': max(1, min(10, int(max_score / 10))),
-                'confidence': confidence,
-                'emotions_breakdown': emotion_scores,
-                'facial_features': {
-                    'eye_openness': avg_ear,
-                    'mouth_openness': mouth_ar,
-                    'mouth_curvature': mouth_curvature,
-                    'eyebrow_elevation': avg_eyebrow_height,
-                    'left_right_asymmetry': abs(left_ear - right_ear) + abs(left_eyebrow_height - right_eyebrow_height)
-                },
-                'geometric_analysis': {
-                    'left_eye_ratio': left_ear,
-                    'right_eye_ratio': right_ear,
-                    'mouth_aspect_ratio': mouth_ar,
-                    'eyebrow_symmetry': abs(left_eyebrow_height - right_eyebrow_height)
-                }
-            }
-            
-        except Exception as e:
-            logger.error(f"Enhanced landmark analysis error: {e}")
-            return {
-                'primary_emotion': 'neutral',
-                'emotion_intensity': 3,
-                'confidence': 0.4,
-                'emotions_breakdown': {'neutral': 60, 'happy': 20, 'sad': 10, 'angry': 5, 'surprised': 3, 'anxious': 2},
-                'facial_features': {},
-                'analysis_error': str(e)
-            }
+        return analyze_landmarks(landmarks)
     
     def _enhanced_facial_analysis_fusion(self, mediapipe_result: Dict, gemini_analysis: str) -> Dict[str, Any]:
         """Advanced fusion of MediaPipe and Gemini facial analysis results"""
@@ -1078,6 +1012,9 @@ class EmotionDetector:
                 if gemini_conf > audio_conf:
                     combined['primary_emotion'] = gemini_result.get('primary_emotion')
                     combined['emotion_intensity'] = gemini_result.get('emotion_intensity', 5)
+                if 'fallback' not in str(gemini_result.get('model_used', '')):
+                    # Teacher label for the distilled audio model
+                    combined['gemini_emotion'] = gemini_result.get('primary_emotion')
             
             # Add audio features for reference
             combined['audio_features'] = features
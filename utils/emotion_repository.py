@@ -0,0 +1,372 @@
+# 🧠 Manas: Emotion History Repository
+# Hot/cold storage for emotional_states and voice_conversations with monthly archives
+
+import argparse
+import json
+import logging
+import os
+import sqlite3
+import zlib
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Any
+
+from .blob_codec import BlobCodec, COMPRESSED_COLUMNS
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Rows older than this are moved out of the hot database by the tiering job
+DEFAULT_ARCHIVE_AFTER_DAYS = int(os.environ.get('ARCHIVE_AFTER_DAYS', 90))
+DEFAULT_ARCHIVE_DIR = os.environ.get('ARCHIVE_DIR', 'archive')
+
+
+class EmotionRepository:
+    """Data-access layer for emotion and voice conversation history.
+
+    Recent rows live in the hot ``manas_wellness.db``. The tiering job moves
+    older rows into per-month archive databases (``archive/manas_archive_YYYY_MM.db``)
+    with their bulky JSON columns zlib-compressed. Read methods merge both tiers,
+    so callers never need to know where a row is stored. Hot-table JSON blobs
+    go through a ``BlobCodec`` and are returned decoded.
+    """
+
+    # Columns kept uncompressed in the archive so they stay filterable
+    ARCHIVE_TABLES = {
+        'emotional_states': {
+            'time_column': 'timestamp',
+            'indexed': ['id', 'user_id', 'session_id', 'modality', 'confidence', 'timestamp'],
+            'packed': ['emotion_data']
+        },
+        'voice_conversations': {
+            'time_column': 'created_at',
+            'indexed': ['id', 'user_id', 'sentiment', 'confidence', 'emotion', 'created_at'],
+            'packed': ['user_message', 'ai_response', 'keywords']
+        }
+    }
+
+    def __init__(self, db_path: str = 'manas_wellness.db', archive_dir: str = DEFAULT_ARCHIVE_DIR,
+                 archive_after_days: int = DEFAULT_ARCHIVE_AFTER_DAYS, codec: Optional[BlobCodec] = None):
+        """
+        Initialize repository
+
+        Args:
+            db_path: Path to the hot SQLite database
+            archive_dir: Directory holding the per-month archive databases
+            archive_after_days: Age in days after which rows are archived
+            codec: Blob codec for compressed JSON columns (defaults to one on ``db_path``)
+        """
+        self.db_path = db_path
+        self.archive_dir = archive_dir
+        self.archive_after_days = archive_after_days
+        self.codec = codec or BlobCodec(db_path)
+
+    # ==================== CONNECTIONS ====================
+
+    def _connect(self, path: Optional[str] = None) -> sqlite3.Connection:
+        """Open a SQLite connection with dict-like rows"""
+        conn = sqlite3.connect(path or self.db_path)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _archive_path(self, month_key: str) -> str:
+        """Archive database path for a ``YYYY_MM`` month key"""
+        return os.path.join(self.archive_dir, f"manas_archive_{month_key}.db")
+
+    def _archive_paths_newest_first(self) -> List[str]:
+        """List existing archive databases, newest month first"""
+        if not os.path.isdir(self.archive_dir):
+            return []
+        files = [name for name in os.listdir(self.archive_dir)
+                 if name.startswith('manas_archive_') and name.endswith('.db')]
+        return [os.path.join(self.archive_dir, name) for name in sorted(files, reverse=True)]
+
+    def _init_archive_db(self, conn: sqlite3.Connection):
+        """Create archive tables and indexes in an archive database"""
+        for table, spec in self.ARCHIVE_TABLES.items():
+            columns = ', '.join(
+                f"{col} INTEGER PRIMARY KEY" if col == 'id' else col
+                for col in spec['indexed']
+            )
+            conn.execute(f"CREATE TABLE IF NOT EXISTS {table}_archive ({columns}, payload BLOB)")
+            conn.execute(f'''
+                CREATE INDEX IF NOT EXISTS idx_{table}_archive_user_time
+                ON {table}_archive (user_id, {spec['time_column']})
+            ''')
+
+    def ensure_schema(self):
+        """Create hot-table indexes used by the repository queries"""
+        try:
+            conn = self._connect()
+            conn.execute('''
+                CREATE INDEX IF NOT EXISTS idx_emotional_states_user_time
+                ON emotional_states (user_id, timestamp)
+            ''')
+            conn.execute('''
+                CREATE INDEX IF NOT EXISTS idx_voice_conversations_user_time
+                ON voice_conversations (user_id, created_at)
+            ''')
+            conn.commit()
+            conn.close()
+        except Exception as e:
+            logger.error(f"Emotion repository schema error: {e}")
+
+    # ==================== PAYLOAD PACKING ====================
+
+    def _pack(self, row: sqlite3.Row, columns: List[str]) -> bytes:
+        """Compress the bulky columns of a row into one archive payload"""
+        payload = {col: self.codec.decode(row[col]) for col in columns}
+        return zlib.compress(json.dumps(payload).encode('utf-8'), 9)
+
+    def _unpack(self, row: sqlite3.Row, table: str) -> Dict[str, Any]:
+        """Rebuild a hot-table shaped dict from an archive row"""
+        spec = self.ARCHIVE_TABLES[table]
+        result = {col: row[col] for col in spec['indexed']}
+        try:
+            result.update(json.loads(zlib.decompress(row['payload']).decode('utf-8')))
+        except Exception as e:
+            logger.error(f"Archive payload decode error in {table} row {row['id']}: {e}")
+            result.update({col: None for col in spec['packed']})
+        result['archived'] = True
+        return result
+
+    # ==================== WRITES ====================
+
+    def save_emotional_state(self, user_id: str, session_id: str, emotion_data: Dict[str, Any],
+                             modality: str, confidence: float) -> Optional[int]:
+        """Insert an emotion analysis result into the hot table"""
+        conn = self._connect()
+        try:
+            cursor = conn.execute('''
+                INSERT INTO emotional_states (user_id, session_id, emotion_data, modality, confidence)
+                VALUES (?, ?, ?, ?, ?)
+            ''', (user_id, session_id, self.codec.encode(json.dumps(emotion_data)), modality, confidence))
+            conn.commit()
+            return cursor.lastrowid
+        finally:
+            conn.close()
+
+    def save_voice_conversation(self, user_id: str, user_message: str, ai_response: str,
+                                analysis_data: Dict[str, Any]) -> Optional[int]:
+        """Insert a voice chat exchange into the hot table"""
+        conn = self._connect()
+        try:
+            cursor = conn.execute('''
+                INSERT INTO voice_conversations (
+                    user_id, user_message, ai_response, sentiment, confidence, emotion, keywords
+                ) VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', (
+                user_id,
+                user_message,
+                ai_response,
+                analysis_data.get('sentiment', 'neutral'),
+                analysis_data.get('confidence', 0.7),
+                analysis_data.get('emotion', 'Neutral'),
+                json.dumps(analysis_data.get('keywords', []))
+            ))
+            conn.commit()
+            return cursor.lastrowid
+        finally:
+            conn.close()
+
+    # ==================== READS ====================
+
+    def _query_tiers(self, table: str, user_id: str, limit: Optional[int],
+                     since: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Read rows newest first, falling through to archives until ``limit`` is met"""
+        time_column = self.ARCHIVE_TABLES[table]['time_column']
+        where = "WHERE user_id = ?"
+        params: List[Any] = [user_id]
+        if since:
+            where += f" AND {time_column} >= ?"
+            params.append(since)
+        limit_clause = " LIMIT ?" if limit else ""
+        limit_params = [limit] if limit else []
+
+        blob_columns = COMPRESSED_COLUMNS.get(table, [])
+        conn = self._connect()
+        try:
+            rows = [self.codec.decode_row(row, blob_columns) for row in conn.execute(
+                f"SELECT * FROM {table} {where} ORDER BY {time_column} DESC{limit_clause}",
+                params + limit_params
+            ).fetchall()]
+        finally:
+            conn.close()
+
+        for archive_path in self._archive_paths_newest_first():
+            if limit and len(rows) >= limit:
+                break
+            # Month files are ordered, so once a month ends before ``since`` the rest do too
+            if since and os.path.basename(archive_path)[14:21].replace('_', '-') < since[:7]:
+                break
+            remaining = [limit - len(rows)] if limit else []
+            try:
+                archive_conn = self._connect(archive_path)
+                archive_rows = archive_conn.execute(
+                    f"SELECT * FROM {table}_archive {where} ORDER BY {time_column} DESC{limit_clause}",
+                    params + remaining
+                ).fetchall()
+                archive_conn.close()
+                rows.extend(self._unpack(row, table) for row in archive_rows)
+            except sqlite3.Error as e:
+                logger.error(f"Archive read error ({archive_path}): {e}")
+
+        return rows
+
+    def get_recent_emotions(self, user_id: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Most recent emotional states for a user across hot and archived storage"""
+        return self._query_tiers('emotional_states', user_id, limit)
+
+    def get_emotion_history(self, user_id: str, since: Optional[str] = None,
+                            limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Emotional state history for a user, newest first
+
+        Args:
+            user_id: User identifier
+            since: Optional lower bound timestamp (``YYYY-MM-DD[ HH:MM:SS]``)
+            limit: Optional maximum number of rows
+        """
+        return self._query_tiers('emotional_states', user_id, limit, since)
+
+    def get_voice_conversations(self, user_id: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """Most recent voice conversations for a user across hot and archived storage"""
+        return self._query_tiers('voice_conversations', user_id, limit)
+
+    def iter_emotional_state_batches(self, modalities: Optional[List[str]] = None,
+                                     batch_size: int = 1000) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Every emotional state of every user, hot table first, in id-ordered batches
+
+        Uses keyset pagination so memory stays bounded by ``batch_size``
+        however large the history is.
+
+        Args:
+            modalities: Restrict to these modalities
+            batch_size: Rows per yielded batch
+        """
+        modality_clause = ''
+        modality_params: List[Any] = []
+        if modalities:
+            modality_clause = f" AND modality IN ({', '.join('?' for _ in modalities)})"
+            modality_params = list(modalities)
+
+        sources = [(self.db_path, 'emotional_states', False)]
+        sources += [(path, 'emotional_states_archive', True) for path in self._archive_paths_newest_first()]
+
+        for path, table, archived in sources:
+            last_id = 0
+            try:
+                conn = self._connect(path)
+            except sqlite3.Error as e:
+                logger.error(f"Could not open {path} for export: {e}")
+                continue
+            try:
+                while True:
+                    rows = conn.execute(
+                        f"SELECT * FROM {table} WHERE id > ?{modality_clause} ORDER BY id LIMIT ?",
+                        [last_id] + modality_params + [batch_size]
+                    ).fetchall()
+                    if not rows:
+                        break
+                    last_id = rows[-1]['id']
+                    if archived:
+                        yield [self._unpack(row, 'emotional_states') for row in rows]
+                    else:
+                        yield [self.codec.decode_row(row, COMPRESSED_COLUMNS['emotional_states']) for row in rows]
+            except sqlite3.Error as e:
+                logger.error(f"Export read error ({path}): {e}")
+            finally:
+                conn.close()
+
+    # ==================== TIERING JOB ====================
+
+    def archive_old_rows(self, older_than_days: Optional[int] = None, batch_size: int = 500,
+                         vacuum: bool = False) -> Dict[str, Any]:
+        """
+        Move rows older than the configured age into monthly archive databases
+
+        Rows are copied with ``INSERT OR IGNORE`` on their original id and only
+        deleted from the hot table once the archive commit succeeded, so an
+        interrupted run can simply be repeated.
+
+        Args:
+            older_than_days: Override for the configured archive age
+            batch_size: Rows moved per transaction
+            vacuum: Run VACUUM on the hot database afterwards to return space
+
+        Returns:
+            Summary of rows archived per table
+        """
+        days = older_than_days if older_than_days is not None else self.archive_after_days
+        summary = {'cutoff_days': days, 'archived': {}, 'errors': []}
+        os.makedirs(self.archive_dir, exist_ok=True)
+
+        conn = self._connect()
+        try:
+            for table, spec in self.ARCHIVE_TABLES.items():
+                time_column = spec['time_column']
+                moved = 0
+                while True:
+                    rows = conn.execute(f'''
+                        SELECT *, strftime('%Y_%m', {time_column}) AS month_key FROM {table}
+                        WHERE {time_column} < datetime('now', ?)
+                        ORDER BY id LIMIT ?
+                    ''', (f'-{days} days', batch_size)).fetchall()
+                    if not rows:
+                        break
+
+                    by_month: Dict[str, List[sqlite3.Row]] = {}
+                    for row in rows:
+                        by_month.setdefault(row['month_key'] or 'undated', []).append(row)
+
+                    for month_key, month_rows in by_month.items():
+                        archive_conn = self._connect(self._archive_path(month_key))
+                        try:
+                            self._init_archive_db(archive_conn)
+                            placeholders = ', '.join('?' * (len(spec['indexed']) + 1))
+                            archive_conn.executemany(
+                                f"INSERT OR IGNORE INTO {table}_archive "
+                                f"({', '.join(spec['indexed'])}, payload) VALUES ({placeholders})",
+                                [[row[col] for col in spec['indexed']] + [self._pack(row, spec['packed'])]
+                                 for row in month_rows]
+                            )
+                            archive_conn.commit()
+                        finally:
+                            archive_conn.close()
+
+                    conn.executemany(f"DELETE FROM {table} WHERE id = ?", [(row['id'],) for row in rows])
+                    conn.commit()
+                    moved += len(rows)
+
+                summary['archived'][table] = moved
+                logger.info(f"Archived {moved} rows from {table} older than {days} days")
+
+            if vacuum and any(summary['archived'].values()):
+                conn.execute('VACUUM')
+
+        except Exception as e:
+            logger.error(f"Archive job error: {e}")
+            summary['errors'].append(str(e))
+        finally:
+            conn.close()
+
+        summary['completed_at'] = datetime.now().isoformat()
+        return summary
+
+
+def main():
+    """Command-line entry point for the tiering job"""
+    parser = argparse.ArgumentParser(description='Archive old emotion history out of the hot database')
+    parser.add_argument('--db', default='manas_wellness.db', help='Hot database path')
+    parser.add_argument('--archive-dir', default=DEFAULT_ARCHIVE_DIR, help='Archive database directory')
+    parser.add_argument('--days', type=int, default=DEFAULT_ARCHIVE_AFTER_DAYS, help='Archive rows older than this many days')
+    parser.add_argument('--vacuum', action='store_true', help='VACUUM the hot database afterwards')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    repository = EmotionRepository(args.db, args.archive_dir, args.days)
+    print(json.dumps(repository.archive_old_rows(vacuum=args.vacuum), indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,7 +1,6 @@
 # 🧠 Manas: Gemini AI Integration
 # Advanced AI processing for mental wellness platform
 
-import google.generativeai as genai
 import os
 import json
 import logging
@@ -9,7 +8,11 @@ import re
 from datetime import datetime
 from PIL import Image
 import tempfile
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Union
+
+from .crisis_lexicon import get_crisis_lexicon
+from .lazy_import import lazy_import
+from .text_emotion_model import get_text_emotion_model
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -18,10 +21,18 @@ logger = logging.getLogger(__name__)
 GEMINI_API_KEY = os.environ.get('GEMINI_API_KEY')
 DEMO_MODE = False  # Always use real API now
 
-if GEMINI_API_KEY:
-    genai.configure(api_key=GEMINI_API_KEY)
-    logger.info("Gemini API configured successfully")
-else:
+def _configure_genai(module):
+    """Runs once, when the SDK is first used"""
+    if GEMINI_API_KEY:
+        module.configure(api_key=GEMINI_API_KEY)
+        logger.info("Gemini API configured successfully")
+
+
+# The SDK (and its grpc/protobuf stack) is imported on the first Gemini call,
+# never in a forking master: it brings up gRPC, which does not survive fork
+genai = lazy_import('google.generativeai', on_load=_configure_genai, fork_safe=False)
+
+if not GEMINI_API_KEY:
     logger.error("GEMINI_API_KEY not found in environment variables")
 
 def gemini_text(prompt: str, model_name: str = "gemini-1.5-flash", max_retries: int = 2) -> str:
@@ -68,12 +79,20 @@ def gemini_text(prompt: str, model_name: str = "gemini-1.5-flash", max_retries:
             })
         return f"I'm currently experiencing technical difficulties. Please try again later. Error: {str(e)}"
 
-def gemini_multimodal(image_path: str, prompt: str, model_name: str = "gemini-1.5-flash") -> str:
+def _as_pil_image(image: Union[str, Image.Image, Any]) -> Image.Image:
+    """Accept a file path, a PIL image or an RGB numpy array"""
+    if isinstance(image, Image.Image):
+        return image
+    if hasattr(image, '__array_interface__'):
+        return Image.fromarray(image)
+    return Image.open(image)
+
+def gemini_multimodal(image_path: Union[str, Image.Image, Any], prompt: str, model_name: str = "gemini-1.5-flash") -> str:
     """
     Generate response from image and text using Gemini Vision with enhanced analysis
     
     Args:
-        image_path: Path to image file
+        image_path: Path to image file, PIL image, or already-decoded RGB array
         prompt: Text prompt to accompany image
         model_name: Gemini model to use
     
@@ -82,7 +101,7 @@ def gemini_multimodal(image_path: str, prompt: str, model_name: str = "gemini-1.
     """
     try:
         model = genai.GenerativeModel(model_name)
-        image = Image.open(image_path)
+        image = _as_pil_image(image_path)
         
         # Enhanced prompt for facial emotion analysis
         enhanced_prompt = f"""
@@ -368,56 +387,38 @@ def _fallback_emotion_analysis(text: str, context: Dict[str, Any] = None, error:
             confidence = 0.7  # Higher confidence for voice-detected emotions
             
         else:
-            # Original text-based analysis
+            # Local trained text model (replaces the old keyword lists)
             text_lower = text.lower()
+            model = get_text_emotion_model()
             
-            # Emotion keywords
-            emotion_keywords = {
-                'happy': ['happy', 'joy', 'excited', 'great', 'awesome', 'amazing', 'wonderful', 'fantastic', 'good'],
-                'sad': ['sad', 'depressed', 'down', 'crying', 'tears', 'unhappy', 'miserable', 'heartbroken'],
-                'anxious': ['anxious', 'worried', 'nervous', 'stress', 'panic', 'overwhelmed', 'scared', 'afraid'],
-                'angry': ['angry', 'mad', 'furious', 'hate', 'annoyed', 'frustrated', 'irritated', 'rage'],
-                'confused': ['confused', 'lost', 'uncertain', 'unsure', 'dont know', "don't know", 'puzzled'],
-                'hopeless': ['hopeless', 'worthless', 'useless', 'pointless', 'give up', 'cant do', "can't do"]
-            }
-            
-            # Risk keywords
-            high_risk_keywords = ['suicide', 'kill myself', 'end it all', 'no point living', 'want to die', 'self harm']
-            moderate_risk_keywords = ['depressed', 'hopeless', 'alone', 'no one cares', 'cant take it', "can't take it"]
-            
-            # Analyze emotions
-            emotion_scores = {}
-            for emotion, keywords in emotion_keywords.items():
-                score = sum(1 for keyword in keywords if keyword in text_lower)
-                emotion_scores[emotion] = score
-            
-            # Determine primary emotion
-            if sum(emotion_scores.values()) == 0:
+            if model is None:
                 primary_emotion = 'neutral'
                 intensity = 3
                 confidence = 0.3
                 sentiment_score = 0.0
             else:
-                primary_emotion = max(emotion_scores, key=emotion_scores.get)
-                intensity = min(8, max(3, emotion_scores[primary_emotion] * 2))
-                confidence = min(0.7, max(0.4, emotion_scores[primary_emotion] / 5))
-                sentiment_score = -0.5 if primary_emotion in ['sad', 'angry', 'anxious', 'hopeless'] else 0.0 if primary_emotion == 'neutral' else 0.3
+                prediction = model.analyze(text)
+                primary_emotion = prediction['primary_emotion']
+                intensity = prediction['emotion_intensity']
+                confidence = prediction['confidence']
+                sentiment_score = prediction['sentiment_score']
         
         # Risk assessment
         text_lower = text.lower() if 'text_lower' not in locals() else text_lower
-        high_risk_keywords = ['suicide', 'kill myself', 'end it all', 'no point living', 'want to die', 'self harm']
-        moderate_risk_keywords = ['depressed', 'hopeless', 'alone', 'no one cares', 'cant take it', "can't take it"]
+        risk_categories = get_crisis_lexicon().analyze(text)['categories']
         
         if modality == 'voice' and detected_emotion:
             # Use the risk level from voice emotion mapping
             pass  # risk_level already set above
         else:
             # Text-based risk assessment
-            if any(keyword in text_lower for keyword in high_risk_keywords):
+            if risk_categories['high_risk']:
                 risk_level = 0.9
-            elif any(keyword in text_lower for keyword in moderate_risk_keywords):
+            elif risk_categories['moderate_risk']:
                 risk_level = 0.6
-            elif primary_emotion in ['sad', 'hopeless', 'anxious']:
+            elif primary_emotion == 'hopeless':
+                risk_level = 0.5
+            elif primary_emotion in ['sad', 'anxious', 'stressed']:
                 risk_level = 0.3
             else:
                 risk_level = 0.1
@@ -437,6 +438,9 @@ def _fallback_emotion_analysis(text: str, context: Dict[str, Any] = None, error:
         else:
             recommendations_map = {
                 'happy': "Continue what you're doing! Consider sharing your positive energy with others.",
+                'excited': "Enjoy this energy! Channel it into something you care about.",
+                'calm': "This calm is worth protecting. Notice what helped you feel this way.",
+                'stressed': "Break your workload into small steps and take short breaks between them.",
                 'sad': "It's okay to feel sad. Try talking to someone you trust or practicing mindfulness.",
                 'anxious': "Practice deep breathing exercises. Consider breaking down overwhelming tasks into smaller steps.",
                 'angry': "Try physical exercise or journaling to process these feelings constructively.",
@@ -458,11 +462,11 @@ def _fallback_emotion_analysis(text: str, context: Dict[str, Any] = None, error:
             "therapy_type": "mindfulness" if primary_emotion in ['anxious', 'stressed'] else "cbt" if primary_emotion in ['sad', 'hopeless'] else "journaling",
             "follow_up_timeline": "immediately" if risk_level > 0.7 else "daily" if risk_level > 0.5 else "weekly",
             "analysis_timestamp": datetime.now().isoformat(),
-            "model_used": "fallback_keyword_analysis",
+            "model_used": "fallback_local_text_model",
             "analysis_version": "fallback_2.0",
             "fallback_reason": error if error else "Gemini API unavailable",
             "modality": modality,
-            "detected_emotion_source": "voice_pattern_analysis" if modality == 'voice' and detected_emotion else "text_keyword_analysis"
+            "detected_emotion_source": "voice_pattern_analysis" if modality == 'voice' and detected_emotion else "local_text_model"
         }
         
     except Exception as fallback_error:
@@ -0,0 +1,142 @@
+# 🧠 Manas: Perceptual Image Cache
+# Returns the previous facial analysis for near-duplicate selfies (retries, auto-captured frames)
+
+import copy
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from .lazy_import import lazy_import
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Imported on first use
+cv2 = lazy_import('cv2')
+
+IMAGE_CACHE_ENABLED = os.environ.get('IMAGE_CACHE_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+IMAGE_CACHE_MAX_DISTANCE = int(os.environ.get('IMAGE_CACHE_MAX_DISTANCE', 6))
+IMAGE_CACHE_TTL_SECONDS = float(os.environ.get('IMAGE_CACHE_TTL_SECONDS', 600))
+
+Fingerprint = Tuple[int, int]
+
+
+def _grey(image: np.ndarray) -> np.ndarray:
+    return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if image.ndim == 3 else image
+
+
+def _bits_to_int(bits: np.ndarray) -> int:
+    return int(np.packbits(bits.astype(np.uint8).ravel()).view('>u8')[0])
+
+
+def dhash(image: np.ndarray, hash_size: int = 8) -> int:
+    """64-bit difference hash: sign of horizontal gradients on a 9x8 thumbnail"""
+    small = cv2.resize(_grey(image), (hash_size + 1, hash_size), interpolation=cv2.INTER_AREA)
+    return _bits_to_int(small[:, 1:] > small[:, :-1])
+
+
+def phash(image: np.ndarray, hash_size: int = 8) -> int:
+    """64-bit perceptual hash: low-frequency DCT coefficients above their median"""
+    small = cv2.resize(_grey(image), (hash_size * 4, hash_size * 4), interpolation=cv2.INTER_AREA)
+    low = cv2.dct(np.float32(small))[:hash_size, :hash_size]
+    return _bits_to_int(low > np.median(low[1:, 1:]))
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count('1')
+
+
+class ImageHashCache:
+    """Per-user index of recent facial analyses keyed by perceptual hashes.
+
+    An image matches a cached one when both its pHash and dHash are within
+    ``max_distance`` bits: pHash tolerates re-encoding and small lighting
+    changes, dHash guards against pHash collisions between different poses.
+    Entries expire after ``ttl_seconds``; only the ``per_user`` most recent
+    analyses of the ``max_users`` most recently active users are kept.
+    """
+
+    def __init__(self, max_distance: int = IMAGE_CACHE_MAX_DISTANCE, ttl_seconds: float = IMAGE_CACHE_TTL_SECONDS,
+                 per_user: int = 8, max_users: int = 2048, enabled: bool = IMAGE_CACHE_ENABLED):
+        """
+        Args:
+            max_distance: Largest Hamming distance (of 64 bits) treated as the same image
+            ttl_seconds: Age after which a cached analysis is no longer reused
+            per_user: Cached analyses kept per user
+            max_users: Users tracked before the least recently active is dropped
+            enabled: When False lookups always miss and nothing is stored
+        """
+        self.max_distance = max_distance
+        self.ttl_seconds = ttl_seconds
+        self.per_user = per_user
+        self.max_users = max_users
+        self.enabled = enabled
+        self._entries: 'OrderedDict[str, deque]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def fingerprint(image: np.ndarray) -> Fingerprint:
+        """(pHash, dHash) of a decoded BGR or greyscale image"""
+        return phash(image), dhash(image)
+
+    def lookup(self, user_id: str, fingerprint: Fingerprint) -> Optional[Dict[str, Any]]:
+        """
+        Cached analysis of a near-duplicate image, marked as cached
+
+        Returns:
+            A copy of the cached result with 'cached', 'cache_distance' and
+            'cached_at' set, or None on a miss
+        """
+        if not self.enabled:
+            return None
+        now = time.monotonic()
+        best = None
+        with self._lock:
+            entries = self._entries.get(user_id)
+            if entries:
+                while entries and now - entries[0][1] > self.ttl_seconds:
+                    entries.popleft()
+                for (p, d), stored_at, cached_at, result in entries:
+                    distance = max(hamming(p, fingerprint[0]), hamming(d, fingerprint[1]))
+                    if distance <= self.max_distance and (best is None or distance < best[0]):
+                        best = (distance, cached_at, result)
+                self._entries.move_to_end(user_id)
+            if best is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+
+        result = copy.deepcopy(best[2])
+        result.update({'cached': True, 'cache_distance': best[0], 'cached_at': best[1]})
+        return result
+
+    def store(self, user_id: str, fingerprint: Fingerprint, result: Dict[str, Any]):
+        """Remember a fresh analysis (errors are never cached)"""
+        if not self.enabled or result.get('primary_emotion') == 'error' or result.get('error'):
+            return
+        with self._lock:
+            entries = self._entries.get(user_id)
+            if entries is None:
+                entries = self._entries[user_id] = deque(maxlen=self.per_user)
+                while len(self._entries) > self.max_users:
+                    self._entries.popitem(last=False)
+            entries.append((fingerprint, time.monotonic(), datetime.now().isoformat(), copy.deepcopy(result)))
+            self._entries.move_to_end(user_id)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / total, 4) if total else 0.0,
+                'users': len(self._entries)
+            }
@@ -0,0 +1,219 @@
+# 🧠 Manas: Facial Landmark Features
+# Vectorized geometric features and emotion scores for one or many Face Mesh results
+
+import logging
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Face Mesh with refine_landmarks=True
+NUM_LANDMARKS = 478
+
+# Landmark indices (MediaPipe Face Mesh)
+LEFT_EYE = [33, 7, 163, 144, 145, 153]
+RIGHT_EYE = [362, 382, 381, 380, 374, 373]
+MOUTH_OUTER = [61, 84, 17, 314, 405, 320, 307, 375, 321, 308, 324, 318]
+LEFT_EYEBROW = [70, 63, 105, 66]
+RIGHT_EYEBROW = [296, 334, 293, 300]
+EYE_REFERENCE = slice(33, 40)
+LEFT_IRIS = [468, 469, 470, 471, 472]
+RIGHT_IRIS = [473, 474, 475, 476, 477]
+
+# Every distance the features need, gathered in one operation:
+# per eye two vertical spans then the width, for the mouth three vertical spans then the width
+_DISTANCE_PAIRS = np.array([
+    (LEFT_EYE[1], LEFT_EYE[5]), (LEFT_EYE[2], LEFT_EYE[4]), (LEFT_EYE[0], LEFT_EYE[3]),
+    (RIGHT_EYE[1], RIGHT_EYE[5]), (RIGHT_EYE[2], RIGHT_EYE[4]), (RIGHT_EYE[0], RIGHT_EYE[3]),
+    (MOUTH_OUTER[2], MOUTH_OUTER[6]), (MOUTH_OUTER[3], MOUTH_OUTER[7]), (MOUTH_OUTER[4], MOUTH_OUTER[8]),
+    (MOUTH_OUTER[0], MOUTH_OUTER[6]),
+])
+
+EMOTIONS = ['happy', 'sad', 'surprised', 'angry', 'neutral', 'anxious']
+
+FALLBACK_ANALYSIS = {
+    'primary_emotion': 'neutral',
+    'emotion_intensity': 3,
+    'confidence': 0.4,
+    'emotions_breakdown': {'neutral': 60, 'happy': 20, 'sad': 10, 'angry': 5, 'surprised': 3, 'anxious': 2},
+    'facial_features': {}
+}
+
+
+# ==================== LANDMARK ARRAYS ====================
+
+def landmarks_to_array(face_landmarks, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Copy a Face Mesh landmark list into an (N, 3) array without per-point lists
+
+    Args:
+        face_landmarks: ``results.multi_face_landmarks[i]``
+        out: Optional preallocated (N, 3) buffer to fill
+
+    Returns:
+        The filled (N, 3) float array
+    """
+    points = face_landmarks.landmark
+    flat = np.fromiter((v for lm in points for v in (lm.x, lm.y, lm.z)), dtype=np.float64, count=3 * len(points))
+    if out is None:
+        return flat.reshape(-1, 3)
+    out.reshape(-1)[:flat.size] = flat
+    return out
+
+
+def stack_landmarks(landmarks: Sequence[Optional[np.ndarray]]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Stack per-frame landmarks (None where no face was found) into one buffer
+
+    Returns:
+        (batch, mask) - a (B, N, 3) array and a boolean mask of frames with a face
+    """
+    mask = np.array([lm is not None for lm in landmarks], dtype=bool)
+    num_points = next((len(lm) for lm in landmarks if lm is not None), NUM_LANDMARKS)
+    batch = np.zeros((len(landmarks), num_points, 3), dtype=np.float64)
+    for i, lm in enumerate(landmarks):
+        if lm is not None:
+            batch[i] = lm
+    return batch, mask
+
+
+def _as_batch(landmarks: np.ndarray) -> np.ndarray:
+    batch = np.asarray(landmarks, dtype=np.float64)
+    return batch[None] if batch.ndim == 2 else batch
+
+
+def _safe_ratio(numerator: np.ndarray, denominator: np.ndarray, default: float) -> np.ndarray:
+    return np.divide(numerator, denominator, out=np.full_like(numerator, default), where=denominator > 0)
+
+
+# ==================== FEATURES ====================
+
+def compute_features(landmarks: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Geometric facial features for a batch of faces
+
+    Args:
+        landmarks: (N, 3) for one face or (B, N, 3) for a batch
+
+    Returns:
+        Feature name -> (B,) array
+    """
+    batch = _as_batch(landmarks)
+    pairs = _DISTANCE_PAIRS
+    distances = np.linalg.norm(batch[:, pairs[:, 0]] - batch[:, pairs[:, 1]], axis=-1)
+
+    left_ear = _safe_ratio(distances[:, 0] + distances[:, 1], 2.0 * distances[:, 2], 0.25)
+    right_ear = _safe_ratio(distances[:, 3] + distances[:, 4], 2.0 * distances[:, 5], 0.25)
+    mouth_ar = _safe_ratio(distances[:, 6:9].sum(axis=1), 3.0 * distances[:, 9], 0.0)
+
+    y = batch[..., 1]
+    eye_y = y[:, EYE_REFERENCE].mean(axis=1)
+    # Higher values = raised eyebrows
+    left_brow = eye_y - y[:, LEFT_EYEBROW].mean(axis=1)
+    right_brow = eye_y - y[:, RIGHT_EYEBROW].mean(axis=1)
+    # Positive curvature = smile, negative = frown
+    corners_y = (y[:, MOUTH_OUTER[0]] + y[:, MOUTH_OUTER[6]]) / 2
+    center_y = (y[:, MOUTH_OUTER[3]] + y[:, MOUTH_OUTER[9]]) / 2
+
+    return {
+        'left_eye_ratio': left_ear,
+        'right_eye_ratio': right_ear,
+        'eye_openness': (left_ear + right_ear) / 2,
+        'mouth_openness': mouth_ar,
+        'mouth_curvature': corners_y - center_y,
+        'left_eyebrow_height': left_brow,
+        'right_eyebrow_height': right_brow,
+        'eyebrow_elevation': (left_brow + right_brow) / 2,
+        'eyebrow_symmetry': np.abs(left_brow - right_brow),
+        'left_right_asymmetry': np.abs(left_ear - right_ear) + np.abs(left_brow - right_brow),
+    }
+
+
+def emotion_scores(features: Dict[str, np.ndarray]) -> np.ndarray:
+    """(B, len(EMOTIONS)) heuristic scores in 0..100"""
+    ear = features['eye_openness']
+    mouth = features['mouth_openness']
+    curve = features['mouth_curvature']
+    brow = features['eyebrow_elevation']
+    scores = np.stack([
+        curve * 60 + (1 - ear) * 40,
+        (1 - curve) * 50 + (1 - ear) * 30 + (1 - brow) * 20,
+        ear * 40 + mouth * 35 + brow * 25,
+        (1 - ear) * 35 + (1 - curve) * 30 + brow * 35,
+        100 - np.abs(curve - 0.5) * 80 - np.abs(ear - 0.4) * 60,
+        (1 - ear) * 40 + brow * 45 + mouth * 15,
+    ], axis=1)
+    return np.clip(scores, 0, 100)
+
+
+def gaze_points(landmarks: np.ndarray) -> np.ndarray:
+    """(B, 2) normalised gaze estimate from the mean of both iris centres"""
+    batch = _as_batch(landmarks)
+    iris = np.concatenate([batch[:, LEFT_IRIS], batch[:, RIGHT_IRIS]], axis=1)
+    return iris[..., :2].mean(axis=1)
+
+
+# ==================== ANALYSIS ====================
+
+def analyze_landmarks_batch(landmarks: Union[np.ndarray, Sequence[Optional[np.ndarray]]]) -> List[Optional[Dict[str, Any]]]:
+    """
+    Landmark emotion analysis for many faces at once
+
+    Args:
+        landmarks: (B, N, 3) array, or a list of (N, 3) arrays with None for frames without a face
+
+    Returns:
+        One analysis dict per input (None where there was no face), in the
+        shape returned by EmotionDetector._enhanced_landmark_analysis
+    """
+    if isinstance(landmarks, np.ndarray) and landmarks.ndim == 3:
+        batch, mask = landmarks, np.ones(len(landmarks), dtype=bool)
+    else:
+        batch, mask = stack_landmarks(landmarks)
+    if not mask.any():
+        return [None] * len(mask)
+
+    features = compute_features(batch[mask])
+    scores = emotion_scores(features)
+
+    primary = np.argmax(scores, axis=1)
+    ranked = np.sort(scores, axis=1)
+    top = ranked[:, -1]
+    # Confidence from how distinct the winning emotion is
+    confidence = np.clip((top - ranked[:, -2]) / 100, 0.3, 0.9)
+    intensity = np.clip((top / 10).astype(int), 1, 10)
+
+    results: List[Optional[Dict[str, Any]]] = [None] * len(mask)
+    for i, index in enumerate(np.flatnonzero(mask)):
+        f = {name: float(values[i]) for name, values in features.items()}
+        results[index] = {
+            'primary_emotion': EMOTIONS[primary[i]],
+            'emotion_intensity': int(intensity[i]),
+            'confidence': float(confidence[i]),
+            'emotions_breakdown': {e: float(s) for e, s in zip(EMOTIONS, scores[i])},
+            'facial_features': {
+                'eye_openness': f['eye_openness'],
+                'mouth_openness': f['mouth_openness'],
+                'mouth_curvature': f['mouth_curvature'],
+                'eyebrow_elevation': f['eyebrow_elevation'],
+                'left_right_asymmetry': f['left_right_asymmetry']
+            },
+            'geometric_analysis': {
+                'left_eye_ratio': f['left_eye_ratio'],
+                'right_eye_ratio': f['right_eye_ratio'],
+                'mouth_aspect_ratio': f['mouth_openness'],
+                'eyebrow_symmetry': f['eyebrow_symmetry']
+            }
+        }
+    return results
+
+
+def analyze_landmarks(landmarks: np.ndarray) -> Dict[str, Any]:
+    """Landmark emotion analysis for a single (N, 3) face"""
+    try:
+        return analyze_landmarks_batch(_as_batch(landmarks))[0]
+    except Exception as e:
+        logger.error(f"Enhanced landmark analysis error: {e}")
+        return dict(FALLBACK_ANALYSIS, analysis_error=str(e))
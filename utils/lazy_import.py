@@ -0,0 +1,211 @@
+# 🧠 Manas: Lazy Imports
+# Deferred import of heavy ML dependencies and deferred construction of app components
+
+import importlib
+import importlib.util
+import logging
+import sys
+import threading
+import time
+import types
+from typing import Any, Callable, Dict, List, Optional
+
+from .preload import register_after_fork
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Everything created through this module, so warmup() can force it in one place
+_lazy_modules: Dict[str, 'LazyModule'] = {}
+_lazy_components: List['LazyComponent'] = []
+
+
+def module_available(name: str) -> bool:
+    """Whether ``name`` can be imported, without importing it (parents of dotted names are imported)"""
+    if name in sys.modules:
+        return sys.modules[name] is not None
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+class LazyModule(types.ModuleType):
+    """Stand-in for a module that is imported on first attribute access.
+
+    After loading, the real module's namespace is copied onto the proxy, so
+    later attribute lookups are ordinary dict hits rather than __getattr__
+    calls. A missing dependency raises ImportError at first use, not at
+    import of the module that declared it.
+    """
+
+    def __init__(self, name: str, on_load: Optional[Callable[[types.ModuleType], None]] = None,
+                 fork_safe: bool = True):
+        super().__init__(name)
+        self.__dict__['_lazy_on_load'] = on_load
+        self.__dict__['_lazy_fork_safe'] = fork_safe
+        self.__dict__['_lazy_module'] = None
+        self.__dict__['_lazy_lock'] = threading.Lock()
+
+    def _load(self) -> types.ModuleType:
+        module = self.__dict__['_lazy_module']
+        if module is not None:
+            return module
+        with self.__dict__['_lazy_lock']:
+            module = self.__dict__['_lazy_module']
+            if module is None:
+                start = time.perf_counter()
+                module = importlib.import_module(self.__name__)
+                on_load = self.__dict__['_lazy_on_load']
+                if on_load is not None:
+                    on_load(module)
+                self.__dict__.update({k: v for k, v in vars(module).items() if k not in ('__name__', '__spec__')})
+                self.__dict__['_lazy_module'] = module
+                logger.info(f"Imported {self.__name__} on demand in {time.perf_counter() - start:.2f}s")
+        return module
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    @property
+    def loaded(self) -> bool:
+        return self.__dict__['_lazy_module'] is not None
+
+
+def lazy_import(name: str, on_load: Optional[Callable[[types.ModuleType], None]] = None,
+                fork_safe: bool = True) -> types.ModuleType:
+    """
+    Module proxy that imports ``name`` on first use
+
+    Args:
+        name: Dotted module name
+        on_load: Called once with the real module right after it is imported
+            (e.g. to configure an SDK)
+        fork_safe: False for modules that must not be imported in a process
+            that will fork (e.g. ones starting gRPC threads); warmup in the
+            preloading master skips them
+
+    Returns:
+        The module itself if already imported, else a shared LazyModule
+    """
+    module = sys.modules.get(name)
+    if module is not None and on_load is None:
+        return module
+    proxy = _lazy_modules.get(name)
+    if proxy is None:
+        proxy = _lazy_modules[name] = LazyModule(name, on_load, fork_safe)
+    return proxy
+
+
+class LazyComponent:
+    """Proxy for a component built on first attribute access.
+
+    Lets app.py declare its singletons at import time without paying for
+    their construction (MediaPipe graphs, SDK clients, thread pools) until a
+    request actually needs them, or until warmup() builds them.
+
+    Components holding per-process state are declared ``fork_safe=False``:
+    they are never built in a preloading master, and a copy inherited
+    through fork is dropped so each worker builds its own.
+    """
+
+    def __init__(self, name: str, factory: Callable[[], Any], fork_safe: bool = True):
+        """
+        Args:
+            name: Label used in logs and warmup reports
+            factory: Zero-argument callable returning the real component
+            fork_safe: Whether a built instance may be shared with forked workers
+        """
+        self._name = name
+        self._factory = factory
+        self._fork_safe = fork_safe
+        self._instance = None
+        self._lock = threading.Lock()
+        _lazy_components.append(self)
+
+    def get(self) -> Any:
+        """The component, building it if needed"""
+        instance = self._instance
+        if instance is None:
+            with self._lock:
+                if self._instance is None:
+                    start = time.perf_counter()
+                    self._instance = self._factory()
+                    logger.info(f"Built {self._name} in {time.perf_counter() - start:.2f}s")
+                instance = self._instance
+        return instance
+
+    @property
+    def built(self) -> bool:
+        return self._instance is not None
+
+    def reset(self):
+        """Forget the instance; the next use builds a new one"""
+        self._instance = None
+        self._lock = threading.Lock()
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self.get(), attr)
+
+    def __repr__(self) -> str:
+        return f"<LazyComponent {self._name} {'built' if self.built else 'pending'}>"
+
+
+def warmup(modules: bool = True, components: bool = True, fork_safe_only: bool = False) -> Dict[str, float]:
+    """
+    Import every lazy module and build every lazy component now
+
+    Call this where slow first requests are worse than slow boot: in the
+    gunicorn master before forking (with ``fork_safe_only``), in each worker
+    after fork, or behind a readiness probe.
+
+    Args:
+        modules: Import lazy modules
+        components: Build lazy components
+        fork_safe_only: Skip modules and components marked fork_safe=False
+
+    Returns:
+        Seconds spent per module / component (failures are logged and skipped)
+    """
+    timings: Dict[str, float] = {}
+    if modules:
+        for name, proxy in list(_lazy_modules.items()):
+            if fork_safe_only and not proxy.__dict__['_lazy_fork_safe']:
+                continue
+            start = time.perf_counter()
+            try:
+                proxy._load()
+            except Exception as e:
+                logger.warning(f"Warmup could not import {name}: {e}")
+                continue
+            timings[name] = round(time.perf_counter() - start, 4)
+    if components:
+        for component in list(_lazy_components):
+            if fork_safe_only and not component._fork_safe:
+                continue
+            start = time.perf_counter()
+            try:
+                component.get()
+            except Exception as e:
+                logger.warning(f"Warmup could not build {component._name}: {e}")
+                continue
+            timings[component._name] = round(time.perf_counter() - start, 4)
+    return timings
+
+
+@register_after_fork
+def _reset_process_local_components():
+    for component in _lazy_components:
+        if not component._fork_safe and component.built:
+            component.reset()
+
+
+def lazy_status() -> Dict[str, Dict[str, bool]]:
+    """Which lazy modules are imported and which components are built"""
+    return {
+        'modules': {name: proxy.loaded for name, proxy in _lazy_modules.items()},
+        'components': {component._name: component.built for component in _lazy_components}
+    }
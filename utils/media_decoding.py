@@ -0,0 +1,76 @@
+# 🧠 Manas: In-Memory Media Decoding
+# Decode uploaded images straight from request bytes, with optional async persistence (audio: see audio_frontend)
+
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+import numpy as np
+
+from .lazy_import import lazy_import
+from .preload import register_after_fork
+
+# Heavy dependencies are imported on first use
+cv2 = lazy_import('cv2')
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Sample rate all voice analysis runs at
+TARGET_SAMPLE_RATE = 22050
+
+
+def decode_image(data: bytes) -> np.ndarray:
+    """Decode an uploaded image into a BGR array without touching disk
+
+    Args:
+        data: Encoded image bytes (PNG, JPEG, ...)
+
+    Returns:
+        HxWx3 uint8 BGR array, as cv2.imread would return
+    """
+    image = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+    if image is None:
+        raise ValueError("Could not decode image")
+    return image
+
+
+class UploadPersister:
+    """Writes original uploads to disk in the background.
+
+    Analysis never waits on this; it is disabled unless PERSIST_UPLOADS is set.
+    """
+
+    def __init__(self, upload_folder: str, enabled: Optional[bool] = None):
+        self.upload_folder = upload_folder
+        if enabled is None:
+            enabled = os.environ.get('PERSIST_UPLOADS', 'false').lower() in ('1', 'true', 'yes')
+        self.enabled = enabled
+        self._executor = self._new_executor()
+        register_after_fork(self._restart)
+
+    def _new_executor(self) -> Optional[ThreadPoolExecutor]:
+        return ThreadPoolExecutor(max_workers=1, thread_name_prefix='upload-persist') if self.enabled else None
+
+    def _restart(self):
+        # Each forked worker writes through its own thread
+        self._executor = self._new_executor()
+
+    def _write(self, path: str, data: bytes):
+        try:
+            with open(path, 'wb') as f:
+                f.write(data)
+        except Exception as e:
+            logger.error(f"Failed to persist upload {path}: {e}")
+
+    def persist(self, data: bytes, filename: str) -> Optional[str]:
+        """Queue an upload for writing
+
+        Returns:
+            The stored filename, or None when persistence is disabled
+        """
+        if not self.enabled:
+            return None
+        self._executor.submit(self._write, os.path.join(self.upload_folder, filename), data)
+        return filename
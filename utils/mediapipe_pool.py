@@ -0,0 +1,176 @@
+# 🧠 Manas: MediaPipe Graph Pool
+# Pre-initialized FaceMesh / FaceDetection graphs with checkout/return semantics
+
+import logging
+import os
+import queue
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, List, Optional, Tuple
+
+import numpy as np
+
+from .landmark_features import landmarks_to_array, NUM_LANDMARKS
+from .lazy_import import lazy_import, module_available
+from .preload import register_after_fork
+
+# Imported when the first pool is built
+MEDIAPIPE_AVAILABLE = module_available('mediapipe')
+mp = lazy_import('mediapipe') if MEDIAPIPE_AVAILABLE else None
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+def default_pool_size() -> int:
+    """Pool size: MEDIAPIPE_POOL_SIZE, else the worker thread count, else CPU count (max 4)"""
+    for var in ('MEDIAPIPE_POOL_SIZE', 'GUNICORN_THREADS'):
+        value = os.environ.get(var)
+        if value:
+            try:
+                return max(1, int(value))
+            except ValueError:
+                logger.warning(f"Ignoring invalid {var}={value!r}")
+    return max(1, min(4, os.cpu_count() or 1))
+
+
+class GraphPool:
+    """Fixed-size pool of MediaPipe solution graphs.
+
+    A MediaPipe graph must not run ``process()`` from two threads at once, so
+    each request checks one out exclusively and returns it when done. All
+    graphs are built up front, so the request path never pays for graph
+    construction.
+    """
+
+    def __init__(self, name: str, factory: Callable[[], Any], size: int):
+        self.name = name
+        self.size = size
+        self._pool: "queue.Queue[Any]" = queue.Queue(maxsize=size)
+        for _ in range(size):
+            self._pool.put(factory())
+        logger.info(f"MediaPipe {name} pool initialized with {size} graphs")
+
+    @contextmanager
+    def checkout(self, timeout: Optional[float] = 30.0):
+        """Borrow a graph for the duration of the ``with`` block.
+
+        Args:
+            timeout: Seconds to wait for a free graph (None waits forever)
+
+        Raises:
+            TimeoutError: If no graph became free in time
+        """
+        try:
+            graph = self._pool.get(timeout=timeout)
+        except queue.Empty:
+            raise TimeoutError(f"No MediaPipe {self.name} graph available after {timeout}s")
+        try:
+            yield graph
+        finally:
+            self._pool.put(graph)
+
+    def close(self):
+        """Release the native resources of every idle graph"""
+        while True:
+            try:
+                graph = self._pool.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                graph.close()
+            except Exception as e:
+                logger.warning(f"Error closing MediaPipe {self.name} graph: {e}")
+
+
+class FacePools:
+    """The FaceMesh and FaceDetection pools used for facial emotion analysis"""
+
+    def __init__(self, size: Optional[int] = None):
+        if not MEDIAPIPE_AVAILABLE:
+            raise RuntimeError("mediapipe is not installed")
+
+        size = size or default_pool_size()
+        self.face_mesh = GraphPool('FaceMesh', lambda: mp.solutions.face_mesh.FaceMesh(
+            static_image_mode=True,
+            max_num_faces=1,
+            refine_landmarks=True,
+            min_detection_confidence=0.5
+        ), size)
+        self.face_detection = GraphPool('FaceDetection', lambda: mp.solutions.face_detection.FaceDetection(
+            min_detection_confidence=0.3
+        ), size)
+
+    def detect(self, rgb_image: np.ndarray, timeout: Optional[float] = 30.0) -> Tuple[bool, Optional[np.ndarray]]:
+        """Locate a face and its mesh landmarks in an RGB image.
+        
+        Args:
+            rgb_image: HxWx3 uint8 RGB image
+            timeout: Seconds to wait for a free graph
+        
+        Returns:
+            (face_found, landmarks) - landmarks is an (N, 3) array, or None
+            when only the coarse FaceDetection fallback found a face
+        """
+        with self.face_mesh.checkout(timeout) as face_mesh:
+            results = face_mesh.process(rgb_image)
+        
+        if results.multi_face_landmarks:
+            face_landmarks = results.multi_face_landmarks[0]
+            return True, landmarks_to_array(face_landmarks)
+        
+        # Fallback: try with simpler face detection
+        with self.face_detection.checkout(timeout) as face_detection:
+            detection_results = face_detection.process(rgb_image)
+        return bool(detection_results.detections), None
+
+    def detect_batch(self, rgb_images: List[np.ndarray], timeout: Optional[float] = 30.0) -> List[Optional[np.ndarray]]:
+        """Mesh landmarks for a batch of frames using a single graph checkout
+        
+        Args:
+            rgb_images: Sequence of HxWx3 uint8 RGB frames
+            timeout: Seconds to wait for a free graph
+        
+        Returns:
+            One (N, 3) landmark array per frame, or None where no face was found
+        """
+        # One buffer for the whole batch; each frame's landmarks are a view into it
+        buffer = np.empty((len(rgb_images), NUM_LANDMARKS, 3), dtype=np.float64)
+        landmarks = []
+        with self.face_mesh.checkout(timeout) as face_mesh:
+            for i, rgb_image in enumerate(rgb_images):
+                results = face_mesh.process(rgb_image)
+                if results.multi_face_landmarks:
+                    face_landmarks = results.multi_face_landmarks[0]
+                    if len(face_landmarks.landmark) == NUM_LANDMARKS:
+                        landmarks.append(landmarks_to_array(face_landmarks, out=buffer[i]))
+                    else:
+                        landmarks.append(landmarks_to_array(face_landmarks))
+                else:
+                    landmarks.append(None)
+        return landmarks
+
+    def close(self):
+        self.face_mesh.close()
+        self.face_detection.close()
+
+
+_shared_pools: Optional[FacePools] = None
+_shared_lock = threading.Lock()
+
+
+def get_face_pools(size: Optional[int] = None) -> FacePools:
+    """Process-wide FacePools instance, created on first use"""
+    global _shared_pools
+    with _shared_lock:
+        if _shared_pools is None:
+            _shared_pools = FacePools(size)
+        return _shared_pools
+
+
+@register_after_fork
+def _reset_face_pools():
+    # MediaPipe graphs own native threads that do not survive fork
+    global _shared_pools, _shared_lock
+    _shared_pools = None
+    _shared_lock = threading.Lock()
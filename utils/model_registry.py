@@ -0,0 +1,149 @@
+# 🧠 Manas: Local Model Registry
+# Versioned model artifacts on disk with an atomically switched CURRENT pointer and hot reload
+
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+MODEL_DIR = os.environ.get('MANAS_MODEL_DIR', 'models')
+RELOAD_CHECK_SECONDS = float(os.environ.get('MODEL_RELOAD_CHECK_SECONDS', 30))
+
+ARTIFACT_NAME = 'model.joblib'
+METRICS_NAME = 'metrics.json'
+CURRENT_NAME = 'CURRENT'
+
+
+class ModelRegistry:
+    """Layout: <root>/<kind>/<version>/{model.joblib,metrics.json} and <root>/<kind>/CURRENT
+
+    Versions are never modified once written; promoting a model only
+    rewrites the small CURRENT file (via os.replace, so readers never see a
+    partial write), which is what running workers poll to hot-reload.
+    """
+
+    def __init__(self, root: str = MODEL_DIR):
+        self.root = root
+
+    def kind_dir(self, kind: str) -> str:
+        return os.path.join(self.root, kind)
+
+    def version_dir(self, kind: str, version: str) -> str:
+        return os.path.join(self.kind_dir(kind), version)
+
+    def artifact_path(self, kind: str, version: str) -> str:
+        return os.path.join(self.version_dir(kind, version), ARTIFACT_NAME)
+
+    def versions(self, kind: str) -> List[str]:
+        """All published versions, oldest first"""
+        try:
+            return sorted(
+                name for name in os.listdir(self.kind_dir(kind))
+                if os.path.exists(os.path.join(self.kind_dir(kind), name, ARTIFACT_NAME))
+            )
+        except FileNotFoundError:
+            return []
+
+    def current_version(self, kind: str) -> Optional[str]:
+        try:
+            with open(os.path.join(self.kind_dir(kind), CURRENT_NAME)) as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def read_metrics(self, kind: str, version: str) -> Dict[str, Any]:
+        try:
+            with open(os.path.join(self.version_dir(kind, version), METRICS_NAME)) as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def publish(self, kind: str, save_artifact: Callable[[str], None], metrics: Dict[str, Any],
+                version: Optional[str] = None) -> str:
+        """Write a new version (not yet active)
+
+        Args:
+            kind: Model kind, e.g. 'text', 'landmark', 'audio'
+            save_artifact: Callable writing the model to the given path
+            metrics: Evaluation results stored next to the artifact
+            version: Version name (defaults to a timestamp)
+
+        Returns:
+            The version name
+        """
+        version = version or datetime.now().strftime('%Y%m%d%H%M%S')
+        os.makedirs(self.version_dir(kind, version), exist_ok=False)
+        save_artifact(self.artifact_path(kind, version))
+        with open(os.path.join(self.version_dir(kind, version), METRICS_NAME), 'w') as f:
+            json.dump(metrics, f, indent=2, default=str)
+        logger.info(f"Published {kind} model version {version}")
+        return version
+
+    def promote(self, kind: str, version: str):
+        """Make ``version`` the active model for ``kind``"""
+        if not os.path.exists(self.artifact_path(kind, version)):
+            raise ValueError(f"No {kind} model version {version}")
+        pointer = os.path.join(self.kind_dir(kind), CURRENT_NAME)
+        tmp = f"{pointer}.tmp"
+        with open(tmp, 'w') as f:
+            f.write(version)
+        os.replace(tmp, pointer)
+        logger.info(f"Promoted {kind} model version {version}")
+
+
+class HotSwappableModel:
+    """Holds a worker's active model of one kind and swaps it when CURRENT changes.
+
+    ``get()`` re-reads the pointer at most every ``check_interval`` seconds, so
+    a promotion reaches every worker within that interval without a restart.
+    """
+
+    def __init__(self, kind: str, load: Callable[[str], Any], fallback: Optional[Callable[[], Any]] = None,
+                 registry: Optional[ModelRegistry] = None, check_interval: float = RELOAD_CHECK_SECONDS):
+        """
+        Args:
+            kind: Model kind in the registry
+            load: Loads a model from an artifact path
+            fallback: Provides a model when the registry has none (may return None)
+            registry: Registry to watch (defaults to MODEL_DIR)
+            check_interval: Seconds between CURRENT pointer checks
+        """
+        self.kind = kind
+        self.load = load
+        self.fallback = fallback
+        self.registry = registry or ModelRegistry()
+        self.check_interval = check_interval
+        self.version: Optional[str] = None
+        self._model = None
+        self._fallback_loaded = False
+        self._last_check = -float('inf')
+        self._lock = threading.Lock()
+
+    def _refresh(self):
+        version = self.registry.current_version(self.kind)
+        if version and version != self.version:
+            try:
+                model = self.load(self.registry.artifact_path(self.kind, version))
+                self._model, self.version = model, version
+                logger.info(f"Loaded {self.kind} model version {version}")
+            except Exception as e:
+                logger.error(f"Failed to load {self.kind} model version {version}: {e}")
+        if self._model is None and self.fallback and not self._fallback_loaded:
+            self._fallback_loaded = True
+            self._model = self.fallback()
+
+    def get(self):
+        """The active model (or the fallback / None)"""
+        now = time.monotonic()
+        if now - self._last_check >= self.check_interval:
+            with self._lock:
+                if now - self._last_check >= self.check_interval:
+                    self._refresh()
+                    self._last_check = now
+        return self._model
@@ -7,158 +7,167 @@ from typing import Dict, List, Optional, Any
 import re
 
 from .gemini_api import gemini_text
+from .preload import freeze
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# ==================== SHARED TABLES ====================
+
+# Supported languages
+SUPPORTED_LANGUAGES = freeze({
+    'english': {
+        'name': 'English',
+        'code': 'en',
+        'script': 'latin',
+        'direction': 'ltr'
+    },
+    'hindi': {
+        'name': 'हिंदी',
+        'code': 'hi',
+        'script': 'devanagari',
+        'direction': 'ltr'
+    },
+    'telugu': {
+        'name': 'తెలుగు',
+        'code': 'te',
+        'script': 'telugu',
+        'direction': 'ltr'
+    },
+    'tamil': {
+        'name': 'தமிழ்',
+        'code': 'ta',
+        'script': 'tamil',
+        'direction': 'ltr'
+    },
+    'bengali': {
+        'name': 'বাংলা',
+        'code': 'bn',
+        'script': 'bengali',
+        'direction': 'ltr'
+    },
+    'gujarati': {
+        'name': 'ગુજરાતી',
+        'code': 'gu',
+        'script': 'gujarati',
+        'direction': 'ltr'
+    },
+    'marathi': {
+        'name': 'मराठी',
+        'code': 'mr',
+        'script': 'devanagari',
+        'direction': 'ltr'
+    },
+    'kannada': {
+        'name': 'ಕನ್ನಡ',
+        'code': 'kn',
+        'script': 'kannada',
+        'direction': 'ltr'
+    },
+    'malayalam': {
+        'name': 'മലയാളം',
+        'code': 'ml',
+        'script': 'malayalam',
+        'direction': 'ltr'
+    },
+    'punjabi': {
+        'name': 'ਪੰਜਾਬੀ',
+        'code': 'pa',
+        'script': 'gurmukhi',
+        'direction': 'ltr'
+    }
+})
+
+# Cultural context mappings
+CULTURAL_CONTEXTS = freeze({
+    'hindi': {
+        'greeting': 'नमस्ते',
+        'family_terms': ['माता-पिता', 'परिवार', 'बुजुर्ग'],
+        'spiritual_terms': ['शांति', 'ध्यान', 'योग', 'प्राणायाम'],
+        'emotional_terms': {
+            'stress': 'तनाव',
+            'anxiety': 'चिंता',
+            'peace': 'शांति',
+            'happiness': 'खुशी',
+            'sadness': 'उदासी'
+        }
+    },
+    'telugu': {
+        'greeting': 'నమస్కారం',
+        'family_terms': ['తల్లిదండ్రులు', 'కుటుంబం', 'పెద్దలు'],
+        'spiritual_terms': ['శాంతి', 'ధ్యానం', 'యోగా', 'ప్రాణాయామం'],
+        'emotional_terms': {
+            'stress': 'ఒత్తిడి',
+            'anxiety': 'ఆందోళన',
+            'peace': 'శాంతి',
+            'happiness': 'ఆనందం',
+            'sadness': 'దుఃఖం'
+        }
+    },
+    'tamil': {
+        'greeting': 'வணக்கம்',
+        'family_terms': ['பெற்றோர்', 'குடும்பம்', 'பெரியவர்கள்'],
+        'spiritual_terms': ['அமைதி', 'தியானம்', 'யோகா', 'பிராணாயாமம்'],
+        'emotional_terms': {
+            'stress': 'மன அழுத்தம்',
+            'anxiety': 'கவலை',
+            'peace': 'அமைதி',
+            'happiness': 'மகிழ்ச்சி',
+            'sadness': 'துக்கம்'
+        }
+    }
+})
+
+# Common mental health terms in different languages
+MENTAL_HEALTH_VOCABULARY = freeze({
+    'english': {
+        'mental_health': 'mental health',
+        'wellbeing': 'wellbeing',
+        'therapy': 'therapy',
+        'counseling': 'counseling',
+        'meditation': 'meditation',
+        'breathing': 'breathing exercise',
+        'mindfulness': 'mindfulness',
+        'support': 'support',
+        'help': 'help',
+        'crisis': 'crisis'
+    },
+    'hindi': {
+        'mental_health': 'मानसिक स्वास्थ्य',
+        'wellbeing': 'कल्याण',
+        'therapy': 'चिकित्सा',
+        'counseling': 'परामर्श',
+        'meditation': 'ध्यान',
+        'breathing': 'श्वास अभ्यास',
+        'mindfulness': 'सचेतता',
+        'support': 'सहायता',
+        'help': 'मदद',
+        'crisis': 'संकट'
+    },
+    'telugu': {
+        'mental_health': 'మానసిక ఆరోగ్యం',
+        'wellbeing': 'క్షేమం',
+        'therapy': 'చికిత్స',
+        'counseling': 'సలహా',
+        'meditation': 'ధ్యానం',
+        'breathing': 'శ్వాస వ్యాయామం',
+        'mindfulness': 'అవగాహన',
+        'support': 'మద్దతు',
+        'help': 'సహాయం',
+        'crisis': 'సంక్షోభం'
+    }
+})
+
+
 class MultiLanguageProcessor:
     """Multi-language processing system for Indian regional languages"""
     
     def __init__(self):
         """Initialize multi-language processor"""
-        # Supported languages
-        self.supported_languages = {
-            'english': {
-                'name': 'English',
-                'code': 'en',
-                'script': 'latin',
-                'direction': 'ltr'
-            },
-            'hindi': {
-                'name': 'हिंदी',
-                'code': 'hi',
-                'script': 'devanagari',
-                'direction': 'ltr'
-            },
-            'telugu': {
-                'name': 'తెలుగు',
-                'code': 'te',
-                'script': 'telugu',
-                'direction': 'ltr'
-            },
-            'tamil': {
-                'name': 'தமிழ்',
-                'code': 'ta',
-                'script': 'tamil',
-                'direction': 'ltr'
-            },
-            'bengali': {
-                'name': 'বাংলা',
-                'code': 'bn',
-                'script': 'bengali',
-                'direction': 'ltr'
-            },
-            'gujarati': {
-                'name': 'ગુજરાતી',
-                'code': 'gu',
-                'script': 'gujarati',
-                'direction': 'ltr'
-            },
-            'marathi': {
-                'name': 'मराठी',
-                'code': 'mr',
-                'script': 'devanagari',
-                'direction': 'ltr'
-            },
-            'kannada': {
-                'name': 'ಕನ್ನಡ',
-                'code': 'kn',
-                'script': 'kannada',
-                'direction': 'ltr'
-            },
-            'malayalam': {
-                'name': 'മലയാളം',
-                'code': 'ml',
-                'script': 'malayalam',
-                'direction': 'ltr'
-            },
-            'punjabi': {
-                'name': 'ਪੰਜਾਬੀ',
-                'code': 'pa',
-                'script': 'gurmukhi',
-                'direction': 'ltr'
-            }
-        }
-        
-        # Cultural context mappings
-        self.cultural_contexts = {
-            'hindi': {
-                'greeting': 'नमस्ते',
-                'family_terms': ['माता-पिता', 'परिवार', 'बुजुर्ग'],
-                'spiritual_terms': ['शांति', 'ध्यान', 'योग', 'प्राणायाम'],
-                'emotional_terms': {
-                    'stress': 'तनाव',
-                    'anxiety': 'चिंता',
-                    'peace': 'शांति',
-                    'happiness': 'खुशी',
-                    'sadness': 'उदासी'
-                }
-            },
-            'telugu': {
-                'greeting': 'నమస్కారం',
-                'family_terms': ['తల్లిదండ్రులు', 'కుటుంబం', 'పెద్దలు'],
-                'spiritual_terms': ['శాంతి', 'ధ్యానం', 'యోగా', 'ప్రాణాయామం'],
-                'emotional_terms': {
-                    'stress': 'ఒత్తిడి',
-                    'anxiety': 'ఆందోళన',
-                    'peace': 'శాంతి',
-                    'happiness': 'ఆనందం',
-                    'sadness': 'దుఃఖం'
-                }
-            },
-            'tamil': {
-                'greeting': 'வணக்கம்',
-                'family_terms': ['பெற்றோர்', 'குடும்பம்', 'பெரியவர்கள்'],
-                'spiritual_terms': ['அமைதி', 'தியானம்', 'யோகா', 'பிராணாயாமம்'],
-                'emotional_terms': {
-                    'stress': 'மன அழுத்தம்',
-                    'anxiety': 'கவலை',
-                    'peace': 'அமைதி',
-                    'happiness': 'மகிழ்ச்சி',
-                    'sadness': 'துக்கம்'
-                }
-            }
-        }
-        
-        # Common mental health terms in different languages
-        self.mental_health_vocabulary = {
-            'english': {
-                'mental_health': 'mental health',
-                'wellbeing': 'wellbeing',
-                'therapy': 'therapy',
-                'counseling': 'counseling',
-                'meditation': 'meditation',
-                'breathing': 'breathing exercise',
-                'mindfulness': 'mindfulness',
-                'support': 'support',
-                'help': 'help',
-                'crisis': 'crisis'
-            },
-            'hindi': {
-                'mental_health': 'मानसिक स्वास्थ्य',
-                'wellbeing': 'कल्याण',
-                'therapy': 'चिकित्सा',
-                'counseling': 'परामर्श',
-                'meditation': 'ध्यान',
-                'breathing': 'श्वास अभ्यास',
-                'mindfulness': 'सचेतता',
-                'support': 'सहायता',
-                'help': 'मदद',
-                'crisis': 'संकट'
-            },
-            'telugu': {
-                'mental_health': 'మానసిక ఆరోగ్యం',
-                'wellbeing': 'క్షేమం',
-                'therapy': 'చికిత్స',
-                'counseling': 'సలహా',
-                'meditation': 'ధ్యానం',
-                'breathing': 'శ్వాస వ్యాయామం',
-                'mindfulness': 'అవగాహన',
-                'support': 'మద్దతు',
-                'help': 'సహాయం',
-                'crisis': 'సంక్షోభం'
-            }
-        }
+        # Shared, read-only module tables (see SHARED TABLES above)
+        self.supported_languages = SUPPORTED_LANGUAGES
+        self.cultural_contexts = CULTURAL_CONTEXTS
+        self.mental_health_vocabulary = MENTAL_HEALTH_VOCABULARY
         
         logger.info("MultiLanguageProcessor initialized successfully")
     
@@ -197,9 +206,9 @@ class MultiLanguageProcessor:
             5. Consider family and social dynamics in Indian culture
             
             Cultural terms to consider:
-            - Family: {cultural_context.get('family_terms', [])}
-            - Spiritual: {cultural_context.get('spiritual_terms', [])}
-            - Emotional: {cultural_context.get('emotional_terms', {})}
+            - Family: {list(cultural_context.get('family_terms', ()))}
+            - Spiritual: {list(cultural_context.get('spiritual_terms', ()))}
+            - Emotional: {dict(cultural_context.get('emotional_terms', {}))}
             
             Return only the translated text.
             """
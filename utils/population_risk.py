@@ -0,0 +1,356 @@
+# 🧠 Manas: Population Risk Job
+# Nightly vectorized re-scoring of every user's risk and trend, flagging rising users for counsellor review
+#
+# Usage: python -m utils.population_risk [--db manas_wellness.db] [--dry-run]
+
+import argparse
+import json
+import logging
+import sqlite3
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .crisis_detector import RISK_FACTOR_WEIGHTS
+from .risk_history import HISTORY_WEIGHTS, RISK_EVENT_SATURATION, RISK_EVENT_WINDOW_SECONDS, RISK_HALF_LIFE_SECONDS
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Trend compares the last RECENT_DAYS with the BASELINE_DAYS before them
+RECENT_DAYS = 7
+BASELINE_DAYS = 28
+
+RISK_FLAG_THRESHOLD = 0.45
+TREND_FLAG_THRESHOLD = 0.35
+# Users with fewer baseline journal entries have no established rhythm to break
+MIN_BASELINE_ENTRIES = 4
+
+# Contributions to the trend score (each component is in [0, 1])
+TREND_WEIGHTS = {
+    'journal_sentiment_drop': 0.3,
+    'voice_negativity_rise': 0.25,
+    'journal_gap': 0.25,
+    'activity_drop': 0.2
+}
+
+REASON_LABELS = {
+    'risk': 'Elevated combined risk',
+    'recent_crisis': 'High or critical assessment in the last week',
+    'journal_sentiment_drop': 'Journal sentiment falling',
+    'voice_negativity_rise': 'More negative voice conversations',
+    'journal_gap': 'Stopped journaling',
+    'activity_drop': 'Check-ins dropped off'
+}
+
+SECONDS_PER_DAY = 86400.0
+UNIX_EPOCH_JULIAN_DAY = 2440587.5
+
+# ==================== ROLLUPS ====================
+
+# One GROUP BY per source; ``:now`` is the run time as a Julian day, ages are in days
+ROLLUP_QUERIES = {
+    'journal': '''
+        SELECT user_id,
+               AVG(CASE WHEN :now - julianday(created_at) <= :recent THEN sentiment_score END) AS journal_sentiment_recent,
+               AVG(CASE WHEN :now - julianday(created_at) > :recent THEN sentiment_score END) AS journal_sentiment_baseline,
+               SUM(:now - julianday(created_at) <= :recent) AS journal_entries_recent,
+               SUM(:now - julianday(created_at) > :recent) AS journal_entries_baseline,
+               AVG(CASE WHEN :now - julianday(created_at) <= :recent
+                        THEN LOWER(emotion_detected) = 'negative' END) AS journal_negative_recent,
+               MIN(:now - julianday(created_at)) AS days_since_journal
+        FROM journal_entries
+        WHERE created_at >= datetime(:now - :span)
+        GROUP BY user_id
+    ''',
+    'voice': '''
+        SELECT user_id,
+               AVG(CASE WHEN :now - julianday(created_at) <= :recent
+                        THEN LOWER(sentiment) = 'negative' END) AS voice_negative_recent,
+               AVG(CASE WHEN :now - julianday(created_at) > :recent
+                        THEN LOWER(sentiment) = 'negative' END) AS voice_negative_baseline
+        FROM voice_conversations
+        WHERE created_at >= datetime(:now - :span)
+        GROUP BY user_id
+    ''',
+    'checkins': '''
+        SELECT user_id,
+               SUM(:now - julianday(timestamp) <= :recent) AS checkins_recent,
+               SUM(:now - julianday(timestamp) > :recent) AS checkins_baseline
+        FROM emotional_states
+        WHERE timestamp >= datetime(:now - :span)
+        GROUP BY user_id
+    ''',
+    'risk_state': '''
+        SELECT user_id, ewma, peak, window_start, window_count, previous_window_count,
+               last_crisis_at, updated_at
+        FROM user_risk_state
+    '''
+}
+
+
+def load_rollups(conn: sqlite3.Connection, now: Optional[float] = None) -> pd.DataFrame:
+    """
+    Per-user rollups of every source, one row per user
+
+    Args:
+        conn: Connection to the hot database
+        now: Run time (epoch seconds)
+
+    Returns:
+        Frame indexed by user_id (missing sources are NaN)
+    """
+    now = time.time() if now is None else now
+    params = {'now': now / SECONDS_PER_DAY + UNIX_EPOCH_JULIAN_DAY,
+              'recent': RECENT_DAYS, 'span': RECENT_DAYS + BASELINE_DAYS}
+    frames = []
+    for name, query in ROLLUP_QUERIES.items():
+        try:
+            frame = pd.read_sql_query(query, conn, params=params if ':now' in query else None)
+        except Exception as e:
+            # A source table that does not exist yet contributes nothing
+            logger.warning(f"Population rollup {name} skipped: {e}")
+            continue
+        frames.append(frame.set_index('user_id'))
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames, axis=1, join='outer')
+
+
+# ==================== SCORING ====================
+
+def _column(frame: pd.DataFrame, name: str, fill: float = 0.0) -> np.ndarray:
+    if name not in frame:
+        return np.full(len(frame), fill)
+    return frame[name].to_numpy(dtype=np.float64, na_value=fill)
+
+
+def score_population(frame: pd.DataFrame, now: Optional[float] = None) -> pd.DataFrame:
+    """
+    Risk and trend for every user in one vectorized pass
+
+    Risk re-applies the current RISK_FACTOR_WEIGHTS of CrisisDetector:
+    the decayed risk average stands in for the emotion-based factor, recent
+    journal/voice negativity for the text factor, and the risk-history
+    state (as in RiskHistory.historical_risk) for the historical factor.
+    Trend measures deterioration of the last RECENT_DAYS against the
+    BASELINE_DAYS before them, so users who have gone quiet are still
+    scored.
+
+    Args:
+        frame: Output of load_rollups
+        now: Run time (epoch seconds)
+
+    Returns:
+        ``frame`` with risk_score, historical_risk, trend_score, the trend components and flagged
+    """
+    now = time.time() if now is None else now
+    frame = frame.copy()
+    if frame.empty:
+        return frame.assign(risk_score=[], historical_risk=[], trend_score=[], flagged=[])
+
+    # Risk history, decayed to now exactly as RiskHistory does per user
+    updated_at = _column(frame, 'updated_at', np.nan)
+    decay = np.where(np.isnan(updated_at), 0.0, 0.5 ** (np.maximum(now - np.nan_to_num(updated_at, nan=now), 0.0)
+                                                         / RISK_HALF_LIFE_SECONDS))
+    ewma = _column(frame, 'ewma') * decay
+    peak = _column(frame, 'peak') * decay
+    # Sliding-window event count with the same bucket roll-over as RiskHistory._advance
+    window_start = _column(frame, 'window_start', now)
+    window_count = _column(frame, 'window_count')
+    window_age = now - window_start
+    rolled = window_age >= RISK_EVENT_WINDOW_SECONDS
+    expired = window_age >= 2 * RISK_EVENT_WINDOW_SECONDS
+    current = np.where(rolled, 0.0, window_count)
+    previous = np.where(expired, 0.0, np.where(rolled, window_count, _column(frame, 'previous_window_count')))
+    window_start = np.where(rolled, window_start + RISK_EVENT_WINDOW_SECONDS, window_start)
+    overlap = np.clip(1 - (now - window_start) / RISK_EVENT_WINDOW_SECONDS, 0.0, 1.0)
+    recent_events = current + previous * overlap
+    last_crisis_at = _column(frame, 'last_crisis_at', np.nan)
+    crisis_recency = np.where(np.isnan(last_crisis_at), 0.0,
+                              0.5 ** (np.maximum(now - np.nan_to_num(last_crisis_at, nan=now), 0.0) / RISK_HALF_LIFE_SECONDS))
+    historical = np.minimum(
+        HISTORY_WEIGHTS['ewma'] * ewma
+        + HISTORY_WEIGHTS['peak'] * peak
+        + HISTORY_WEIGHTS['events'] * np.minimum(recent_events / RISK_EVENT_SATURATION, 1.0)
+        + HISTORY_WEIGHTS['recent_crisis'] * crisis_recency,
+        1.0
+    )
+    frame['historical_risk'] = historical
+
+    # Text signal: share of recent negative journal entries / voice conversations
+    text_signal = np.fmax(_column(frame, 'journal_negative_recent', np.nan),
+                          _column(frame, 'voice_negative_recent', np.nan))
+    text_signal = np.nan_to_num(text_signal, nan=0.0)
+
+    frame['risk_score'] = np.minimum(
+        RISK_FACTOR_WEIGHTS['base'] * ewma
+        + RISK_FACTOR_WEIGHTS['text'] * text_signal
+        + RISK_FACTOR_WEIGHTS['historical'] * historical,
+        1.0
+    )
+
+    # Trend components, each in [0, 1] (0 when either window has no data)
+    sentiment_drop = _column(frame, 'journal_sentiment_baseline', np.nan) - _column(frame, 'journal_sentiment_recent', np.nan)
+    frame['journal_sentiment_drop'] = np.clip(np.nan_to_num(sentiment_drop, nan=0.0) * 2, 0.0, 1.0)
+
+    negativity_rise = _column(frame, 'voice_negative_recent', np.nan) - _column(frame, 'voice_negative_baseline', np.nan)
+    frame['voice_negativity_rise'] = np.clip(np.nan_to_num(negativity_rise, nan=0.0), 0.0, 1.0)
+
+    baseline_entries = _column(frame, 'journal_entries_baseline')
+    usual_interval = BASELINE_DAYS / np.maximum(baseline_entries, 1.0)
+    days_since = _column(frame, 'days_since_journal', RECENT_DAYS + BASELINE_DAYS)
+    gap_ratio = days_since / usual_interval
+    frame['journal_gap'] = np.where(baseline_entries >= MIN_BASELINE_ENTRIES,
+                                    np.clip((gap_ratio - 2.0) / 4.0, 0.0, 1.0), 0.0)
+
+    recent_rate = _column(frame, 'checkins_recent') / RECENT_DAYS
+    baseline_rate = _column(frame, 'checkins_baseline') / BASELINE_DAYS
+    frame['activity_drop'] = np.where(baseline_rate > 0,
+                                      np.clip(1 - recent_rate / np.maximum(baseline_rate, 1e-9), 0.0, 1.0), 0.0)
+
+    frame['trend_score'] = sum(weight * frame[name].to_numpy() for name, weight in TREND_WEIGHTS.items())
+    frame['recent_crisis'] = crisis_recency >= 0.5 ** (RECENT_DAYS * SECONDS_PER_DAY / RISK_HALF_LIFE_SECONDS)
+    frame['flagged'] = ((frame['risk_score'].to_numpy() >= RISK_FLAG_THRESHOLD)
+                        | (frame['trend_score'].to_numpy() >= TREND_FLAG_THRESHOLD)
+                        | frame['recent_crisis'].to_numpy())
+    return frame
+
+
+def flag_reasons(row: pd.Series) -> List[str]:
+    """Readable reasons for one flagged user"""
+    reasons = []
+    if row['risk_score'] >= RISK_FLAG_THRESHOLD:
+        reasons.append(REASON_LABELS['risk'])
+    if row['recent_crisis']:
+        reasons.append(REASON_LABELS['recent_crisis'])
+    for name in TREND_WEIGHTS:
+        if row[name] >= 0.5:
+            reasons.append(REASON_LABELS[name])
+    return reasons
+
+
+# ==================== JOB ====================
+
+class PopulationRiskJob:
+    """Nightly job: load rollups, score everyone, queue flagged users for review.
+
+    A user already waiting in ``risk_review_queue`` is not queued again;
+    their open item is refreshed with the new scores instead.
+    """
+
+    def __init__(self, db_path: str = 'manas_wellness.db'):
+        self.db_path = db_path
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def ensure_schema(self):
+        """Create the review queue"""
+        conn = self._connect()
+        try:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS risk_review_queue (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    user_id TEXT NOT NULL,
+                    run_id TEXT NOT NULL,
+                    risk_score REAL NOT NULL,
+                    trend_score REAL NOT NULL,
+                    reasons TEXT,
+                    status TEXT NOT NULL DEFAULT 'open',
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            ''')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_risk_review_queue_status ON risk_review_queue (status, user_id)')
+            conn.commit()
+        finally:
+            conn.close()
+
+    def run(self, now: Optional[float] = None, dry_run: bool = False) -> Dict[str, Any]:
+        """
+        Score every user and write flagged ones to the review queue
+
+        Args:
+            now: Run time (epoch seconds)
+            dry_run: Score and report without writing
+
+        Returns:
+            Summary with counts, timings and the top flagged users
+        """
+        now = time.time() if now is None else now
+        run_id = uuid.uuid4().hex
+        start = time.perf_counter()
+
+        conn = self._connect()
+        try:
+            rollups = load_rollups(conn, now)
+            loaded = time.perf_counter()
+            scored = score_population(rollups, now)
+            flagged = scored[scored['flagged']] if not scored.empty else scored
+            scored_at = time.perf_counter()
+
+            queued = refreshed = 0
+            if not dry_run and not flagged.empty:
+                queued, refreshed = self._write_queue(conn, flagged, run_id, now)
+        finally:
+            conn.close()
+
+        top = flagged.sort_values(['risk_score', 'trend_score'], ascending=False).head(10) if not flagged.empty else flagged
+        summary = {
+            'run_id': run_id,
+            'users': int(len(scored)),
+            'flagged': int(len(flagged)),
+            'queued': queued,
+            'refreshed': refreshed,
+            'load_seconds': round(loaded - start, 3),
+            'score_seconds': round(scored_at - loaded, 3),
+            'total_seconds': round(time.perf_counter() - start, 3),
+            'top': [{'user_id': user_id, 'risk_score': round(float(row['risk_score']), 3),
+                     'trend_score': round(float(row['trend_score']), 3), 'reasons': flag_reasons(row)}
+                    for user_id, row in top.iterrows()]
+        }
+        logger.info(f"Population risk run {run_id}: {summary['flagged']}/{summary['users']} users flagged "
+                    f"in {summary['total_seconds']}s")
+        return summary
+
+    def _write_queue(self, conn: sqlite3.Connection, flagged: pd.DataFrame, run_id: str, now: float):
+        open_users = {row[0] for row in conn.execute("SELECT user_id FROM risk_review_queue WHERE status = 'open'")}
+        is_open = flagged.index.isin(list(open_users))
+        rows = [
+            (float(row['risk_score']), float(row['trend_score']), json.dumps(flag_reasons(row)), run_id, now, user_id)
+            for user_id, row in flagged.iterrows()
+        ]
+        new_rows = [r for r, already in zip(rows, is_open) if not already]
+        refresh_rows = [r for r, already in zip(rows, is_open) if already]
+        conn.executemany('''
+            INSERT INTO risk_review_queue (risk_score, trend_score, reasons, run_id, created_at, user_id, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        ''', [r + (now,) for r in new_rows])
+        conn.executemany('''
+            UPDATE risk_review_queue
+            SET risk_score = ?, trend_score = ?, reasons = ?, run_id = ?, updated_at = ?
+            WHERE user_id = ? AND status = 'open'
+        ''', refresh_rows)
+        conn.commit()
+        return len(new_rows), len(refresh_rows)
+
+
+def main():
+    """Command-line entry point for the nightly job"""
+    parser = argparse.ArgumentParser(description='Re-score every user and queue rising risk for counsellor review')
+    parser.add_argument('--db', default='manas_wellness.db', help='Hot database path')
+    parser.add_argument('--dry-run', action='store_true', help='Score and report without writing the queue')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    job = PopulationRiskJob(args.db)
+    job.ensure_schema()
+    print(json.dumps(job.run(dry_run=args.dry_run), indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,210 @@
+# 🧠 Manas: Per-User Render Cache
+# Versioned page cache with write-through invalidation and ETag / 304 support
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Callable, Optional, Tuple
+
+from flask import make_response, request
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Cache scopes and the pages that depend on them
+SCOPE_DASHBOARD = 'dashboard'
+SCOPE_JOURNAL = 'journal'
+
+
+def build_version(template_dir: Optional[str] = None) -> str:
+    """Identifier of the deployed code and templates, part of every ETag
+
+    APP_VERSION (or RENDER_GIT_COMMIT on Render) when set; otherwise a hash
+    of the template files, so a deploy that changes a page also changes its
+    ETags and browsers stop getting 304s for the old markup.
+    """
+    version = os.environ.get('APP_VERSION') or os.environ.get('RENDER_GIT_COMMIT')
+    if version:
+        return version
+    digest = hashlib.sha1()
+    if template_dir and os.path.isdir(template_dir):
+        for root, dirs, files in os.walk(template_dir):
+            dirs.sort()
+            for name in sorted(files):
+                path = os.path.join(root, name)
+                digest.update(os.path.relpath(path, template_dir).encode('utf-8'))
+                try:
+                    with open(path, 'rb') as f:
+                        digest.update(f.read())
+                except OSError as e:
+                    logger.warning(f"Template not hashed for build version: {e}")
+    return digest.hexdigest()[:12]
+
+
+class RenderCache:
+    """Cache rendered per-user pages keyed by a per-user data version.
+
+    Every write path that changes what a page shows calls ``invalidate``,
+    which bumps the user's version for that scope in SQLite. Readers only
+    need a primary-key lookup of the version to know whether the cached
+    HTML (or the browser's copy, via ETag) is still current, and because
+    the version lives in the database the invalidation is visible to every
+    worker process.
+    """
+
+    def __init__(self, db_path: str = 'manas_wellness.db', max_entries: int = 512, build: str = ''):
+        """
+        Args:
+            db_path: SQLite database holding the version table
+            max_entries: Rendered pages kept per process
+            build: Deploy identifier mixed into ETags (see ``build_version``)
+        """
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.build = build
+        self._pages: "OrderedDict[Tuple[str, str, int, str], str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=5)
+
+    def ensure_schema(self):
+        """Create the version table"""
+        conn = self._connect()
+        try:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS render_versions (
+                    user_id TEXT NOT NULL,
+                    scope TEXT NOT NULL,
+                    version INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (user_id, scope)
+                )
+            ''')
+            conn.commit()
+        finally:
+            conn.close()
+
+    # ==================== VERSIONS ====================
+
+    def version(self, user_id: str, scope: str) -> int:
+        """Current data version of a user's scope (0 if never written)"""
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                'SELECT version FROM render_versions WHERE user_id = ? AND scope = ?',
+                (user_id, scope)
+            ).fetchone()
+        finally:
+            conn.close()
+        return row[0] if row else 0
+
+    def invalidate(self, user_id: str, *scopes: str):
+        """Bump the version of each scope so cached renders and ETags go stale.
+
+        Args:
+            user_id: Owner of the changed data
+            *scopes: Scopes to invalidate (defaults to all known scopes)
+        """
+        if not user_id:
+            return
+        scopes = scopes or (SCOPE_DASHBOARD, SCOPE_JOURNAL)
+        try:
+            conn = self._connect()
+            try:
+                conn.executemany('''
+                    INSERT INTO render_versions (user_id, scope, version) VALUES (?, ?, 1)
+                    ON CONFLICT(user_id, scope) DO UPDATE SET version = version + 1
+                ''', [(user_id, scope) for scope in scopes])
+                conn.commit()
+            finally:
+                conn.close()
+        except Exception as e:
+            logger.error(f"Render cache invalidation error: {e}")
+            # Drop this process's copies so at least the local worker stays correct
+            with self._lock:
+                for key in [k for k in self._pages if k[0] == user_id and k[1] in scopes]:
+                    del self._pages[key]
+
+    def etag(self, user_id: str, scope: str, version: int, extra: str = '') -> str:
+        """Opaque ETag for one rendered version of a page in this build"""
+        return hashlib.sha1(f"{self.build}:{user_id}:{scope}:{version}:{extra}".encode('utf-8')).hexdigest()
+
+    # ==================== RESPONSES ====================
+
+    def _get(self, key: Tuple[str, str, int, str]) -> Optional[str]:
+        with self._lock:
+            html = self._pages.get(key)
+            if html is not None:
+                self._pages.move_to_end(key)
+            return html
+
+    def _put(self, key: Tuple[str, str, int, str], html: str):
+        with self._lock:
+            # Older versions of the same page can never be served again
+            for stale in [k for k in self._pages if k[:2] == key[:2] and k != key]:
+                del self._pages[stale]
+            self._pages[key] = html
+            while len(self._pages) > self.max_entries:
+                self._pages.popitem(last=False)
+
+    def cached_response(self, user_id: str, scope: str, render: Callable[[], str], extra: str = '',
+                        fallback: Optional[Callable[[], str]] = None):
+        """Serve a page from cache, answering 304 when the client copy is current.
+
+        Args:
+            user_id: Owner of the page
+            scope: Cache scope the page depends on
+            render: Callable producing the HTML on a miss; raises on failure
+            extra: Additional cache-key component (e.g. today's date for
+                pages whose content changes with the calendar)
+            fallback: Page served when ``render`` fails; never cached and
+                sent without an ETag, so the next request renders again
+
+        Returns:
+            Flask response
+        """
+        try:
+            version = self.version(user_id, scope)
+        except Exception as e:
+            logger.error(f"Render cache lookup error: {e}")
+            return self._uncached(render, fallback)
+
+        etag = self.etag(user_id, scope, version, extra)
+
+        if request.if_none_match.contains(etag):
+            response = make_response('', 304)
+        else:
+            key = (user_id, scope, version, extra)
+            html = self._get(key)
+            if html is None:
+                try:
+                    html = render()
+                except Exception as e:
+                    if fallback is None:
+                        raise
+                    logger.error(f"Render error for {scope} page: {e}")
+                    return self._no_store(fallback())
+                self._put(key, html)
+            response = make_response(html)
+
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'private, no-cache'
+        return response
+
+    def _uncached(self, render: Callable[[], str], fallback: Optional[Callable[[], str]]):
+        try:
+            return self._no_store(render())
+        except Exception as e:
+            if fallback is None:
+                raise
+            logger.error(f"Render error: {e}")
+            return self._no_store(fallback())
+
+    @staticmethod
+    def _no_store(html: str):
+        response = make_response(html)
+        response.headers['Cache-Control'] = 'no-store'
+        return response
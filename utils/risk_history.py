@@ -0,0 +1,186 @@
+# 🧠 Manas: Risk History
+# Per-user running risk state (EWMA, decaying peak, windowed event count, last crisis), updated in O(1)
+
+import logging
+import os
+import sqlite3
+import time
+from typing import Any, Dict, Optional
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Weight of the newest assessment in the moving average
+RISK_EWMA_ALPHA = float(os.environ.get('RISK_EWMA_ALPHA', 0.3))
+# Average and peak fade towards zero with this half-life while no assessments arrive
+RISK_HALF_LIFE_SECONDS = float(os.environ.get('RISK_HALF_LIFE_HOURS', 72)) * 3600
+# Sliding window for counting moderate-or-higher assessments
+RISK_EVENT_WINDOW_SECONDS = float(os.environ.get('RISK_EVENT_WINDOW_HOURS', 168)) * 3600
+# This many elevated assessments in the window count as a fully established pattern
+RISK_EVENT_SATURATION = 5
+
+ELEVATED_CATEGORIES = frozenset({'moderate', 'high', 'critical'})
+CRISIS_CATEGORIES = frozenset({'high', 'critical'})
+
+# How the state combines into the historical factor of CrisisDetector
+HISTORY_WEIGHTS = {'ewma': 0.4, 'peak': 0.25, 'events': 0.2, 'recent_crisis': 0.15}
+
+
+def _decay(elapsed: float, half_life: float = RISK_HALF_LIFE_SECONDS) -> float:
+    return 0.5 ** (max(elapsed, 0.0) / half_life)
+
+
+def _windowed_count(window_start: float, current: int, previous: int, now: float,
+                    window: float = RISK_EVENT_WINDOW_SECONDS) -> float:
+    """Events in the last ``window`` seconds, from the current and previous fixed buckets.
+
+    The previous bucket is weighted by how much of it still overlaps the
+    sliding window (the usual sliding-window-counter approximation), so
+    only three numbers are stored per user, however many events occur.
+    """
+    overlap = max(1 - (now - window_start) / window, 0.0)
+    return current + previous * overlap
+
+
+class RiskHistory:
+    """Running risk state per user in the ``user_risk_state`` table.
+
+    Each assessment updates one row in place (primary-key upsert), and the
+    historical factor is read back with a single primary-key lookup, so
+    cost does not grow with the user's history and emotional_states is
+    never scanned.
+    """
+
+    def __init__(self, db_path: str = 'manas_wellness.db'):
+        self.db_path = db_path
+        self._init_table()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=5)
+
+    def _init_table(self):
+        try:
+            conn = self._connect()
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS user_risk_state (
+                    user_id TEXT PRIMARY KEY,
+                    ewma REAL NOT NULL DEFAULT 0,
+                    peak REAL NOT NULL DEFAULT 0,
+                    window_start REAL NOT NULL,
+                    window_count INTEGER NOT NULL DEFAULT 0,
+                    previous_window_count INTEGER NOT NULL DEFAULT 0,
+                    last_crisis_at REAL,
+                    assessments INTEGER NOT NULL DEFAULT 0,
+                    updated_at REAL NOT NULL
+                )
+            ''')
+            conn.commit()
+            conn.close()
+        except Exception as e:
+            logger.error(f"Risk state table initialization error: {e}")
+
+    # ==================== STATE ====================
+
+    @staticmethod
+    def _advance(row: Optional[sqlite3.Row], now: float) -> Dict[str, Any]:
+        """Stored state brought forward to ``now`` (decay and window roll-over)"""
+        if row is None:
+            return {'ewma': 0.0, 'peak': 0.0, 'window_start': now, 'window_count': 0,
+                    'previous_window_count': 0, 'last_crisis_at': None, 'assessments': 0}
+        decay = _decay(now - row['updated_at'])
+        window_start, current, previous = row['window_start'], row['window_count'], row['previous_window_count']
+        elapsed = now - window_start
+        if elapsed >= 2 * RISK_EVENT_WINDOW_SECONDS:
+            window_start, current, previous = now, 0, 0
+        elif elapsed >= RISK_EVENT_WINDOW_SECONDS:
+            window_start, current, previous = window_start + RISK_EVENT_WINDOW_SECONDS, 0, current
+        return {
+            'ewma': row['ewma'] * decay,
+            'peak': row['peak'] * decay,
+            'window_start': window_start,
+            'window_count': current,
+            'previous_window_count': previous,
+            'last_crisis_at': row['last_crisis_at'],
+            'assessments': row['assessments']
+        }
+
+    def get_state(self, user_id: str, now: Optional[float] = None) -> Dict[str, Any]:
+        """
+        User's risk state as of ``now``
+
+        Returns:
+            ewma, peak (both decayed to now), recent_events (elevated
+            assessments in the sliding window), seconds_since_crisis (None if
+            never) and the number of assessments recorded
+        """
+        now = time.time() if now is None else now
+        conn = self._connect()
+        conn.row_factory = sqlite3.Row
+        try:
+            row = conn.execute('SELECT * FROM user_risk_state WHERE user_id = ?', (user_id,)).fetchone()
+        finally:
+            conn.close()
+        state = self._advance(row, now)
+        return {
+            'ewma': round(state['ewma'], 4),
+            'peak': round(state['peak'], 4),
+            'recent_events': round(_windowed_count(state['window_start'], state['window_count'],
+                                                   state['previous_window_count'], now), 2),
+            'seconds_since_crisis': None if state['last_crisis_at'] is None else round(now - state['last_crisis_at']),
+            'assessments': state['assessments']
+        }
+
+    def record(self, user_id: str, risk_level: float, risk_category: str, now: Optional[float] = None):
+        """
+        Fold one assessment into the user's state
+
+        Args:
+            user_id: User identifier
+            risk_level: Combined risk in [0, 1]
+            risk_category: Category from CrisisDetector._categorize_risk
+            now: Assessment time (epoch seconds)
+        """
+        now = time.time() if now is None else now
+        risk_level = min(max(float(risk_level), 0.0), 1.0)
+        conn = self._connect()
+        conn.row_factory = sqlite3.Row
+        try:
+            # Serialize concurrent writers for this read-modify-write
+            conn.execute('BEGIN IMMEDIATE')
+            row = conn.execute('SELECT * FROM user_risk_state WHERE user_id = ?', (user_id,)).fetchone()
+            state = self._advance(row, now)
+            ewma = risk_level if row is None else (1 - RISK_EWMA_ALPHA) * state['ewma'] + RISK_EWMA_ALPHA * risk_level
+            conn.execute('''
+                INSERT OR REPLACE INTO user_risk_state
+                    (user_id, ewma, peak, window_start, window_count, previous_window_count,
+                     last_crisis_at, assessments, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (
+                user_id,
+                ewma,
+                max(state['peak'], risk_level),
+                state['window_start'],
+                state['window_count'] + (1 if risk_category in ELEVATED_CATEGORIES else 0),
+                state['previous_window_count'],
+                now if risk_category in CRISIS_CATEGORIES else state['last_crisis_at'],
+                state['assessments'] + 1,
+                now
+            ))
+            conn.commit()
+        finally:
+            conn.close()
+
+    # ==================== SCORING ====================
+
+    @staticmethod
+    def historical_risk(state: Dict[str, Any]) -> float:
+        """Historical risk factor in [0, 1] from a state returned by get_state"""
+        since = state.get('seconds_since_crisis')
+        recent_crisis = 0.0 if since is None else _decay(since)
+        score = (
+            HISTORY_WEIGHTS['ewma'] * state.get('ewma', 0.0)
+            + HISTORY_WEIGHTS['peak'] * state.get('peak', 0.0)
+            + HISTORY_WEIGHTS['events'] * min(state.get('recent_events', 0.0) / RISK_EVENT_SATURATION, 1.0)
+            + HISTORY_WEIGHTS['recent_crisis'] * recent_crisis
+        )
+        return round(min(score, 1.0), 4)
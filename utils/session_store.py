@@ -0,0 +1,451 @@
+# 🧠 Manas: Server-Side Session Store
+# Opaque-id sessions backed by SQLite (default) or Redis, replacing the signed cookie payload
+
+import copy
+import json
+import logging
+import os
+import secrets
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Any, Tuple
+
+from flask.sessions import SessionInterface, SessionMixin
+from itsdangerous import BadSignature, Signer
+
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+    redis = None
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Rarely used keys are stored in a separate record and only fetched when touched
+LAZY_KEYS = frozenset({
+    'spotify_access_token',
+    'spotify_refresh_token',
+    'spotify_expires_at',
+    'spotify_scopes',
+    'oauth_state',
+    'googlefit_oauth_state'
+})
+
+CORE_PART = 'core'
+LAZY_PART = 'lazy'
+
+DEFAULT_SESSION_TTL = int(os.environ.get('SESSION_TTL_SECONDS', 31 * 24 * 3600))
+
+
+def new_version() -> str:
+    """Random token identifying one write of a session part"""
+    return secrets.token_urlsafe(8)
+
+
+def _pack(data: Dict[str, Any], version: str) -> str:
+    return json.dumps({'v': version, 'data': data})
+
+
+def _unpack(raw) -> Tuple[Dict[str, Any], Optional[str]]:
+    """(data, version) of a stored part; records written before versioning have no version"""
+    record = json.loads(raw)
+    if isinstance(record, dict) and set(record) == {'v', 'data'}:
+        return record['data'], record['v']
+    return record, None
+
+
+class SQLiteSessionBackend:
+    """Session records in a SQLite table keyed by (sid, part)"""
+
+    def __init__(self, db_path: str = 'manas_wellness.db'):
+        self.db_path = db_path
+        self._last_purge = 0.0
+        self._init_table()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=5)
+
+    def _init_table(self):
+        try:
+            conn = self._connect()
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS server_sessions (
+                    sid TEXT NOT NULL,
+                    part TEXT NOT NULL,
+                    data TEXT,
+                    expires_at REAL,
+                    PRIMARY KEY (sid, part)
+                )
+            ''')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_server_sessions_expiry ON server_sessions (expires_at)')
+            conn.commit()
+            conn.close()
+        except Exception as e:
+            logger.error(f"Session table initialization error: {e}")
+
+    def get(self, sid: str, part: str) -> Optional[Tuple[Dict[str, Any], Optional[str]]]:
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                'SELECT data FROM server_sessions WHERE sid = ? AND part = ? AND expires_at > ?',
+                (sid, part, time.time())
+            ).fetchone()
+        finally:
+            conn.close()
+        return _unpack(row[0]) if row else None
+
+    def set(self, sid: str, part: str, data: Dict[str, Any], version: str, ttl: int):
+        conn = self._connect()
+        try:
+            conn.execute(
+                'INSERT OR REPLACE INTO server_sessions (sid, part, data, expires_at) VALUES (?, ?, ?, ?)',
+                (sid, part, _pack(data, version), time.time() + ttl)
+            )
+            # Expired rows are swept at most once an hour, piggybacking on a write
+            if time.time() - self._last_purge > 3600:
+                conn.execute('DELETE FROM server_sessions WHERE expires_at <= ?', (time.time(),))
+                self._last_purge = time.time()
+            conn.commit()
+        finally:
+            conn.close()
+
+    def delete(self, sid: str):
+        conn = self._connect()
+        try:
+            conn.execute('DELETE FROM server_sessions WHERE sid = ?', (sid,))
+            conn.commit()
+        finally:
+            conn.close()
+
+
+class RedisSessionBackend:
+    """Session records as Redis keys with native expiry"""
+
+    def __init__(self, url: str, prefix: str = 'manas:session:'):
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+
+    def _key(self, sid: str, part: str) -> str:
+        return f"{self.prefix}{sid}:{part}"
+
+    def get(self, sid: str, part: str) -> Optional[Tuple[Dict[str, Any], Optional[str]]]:
+        raw = self.client.get(self._key(sid, part))
+        return _unpack(raw) if raw else None
+
+    def set(self, sid: str, part: str, data: Dict[str, Any], version: str, ttl: int):
+        self.client.setex(self._key(sid, part), ttl, _pack(data, version))
+
+    def delete(self, sid: str):
+        self.client.delete(self._key(sid, CORE_PART), self._key(sid, LAZY_PART))
+
+
+class _ReadThroughCache:
+    """Small per-process LRU of session parts keyed by (sid, part, version).
+
+    Each write of a part gets a fresh random version, carried in the cookie
+    and stored next to the data, so a key names exactly one write and an
+    entry cannot be overwritten by a concurrent request. Entries are copies:
+    the live session never shares objects with the cache.
+    """
+
+    def __init__(self, max_entries: int = 2048):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str, str], Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple[str, str, str]) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                return None
+            self._entries.move_to_end(key)
+        return copy.deepcopy(value)
+
+    def put(self, key: Tuple[str, str, str], value: Dict[str, Any]):
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+class ServerSideSession(dict, SessionMixin):
+    """Session dict that loads its data from the backend on first use.
+
+    Ordinary keys are loaded together the first time any of them is read;
+    keys in ``LAZY_KEYS`` are loaded separately and only when touched, so
+    most requests never fetch the Spotify/OAuth token record at all.
+    """
+
+    def __init__(self, interface: 'ServerSideSessionInterface', sid: str,
+                 versions: Optional[Dict[str, Optional[str]]] = None, new: bool = False):
+        super().__init__()
+        self.sid = sid
+        self.versions = dict(versions or {})
+        self.previous_sid: Optional[str] = None
+        self.new = new
+        self.modified = False
+        self.accessed = False
+        self._interface = interface
+        self._loaded = {CORE_PART: new, LAZY_PART: new}
+        self._dirty = set()
+
+    # ----- loading -----
+
+    def _part_for(self, key: Any) -> str:
+        return LAZY_PART if key in LAZY_KEYS else CORE_PART
+
+    def _load(self, part: str):
+        if self._loaded[part]:
+            return
+        self._loaded[part] = True
+        data = self._interface.load_part(self.sid, self.versions.get(part), part)
+        if data:
+            for key, value in data.items():
+                dict.setdefault(self, key, value)
+
+    def _load_for(self, key: Any):
+        self.accessed = True
+        self._load(self._part_for(key))
+
+    def _load_all(self):
+        self.accessed = True
+        self._load(CORE_PART)
+        self._load(LAZY_PART)
+
+    def _touch(self, key: Any):
+        self.modified = True
+        self._dirty.add(self._part_for(key))
+
+    # ----- mapping interface -----
+
+    def __getitem__(self, key):
+        self._load_for(key)
+        return dict.__getitem__(self, key)
+
+    def __setitem__(self, key, value):
+        self._load_for(key)
+        self._touch(key)
+        dict.__setitem__(self, key, value)
+
+    def __delitem__(self, key):
+        self._load_for(key)
+        self._touch(key)
+        dict.__delitem__(self, key)
+
+    def __contains__(self, key):
+        self._load_for(key)
+        return dict.__contains__(self, key)
+
+    def __iter__(self):
+        self._load_all()
+        return dict.__iter__(self)
+
+    def __len__(self):
+        self._load_all()
+        return dict.__len__(self)
+
+    def get(self, key, default=None):
+        self._load_for(key)
+        return dict.get(self, key, default)
+
+    def setdefault(self, key, default=None):
+        self._load_for(key)
+        if not dict.__contains__(self, key):
+            self._touch(key)
+        return dict.setdefault(self, key, default)
+
+    def pop(self, key, *args):
+        self._load_for(key)
+        if dict.__contains__(self, key):
+            self._touch(key)
+        return dict.pop(self, key, *args)
+
+    def popitem(self):
+        self._load_all()
+        key, value = dict.popitem(self)
+        self._touch(key)
+        return key, value
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def clear(self):
+        self._load_all()
+        self.modified = True
+        self._dirty.update((CORE_PART, LAZY_PART))
+        dict.clear(self)
+
+    def keys(self):
+        self._load_all()
+        return dict.keys(self)
+
+    def values(self):
+        self._load_all()
+        return dict.values(self)
+
+    def items(self):
+        self._load_all()
+        return dict.items(self)
+
+    def copy(self):
+        self._load_all()
+        return dict(self)
+
+    # ----- persistence helpers -----
+
+    def dirty_parts(self) -> Dict[str, Dict[str, Any]]:
+        """Data for every part that changed, split by storage part"""
+        # Setting ``session.modified`` after changing a value in place marks every loaded part
+        dirty = self._dirty or {part for part, loaded in self._loaded.items() if loaded}
+        parts = {}
+        for part in dirty:
+            parts[part] = {key: value for key, value in dict.items(self) if self._part_for(key) == part}
+        return parts
+
+    def regenerate(self):
+        """Move the data to a new sid (on login), so a sid known before login is worthless after it"""
+        self._load_all()
+        if self.previous_sid is None and not self.new:
+            self.previous_sid = self.sid
+        self.sid = secrets.token_urlsafe(32)
+        self.versions = {}
+        self.modified = True
+        self._dirty.update((CORE_PART, LAZY_PART))
+
+    def is_empty(self) -> bool:
+        """True when the session holds no data in either part"""
+        self._load_all()
+        return dict.__len__(self) == 0
+
+
+class ServerSideSessionInterface(SessionInterface):
+    """Flask session interface storing session data server-side.
+
+    The cookie carries only a signed ``<sid>.<core version>.<lazy version>``
+    token instead of the whole session, so static and API responses no
+    longer re-send tokens and OAuth state on every request.
+    """
+
+    def __init__(self, backend, ttl: int = DEFAULT_SESSION_TTL, cache_entries: int = 2048):
+        self.backend = backend
+        self.ttl = ttl
+        self.cache = _ReadThroughCache(cache_entries)
+
+    def _signer(self, app) -> Optional[Signer]:
+        if not app.secret_key:
+            return None
+        return Signer(app.secret_key, salt='manas-server-session')
+
+    def load_part(self, sid: str, version: Optional[str], part: str) -> Optional[Dict[str, Any]]:
+        """Read-through fetch of one session part at the version named by the cookie"""
+        if version:
+            data = self.cache.get((sid, part, version))
+            if data is not None:
+                return data
+        try:
+            record = self.backend.get(sid, part)
+        except Exception as e:
+            logger.error(f"Session backend read error: {e}")
+            return {}
+        if record is None:
+            return {}
+        data, stored_version = record
+        # Only cache the write the cookie refers to; a newer write by a concurrent
+        # request is returned as read but never cached under this cookie's version
+        if version and stored_version == version:
+            self.cache.put((sid, part, version), data)
+        return data
+
+    def open_session(self, app, request) -> Optional[ServerSideSession]:
+        signer = self._signer(app)
+        if signer is None:
+            return None
+        cookie = request.cookies.get(self.get_cookie_name(app))
+        if cookie:
+            try:
+                sid, *versions = signer.unsign(cookie).decode('utf-8').split('.')
+                if sid:
+                    # Cookies from before per-part versions carry a counter; it matches no stored version
+                    parts = dict(zip((CORE_PART, LAZY_PART), versions)) if len(versions) == 2 else {}
+                    return ServerSideSession(self, sid, parts)
+            except (BadSignature, UnicodeDecodeError):
+                logger.warning("Invalid session cookie - starting a new session")
+        return ServerSideSession(self, secrets.token_urlsafe(32), new=True)
+
+    def _delete(self, sid: str):
+        try:
+            self.backend.delete(sid)
+        except Exception as e:
+            logger.error(f"Session backend delete error: {e}")
+
+    def save_session(self, app, session: ServerSideSession, response):
+        name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+
+        if session.accessed:
+            response.vary.add('Cookie')
+
+        if not session.modified:
+            return
+
+        if session.previous_sid:
+            self._delete(session.previous_sid)
+
+        if session.is_empty():
+            if not session.new:
+                self._delete(session.sid)
+                response.delete_cookie(name, domain=domain, path=path)
+            return
+
+        for part, data in session.dirty_parts().items():
+            version = new_version()
+            try:
+                self.backend.set(session.sid, part, data, version, self.ttl)
+            except Exception as e:
+                logger.error(f"Session backend write error: {e}")
+                continue
+            session.versions[part] = version
+            self.cache.put((session.sid, part, version), data)
+
+        versions = '.'.join(session.versions.get(part) or '' for part in (CORE_PART, LAZY_PART))
+        token = self._signer(app).sign(f"{session.sid}.{versions}".encode('utf-8')).decode('utf-8')
+        response.set_cookie(
+            name,
+            token,
+            expires=self.get_expiration_time(app, session),
+            httponly=self.get_cookie_httponly(app),
+            domain=domain,
+            path=path,
+            secure=self.get_cookie_secure(app),
+            samesite=self.get_cookie_samesite(app)
+        )
+
+
+def regenerate_session_id(session) -> None:
+    """Give the current session a new sid, if it is a server-side session (call on login)"""
+    if isinstance(session, ServerSideSession):
+        session.regenerate()
+
+
+def create_session_interface(db_path: str = 'manas_wellness.db') -> ServerSideSessionInterface:
+    """Build the session interface: Redis when SESSION_REDIS_URL is set, SQLite otherwise"""
+    redis_url = os.environ.get('SESSION_REDIS_URL')
+    if redis_url and REDIS_AVAILABLE:
+        try:
+            backend = RedisSessionBackend(redis_url)
+            backend.client.ping()
+            logger.info("Using Redis server-side sessions")
+            return ServerSideSessionInterface(backend)
+        except Exception as e:
+            logger.error(f"Redis session backend unavailable, falling back to SQLite: {e}")
+    elif redis_url:
+        logger.warning("SESSION_REDIS_URL set but redis is not installed - using SQLite sessions")
+    return ServerSideSessionInterface(SQLiteSessionBackend(db_path))
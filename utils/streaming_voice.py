@@ -0,0 +1,302 @@
+# 🧠 Manas: Streaming Voice Emotion
+# Incremental voice features over Socket.IO with provisional estimates and a final fused result
+
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from .audio_features import HOP_LENGTH, N_FFT, N_MFCC, TEMPO_ENABLED
+from .lazy_import import lazy_import, module_available
+from .media_decoding import TARGET_SAMPLE_RATE
+
+# Imported on first use
+LIBROSA_AVAILABLE = module_available('librosa')
+librosa = lazy_import('librosa') if LIBROSA_AVAILABLE else None
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+PROVISIONAL_INTERVAL_SECONDS = float(os.environ.get('VOICE_STREAM_PROVISIONAL_SECONDS', 3))
+MAX_STREAM_SECONDS = float(os.environ.get('VOICE_STREAM_MAX_SECONDS', 300))
+# Frames this far below the loudest frame so far are treated as silence
+SILENCE_DB = 35.0
+
+
+class _Moments:
+    """Running count / sum / sum of squares of a scalar or vector quantity"""
+
+    def __init__(self, size: int = 1):
+        self.count = 0
+        self.total = np.zeros(size)
+        self.squares = np.zeros(size)
+
+    def add(self, values: np.ndarray):
+        """Add observations (rows are observations)"""
+        values = np.asarray(values, dtype=np.float64).reshape(len(values), -1)
+        self.count += len(values)
+        self.total += values.sum(axis=0)
+        self.squares += (values ** 2).sum(axis=0)
+
+    def mean(self) -> np.ndarray:
+        return self.total / self.count if self.count else np.zeros_like(self.total)
+
+    def std(self) -> np.ndarray:
+        if not self.count:
+            return np.zeros_like(self.total)
+        return np.sqrt(np.maximum(self.squares / self.count - self.mean() ** 2, 0.0))
+
+
+class RunningVoiceFeatures:
+    """The features of utils.audio_features, accumulated chunk by chunk.
+
+    Samples are framed exactly as in the offline extractor (same FFT size
+    and hop, with the unused tail of each chunk carried into the next), and
+    per-frame values are folded into running moments, so the cost of a
+    chunk depends only on its length. Pitch thresholds and mel dB scaling
+    are per chunk, a close approximation of the whole-file values. Energy
+    is the time-domain frame RMS, as offline. For tempo the onset envelope
+    (over all frames, silent ones included) is kept and beat-tracked when
+    features are read.
+    """
+
+    def __init__(self, sr: int = TARGET_SAMPLE_RATE, include_tempo: Optional[bool] = None):
+        self.sr = sr
+        self.include_tempo = TEMPO_ENABLED if include_tempo is None else include_tempo
+        self.tail = np.zeros(0, dtype=np.float32)
+        self.samples_seen = 0
+        self.peak_db = -np.inf
+        self.voiced_frames = 0
+        self.pitch = _Moments()
+        self.energy = _Moments()
+        self.centroid = _Moments()
+        self.rolloff = _Moments()
+        self.zcr = _Moments()
+        self.mfcc = _Moments(N_MFCC)
+        self.onset_env: List[np.ndarray] = []
+        self._last_mel_db: Optional[np.ndarray] = None
+
+    @property
+    def seconds(self) -> float:
+        return self.samples_seen / self.sr
+
+    def add(self, y: np.ndarray):
+        """Fold a chunk of mono float samples at ``sr`` into the statistics"""
+        self.samples_seen += len(y)
+        block = np.concatenate([self.tail, y.astype(np.float32, copy=False)])
+        if len(block) < N_FFT:
+            self.tail = block
+            return
+        n_frames = 1 + (len(block) - N_FFT) // HOP_LENGTH
+        consumed = n_frames * HOP_LENGTH
+        frames_y = block[:consumed - HOP_LENGTH + N_FFT]
+        self.tail = block[consumed:]
+
+        S = np.abs(librosa.stft(frames_y, n_fft=N_FFT, hop_length=HOP_LENGTH, center=False))
+        frames = librosa.util.frame(frames_y, frame_length=N_FFT, hop_length=HOP_LENGTH)
+        # Time-domain RMS, as librosa.feature.rms(y=...) in extract_audio_features
+        rms = np.sqrt(np.mean(frames.astype(np.float64) ** 2, axis=0))
+        mel_db = librosa.power_to_db(librosa.feature.melspectrogram(S=S ** 2, sr=self.sr))
+        if self.include_tempo:
+            self._add_onsets(mel_db)
+
+        # Skip silent frames, judged against the loudest frame heard so far
+        rms_db = 20 * np.log10(rms + 1e-10)
+        self.peak_db = max(self.peak_db, float(rms_db.max()))
+        voiced = rms_db > self.peak_db - SILENCE_DB
+        if not voiced.any():
+            return
+        S = S[:, voiced]
+        frames = frames[:, voiced]
+        self.voiced_frames += int(voiced.sum())
+
+        pitches, magnitudes = librosa.piptrack(S=S, sr=self.sr, n_fft=N_FFT, hop_length=HOP_LENGTH)
+        pitch_values = pitches[magnitudes > np.percentile(magnitudes, 85)]
+        if len(pitch_values):
+            self.pitch.add(pitch_values)
+        self.energy.add(rms[voiced])
+        self.centroid.add(librosa.feature.spectral_centroid(S=S, sr=self.sr, n_fft=N_FFT, hop_length=HOP_LENGTH)[0])
+        self.rolloff.add(librosa.feature.spectral_rolloff(S=S, sr=self.sr, n_fft=N_FFT, hop_length=HOP_LENGTH)[0])
+        self.zcr.add(np.mean(np.abs(np.diff(np.signbit(frames), axis=0)), axis=0))
+        self.mfcc.add(librosa.feature.mfcc(S=mel_db[:, voiced], n_mfcc=N_MFCC).T)
+
+    def _add_onsets(self, mel_db: np.ndarray):
+        """Extend the onset envelope (librosa.onset.onset_strength: mean positive mel dB flux)"""
+        previous = mel_db[:, :1] if self._last_mel_db is None else self._last_mel_db
+        flux = np.diff(np.concatenate([previous, mel_db], axis=1), axis=1)
+        self.onset_env.append(np.maximum(flux, 0.0).mean(axis=0))
+        self._last_mel_db = mel_db[:, -1:]
+
+    def features(self) -> Dict[str, float]:
+        """Current feature dict, same keys as extract_audio_features"""
+        if not self.voiced_frames:
+            return {}
+        features = {
+            'pitch_mean': float(self.pitch.mean()[0]),
+            'pitch_variation': float(self.pitch.std()[0]),
+            'energy': float(self.energy.mean()[0]),
+            'spectral_centroid': float(self.centroid.mean()[0]),
+            'spectral_rolloff': float(self.rolloff.mean()[0]),
+            'zcr': float(self.zcr.mean()[0]),
+        }
+        for i, value in enumerate(self.mfcc.mean()):
+            features[f'mfcc_{i}'] = float(value)
+        if self.include_tempo and self.onset_env:
+            tempo, _ = librosa.beat.beat_track(onset_envelope=np.concatenate(self.onset_env),
+                                               sr=self.sr, hop_length=HOP_LENGTH)
+            features['tempo'] = float(np.atleast_1d(tempo)[0])
+        return features
+
+
+class VoiceEmotionStream:
+    """One client's streamed recording"""
+
+    def __init__(self, detector, input_sr: int = TARGET_SAMPLE_RATE,
+                 provisional_interval: float = PROVISIONAL_INTERVAL_SECONDS,
+                 max_seconds: float = MAX_STREAM_SECONDS):
+        """
+        Args:
+            detector: EmotionDetector used for classification and the final analysis
+            input_sr: Sample rate of the PCM the client sends
+            provisional_interval: Seconds of audio between provisional estimates
+            max_seconds: Audio beyond this is ignored
+        """
+        self.detector = detector
+        self.input_sr = int(input_sr)
+        self.provisional_interval = provisional_interval
+        self.max_seconds = max_seconds
+        self.features = RunningVoiceFeatures(TARGET_SAMPLE_RATE)
+        self.timeline: List[Dict[str, Any]] = []
+        self.started = time.monotonic()
+        self._next_provisional = provisional_interval
+        self._lock = threading.Lock()
+
+    def _decode(self, chunk: Any) -> np.ndarray:
+        """16-bit little-endian PCM bytes, or a list of floats, to float32 at the feature rate"""
+        if isinstance(chunk, (bytes, bytearray, memoryview)):
+            y = np.frombuffer(chunk, dtype='<i2').astype(np.float32) / 32768.0
+        else:
+            y = np.asarray(chunk, dtype=np.float32)
+        if self.input_sr != TARGET_SAMPLE_RATE and len(y):
+            y = librosa.resample(y, orig_sr=self.input_sr, target_sr=TARGET_SAMPLE_RATE)
+        return y
+
+    def _estimate(self) -> Dict[str, Any]:
+        features = self.features.features()
+        estimate = self.detector._classify_emotion_from_audio(features)
+        self.detector._apply_distilled_model('audio', estimate, features)
+        return estimate
+
+    def add_chunk(self, chunk: Any) -> Optional[Dict[str, Any]]:
+        """
+        Add audio; returns a provisional estimate whenever another interval has been heard
+
+        Provisional estimates are local only (no Gemini), so they are cheap
+        enough to push every few seconds.
+        """
+        with self._lock:
+            if self.features.seconds >= self.max_seconds:
+                return None
+            self.features.add(self._decode(chunk))
+            if self.features.seconds < self._next_provisional or not self.features.voiced_frames:
+                return None
+            self._next_provisional = self.features.seconds + self.provisional_interval
+
+            estimate = self._estimate()
+            provisional = {
+                'provisional': True,
+                'seconds': round(self.features.seconds, 2),
+                'primary_emotion': estimate.get('primary_emotion'),
+                'confidence': estimate.get('confidence'),
+                'emotion_intensity': estimate.get('emotion_intensity')
+            }
+            self.timeline.append(provisional)
+            return provisional
+
+    def finish(self) -> Dict[str, Any]:
+        """Final result: the full voice analysis (tiering, Gemini) on the accumulated features"""
+        with self._lock:
+            features = self.features.features()
+            if not features:
+                return {
+                    'primary_emotion': 'error',
+                    'emotion_intensity': 0,
+                    'confidence': 0.0,
+                    'analysis_method': 'error',
+                    'error': 'No voiced audio received'
+                }
+            result = self.detector.analyze_voice_features(features)
+            result.setdefault('audio_features', features)
+            result.update({
+                'analysis_mode': 'streaming',
+                'emotion_timeline': self.timeline,
+                'stream_seconds': round(self.features.seconds, 2),
+                'voiced_seconds': round(self.features.voiced_frames * HOP_LENGTH / TARGET_SAMPLE_RATE, 2),
+                'processing_timestamp': datetime.now().isoformat()
+            })
+            return result
+
+
+def register_voice_stream_handlers(socketio, detector, on_final: Callable[[str, Dict[str, Any]], Dict[str, Any]],
+                                   namespace: str = '/voice'):
+    """
+    Socket.IO protocol for streamed voice emotion
+
+    Client -> server: ``start`` {sample_rate}, ``chunk`` <PCM16 bytes>, ``end``
+    Server -> client: ``ready``, ``provisional`` {...}, ``final`` {...}, ``error`` {...}
+
+    Args:
+        socketio: flask_socketio.SocketIO instance
+        detector: EmotionDetector
+        on_final: Called with (user_id, result) to persist the final result;
+            its return value is merged into the ``final`` payload
+        namespace: Socket.IO namespace
+    """
+    from flask import request, session
+    from flask_socketio import emit
+
+    streams: Dict[str, VoiceEmotionStream] = {}
+
+    @socketio.on('start', namespace=namespace)
+    def handle_start(data=None):
+        sample_rate = (data or {}).get('sample_rate', TARGET_SAMPLE_RATE)
+        streams[request.sid] = VoiceEmotionStream(detector, input_sr=sample_rate)
+        emit('ready', {'sample_rate': sample_rate, 'provisional_interval': PROVISIONAL_INTERVAL_SECONDS})
+
+    @socketio.on('chunk', namespace=namespace)
+    def handle_chunk(chunk):
+        stream = streams.get(request.sid)
+        if stream is None:
+            emit('error', {'error': 'Stream not started'})
+            return
+        try:
+            provisional = stream.add_chunk(chunk)
+            if provisional:
+                emit('provisional', provisional)
+        except Exception as e:
+            logger.error(f"Voice stream chunk error: {e}")
+            emit('error', {'error': str(e)})
+
+    @socketio.on('end', namespace=namespace)
+    def handle_end(data=None):
+        stream = streams.pop(request.sid, None)
+        if stream is None:
+            emit('error', {'error': 'Stream not started'})
+            return
+        try:
+            result = stream.finish()
+            payload = {'emotion_result': result}
+            if result.get('primary_emotion') != 'error':
+                payload.update(on_final(session.get('user_id', 'demo_user'), result) or {})
+            emit('final', payload)
+        except Exception as e:
+            logger.error(f"Voice stream finish error: {e}")
+            emit('error', {'error': str(e)})
+
+    @socketio.on('disconnect', namespace=namespace)
+    def handle_disconnect():
+        streams.pop(request.sid, None)
@@ -0,0 +1,252 @@
+# 🧠 Manas: Local Text Emotion Model
+# TF-IDF character + word n-gram linear classifier for English, Hindi and Hinglish
+
+import argparse
+import logging
+import os
+import re
+import threading
+import time
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence
+
+from .lazy_import import lazy_import, module_available
+from .model_registry import HotSwappableModel, MODEL_DIR
+from .text_emotion_seed import SEED_EXAMPLES
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# scikit-learn is imported when a model is first loaded or trained
+SKLEARN_AVAILABLE = module_available('sklearn') and module_available('joblib')
+joblib = lazy_import('joblib') if SKLEARN_AVAILABLE else None
+
+MODEL_FILENAME = 'text_emotion.joblib'
+
+# Words are runs of word characters or Devanagari (whose vowel signs are not \w)
+TOKEN_PATTERN = r'(?u)[\w\u0900-\u097F]+'
+
+# How each label maps onto the fields the rest of the app expects
+EMOTION_PROFILES = {
+    'happy': {'sentiment': 0.8, 'risk': 0.1, 'intensity': 6},
+    'excited': {'sentiment': 0.9, 'risk': 0.0, 'intensity': 7},
+    'calm': {'sentiment': 0.5, 'risk': 0.1, 'intensity': 3},
+    'neutral': {'sentiment': 0.0, 'risk': 0.1, 'intensity': 3},
+    'confused': {'sentiment': -0.2, 'risk': 0.2, 'intensity': 4},
+    'stressed': {'sentiment': -0.5, 'risk': 0.3, 'intensity': 6},
+    'anxious': {'sentiment': -0.5, 'risk': 0.3, 'intensity': 6},
+    'angry': {'sentiment': -0.6, 'risk': 0.2, 'intensity': 6},
+    'sad': {'sentiment': -0.6, 'risk': 0.3, 'intensity': 6},
+    'hopeless': {'sentiment': -0.9, 'risk': 0.5, 'intensity': 8},
+}
+
+
+def normalize_text(text: str) -> str:
+    return re.sub(r'\s+', ' ', (text or '').strip().lower())
+
+
+def build_pipeline() -> 'Pipeline':
+    """Character n-grams cope with Hinglish spelling variation, word n-grams with phrasing"""
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.pipeline import FeatureUnion, Pipeline
+
+    return Pipeline([
+        ('features', FeatureUnion([
+            ('char', TfidfVectorizer(analyzer='char_wb', ngram_range=(2, 4), sublinear_tf=True)),
+            ('word', TfidfVectorizer(analyzer='word', ngram_range=(1, 2), sublinear_tf=True,
+                                     token_pattern=TOKEN_PATTERN)),
+        ])),
+        ('clf', LogisticRegression(max_iter=2000, C=5.0, class_weight='balanced')),
+    ])
+
+
+class TextEmotionModel:
+    """A trained text emotion classifier plus its metadata"""
+
+    def __init__(self, pipeline: 'Pipeline', metadata: Optional[Dict[str, Any]] = None):
+        self.pipeline = pipeline
+        self.labels: List[str] = list(pipeline.named_steps['clf'].classes_)
+        self.metadata = metadata or {}
+        self.version = self.metadata.get('version', 'unversioned')
+        # Repeated inputs (retries, identical journal prompts) skip the model entirely
+        self._cached_proba = lru_cache(maxsize=4096)(self._predict_proba)
+
+    # ==================== TRAINING / PERSISTENCE ====================
+
+    @classmethod
+    def train(cls, texts: Sequence[str], labels: Sequence[str], metadata: Optional[Dict[str, Any]] = None) -> 'TextEmotionModel':
+        """Fit a new model
+
+        Args:
+            texts: Training texts
+            labels: Emotion label per text
+            metadata: Extra metadata stored with the artifact
+
+        Returns:
+            Trained TextEmotionModel
+        """
+        pipeline = build_pipeline()
+        pipeline.fit([normalize_text(t) for t in texts], list(labels))
+        info = {
+            'version': datetime.now().strftime('%Y%m%d%H%M%S'),
+            'trained_at': datetime.now().isoformat(),
+            'training_examples': len(texts),
+        }
+        info.update(metadata or {})
+        return cls(pipeline, info)
+
+    @classmethod
+    def from_seed(cls) -> 'TextEmotionModel':
+        """Bootstrap model trained on the bundled seed corpus"""
+        texts, labels = [], []
+        for label, examples in SEED_EXAMPLES.items():
+            texts.extend(examples)
+            labels.extend([label] * len(examples))
+        return cls.train(texts, labels, {'source': 'seed'})
+
+    def save(self, path: str):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        joblib.dump({'pipeline': self.pipeline, 'metadata': self.metadata}, tmp_path)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'TextEmotionModel':
+        artifact = joblib.load(path)
+        return cls(artifact['pipeline'], artifact.get('metadata'))
+
+    # ==================== INFERENCE ====================
+
+    def _predict_proba(self, normalized: str) -> Dict[str, float]:
+        probabilities = self.pipeline.predict_proba([normalized])[0]
+        return {label: float(p) for label, p in zip(self.labels, probabilities)}
+
+    def predict_proba(self, text: str) -> Dict[str, float]:
+        """Probability per emotion label"""
+        return self._cached_proba(normalize_text(text))
+
+    def sentiment(self, probabilities: Dict[str, float]) -> float:
+        """Expected sentiment (-1..1) under the label distribution"""
+        return sum(p * EMOTION_PROFILES.get(label, {}).get('sentiment', 0.0) for label, p in probabilities.items())
+
+    def top_terms(self, text: str, label: str, k: int = 5) -> List[str]:
+        """Words in ``text`` that most support ``label``"""
+        try:
+            word_vectorizer = self.pipeline.named_steps['features'].transformer_list[1][1]
+            clf = self.pipeline.named_steps['clf']
+            vocabulary = word_vectorizer.vocabulary_
+            offset = len(self.pipeline.named_steps['features'].transformer_list[0][1].vocabulary_)
+            row = clf.coef_[self.labels.index(label)] if clf.coef_.shape[0] > 1 else clf.coef_[0]
+            tokens = set(re.findall(TOKEN_PATTERN, normalize_text(text)))
+            scored = [(row[offset + vocabulary[t]], t) for t in tokens if t in vocabulary]
+            return [t for score, t in sorted(scored, reverse=True)[:k] if score > 0]
+        except Exception as e:
+            logger.debug(f"Top term extraction failed: {e}")
+            return []
+
+    def analyze(self, text: str) -> Dict[str, Any]:
+        """Emotion analysis in the shape used across the app
+
+        Returns:
+            Dictionary with primary_emotion, emotion_intensity, sentiment_score,
+            risk_level, confidence and the full probability distribution
+        """
+        probabilities = self.predict_proba(text)
+        primary_emotion = max(probabilities, key=probabilities.get)
+        confidence = probabilities[primary_emotion]
+        profile = EMOTION_PROFILES.get(primary_emotion, EMOTION_PROFILES['neutral'])
+        return {
+            'primary_emotion': primary_emotion,
+            'emotion_intensity': profile['intensity'],
+            'sentiment_score': round(self.sentiment(probabilities), 3),
+            'risk_level': profile['risk'],
+            'confidence': round(confidence, 3),
+            'emotion_probabilities': {k: round(v, 4) for k, v in probabilities.items()},
+            'model_used': 'local_text_model',
+            'model_version': self.version,
+        }
+
+
+# ==================== PER-WORKER INSTANCE ====================
+
+_model_lock = threading.Lock()
+_slot: Optional[HotSwappableModel] = None
+
+
+def default_model_path() -> str:
+    return os.path.join(MODEL_DIR, MODEL_FILENAME)
+
+
+def _load_or_seed() -> TextEmotionModel:
+    """Bootstrap model used until the distillation job promotes one
+
+    The build step (``python -m utils.text_emotion_model seed``) writes the
+    artifact and warmup loads it, so training here is only a last resort.
+    """
+    path = default_model_path()
+    try:
+        if os.path.exists(path):
+            model = TextEmotionModel.load(path)
+            logger.info(f"Loaded text emotion model {model.version} from {path}")
+            return model
+    except Exception as e:
+        logger.error(f"Could not load text emotion model from {path}: {e}")
+    logger.warning(f"No text emotion model at {path} - training from seed corpus now; "
+                   f"run 'python -m utils.text_emotion_model seed' at build time")
+    model = TextEmotionModel.from_seed()
+    logger.info("Trained text emotion model from seed corpus")
+    try:
+        model.save(path)
+    except Exception as e:
+        logger.warning(f"Could not save seed text emotion model: {e}")
+    return model
+
+
+def get_text_emotion_model() -> Optional[TextEmotionModel]:
+    """The worker's text model
+
+    The promoted version in the model registry wins; until there is one the
+    bootstrap model is loaded (or trained from the seed corpus) once. A newly
+    promoted version is picked up without a restart.
+
+    Returns:
+        TextEmotionModel, or None when scikit-learn is not installed
+    """
+    global _slot
+    if not SKLEARN_AVAILABLE:
+        return None
+    if _slot is None:
+        with _model_lock:
+            if _slot is None:
+                _slot = HotSwappableModel('text', TextEmotionModel.load, fallback=_load_or_seed)
+    return _slot.get()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Local text emotion model')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    subparsers.add_parser('seed', help='Train the bootstrap model from the seed corpus and save it')
+    predict_parser = subparsers.add_parser('predict', help='Classify text and report latency')
+    predict_parser.add_argument('text')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    if args.command == 'seed':
+        model = TextEmotionModel.from_seed()
+        model.save(default_model_path())
+        print(f"Saved seed model {model.version} to {default_model_path()}")
+    else:
+        model = get_text_emotion_model()
+        model.pipeline.predict_proba([normalize_text(args.text)])  # warm up
+        start = time.perf_counter()
+        model.pipeline.predict_proba([normalize_text(args.text)])
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        result = model.analyze(args.text)
+        print(f"{result['primary_emotion']} ({result['confidence']:.2f}) in {elapsed_ms:.3f} ms uncached")
+        print(result['emotion_probabilities'])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,340 @@
+# 🧠 Manas: Text Emotion Seed Corpus
+# Hand-labelled English, Hindi and Hinglish examples used to bootstrap the local text model
+
+# Each label mixes English, romanised Hinglish and Devanagari Hindi so the
+# character n-grams learn all three scripts from the start. The distillation
+# job (utils.distillation) later retrains on real Gemini-labelled traffic.
+SEED_EXAMPLES = {
+    'happy': [
+        "I am so happy today, everything went well",
+        "Had a wonderful day with my friends",
+        "I feel really good and grateful for my family",
+        "Got great marks in my exam, feeling awesome",
+        "Life feels beautiful right now, I love it",
+        "Aaj main bahut khush hoon",
+        "Bahut maza aaya aaj dosto ke saath",
+        "Mood ekdum mast hai aaj",
+        "Result achha aaya, bahut khushi hui",
+        "आज मैं बहुत खुश हूँ",
+        "दोस्तों के साथ बहुत अच्छा समय बिताया",
+        "मन बहुत प्रसन्न है आज",
+        "Today was a really good day, I smiled a lot",
+        "I am feeling cheerful and positive this morning",
+        "My parents surprised me with a gift, I'm so pleased",
+        "We won the match and I feel great",
+        "Spent the evening laughing with my cousins, loved it",
+        "I'm glad I finally finished my project, feeling happy",
+        "Feeling joyful after talking to my best friend",
+        "It was a lovely day at college, everyone was nice",
+        "Aaj ka din bahut achha gaya",
+        "Dosto ke saath hasi mazaak karke mood achha ho gaya",
+        "Mummy ne mera favourite khana banaya, bahut khush hoon",
+        "Match jeet gaye, bahut maza aaya",
+        "Aaj dil se khushi ho rahi hai",
+        "Sab kuch achha chal raha hai, main khush hoon",
+        "Exam achha gaya, mood badhiya hai",
+        "आज का दिन बहुत अच्छा रहा",
+        "परिवार के साथ समय बिताकर खुशी हुई",
+        "मैच जीत गए, बहुत मज़ा आया",
+        "आज मन बहुत खुश है",
+        "परीक्षा अच्छी गई, बहुत अच्छा लग रहा है",
+    ],
+    'excited': [
+        "I can't wait for the trip next week!",
+        "So excited, I got selected for the team!",
+        "This is amazing, I am thrilled about the new job",
+        "Finally going to the concert tomorrow, yay!",
+        "I just got my admission letter, I'm over the moon",
+        "Kal trip pe ja rahe hain, bahut excited hoon",
+        "Yaar selection ho gaya, bas ab wait nahi hota",
+        "Naya phone aa raha hai kal, full josh mein hoon",
+        "कल घूमने जा रहे हैं, बहुत उत्साहित हूँ",
+        "मेरा चयन हो गया, इंतज़ार नहीं हो रहा",
+        "नई नौकरी मिली है, बहुत जोश में हूँ",
+        "Tomorrow is my birthday party, I'm so excited!",
+        "We are going to Goa next week, can't wait!",
+        "I got the internship, this is incredible!",
+        "The festival starts tomorrow and I am pumped",
+        "I'm buzzing with energy about the hackathon this weekend",
+        "Our band is performing tonight, I'm thrilled!",
+        "I just booked tickets for the match, so hyped",
+        "My results are out and I topped the class, wow!",
+        "Kal birthday party hai, bahut excited hoon",
+        "Goa ka plan ban gaya, ab intezaar nahi ho raha",
+        "Internship mil gayi yaar, full excitement",
+        "Kal fest hai, full josh mein hoon",
+        "Aaj raat concert hai, bahut maza aane wala hai",
+        "Topper ban gaya, ab toh party hogi!",
+        "Weekend pe hackathon hai, bahut utsuk hoon",
+        "कल जन्मदिन की पार्टी है, बहुत उत्साहित हूँ",
+        "अगले हफ़्ते गोवा जा रहे हैं, बहुत जोश है",
+        "इंटर्नशिप मिल गई, इंतज़ार नहीं हो रहा",
+        "कल त्योहार है, बहुत उत्साह है",
+        "आज रात कॉन्सर्ट है, बहुत रोमांचित हूँ",
+    ],
+    'calm': [
+        "I feel peaceful and relaxed after meditation",
+        "Just sitting quietly, feeling calm and content",
+        "Went for a slow walk, my mind feels at ease",
+        "Everything is steady, I feel balanced today",
+        "Yoga ke baad mann shaant hai",
+        "Aaj bilkul relaxed feel ho raha hai",
+        "Sab theek chal raha hai, sukoon hai",
+        "ध्यान के बाद मन शांत है",
+        "आज बहुत सुकून महसूस हो रहा है",
+        "सब कुछ ठीक है, मन स्थिर है",
+        "I feel at peace sitting by the window with tea",
+        "Had a quiet evening reading a book, very relaxing",
+        "My breathing is slow and steady, I feel settled",
+        "Listening to soft music, my mind is calm",
+        "The rain outside makes me feel serene",
+        "I am relaxed and comfortable after a good sleep",
+        "Took a long bath, feeling light and peaceful",
+        "Sunset walk by the lake left me feeling tranquil",
+        "Chai peete hue khidki ke paas baitha hoon, bahut sukoon hai",
+        "Kitaab padhke shaam bahut aaram se guzri",
+        "Halka music sun raha hoon, mann shaant hai",
+        "Baarish dekh ke bahut sukoon mil raha hai",
+        "Achhi neend ke baad bilkul relaxed hoon",
+        "Mann halka aur shaant lag raha hai",
+        "Dheere dheere saans le raha hoon, sab theek lag raha hai",
+        "चाय पीते हुए बहुत सुकून मिल रहा है",
+        "किताब पढ़कर शाम आराम से बीती",
+        "बारिश देखकर मन शांत है",
+        "अच्छी नींद के बाद मन हल्का है",
+        "धीमा संगीत सुनकर बहुत शांति मिल रही है",
+    ],
+    'sad': [
+        "I feel so sad and lonely these days",
+        "I was crying all night, nothing feels right",
+        "My best friend stopped talking to me and it hurts",
+        "Feeling really down and unhappy",
+        "I miss my home and my parents so much",
+        "Aaj mann bahut udaas hai",
+        "Bahut akela mehsoos ho raha hai",
+        "Dil toot gaya yaar, rona aa raha hai",
+        "Ghar ki bahut yaad aa rahi hai",
+        "आज मन बहुत उदास है",
+        "बहुत अकेलापन महसूस हो रहा है",
+        "रात भर रोता रहा, कुछ अच्छा नहीं लग रहा",
+        "I feel empty and sad since my grandmother passed away",
+        "Nobody remembered my birthday, I feel so hurt",
+        "I keep crying and I don't know why",
+        "My heart feels heavy today",
+        "I lost my pet last week and I miss him so much",
+        "Everyone is busy and I feel left out and sad",
+        "I feel gloomy and tearful this evening",
+        "Breaking up with her has left me heartbroken",
+        "Dadi ke jaane ke baad bahut udaasi hai",
+        "Kisi ne birthday yaad nahi rakha, bura laga",
+        "Bina wajah rona aa raha hai",
+        "Dil bahut bhaari hai aaj",
+        "Mera kutta chala gaya, uski bahut yaad aati hai",
+        "Sab busy hain, main akela pad gaya hoon, dukh hota hai",
+        "Breakup ke baad dil toot gaya hai",
+        "दादी के जाने के बाद बहुत दुख है",
+        "किसी ने जन्मदिन याद नहीं रखा, बहुत बुरा लगा",
+        "बिना वजह रोना आ रहा है",
+        "दिल बहुत भारी है आज",
+        "सब व्यस्त हैं, मैं अकेला और दुखी हूँ",
+    ],
+    'anxious': [
+        "I am so anxious about tomorrow's interview",
+        "My heart is racing and I keep worrying",
+        "I feel nervous and scared all the time",
+        "Panic attack again before the presentation",
+        "I can't stop overthinking what people think of me",
+        "Kal ke exam ko leke bahut ghabrahat ho rahi hai",
+        "Dil bahut tez dhadak raha hai, dar lag raha hai",
+        "Har waqt tension aur chinta rehti hai",
+        "कल के इंटरव्यू को लेकर बहुत घबराहट है",
+        "मुझे हर समय डर और चिंता रहती है",
+        "दिल की धड़कन तेज़ है, बहुत बेचैनी है",
+        "I'm worried something bad is going to happen",
+        "My hands are shaking before the exam results",
+        "I can't sleep because I keep worrying about everything",
+        "I feel restless and on edge all day",
+        "What if I fail, I'm so scared",
+        "I get nervous talking to people in class",
+        "My chest feels tight and I'm panicking",
+        "I'm afraid of what my parents will say about my marks",
+        "Lag raha hai kuch bura hone wala hai",
+        "Result se pehle haath kaanp rahe hain",
+        "Chinta ki wajah se neend nahi aa rahi",
+        "Din bhar bechaini rehti hai",
+        "Agar fail ho gaya toh, bahut darr lag raha hai",
+        "Class mein bolne se ghabrahat hoti hai",
+        "Papa marks dekh ke kya kahenge, soch ke dar lagta hai",
+        "लग रहा है कुछ बुरा होने वाला है",
+        "नतीजों से पहले हाथ काँप रहे हैं",
+        "चिंता के कारण नींद नहीं आ रही",
+        "दिन भर बेचैनी रहती है",
+        "फेल हो गया तो क्या होगा, बहुत डर लग रहा है",
+    ],
+    'stressed': [
+        "So much pressure with exams and assignments",
+        "Deadlines everywhere, I am totally stressed out",
+        "Too much work and no time to rest",
+        "My parents expect too much and it's overwhelming",
+        "I am exhausted from studying all day for the boards",
+        "Padhai ka bahut pressure hai yaar",
+        "Assignments ka load bahut zyada hai",
+        "Exam sar pe hai aur kuch padha nahi, full stress",
+        "पढ़ाई का बहुत दबाव है",
+        "काम बहुत ज़्यादा है और समय बिल्कुल नहीं",
+        "परीक्षा सिर पर है, बहुत तनाव है",
+        "I have three exams this week and I'm stressed",
+        "Juggling college, coaching and homework is too much",
+        "I'm under a lot of pressure to get into a good college",
+        "I haven't slept properly because of all the work",
+        "My schedule is packed and I'm burning out",
+        "Board exams are coming and I'm so tense",
+        "The project deadline is tomorrow and nothing is done",
+        "Everyone expects me to score high, the pressure is crushing",
+        "Is hafte teen exam hain, bahut tension hai",
+        "College, coaching aur homework, sab ek saath, bahut load hai",
+        "Achhe college ka pressure bahut hai",
+        "Kaam ki wajah se theek se soya nahi",
+        "Schedule itna bhara hai ki thak gaya hoon",
+        "Boards aa rahe hain, bahut tension hai",
+        "Kal deadline hai aur kuch bhi nahi hua",
+        "इस हफ़्ते तीन परीक्षाएँ हैं, बहुत तनाव है",
+        "कॉलेज, कोचिंग और होमवर्क, सब एक साथ, बहुत बोझ है",
+        "अच्छे कॉलेज का बहुत दबाव है",
+        "कल डेडलाइन है और कुछ नहीं हुआ",
+        "बोर्ड परीक्षा आ रही है, बहुत तनाव में हूँ",
+    ],
+    'angry': [
+        "I am so angry at my brother right now",
+        "This is unfair, I hate how they treated me",
+        "I'm furious, nobody listens to me",
+        "So frustrated and irritated with everything",
+        "My teacher humiliated me in class and I'm mad",
+        "Mujhe bahut gussa aa raha hai",
+        "Sab log mera dimaag kharab kar rahe hain",
+        "Yeh bilkul galat hai, bahut chidh ho rahi hai",
+        "मुझे बहुत गुस्सा आ रहा है",
+        "यह बिल्कुल गलत है, कोई मेरी नहीं सुनता",
+        "सब पर बहुत चिढ़ हो रही है",
+        "My roommate ate my food again, I'm so annoyed",
+        "I hate it when people lie to me",
+        "They blamed me for something I didn't do, I'm livid",
+        "I want to scream, everyone keeps interrupting me",
+        "My friend betrayed my trust and I'm really angry",
+        "The bus driver was rude and it made me furious",
+        "I'm fed up with being ignored at home",
+        "Stop telling me what to do, it makes me so mad",
+        "Roommate ne phir se mera khana kha liya, bahut gussa hai",
+        "Mujhse jhooth bolte hain toh bahut gussa aata hai",
+        "Bina galti ke mujhe daant pada, dimaag garam hai",
+        "Dost ne dhokha diya, bahut gussa aa raha hai",
+        "Ghar pe koi meri baat nahi sunta, tang aa gaya hoon",
+        "Baar baar tokte hain, chillane ka mann karta hai",
+        "Bus wale ne badtameezi ki, khoon khaul gaya",
+        "रूममेट ने फिर से मेरा खाना खा लिया, बहुत गुस्सा है",
+        "बिना गलती के डाँट पड़ी, दिमाग गरम है",
+        "दोस्त ने धोखा दिया, बहुत गुस्सा आ रहा है",
+        "घर पर कोई मेरी बात नहीं सुनता, तंग आ गया हूँ",
+        "बार बार टोकते हैं, चिल्लाने का मन करता है",
+    ],
+    'confused': [
+        "I don't know what to do with my career",
+        "I'm confused about which stream to choose",
+        "Not sure what I'm feeling, everything is mixed up",
+        "I feel lost and uncertain about my future",
+        "Can't decide between engineering and arts",
+        "Samajh nahi aa raha kya karun",
+        "Career ko leke bahut confusion hai",
+        "Pata nahi kya sahi hai kya galat",
+        "समझ नहीं आ रहा क्या करूँ",
+        "भविष्य को लेकर बहुत उलझन है",
+        "कौन सा रास्ता चुनूँ, पता नहीं",
+        "I'm not sure if I should tell my parents or not",
+        "I have mixed feelings about moving to a new city",
+        "I don't understand why I feel this way",
+        "Should I take a drop year or join college, I can't decide",
+        "Everyone gives different advice and I'm puzzled",
+        "I don't know whether she likes me or not",
+        "I'm torn between two choices and can't figure it out",
+        "Nothing makes sense to me right now, I'm unsure",
+        "Samajh nahi aa raha mummy papa ko bataun ya nahi",
+        "Naye sheher jaane ko leke mixed feelings hain",
+        "Pata nahi main aisa kyun feel kar raha hoon",
+        "Drop lun ya college join karun, decide nahi ho raha",
+        "Sab alag alag salaah dete hain, kuch samajh nahi aata",
+        "Do options ke beech atak gaya hoon",
+        "Abhi kuch clear nahi hai, bahut confused hoon",
+        "मम्मी पापा को बताऊँ या नहीं, समझ नहीं आ रहा",
+        "नए शहर जाने को लेकर मन में उलझन है",
+        "पता नहीं मैं ऐसा क्यों महसूस कर रहा हूँ",
+        "ड्रॉप लूँ या कॉलेज जाऊँ, तय नहीं कर पा रहा",
+        "सब अलग अलग सलाह देते हैं, कुछ समझ नहीं आता",
+    ],
+    'hopeless': [
+        "Nothing will ever get better, what's the point",
+        "I feel worthless and useless",
+        "I want to give up on everything",
+        "I'm a burden to everyone around me",
+        "There is no way out of this",
+        "Kuch theek nahi hoga, koi fayda nahi",
+        "Main kisi kaam ka nahi hoon",
+        "Sab chhod dene ka mann karta hai",
+        "Jeene ka koi matlab nahi lagta",
+        "कुछ भी ठीक नहीं होगा, कोई फ़ायदा नहीं",
+        "मैं किसी काम का नहीं हूँ",
+        "सब छोड़ देने का मन करता है",
+        "No matter what I do it never works out",
+        "I don't see any future for myself",
+        "I've failed at everything, there's no hope left",
+        "Everyone would be better without me",
+        "I'm tired of trying, nothing changes",
+        "I feel like I'm stuck forever and it won't get better",
+        "What's the point of studying, I'll fail anyway",
+        "I have nothing to look forward to anymore",
+        "Kuch bhi kar lo, kuch nahi badalta",
+        "Mera koi future nahi hai",
+        "Har cheez mein fail ho gaya, koi umeed nahi bachi",
+        "Mere bina sab behtar rahenge",
+        "Koshish karke thak gaya, kuch nahi badalta",
+        "Padhne ka kya fayda, fail hi hounga",
+        "Aage dekhne ko kuch bhi nahi hai",
+        "कुछ भी कर लो, कुछ नहीं बदलता",
+        "मेरा कोई भविष्य नहीं है",
+        "हर चीज़ में फेल हो गया, कोई उम्मीद नहीं बची",
+        "मेरे बिना सब बेहतर रहेंगे",
+        "कोशिश करके थक गया, कुछ नहीं बदलता",
+    ],
+    'neutral': [
+        "I went to college and came back home",
+        "Today was an ordinary day",
+        "Had lunch and studied for a while",
+        "Nothing special happened today",
+        "I have a class at ten tomorrow",
+        "Aaj normal din tha",
+        "College gaya aur wapas aa gaya",
+        "Kuch khaas nahi hua aaj",
+        "आज का दिन सामान्य था",
+        "कॉलेज गया और घर वापस आ गया",
+        "आज कुछ ख़ास नहीं हुआ",
+        "I took the metro to college this morning",
+        "We had a lecture on thermodynamics today",
+        "I need to buy groceries this evening",
+        "My exam is scheduled for Monday",
+        "I watched a documentary after dinner",
+        "Cleaned my room and did some laundry",
+        "The library closes at eight",
+        "I attended two classes and a lab",
+        "Subah metro se college gaya",
+        "Aaj thermodynamics ka lecture tha",
+        "Shaam ko sabzi leni hai",
+        "Somvaar ko exam hai",
+        "Khana khaake ek documentary dekhi",
+        "Kamra saaf kiya aur kapde dhoye",
+        "Do class aur ek lab attend ki",
+        "सुबह मेट्रो से कॉलेज गया",
+        "आज थर्मोडायनामिक्स का लेक्चर था",
+        "शाम को सब्ज़ी खरीदनी है",
+        "सोमवार को परीक्षा है",
+        "कमरा साफ़ किया और कपड़े धोए",
+    ],
+}
@@ -0,0 +1,110 @@
+# 🧠 Manas: Tiered Emotion Analysis
+# Local analyzers answer first; Gemini is consulted only for ambiguous or risky inputs
+
+import logging
+import os
+import re
+import threading
+from collections import Counter
+from typing import Any, Dict, Iterable, Optional
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONFIDENCE_THRESHOLD = float(os.environ.get('LOCAL_CONFIDENCE_THRESHOLD', 0.65))
+TIERED_ANALYSIS_ENABLED = os.environ.get('TIERED_ANALYSIS_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+
+# Local results at or above this risk level always get a Gemini second opinion
+RISK_LEVEL_ESCALATION = 0.5
+
+
+class TierStats:
+    """Thread-safe counters of local vs escalated analyses per modality"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._totals = Counter()
+        self._escalated = Counter()
+        self._reasons = Counter()
+
+    def record(self, modality: str, reason: Optional[str]):
+        with self._lock:
+            self._totals[modality] += 1
+            if reason:
+                self._escalated[modality] += 1
+                self._reasons[reason] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Escalation rate overall and per modality, plus escalation reasons"""
+        with self._lock:
+            total = sum(self._totals.values())
+            escalated = sum(self._escalated.values())
+            return {
+                'total': total,
+                'escalated': escalated,
+                'escalation_rate': round(escalated / total, 4) if total else 0.0,
+                'by_modality': {
+                    modality: {
+                        'total': count,
+                        'escalated': self._escalated[modality],
+                        'escalation_rate': round(self._escalated[modality] / count, 4)
+                    }
+                    for modality, count in self._totals.items()
+                },
+                'reasons': dict(self._reasons)
+            }
+
+
+class TieringPolicy:
+    """Decides whether a local analysis result is good enough to return.
+
+    A result is escalated to Gemini when the local analyzer failed, its
+    confidence is below the threshold for its modality, it reports an
+    elevated risk level, or the input text contains a risk term.
+    """
+
+    def __init__(self, risk_terms: Iterable[str] = (), threshold: float = DEFAULT_CONFIDENCE_THRESHOLD,
+                 modality_thresholds: Optional[Dict[str, float]] = None, enabled: bool = TIERED_ANALYSIS_ENABLED,
+                 lexicon: Optional[Any] = None):
+        """
+        Args:
+            risk_terms: Words/phrases that always force escalation when present in text
+            threshold: Minimum local confidence to skip Gemini
+            modality_thresholds: Per-modality overrides of ``threshold``
+            enabled: When False every analysis is escalated (previous behaviour)
+            lexicon: CrisisLexicon whose high/moderate-risk terms force escalation,
+                negated or not (used instead of ``risk_terms``)
+        """
+        self.threshold = threshold
+        self.modality_thresholds = modality_thresholds or {}
+        self.enabled = enabled
+        self.stats = TierStats()
+        self.lexicon = lexicon
+        terms = sorted({t.lower() for t in risk_terms if t}, key=len, reverse=True)
+        self._risk_pattern = re.compile(r'\b(?:' + '|'.join(re.escape(t) for t in terms) + r')\b', re.IGNORECASE) if terms else None
+
+    def has_risk_terms(self, text: Optional[str]) -> bool:
+        if self.lexicon is not None:
+            return self.lexicon.contains(text, categories=('high_risk', 'moderate_risk'), include_negated=True)
+        return bool(text and self._risk_pattern and self._risk_pattern.search(text))
+
+    def escalation_reason(self, modality: str, local_result: Dict[str, Any], text: Optional[str] = None) -> Optional[str]:
+        """Why the local result must go to Gemini, or None to accept it.
+
+        Every call is recorded in ``stats``.
+        """
+        if not self.enabled:
+            reason = 'tiering_disabled'
+        elif not local_result or local_result.get('primary_emotion') == 'error' or local_result.get('error'):
+            reason = 'local_error'
+        elif self.has_risk_terms(text):
+            reason = 'risk_terms'
+        elif float(local_result.get('risk_level', 0.0) or 0.0) >= RISK_LEVEL_ESCALATION:
+            reason = 'risk_level'
+        elif float(local_result.get('confidence', 0.0) or 0.0) < self.modality_thresholds.get(modality, self.threshold):
+            reason = 'low_confidence'
+        else:
+            reason = None
+
+        self.stats.record(modality, reason)
+        return reason
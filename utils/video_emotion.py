@@ -0,0 +1,293 @@
+# 🧠 Manas: Video Emotion Analysis
+# Adaptive frame sampling, pooled landmarking, temporal smoothing and keyframe-only Gemini review
+
+import logging
+import os
+import tempfile
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+from .emotion_detector import FACIAL_ANALYSIS_JSON_FORMAT
+from .gemini_api import gemini_multimodal
+from .landmark_features import analyze_landmarks_batch, EMOTIONS
+from .lazy_import import lazy_import
+
+# Imported on first use
+cv2 = lazy_import('cv2')
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+class VideoEmotionAnalyzer:
+    """Emotion timeline for a video clip.
+
+    Cost is bounded regardless of clip length: at most ``max_candidates``
+    frames are ever decoded for inspection, near-duplicates of the last kept
+    frame are dropped by frame differencing, landmarks are computed in
+    batches on a pooled FaceMesh graph, and Gemini sees a single montage of
+    at most ``max_keyframes`` representative frames.
+    """
+
+    def __init__(self, detector, sample_fps: float = 4.0, max_candidates: int = 120,
+                 diff_threshold: float = 6.0, max_gap_seconds: float = 2.0,
+                 smoothing_alpha: float = 0.4, max_keyframes: int = 3,
+                 batch_size: int = 16, max_side: int = 480):
+        """
+        Args:
+            detector: EmotionDetector providing the FaceMesh pool and landmark analysis
+            sample_fps: Highest rate at which candidate frames are inspected
+            max_candidates: Upper bound on inspected frames per clip
+            diff_threshold: Mean absolute grey-level change needed to keep a frame
+            max_gap_seconds: Keep a frame after this long even if nothing changed
+            smoothing_alpha: EWMA weight of the newest frame's emotion scores
+            max_keyframes: Frames sent to Gemini
+            batch_size: Frames landmarked per pool checkout
+            max_side: Frames are downscaled so the longer side is at most this
+        """
+        self.detector = detector
+        self.sample_fps = sample_fps
+        self.max_candidates = max_candidates
+        self.diff_threshold = diff_threshold
+        self.max_gap_seconds = max_gap_seconds
+        self.smoothing_alpha = smoothing_alpha
+        self.max_keyframes = max_keyframes
+        self.batch_size = batch_size
+        self.max_side = max_side
+
+    # ==================== SAMPLING ====================
+
+    def _downscale(self, frame: np.ndarray) -> np.ndarray:
+        height, width = frame.shape[:2]
+        scale = self.max_side / max(height, width)
+        if scale < 1.0:
+            frame = cv2.resize(frame, (int(width * scale), int(height * scale)), interpolation=cv2.INTER_AREA)
+        return frame
+
+    def _sample_frames(self, path: str) -> Iterator[Tuple[float, np.ndarray]]:
+        """Yield (timestamp, rgb_frame) for frames that differ from the last kept one"""
+        capture = cv2.VideoCapture(path)
+        if not capture.isOpened():
+            raise ValueError("Could not open video")
+
+        try:
+            fps = capture.get(cv2.CAP_PROP_FPS) or 25.0
+            total_frames = int(capture.get(cv2.CAP_PROP_FRAME_COUNT) or 0)
+
+            # Inspect at most sample_fps frames per second and max_candidates overall
+            stride = max(1, int(round(fps / self.sample_fps)))
+            if total_frames > 0:
+                stride = max(stride, int(np.ceil(total_frames / self.max_candidates)))
+            # For long gaps seeking is cheaper than decoding every skipped frame
+            seek = stride > fps
+
+            last_thumb = None
+            last_kept_time = -np.inf
+            index = 0
+            inspected = 0
+
+            while inspected < self.max_candidates:
+                if seek:
+                    capture.set(cv2.CAP_PROP_POS_FRAMES, index)
+                ok, frame = capture.read()
+                if not ok:
+                    break
+                inspected += 1
+                timestamp = index / fps
+
+                thumb = cv2.resize(cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY), (64, 64), interpolation=cv2.INTER_AREA)
+                changed = last_thumb is None or float(np.mean(cv2.absdiff(thumb, last_thumb))) >= self.diff_threshold
+                if changed or timestamp - last_kept_time >= self.max_gap_seconds:
+                    last_thumb = thumb
+                    last_kept_time = timestamp
+                    yield timestamp, cv2.cvtColor(self._downscale(frame), cv2.COLOR_BGR2RGB)
+
+                index += stride
+                if not seek:
+                    for _ in range(stride - 1):
+                        if not capture.grab():
+                            return
+        finally:
+            capture.release()
+
+    def _batches(self, frames: Iterator[Tuple[float, np.ndarray]]) -> Iterator[List[Tuple[float, np.ndarray]]]:
+        batch = []
+        for item in frames:
+            batch.append(item)
+            if len(batch) >= self.batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    # ==================== ANALYSIS ====================
+
+    def _smooth(self, previous: Optional[np.ndarray], scores: np.ndarray) -> np.ndarray:
+        if previous is None:
+            return scores
+        return self.smoothing_alpha * scores + (1 - self.smoothing_alpha) * previous
+
+    def _build_timeline(self, path: str) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Per-frame timeline plus the best frame of each emotion segment"""
+        timeline = []
+        segments = []  # {'emotion', 'start', 'end', 'best_confidence', 'frame'}
+        smoothed = None
+
+        pools = self.detector.face_pools
+        for batch in self._batches(self._sample_frames(path)):
+            if pools:
+                landmarks = pools.detect_batch([frame for _, frame in batch])
+            else:
+                landmarks = [None] * len(batch)
+
+            # Features and scores for every face in the batch in one vectorized pass
+            analyses = analyze_landmarks_batch(landmarks)
+
+            for (timestamp, frame), analysis in zip(batch, analyses):
+                entry = {'timestamp': round(timestamp, 2), 'face_detected': analysis is not None}
+
+                if analysis is not None:
+                    breakdown = analysis.get('emotions_breakdown', {})
+                    raw = np.array([float(breakdown.get(e, 0.0)) for e in EMOTIONS])
+                    smoothed = self._smooth(smoothed, raw)
+                    entry['raw_emotion'] = analysis.get('primary_emotion', 'neutral')
+                    confidence = float(analysis.get('confidence', 0.0))
+                else:
+                    confidence = 0.0
+
+                if smoothed is None:
+                    # No face seen yet - keep the frame as a Gemini candidate only
+                    emotion = None
+                else:
+                    emotion = EMOTIONS[int(np.argmax(smoothed))]
+                    entry['primary_emotion'] = emotion
+                    entry['scores'] = {e: round(float(v), 1) for e, v in zip(EMOTIONS, smoothed)}
+                entry['confidence'] = round(confidence, 3)
+                timeline.append(entry)
+
+                if not segments or segments[-1]['emotion'] != emotion:
+                    segments.append({'emotion': emotion, 'start': timestamp, 'end': timestamp,
+                                     'best_confidence': -1.0, 'frame': None})
+                segment = segments[-1]
+                segment['end'] = timestamp
+                if confidence > segment['best_confidence']:
+                    segment['best_confidence'] = confidence
+                    segment['frame'] = frame
+
+        return timeline, segments
+
+    def _keyframe_montage(self, segments: List[Dict[str, Any]]) -> Optional[np.ndarray]:
+        """Side-by-side montage of the representative frames of the longest segments"""
+        ranked = sorted(segments, key=lambda s: (s['end'] - s['start'], s['best_confidence']), reverse=True)
+        chosen = sorted(ranked[:self.max_keyframes], key=lambda s: s['start'])
+        frames = [s['frame'] for s in chosen if s['frame'] is not None]
+        if not frames:
+            return None
+        height = min(f.shape[0] for f in frames)
+        resized = [cv2.resize(f, (int(f.shape[1] * height / f.shape[0]), height)) for f in frames]
+        return np.hstack(resized)
+
+    def _summarize(self, timeline: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Clip-level landmark result weighted by time spent in each frame's state"""
+        scored = [e for e in timeline if 'scores' in e]
+        if not scored:
+            return {'primary_emotion': 'neutral', 'emotion_intensity': 3, 'confidence': 0.3,
+                    'emotions_breakdown': {}, 'facial_features': {}}
+
+        weights = np.diff([e['timestamp'] for e in scored] + [scored[-1]['timestamp'] + 1.0])
+        weights = np.maximum(weights, 1e-3)
+        matrix = np.array([[e['scores'][emotion] for emotion in EMOTIONS] for e in scored])
+        mean_scores = (matrix * weights[:, None]).sum(axis=0) / weights.sum()
+        primary = EMOTIONS[int(np.argmax(mean_scores))]
+        face_ratio = sum(1 for e in timeline if e['face_detected']) / len(timeline)
+        return {
+            'primary_emotion': primary,
+            'emotion_intensity': max(1, min(10, int(mean_scores.max() / 10))),
+            'confidence': round(float(np.mean([e['confidence'] for e in scored])) * face_ratio, 3),
+            'emotions_breakdown': {e: round(float(v), 1) for e, v in zip(EMOTIONS, mean_scores)},
+            'facial_features': {}
+        }
+
+    def analyze_video(self, video: Union[str, bytes], extension: str = 'mp4') -> Dict[str, Any]:
+        """
+        Analyze emotion over the course of a video clip
+
+        Args:
+            video: Path to a video file, or the uploaded bytes
+            extension: Container extension used for the temporary file when bytes are given
+
+        Returns:
+            Dictionary with clip-level emotion and an 'emotion_timeline'
+        """
+        temp_path = None
+        try:
+            if isinstance(video, (bytes, bytearray)):
+                # OpenCV can only demux from a file, so stage the bytes briefly
+                fd, temp_path = tempfile.mkstemp(suffix=f".{extension}")
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(video)
+                path = temp_path
+            else:
+                path = video
+
+            timeline, segments = self._build_timeline(path)
+            if not timeline:
+                raise ValueError("No frames could be decoded from video")
+
+            summary = self._summarize(timeline)
+            montage = self._keyframe_montage(segments)
+
+            result = summary
+            if montage is not None:
+                # The geometric breakdown goes in as prose: a JSON-looking dict in the prompt
+                # can be echoed back and picked up by the fusion parser instead of the answer
+                breakdown = ', '.join(
+                    f"{emotion} {share:.0f}%"
+                    for emotion, share in sorted(summary['emotions_breakdown'].items(), key=lambda kv: -kv[1])
+                )
+                prompt = f"""
+                You are an expert clinical psychologist specializing in facial emotion analysis for youth mental health assessment.
+                
+                These are {min(len(segments), self.max_keyframes)} representative frames, left to right in time order,
+                from a short video of one person. Frame-by-frame geometric analysis over the clip estimated
+                the emotion shares as: {breakdown}.
+                
+                Assess the person's overall emotional state across the whole clip.
+                {FACIAL_ANALYSIS_JSON_FORMAT}
+                Return ONLY the JSON object, no additional text or markdown.
+                """
+                try:
+                    gemini_response = gemini_multimodal(montage, prompt)
+                    result = self.detector._enhanced_facial_analysis_fusion(summary, gemini_response)
+                except Exception as gemini_error:
+                    logger.warning(f"Gemini video keyframe analysis failed: {gemini_error}")
+                    result['gemini_error'] = str(gemini_error)
+
+            result.update({
+                'analysis_method': 'video_timeline_gemini_keyframes' if montage is not None else 'video_timeline',
+                'emotion_timeline': timeline,
+                'frames_analyzed': len(timeline),
+                'keyframes_sent': min(len(segments), self.max_keyframes) if montage is not None else 0,
+                'duration_analyzed': timeline[-1]['timestamp'],
+                'facial_landmarks_detected': any(e['face_detected'] for e in timeline),
+                'processing_timestamp': datetime.now().isoformat()
+            })
+            return result
+
+        except Exception as e:
+            logger.error(f"Video emotion analysis error: {e}")
+            return {
+                'primary_emotion': 'error',
+                'emotion_intensity': 0,
+                'confidence': 0.0,
+                'analysis_method': 'error',
+                'error': str(e)
+            }
+        finally:
+            if temp_path:
+                try:
+                    os.remove(temp_path)
+                except OSError:
+                    pass